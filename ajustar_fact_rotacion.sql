@@ -1,54 +1,19 @@
 -- Ajustes a la tabla fact_rotacion para mejorar el análisis
 
--- 1. Agregar columna de clasificación ABC basada en rotación
-ALTER TABLE fact_rotacion ADD COLUMN abc_clasificacion VARCHAR(1) AFTER rotacion_mes;
+-- Las columnas abc_clasificacion, estado_inventario, semanas_inventario,
+-- inventario_critico y alta_rentabilidad se calculan en el transform de
+-- fact_rotacion (TransformadorFactRotacion / LoaderFactRotacionSQL) y se
+-- escriben junto con el resto de la fila. Los loaders crean las columnas si
+-- no existen, por lo que ya no hace falta recalcularlas con UPDATE tras cada carga.
 
--- Actualizar clasificación ABC (A: alta rotación, B: media, C: baja)
-UPDATE fact_rotacion 
-SET abc_clasificacion = 
-    CASE 
-        WHEN rotacion_mes >= 2 THEN 'A'  -- Alta rotación (2+ veces al mes)
-        WHEN rotacion_mes >= 1 THEN 'B'  -- Media rotación (1-2 veces al mes)
-        ELSE 'C'                         -- Baja rotación (menos de 1 vez al mes)
-    END;
-    
--- 2. Agregar columna de estado de inventario
-ALTER TABLE fact_rotacion ADD COLUMN estado_inventario VARCHAR(10) AFTER dias_inventario;
-
--- Actualizar estado de inventario
-UPDATE fact_rotacion 
-SET estado_inventario = 
-    CASE 
-        WHEN dias_inventario <= 15 THEN 'BAJO'        -- Menos de 15 días
-        WHEN dias_inventario <= 45 THEN 'ÓPTIMO'      -- Entre 15 y 45 días
-        WHEN dias_inventario <= 60 THEN 'ALTO'        -- Entre 45 y 60 días
-        ELSE 'EXCESO'                                 -- Más de 60 días
-    END;
-    
--- 3. Agregar columna de semanas de inventario para facilitar análisis
-ALTER TABLE fact_rotacion ADD COLUMN semanas_inventario DECIMAL(10,2) AFTER dias_inventario;
-
--- Actualizar semanas de inventario
-UPDATE fact_rotacion SET semanas_inventario = dias_inventario / 7;
-
--- 4. Agregar columna para indicar si el inventario está agotado o crítico
-ALTER TABLE fact_rotacion ADD COLUMN inventario_critico BOOLEAN AFTER estado_inventario;
-
--- Actualizar estado crítico (menos de 7 días de inventario)
-UPDATE fact_rotacion SET inventario_critico = (dias_inventario < 7);
-
--- 5. Agregar columna para indicar si el producto es de alta rentabilidad
-ALTER TABLE fact_rotacion ADD COLUMN alta_rentabilidad BOOLEAN AFTER margen_porcentaje;
-
--- Actualizar alta rentabilidad (más del 30% de margen)
-UPDATE fact_rotacion SET alta_rentabilidad = (margen_porcentaje > 30);
-
--- 6. Agregar índices para mejorar consultas de análisis
+-- 1. Agregar índices para mejorar consultas de análisis
 CREATE INDEX idx_fact_rotacion_abc ON fact_rotacion(abc_clasificacion);
 CREATE INDEX idx_fact_rotacion_estado_inv ON fact_rotacion(estado_inventario);
 CREATE INDEX idx_fact_rotacion_rentabilidad ON fact_rotacion(alta_rentabilidad);
 
--- 7. Crear vistas para análisis
+-- 2. Crear vistas para análisis
+-- Para el dashboard usar las tablas resumen_* (analysis/loader/resumenes_fact_rotacion.py),
+-- que el ETL de fact_rotacion mantiene por PDV-mes e indexa por periodo.
 
 -- Vista para análisis de rotación por PDV
 CREATE OR REPLACE VIEW vw_rotacion_por_pdv AS
@@ -0,0 +1,98 @@
+# analysis/etl/etl_runner_antiguedad_inventario.py
+
+import os
+import argparse
+
+from analysis.extractor.extractor_antiguedad_inventario import ExtractorAntiguedadInventario
+from analysis.transformer.transformer_antiguedad_inventario import (
+    TransformadorAntiguedadInventario, DIAS_INVENTARIO_MUERTO
+)
+from analysis.loader.loader_antiguedad_inventario import LoaderAntiguedadInventario
+from utils.logger_etl import LoggerETL
+
+RUTA_SALIDA_ANTIGUEDAD = "data/output/antiguedad_inventario"
+
+
+class AntiguedadInventarioETLRunner:
+    """
+    Runner ETL para la tabla antiguedad_inventario.
+    Calcula días sin venta y sin compra por PDV×SKU, agrupa el inventario
+    valorizado en bandas de antigüedad y marca los candidatos a inventario
+    muerto para traslado o devolución.
+    """
+
+    def __init__(self, ruta_salida=RUTA_SALIDA_ANTIGUEDAD, fecha_corte=None, dias_muerto=DIAS_INVENTARIO_MUERTO):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Antiguedad Inventario")
+        self.extractor = ExtractorAntiguedadInventario(logger=self.logger)
+        self.loader = LoaderAntiguedadInventario(logger=self.logger)
+        self.ruta_salida = ruta_salida
+        self.fecha_corte = fecha_corte
+        self.dias_muerto = dias_muerto
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para antiguedad_inventario"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para antiguedad_inventario")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            # Fase de transformación
+            self.logger.info("🔄 Calculando antigüedad de inventario")
+            transformador = TransformadorAntiguedadInventario(
+                datos_extraidos,
+                logger=self.logger,
+                fecha_corte=self.fecha_corte,
+                dias_muerto=self.dias_muerto
+            )
+            df_antiguedad = transformador.transformar()
+
+            if df_antiguedad.empty:
+                self.logger.warning("⚠️ No hay datos después de la transformación")
+                return False
+
+            # Salida CSV: detalle y resumen por banda
+            os.makedirs(self.ruta_salida, exist_ok=True)
+            fecha = df_antiguedad['fecha'].iloc[0]
+            ruta_detalle = os.path.join(self.ruta_salida, f"antiguedad_inventario_{fecha:%Y%m%d}.csv")
+            df_antiguedad.to_csv(ruta_detalle, index=False, encoding='utf-8-sig')
+            ruta_resumen = os.path.join(self.ruta_salida, f"resumen_bandas_{fecha:%Y%m%d}.csv")
+            transformador.resumen_bandas(df_antiguedad).to_csv(ruta_resumen, index=False, encoding='utf-8-sig')
+            self.logger.info(f"💾 CSV guardados en: {self.ruta_salida}")
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_antiguedad)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_antiguedad_inventario
+    parser = argparse.ArgumentParser(description="ETL antigüedad de inventario e inventario muerto")
+    parser.add_argument("--fecha-corte", help="Fecha desde la que se cuentan los días (YYYY-MM-DD)")
+    parser.add_argument("--dias-muerto", type=int, default=DIAS_INVENTARIO_MUERTO,
+                        help="Días sin venta para marcar inventario muerto")
+    parser.add_argument("--salida", default=RUTA_SALIDA_ANTIGUEDAD,
+                        help="Carpeta donde se escriben los CSV")
+    args = parser.parse_args()
+
+    runner = AntiguedadInventarioETLRunner(
+        ruta_salida=args.salida,
+        fecha_corte=args.fecha_corte,
+        dias_muerto=args.dias_muerto
+    )
+    runner.run()
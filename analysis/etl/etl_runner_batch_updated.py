@@ -20,6 +20,16 @@ from analysis.etl.etl_runner_merchandising import run_merchandising_etl
 # Importaciones de los nuevos ETL runners de tablas de hechos
 from analysis.etl.etl_runner_fact_inventarios import FactInventariosETLRunner
 from analysis.etl.etl_runner_fact_rotacion import FactRotacionETLRunner
+from analysis.etl.etl_runner_estadisticas_demanda import EstadisticasDemandaETLRunner
+from analysis.etl.etl_runner_traslados import TrasladosETLRunner
+from analysis.etl.etl_runner_sugerido_compra import SugeridoCompraETLRunner
+from analysis.etl.etl_runner_matriz_productos import MatrizProductosETLRunner
+from analysis.etl.etl_runner_politica_min_max import PoliticaMinMaxETLRunner
+from analysis.etl.etl_runner_pronostico_demanda import PronosticoDemandaETLRunner
+from analysis.etl.etl_runner_stock_seguridad import StockSeguridadETLRunner
+from analysis.etl.etl_runner_antiguedad_inventario import AntiguedadInventarioETLRunner
+from analysis.etl.etl_runner_pedidos_laboratorio import PedidosLaboratorioETLRunner
+from analysis.etl.etl_runner_fact_inventario_producto import FactInventarioProductoETLRunner
 
 from utils.logger_etl import LoggerETL
 
@@ -40,7 +50,17 @@ ETLS = {
     
     # Nuevos ETLs para tablas de hechos
     'fact_inventarios': lambda: FactInventariosETLRunner().run(),
-    'fact_rotacion': lambda: FactRotacionETLRunner().run()
+    'fact_rotacion': lambda: FactRotacionETLRunner().run(),
+    'estadisticas_demanda': lambda: EstadisticasDemandaETLRunner().run(),
+    'traslados': lambda: TrasladosETLRunner().run(),
+    'sugerido_compra': lambda: SugeridoCompraETLRunner().run(),
+    'matriz_productos': lambda: MatrizProductosETLRunner().run(),
+    'politica_min_max': lambda: PoliticaMinMaxETLRunner().run(),
+    'pronostico_demanda': lambda: PronosticoDemandaETLRunner().run(),
+    'stock_seguridad': lambda: StockSeguridadETLRunner().run(),
+    'antiguedad_inventario': lambda: AntiguedadInventarioETLRunner().run(),
+    'pedidos_laboratorio': lambda: PedidosLaboratorioETLRunner().run(),
+    'fact_inventario_producto': lambda: FactInventarioProductoETLRunner().run()
 }
 
 # Grupos de ETLs para ejecución en conjunto
@@ -48,14 +68,23 @@ ETL_GROUPS = {
     'diarios': ['ventas', 'inventario', 'bodega', 'mostrador', 'oferta'],
     'semanales': ['ecommerce', 'convenios'],
     'mensuales': ['merchandising'],
-    'fact_tables': ['fact_inventarios', 'fact_rotacion'],
+    'fact_tables': ['fact_inventarios', 'fact_rotacion', 'estadisticas_demanda', 'fact_inventario_producto'],
     'all': list(ETLS.keys())
 }
 
 # ETLs que dependen de otros
 ETL_DEPENDENCIES = {
     'fact_inventarios': ['inventario'],
-    'fact_rotacion': ['ventas', 'inventario']
+    'fact_rotacion': ['ventas', 'inventario'],
+    'estadisticas_demanda': ['ventas'],
+    'traslados': ['estadisticas_demanda', 'politica_min_max'],
+    'sugerido_compra': ['estadisticas_demanda', 'politica_min_max'],
+    'politica_min_max': ['mostrador', 'convenios', 'merchandising', 'stock_seguridad'],
+    'pronostico_demanda': ['ventas'],
+    'stock_seguridad': ['estadisticas_demanda'],
+    'antiguedad_inventario': ['ventas'],
+    'pedidos_laboratorio': ['sugerido_compra'],
+    'fact_inventario_producto': ['inventario']
 }
 
 def run_etl_with_dependencies(etl_name, executed_etls, logger):
@@ -0,0 +1,62 @@
+# analysis/etl/etl_runner_estadisticas_demanda.py
+
+from analysis.extractor.extractor_estadisticas_demanda import ExtractorEstadisticasDemanda
+from analysis.transformer.transformer_estadisticas_demanda import TransformadorEstadisticasDemanda
+from analysis.loader.loader_estadisticas_demanda import LoaderEstadisticasDemanda
+from utils.logger_etl import LoggerETL
+
+
+class EstadisticasDemandaETLRunner:
+    """
+    Runner ETL para la tabla estadisticas_demanda.
+    Calcula venta_m3/m2/m1, promedios, tendencia, coeficiente de variación y
+    rotación diaria por SKU×PDV a partir del histórico de ventas en staging.
+    """
+
+    def __init__(self, meses=3):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Estadisticas Demanda")
+        self.extractor = ExtractorEstadisticasDemanda(logger=self.logger)
+        self.loader = LoaderEstadisticasDemanda(logger=self.logger)
+        self.meses = meses
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para estadisticas_demanda"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para estadisticas_demanda")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            # Fase de transformación
+            self.logger.info("🔄 Calculando estadísticas de demanda")
+            transformador = TransformadorEstadisticasDemanda(datos_extraidos, logger=self.logger, meses=self.meses)
+            df_estadisticas = transformador.transformar()
+
+            if df_estadisticas.empty:
+                self.logger.warning("⚠️ No hay datos después de la transformación")
+                return False
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_estadisticas)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_estadisticas_demanda
+    runner = EstadisticasDemandaETLRunner()
+    runner.run()
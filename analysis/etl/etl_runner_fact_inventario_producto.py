@@ -0,0 +1,81 @@
+# analysis/etl/etl_runner_fact_inventario_producto.py
+
+import argparse
+
+import pandas as pd
+
+from analysis.extractor.extractor_fact_inventario_producto import ExtractorFactInventarioProducto
+from analysis.transformer.transformer_fact_inventario_producto import TransformadorFactInventarioProducto
+from analysis.loader.loader_fact_inventario_producto import LoaderFactInventarioProducto
+from utils.logger_etl import LoggerETL
+
+
+class FactInventarioProductoETLRunner:
+    """
+    Runner ETL para la tabla fact_inventario_producto.
+    Toma la foto del inventario por PDV×producto de las tablas staging, la
+    compara con el último estado guardado y carga solo las filas que cambiaron.
+    """
+
+    def __init__(self, fecha=None, reconstruir=False):
+        """
+        Inicializa el runner con sus componentes ETL y el logger.
+
+        Args:
+            fecha (date, optional): Fecha de la foto; por defecto hoy
+            reconstruir (bool): Permite recargar una fecha anterior a la última foto cargada
+        """
+        self.logger = LoggerETL("ETL Fact Inventario Producto")
+        self.extractor = ExtractorFactInventarioProducto(logger=self.logger)
+        self.loader = LoaderFactInventarioProducto(logger=self.logger)
+        self.fecha = pd.Timestamp(fecha or pd.Timestamp.now()).normalize()
+        self.reconstruir = reconstruir
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para fact_inventario_producto"""
+        try:
+            self.logger.info(f"🚀 Iniciando ETL para fact_inventario_producto ({self.fecha:%Y-%m-%d})")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+            anterior = self.loader.estado_a_fecha(self.fecha, incluir_fecha=False)
+
+            # Fase de transformación
+            self.logger.info(f"🔄 Comprimiendo contra {len(anterior)} registros del último estado")
+            transformador = TransformadorFactInventarioProducto(
+                datos_extraidos,
+                logger=self.logger,
+                fecha=self.fecha,
+                anterior=anterior
+            )
+            df_cambios = transformador.transformar()
+
+            # Fase de carga (una foto sin cambios también se registra: limpia una recarga previa del día)
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_cambios, self.fecha, reconstruir=self.reconstruir)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_fact_inventario_producto [--fecha 2025-06-30] [--reconstruir]
+    parser = argparse.ArgumentParser(description="ETL foto diaria de inventario por producto (solo cambios)")
+    parser.add_argument("--fecha", help="Fecha de la foto (YYYY-MM-DD); por defecto hoy")
+    parser.add_argument("--reconstruir", action="store_true",
+                        help="Permite recargar una fecha anterior a la última foto cargada")
+    args = parser.parse_args()
+
+    runner = FactInventarioProductoETLRunner(fecha=args.fecha, reconstruir=args.reconstruir)
+    runner.run()
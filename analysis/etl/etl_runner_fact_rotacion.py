@@ -7,6 +7,8 @@ from datetime import datetime
 from analysis.extractor.extractor_fact_rotacion import ExtractorFactRotacion
 from analysis.transformer.transformer_fact_rotacion import TransformadorFactRotacion
 from analysis.loader.loader_fact_rotacion import LoaderFactRotacion
+from analysis.loader.resumenes_fact_rotacion import ResumenesFactRotacion
+from analysis.extractor.cubo_rotacion import CuboRotacion
 from utils.logger_etl import LoggerETL
 
 # Suprimir advertencias de openpyxl
@@ -63,6 +65,12 @@ class FactRotacionETLRunner:
             resultado_carga = self.loader.cargar_dataframe(df_transformado)
             
             if resultado_carga:
+                # Recalcular solo los cortes PDV-mes de los resúmenes que cambiaron
+                ResumenesFactRotacion(logger=self.logger).actualizar(
+                    fecha=df_transformado['fecha'].max(),
+                    codigos_pdv=df_transformado['codigo_pdv'].astype(str).unique()
+                )
+                CuboRotacion.refrescar(self.loader.engine, logger=self.logger)
                 self.logger.info("✅ Proceso ETL completado con éxito")
             else:
                 self.logger.error("❌ Error en la carga de datos")
@@ -1,13 +1,20 @@
 # analysis/etl/etl_runner_fact_rotacion_all_pdv.py
 
 import os
+import argparse
 import warnings
+import pandas as pd
 from datetime import datetime
 
 # Usar el extractor para todos los PDVs
 from analysis.extractor.extractor_fact_rotacion_all_pdv import ExtractorFactRotacion
-from analysis.transformer.transformer_fact_rotacion import TransformadorFactRotacion
+from analysis.extractor.huellas_staging import HuellasStaging
+from analysis.extractor.indice_exclusion import IndiceExclusion
+from analysis.transformer.transformer_fact_rotacion import TransformadorFactRotacion, METODOS_ABC
 from analysis.loader.loader_fact_rotacion import LoaderFactRotacion
+from analysis.loader.loader_fact_rotacion_sql import LoaderFactRotacionSQL, COLUMNAS_FACT_ROTACION
+from analysis.loader.resumenes_fact_rotacion import ResumenesFactRotacion
+from analysis.extractor.cubo_rotacion import CuboRotacion
 from utils.logger_etl import LoggerETL
 
 # Suprimir advertencias de openpyxl
@@ -18,22 +25,127 @@ class FactRotacionETLRunner:
     Runner ETL para la tabla fact_rotacion.
     Implementa un proceso ETL que extrae datos de las tablas stg_rotacion_*
     para TODOS los puntos de venta.
+
+    Soporta dos motores seleccionables:
+    - 'pandas': extrae, transforma en pandas y carga fila a fila (comportamiento original)
+    - 'sql': construye fact_rotacion dentro de MySQL con un único INSERT ... SELECT
+
+    En modo incremental solo se reprocesan los PDVs con alguna tabla staging cuya
+    huella (checksum + filas) cambió desde la última carga exitosa, reemplazando
+    únicamente su corte PDV-mes en fact_rotacion.
     """
     
-    def __init__(self):
-        """Inicializa el runner con sus componentes ETL y el logger"""
+    MOTORES = ('pandas', 'sql')
+    CLAVE_FACT = ['codigo_producto', 'codigo_pdv', 'fecha']
+    
+    def __init__(self, motor="pandas", incremental=False, abc_metodo="rotacion"):
+        """
+        Inicializa el runner con sus componentes ETL y el logger.
+        
+        Args:
+            motor (str): Motor de construcción de fact_rotacion ('pandas' o 'sql')
+            incremental (bool): Reprocesa solo las fuentes que cambiaron
+            abc_metodo (str): Clasificación ABC por 'rotacion' o 'pareto'
+        """
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor no soportado: {motor}. Opciones: {', '.join(self.MOTORES)}")
+        self.motor = motor
         self.logger = LoggerETL("ETL Fact Rotacion (Todos los PDVs)")
         self.extractor = ExtractorFactRotacion(logger=self.logger)
         self.loader = LoaderFactRotacion(logger=self.logger)
+        self.incremental = incremental
+        self.abc_metodo = abc_metodo
+        self.huellas = HuellasStaging(self.extractor.engine, "fact_rotacion", logger=self.logger)
         
     def run(self):
+        """Ejecuta el proceso ETL completo para fact_rotacion con el motor seleccionado"""
+        tablas, pdvs_afectados, huellas = None, None, None
+        
+        if self.incremental:
+            try:
+                tablas, pdvs_afectados, huellas = self._seleccionar_fuentes_cambiadas()
+            except Exception as e:
+                self.logger.error(f"💥 Error al calcular huellas de staging: {e}")
+                return False
+            
+            if not tablas:
+                self.logger.info("✅ Sin cambios en las tablas stg_rotacion_*; no hay nada que reprocesar")
+                return True
+        
+        if self.motor == 'sql':
+            resultado = self._run_sql(tablas, pdvs_afectados)
+        else:
+            resultado = self._run_pandas(tablas, pdvs_afectados)
+        
+        # Registrar huellas solo tras una carga exitosa, para reintentar si falla
+        if resultado and huellas:
+            self.huellas.registrar(huellas)
+        
+        # Recalcular solo los cortes PDV-mes de los resúmenes que cambiaron
+        if resultado:
+            ResumenesFactRotacion(logger=self.logger).actualizar(codigos_pdv=pdvs_afectados)
+            CuboRotacion.refrescar(self.extractor.engine, logger=self.logger)
+        
+        return resultado
+        
+    def _seleccionar_fuentes_cambiadas(self):
+        """
+        Detecta las tablas staging que cambiaron y amplía la selección a todas las
+        tablas de los PDVs afectados, ya que su corte mensual se reconstruye completo.
+        
+        Returns:
+            tuple: (tablas a reprocesar, códigos de PDV afectados, huellas de esas tablas)
+        """
+        todas = self.extractor.esquema.tablas("stg_rotacion_")
+        huellas_actuales = self.huellas.calcular(todas)
+        cambiadas = self.huellas.cambiadas(huellas_actuales)
+        
+        # Formato esperado: stg_rotacion_de_NOMBRE_PDV_CODIGO_NUMERO
+        pdvs_afectados = sorted({tabla.split('_')[-2] for tabla in cambiadas})
+        tablas = [tabla for tabla in todas if tabla.split('_')[-2] in pdvs_afectados]
+        
+        if pdvs_afectados:
+            self.logger.info(
+                f"🔁 PDVs a reprocesar: {', '.join(pdvs_afectados)} ({len(tablas)} tablas)"
+            )
+        
+        return tablas, pdvs_afectados, {tabla: huellas_actuales[tabla] for tabla in tablas}
+        
+    def _run_sql(self, tablas=None, pdvs_afectados=None):
+        """Construye fact_rotacion completamente dentro de MySQL (sin pasar por pandas)"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para fact_rotacion (TODOS los PDVs) con motor SQL")
+            exclusion = IndiceExclusion.compartido(self.extractor.engine, self.extractor.esquema, logger=self.logger)
+            loader_sql = LoaderFactRotacionSQL(
+                logger=self.logger,
+                esquema=self.extractor.esquema,
+                abc_metodo=self.abc_metodo,
+                exclusion=exclusion
+            )
+            resultado_carga = loader_sql.cargar_desde_staging(
+                tablas=tablas,
+                reemplazar_periodo=bool(pdvs_afectados)
+            )
+            
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+                
+            return resultado_carga
+            
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL (motor SQL): {e}")
+            return False
+        
+    def _run_pandas(self, tablas=None, pdvs_afectados=None):
         """Ejecuta el proceso ETL completo para fact_rotacion procesando todos los PDVs"""
         try:
             self.logger.info("🚀 Iniciando ETL para fact_rotacion (TODOS los PDVs)")
             
             # Fase de extracción
             self.logger.info("📥 Iniciando extracción de datos desde tablas stg_rotacion_*")
-            datos_extraidos = self.extractor.extraer()
+            datos_extraidos = self.extractor.extraer(tablas)
             
             if datos_extraidos.empty:
                 self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
@@ -41,9 +153,13 @@ class FactRotacionETLRunner:
                 
             self.logger.info(f"📊 Datos extraídos: {len(datos_extraidos)} registros")
             
+            # Quitar productos excluidos antes de transformar
+            exclusion = IndiceExclusion.compartido(self.extractor.engine, self.extractor.esquema, logger=self.logger)
+            datos_extraidos = exclusion.filtrar(datos_extraidos, columna='codigo_producto', etapa='rotacion')
+            
             # Fase de transformación
             self.logger.info("🔄 Iniciando transformación de datos")
-            transformador = TransformadorFactRotacion(datos_extraidos, logger=self.logger)
+            transformador = TransformadorFactRotacion(datos_extraidos, logger=self.logger, abc_metodo=self.abc_metodo)
             df_transformado = transformador.transformar()
             
             if df_transformado.empty:
@@ -61,7 +177,7 @@ class FactRotacionETLRunner:
             
             # Fase de carga
             self.logger.info("📤 Iniciando carga de datos")
-            resultado_carga = self.loader.cargar_dataframe(df_transformado)
+            resultado_carga = self.loader.cargar_dataframe(df_transformado, reemplazar_pdvs=pdvs_afectados)
             
             if resultado_carga:
                 self.logger.info("✅ Proceso ETL completado con éxito")
@@ -73,9 +189,96 @@ class FactRotacionETLRunner:
         except Exception as e:
             self.logger.error(f"💥 Error en el proceso ETL: {e}")
             return False
+            
+    def comparar_motores(self, tolerancia=0.01):
+        """
+        Calcula fact_rotacion con ambos motores sin cargar nada y compara los resultados
+        por la clave (codigo_producto, codigo_pdv, fecha).
+        
+        Args:
+            tolerancia (float): Diferencia absoluta máxima aceptada en columnas numéricas
+            
+        Returns:
+            pd.DataFrame: Diferencias encontradas (vacío si ambos motores coinciden)
+        """
+        self.logger.info("⚖️ Comparando motores pandas y SQL para fact_rotacion")
+        
+        # Ambos motores descartan los mismos productos excluidos
+        exclusion = IndiceExclusion.compartido(self.extractor.engine, self.extractor.esquema, logger=self.logger)
+        datos_extraidos = exclusion.filtrar(self.extractor.extraer(), columna='codigo_producto', etapa='rotacion')
+        df_pandas = TransformadorFactRotacion(datos_extraidos, logger=self.logger, abc_metodo=self.abc_metodo).transformar()
+        df_sql = LoaderFactRotacionSQL(
+            logger=self.logger,
+            esquema=self.extractor.esquema,
+            abc_metodo=self.abc_metodo,
+            exclusion=exclusion
+        ).consultar()
+        
+        def _preparar(df):
+            df = df.reindex(columns=COLUMNAS_FACT_ROTACION).copy()
+            df['codigo_producto'] = df['codigo_producto'].astype(str).str.strip()
+            df['codigo_pdv'] = df['codigo_pdv'].astype(str).str.strip()
+            df['fecha'] = pd.to_datetime(df['fecha']).dt.normalize()
+            # El loader actualiza la misma clave; prevalece la última fila en orden de tablas
+            return df.drop_duplicates(subset=self.CLAVE_FACT, keep='last').set_index(self.CLAVE_FACT)
+        
+        pandas_idx = _preparar(df_pandas)
+        sql_idx = _preparar(df_sql)
+        
+        diferencias = []
+        solo_pandas = pandas_idx.index.difference(sql_idx.index)
+        solo_sql = sql_idx.index.difference(pandas_idx.index)
+        for clave in solo_pandas:
+            diferencias.append((*clave, 'fila', 'presente', 'ausente'))
+        for clave in solo_sql:
+            diferencias.append((*clave, 'fila', 'ausente', 'presente'))
+        
+        comunes = pandas_idx.index.intersection(sql_idx.index)
+        izquierda = pandas_idx.loc[comunes]
+        derecha = sql_idx.loc[comunes]
+        for col in izquierda.columns:
+            a = pd.to_numeric(izquierda[col], errors='coerce')
+            b = pd.to_numeric(derecha[col], errors='coerce')
+            if a.isna().all() and b.isna().all():
+                # Columnas de texto (clasificaciones): comparar valores tal cual
+                distintos = izquierda[col].astype(str) != derecha[col].astype(str)
+            else:
+                distintos = ~(((a - b).abs() <= tolerancia) | (a.isna() & b.isna()))
+            for clave in izquierda.index[distintos]:
+                diferencias.append((*clave, col, izquierda.at[clave, col], derecha.at[clave, col]))
+        
+        df_diferencias = pd.DataFrame(
+            diferencias,
+            columns=self.CLAVE_FACT + ['columna', 'valor_pandas', 'valor_sql']
+        )
+        
+        if df_diferencias.empty:
+            self.logger.info(f"✅ Motores equivalentes: {len(comunes)} filas idénticas")
+        else:
+            self.logger.warning(
+                f"⚠️ Motores con diferencias: {len(df_diferencias)} "
+                f"(solo pandas: {len(solo_pandas)}, solo SQL: {len(solo_sql)})"
+            )
+        print(f"⚖️ Diferencias entre motores: {len(df_diferencias)}")
+        
+        return df_diferencias
 
 
 if __name__ == '__main__':
-    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_fact_rotacion_all_pdv
-    runner = FactRotacionETLRunner()
-    runner.run()
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_fact_rotacion_all_pdv [--motor sql] [--comparar]
+    parser = argparse.ArgumentParser(description="ETL fact_rotacion para todos los PDVs")
+    parser.add_argument("--motor", choices=FactRotacionETLRunner.MOTORES, default="pandas",
+                        help="Motor de construcción de fact_rotacion")
+    parser.add_argument("--comparar", action="store_true",
+                        help="Compara ambos motores sin cargar datos")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reprocesa solo los PDVs cuyas tablas staging cambiaron")
+    parser.add_argument("--abc", choices=METODOS_ABC, default="rotacion",
+                        help="Clasificación ABC por umbrales de rotación o Pareto de ventas por PDV")
+    args = parser.parse_args()
+    
+    runner = FactRotacionETLRunner(motor=args.motor, incremental=args.incremental, abc_metodo=args.abc)
+    if args.comparar:
+        runner.comparar_motores()
+    else:
+        runner.run()
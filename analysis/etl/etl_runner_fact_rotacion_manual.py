@@ -1,12 +1,19 @@
 # analysis/etl/etl_runner_fact_rotacion_manual.py
 
 import os
+import time
+import argparse
+import concurrent.futures
 import pandas as pd
 import warnings
 from datetime import datetime
 from sqlalchemy import create_engine, text
 from analysis.transformer.transformer_fact_rotacion import TransformadorFactRotacion
 from analysis.loader.loader_fact_rotacion import LoaderFactRotacion
+from analysis.loader.resumenes_fact_rotacion import ResumenesFactRotacion
+from analysis.extractor.cubo_rotacion import CuboRotacion
+from analysis.extractor.esquema_staging import EsquemaStaging
+from analysis.extractor.indice_exclusion import IndiceExclusion
 from utils.db_connection import get_mysql_url
 from utils.logger_etl import LoggerETL
 
@@ -17,14 +24,26 @@ class FactRotacionETLRunnerManual:
     """
     Runner ETL para la tabla fact_rotacion que procesa manualmente
     todos los puntos de venta disponibles.
+    
+    En modo paralelo cada PDV se extrae en su propio worker (con su propia
+    conexión del pool) y cada resultado se transforma apenas termina.
     """
     
-    def __init__(self):
-        """Inicializa el runner con sus componentes ETL y el logger"""
+    def __init__(self, paralelo=False, max_workers=4):
+        """
+        Inicializa el runner con sus componentes ETL y el logger.
+        
+        Args:
+            paralelo (bool): Extraer los PDVs de forma concurrente
+            max_workers (int): Número máximo de workers (y conexiones del pool)
+        """
         self.logger = LoggerETL("ETL Fact Rotacion Manual (Todos los PDVs)")
         self.loader = LoaderFactRotacion(logger=self.logger)
         self.db_url = get_mysql_url("gestion_compras")
-        self.engine = create_engine(self.db_url)
+        self.paralelo = paralelo
+        self.max_workers = max_workers
+        self.engine = create_engine(self.db_url, pool_size=max_workers, max_overflow=2, pool_pre_ping=True)
+        self.esquema = EsquemaStaging(self.engine, logger=self.logger)
         
     def run(self):
         """Ejecuta el proceso ETL completo para fact_rotacion procesando todos los PDVs"""
@@ -39,68 +58,41 @@ class FactRotacionETLRunnerManual:
                 
             self.logger.info(f"🏪 Se procesarán {len(pdvs)} puntos de venta")
             
-            # 2. Procesar cada PDV por separado
-            resultados_globales = []
+            # Cargar el catálogo staging y el índice de exclusión antes de repartir trabajo entre workers
+            self.esquema.cargar()
+            exclusion = IndiceExclusion.compartido(self.engine, self.esquema, logger=self.logger)
             
-            for pdv in pdvs:
-                pdv_sk = pdv['pdv_sk']
-                codigo_pdv = pdv['codigo_pdv']
-                nombre_pdv = pdv['nombre_pdv']
-                
-                self.logger.info(f"\n🏪 Procesando PDV: {nombre_pdv} (Código: {codigo_pdv})")
-                
-                # Obtener tablas de rotación para este PDV
-                tablas_rotacion = self._obtener_tablas_rotacion_pdv(codigo_pdv)
-                if not tablas_rotacion:
-                    self.logger.warning(f"⚠️ No se encontraron tablas de rotación para PDV {codigo_pdv}")
+            # 2. Extraer cada PDV y transformar cada resultado apenas está disponible
+            transformados = []
+            tiempos_pdv = {}
+            # Un solo transformador: reutiliza el engine y las claves de dimensión ya resueltas entre PDVs
+            transformador = TransformadorFactRotacion(None, logger=self.logger, engine=self.engine)
+            
+            for pdv, df_consolidado_pdv, segundos in self._iterar_extracciones(pdvs):
+                tiempos_pdv[pdv['codigo_pdv']] = (pdv['nombre_pdv'], segundos, len(df_consolidado_pdv))
+                df_consolidado_pdv = exclusion.filtrar(df_consolidado_pdv, columna='codigo_producto', etapa='rotacion')
+                if df_consolidado_pdv.empty:
                     continue
                     
-                self.logger.info(f"📊 Encontradas {len(tablas_rotacion)} tablas para PDV {codigo_pdv}")
-                
-                # Procesar cada tabla
-                dfs_pdv = []
-                for tabla in tablas_rotacion:
-                    self.logger.info(f"📋 Procesando tabla: {tabla}")
-                    
-                    # Extraer datos de la tabla
-                    df_tabla = self._extraer_datos_tabla(tabla, pdv)
-                    
-                    if not df_tabla.empty:
-                        self.logger.info(f"✅ Extraídos {len(df_tabla)} registros de {tabla}")
-                        dfs_pdv.append(df_tabla)
-                    else:
-                        self.logger.warning(f"⚠️ No se obtuvieron datos de la tabla {tabla}")
-                
-                # Consolidar datos de este PDV
-                if dfs_pdv:
-                    df_consolidado_pdv = pd.concat(dfs_pdv, ignore_index=True)
-                    
-                    # Eliminar duplicados (mismo producto en diferentes tablas)
-                    df_consolidado_pdv = df_consolidado_pdv.drop_duplicates(subset=['codigo_producto'])
-                    
-                    self.logger.info(f"✅ Total registros para PDV {codigo_pdv}: {len(df_consolidado_pdv)}")
-                    resultados_globales.append(df_consolidado_pdv)
-                else:
-                    self.logger.warning(f"⚠️ No se obtuvieron datos para PDV {codigo_pdv}")
+                df_pdv = transformador.transformar(df_consolidado_pdv)
+                if not df_pdv.empty:
+                    transformados.append(df_pdv)
+            
+            self._resumir_tiempos(tiempos_pdv)
             
             # 3. Consolidar todos los resultados
-            if not resultados_globales:
+            if not transformados:
                 self.logger.error("❌ No se obtuvieron datos para ningún PDV")
                 return False
                 
-            df_final = pd.concat(resultados_globales, ignore_index=True)
-            self.logger.info(f"📊 Total registros consolidados: {len(df_final)}")
-            
-            # 4. Transformar
-            self.logger.info("🔄 Iniciando transformación de datos")
-            transformador = TransformadorFactRotacion(df_final, logger=self.logger)
-            df_transformado = transformador.transformar()
+            df_transformado = pd.concat(transformados, ignore_index=True)
+            self.logger.info(f"📊 Total registros consolidados: {len(df_transformado)}")
             
             if df_transformado.empty:
                 self.logger.warning("⚠️ No hay datos después de la transformación")
                 return False
                 
-            # 5. Guardar histórico como CSV (opcional)
+            # 4. Guardar histórico como CSV (opcional)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             nombre_archivo_csv = f"fact_rotacion_all_pdv_{timestamp}.csv"
             ruta_historico = os.path.join("E:/desarrollo/gestionCompras/historico/ETL_Fact_Rotacion")
@@ -109,11 +101,17 @@ class FactRotacionETLRunnerManual:
             df_transformado.to_csv(ruta_completa, index=False, encoding='utf-8-sig')
             self.logger.info(f"💾 Backup CSV guardado en: {ruta_completa}")
             
-            # 6. Cargar
+            # 5. Cargar
             self.logger.info("📤 Iniciando carga de datos")
             resultado_carga = self.loader.cargar_dataframe(df_transformado)
             
             if resultado_carga:
+                # Recalcular solo los cortes PDV-mes de los resúmenes que cambiaron
+                ResumenesFactRotacion(logger=self.logger).actualizar(
+                    fecha=df_transformado['fecha'].max(),
+                    codigos_pdv=df_transformado['codigo_pdv'].astype(str).unique()
+                )
+                CuboRotacion.refrescar(self.loader.engine, logger=self.logger)
                 self.logger.info("✅ Proceso ETL completado con éxito")
             else:
                 self.logger.error("❌ Error en la carga de datos")
@@ -124,6 +122,94 @@ class FactRotacionETLRunnerManual:
             self.logger.error(f"💥 Error en el proceso ETL: {e}")
             return False
             
+    def _iterar_extracciones(self, pdvs):
+        """
+        Extrae los PDVs en secuencia o en paralelo, entregando cada resultado al terminar.
+        
+        Args:
+            pdvs (list): PDVs a procesar
+            
+        Yields:
+            tuple: (pdv, DataFrame consolidado del PDV, segundos de extracción)
+        """
+        if not self.paralelo:
+            for pdv in pdvs:
+                yield self._extraer_pdv(pdv)
+            return
+        
+        self.logger.info(f"⚡ Extrayendo {len(pdvs)} PDVs en paralelo con {self.max_workers} workers")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_pdv = {executor.submit(self._extraer_pdv, pdv): pdv for pdv in pdvs}
+            
+            for future in concurrent.futures.as_completed(future_to_pdv):
+                pdv = future_to_pdv[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    self.logger.error(f"💥 Excepción al extraer PDV {pdv['codigo_pdv']}: {e}")
+                    
+    def _extraer_pdv(self, pdv):
+        """
+        Extrae y consolida todas las tablas de rotación de un PDV.
+        
+        Args:
+            pdv (dict): Información del PDV
+            
+        Returns:
+            tuple: (pdv, DataFrame consolidado, segundos de extracción)
+        """
+        inicio = time.perf_counter()
+        codigo_pdv = pdv['codigo_pdv']
+        
+        self.logger.info(f"🏪 Procesando PDV: {pdv['nombre_pdv']} (Código: {codigo_pdv})")
+        
+        # Obtener tablas de rotación para este PDV
+        tablas_rotacion = self._obtener_tablas_rotacion_pdv(codigo_pdv)
+        if not tablas_rotacion:
+            self.logger.warning(f"⚠️ No se encontraron tablas de rotación para PDV {codigo_pdv}")
+            return pdv, pd.DataFrame(), time.perf_counter() - inicio
+            
+        self.logger.info(f"📊 Encontradas {len(tablas_rotacion)} tablas para PDV {codigo_pdv}")
+        
+        # Procesar cada tabla
+        dfs_pdv = []
+        for tabla in tablas_rotacion:
+            self.logger.info(f"📋 Procesando tabla: {tabla}")
+            
+            # Extraer datos de la tabla
+            df_tabla = self._extraer_datos_tabla(tabla, pdv)
+            
+            if not df_tabla.empty:
+                self.logger.info(f"✅ Extraídos {len(df_tabla)} registros de {tabla}")
+                dfs_pdv.append(df_tabla)
+            else:
+                self.logger.warning(f"⚠️ No se obtuvieron datos de la tabla {tabla}")
+        
+        if not dfs_pdv:
+            self.logger.warning(f"⚠️ No se obtuvieron datos para PDV {codigo_pdv}")
+            return pdv, pd.DataFrame(), time.perf_counter() - inicio
+        
+        # Consolidar y eliminar duplicados (mismo producto en diferentes tablas)
+        df_consolidado_pdv = pd.concat(dfs_pdv, ignore_index=True)
+        df_consolidado_pdv = df_consolidado_pdv.drop_duplicates(subset=['codigo_producto'])
+        
+        self.logger.info(f"✅ Total registros para PDV {codigo_pdv}: {len(df_consolidado_pdv)}")
+        return pdv, df_consolidado_pdv, time.perf_counter() - inicio
+        
+    def _resumir_tiempos(self, tiempos_pdv):
+        """Registra el tiempo de extracción por PDV, del más lento al más rápido"""
+        if not tiempos_pdv:
+            return
+            
+        self.logger.info("⏱️ Tiempos de extracción por PDV:")
+        for codigo_pdv, (nombre_pdv, segundos, registros) in sorted(
+            tiempos_pdv.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            self.logger.info(f"   🏪 {nombre_pdv} ({codigo_pdv}): {segundos:.2f}s - {registros} registros")
+            
+        total = sum(segundos for _, segundos, _ in tiempos_pdv.values())
+        self.logger.info(f"⏱️ Tiempo acumulado de extracción: {total:.2f}s en {len(tiempos_pdv)} PDVs")
+            
     def _obtener_todos_pdvs(self):
         """Obtiene todos los PDVs desde la dimensión dim_pdv"""
         try:
@@ -152,21 +238,9 @@ class FactRotacionETLRunnerManual:
             return []
             
     def _obtener_tablas_rotacion_pdv(self, codigo_pdv):
-        """Obtiene las tablas de rotación para un PDV específico"""
+        """Obtiene las tablas de rotación para un PDV específico desde el catálogo cacheado"""
         try:
-            query = text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'gestion_compras' 
-                AND table_name LIKE 'stg_rotacion_%'
-                AND table_name LIKE :pattern
-            """)
-            
-            with self.engine.connect() as connection:
-                resultado = connection.execute(query, {"pattern": f"%_{codigo_pdv}_%"})
-                tablas = [row[0] for row in resultado]
-            
-            return tablas
+            return self.esquema.tablas("stg_rotacion_", contiene=f"_{codigo_pdv}_")
             
         except Exception as e:
             self.logger.error(f"💥 Error al obtener tablas para PDV {codigo_pdv}: {e}")
@@ -184,78 +258,13 @@ class FactRotacionETLRunnerManual:
             pd.DataFrame: DataFrame con los datos procesados
         """
         try:
-            # Primero averiguar las columnas de la tabla
-            query_columnas = text(f"""
-                SELECT COLUMN_NAME
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = 'gestion_compras'
-                AND TABLE_NAME = '{nombre_tabla}'
-            """)
-            
-            with self.engine.connect() as connection:
-                columnas = [row[0] for row in connection.execute(query_columnas)]
-            
-            # Mapeo de columnas estándar a nombres en la tabla
-            mapeos_posibles = {
-                'codigo': ['codigo', 'codigo_producto', 'cod_producto', 'id_producto'],
-                'producto': ['producto', 'nombre_producto', 'descripcion', 'nombre'],
-                'ventas': ['ventas', 'venta', 'venta_total', 'venta_pesos'],
-                'unidades': ['unidades', 'cantidad', 'unidades_vendidas', 'venta_unidad'],
-                'costo': ['costo', 'costo_total', 'costo_unidad', 'costo_unitario'],
-                'margen': ['margen', 'margen_bruto', 'margen_porcentaje', 'porcentaje_margen'],
-                'stock': ['stock', 'stock_actual', 'existencia', 'inventario_unidad']
-            }
-            
-            # Encontrar las columnas disponibles en la tabla
-            columnas_a_usar = {}
-            for campo_estandar, posibles_nombres in mapeos_posibles.items():
-                for nombre in posibles_nombres:
-                    if nombre in columnas:
-                        columnas_a_usar[campo_estandar] = nombre
-                        break
-            
-            # Construir la consulta según las columnas disponibles
-            campos_select = []
-            
-            if 'codigo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['codigo']} as codigo_producto")
-            else:
-                campos_select.append("'desconocido' as codigo_producto")
-                
-            if 'producto' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['producto']} as nombre_producto")
-            else:
-                campos_select.append("'' as nombre_producto")
-                
-            if 'ventas' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['ventas']} as venta_total")
-            else:
-                campos_select.append("0 as venta_total")
-                
-            if 'unidades' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['unidades']} as venta_unidades")
-            else:
-                campos_select.append("0 as venta_unidades")
-                
-            if 'costo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['costo']} as costo_total")
-            else:
-                campos_select.append("0 as costo_total")
-                
-            if 'margen' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['margen']} as margen_porcentaje")
-            else:
-                campos_select.append("0 as margen_porcentaje")
-                
-            if 'stock' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['stock']} as inventario_unidades_final")
-            else:
-                campos_select.append("0 as inventario_unidades_final")
+            # Proyección precompilada a partir del catálogo cacheado (sin consultar INFORMATION_SCHEMA)
+            campos_select = self.esquema.proyeccion(nombre_tabla)
             
             # Consultar todos los registros sin límite
             query = text(f"""
                 SELECT 
-                    {', '.join(campos_select)},
+                    {campos_select},
                     NOW() as fecha
                 FROM `{nombre_tabla}`
             """)
@@ -323,6 +332,13 @@ class FactRotacionETLRunnerManual:
 
 
 if __name__ == '__main__':
-    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_fact_rotacion_manual
-    runner = FactRotacionETLRunnerManual()
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_fact_rotacion_manual [--parallel]
+    parser = argparse.ArgumentParser(description="ETL fact_rotacion manual para todos los PDVs")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Extraer los PDVs en paralelo")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Número máximo de workers para la extracción paralela")
+    args = parser.parse_args()
+    
+    runner = FactRotacionETLRunnerManual(paralelo=args.parallel, max_workers=args.workers)
     runner.run()
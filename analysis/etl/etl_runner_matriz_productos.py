@@ -0,0 +1,67 @@
+# analysis/etl/etl_runner_matriz_productos.py
+
+import os
+import argparse
+
+from analysis.extractor.extractor_matriz_productos import ExtractorMatrizProductos
+from analysis.transformer.matriz_productos import MatrizProductos
+from utils.logger_etl import LoggerETL
+
+RUTA_MATRIZ_PRODUCTOS = "data/output/matriz_productos.csv"
+
+
+class MatrizProductosETLRunner:
+    """
+    Runner que genera matriz_productos (codigo × PDV con fecha de activación)
+    a partir de las maestras de PDV, en CSV y opcionalmente en Parquet.
+    """
+
+    def __init__(self, ruta_csv=RUTA_MATRIZ_PRODUCTOS, parquet=False):
+        """Inicializa el runner con sus componentes y el logger"""
+        self.logger = LoggerETL("ETL Matriz Productos")
+        self.extractor = ExtractorMatrizProductos(logger=self.logger)
+        self.ruta_csv = ruta_csv
+        self.parquet = parquet
+
+    def run(self):
+        """Construye y exporta la matriz de productos"""
+        try:
+            self.logger.info("🚀 Iniciando generación de matriz_productos")
+
+            registros = self.extractor.extraer()
+            if registros.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            matriz = MatrizProductos.desde_registros(registros)
+            self.logger.info(
+                f"🧮 Matriz: {len(matriz.codigos)} productos × {len(matriz.pdvs)} PDVs, "
+                f"{len(matriz)} celdas con fecha ({matriz.densidad:.1%})"
+            )
+
+            os.makedirs(os.path.dirname(self.ruta_csv) or ".", exist_ok=True)
+            matriz.exportar_csv(self.ruta_csv)
+            self.logger.info(f"💾 CSV guardado en: {self.ruta_csv}")
+
+            if self.parquet:
+                ruta_parquet = os.path.splitext(self.ruta_csv)[0] + ".parquet"
+                matriz.exportar_parquet(ruta_parquet)
+                self.logger.info(f"💾 Parquet guardado en: {ruta_parquet}")
+
+            self.logger.info("✅ Matriz de productos generada con éxito")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"💥 Error al generar matriz_productos: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_matriz_productos [--parquet]
+    parser = argparse.ArgumentParser(description="Generación de matriz_productos")
+    parser.add_argument("--salida", default=RUTA_MATRIZ_PRODUCTOS, help="Ruta del CSV de salida")
+    parser.add_argument("--parquet", action="store_true", help="Exportar también en Parquet")
+    args = parser.parse_args()
+
+    runner = MatrizProductosETLRunner(ruta_csv=args.salida, parquet=args.parquet)
+    runner.run()
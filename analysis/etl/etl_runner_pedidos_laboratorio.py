@@ -0,0 +1,88 @@
+# analysis/etl/etl_runner_pedidos_laboratorio.py
+
+import os
+import time
+import argparse
+
+import pandas as pd
+
+from analysis.extractor.extractor_pedidos_laboratorio import ExtractorPedidosLaboratorio
+from analysis.transformer.transformer_pedidos_laboratorio import TransformadorPedidosLaboratorio
+from analysis.loader.escritor_pedidos_laboratorio import EscritorPedidosLaboratorio, FORMATOS_PEDIDO
+from utils.logger_etl import LoggerETL
+
+RUTA_SALIDA_PEDIDOS = "data/output/pedidos"
+
+
+class PedidosLaboratorioETLRunner:
+    """
+    Runner para la generación de pedidos por laboratorio.
+    Agrupa el último sugerido de compra por laboratorio y proveedor, escribe un
+    archivo por pedido en paralelo y un manifiesto con el contacto de cada laboratorio.
+    """
+
+    def __init__(self, ruta_salida=RUTA_SALIDA_PEDIDOS, fecha=None, formato='xlsx', procesos=None):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Pedidos Laboratorio")
+        self.extractor = ExtractorPedidosLaboratorio(logger=self.logger, fecha=fecha)
+        self.ruta_salida = ruta_salida
+        self.formato = formato
+        self.procesos = procesos
+
+    def run(self):
+        """Ejecuta la generación completa de pedidos"""
+        try:
+            inicio = time.perf_counter()
+            self.logger.info("🚀 Iniciando generación de pedidos por laboratorio")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+            contactos = self.extractor.contactos()
+
+            # Fase de transformación
+            self.logger.info("🔄 Agrupando sugerido por laboratorio y proveedor")
+            transformador = TransformadorPedidosLaboratorio(datos_extraidos, contactos=contactos, logger=self.logger)
+            resultados = transformador.transformar()
+            if resultados['pedidos'].empty:
+                self.logger.warning("⚠️ No hay pedidos después de la transformación")
+                return False
+
+            # Fase de salida
+            fecha = pd.Timestamp(datos_extraidos['fecha'].iloc[0])
+            escritor = EscritorPedidosLaboratorio(
+                os.path.join(self.ruta_salida, f"{fecha:%Y%m%d}"),
+                formato=self.formato,
+                procesos=self.procesos,
+                logger=self.logger
+            )
+            manifiesto = escritor.escribir(resultados['lineas'], resultados['pedidos'], fecha)
+
+            completos = manifiesto['archivo'].notna().all()
+            self.logger.info(f"✅ Pedidos generados en {time.perf_counter() - inicio:.1f}s")
+            return bool(completos)
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en la generación de pedidos: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_pedidos_laboratorio
+    parser = argparse.ArgumentParser(description="Pedidos por laboratorio desde el sugerido de compra")
+    parser.add_argument("--fecha", help="Fecha del sugerido (YYYY-MM-DD); por defecto la más reciente")
+    parser.add_argument("--formato", choices=FORMATOS_PEDIDO, default='xlsx')
+    parser.add_argument("--procesos", type=int, help="Procesos para escribir archivos; por defecto todos los núcleos")
+    parser.add_argument("--salida", default=RUTA_SALIDA_PEDIDOS,
+                        help="Carpeta donde se escriben los pedidos")
+    args = parser.parse_args()
+
+    runner = PedidosLaboratorioETLRunner(
+        ruta_salida=args.salida,
+        fecha=args.fecha,
+        formato=args.formato,
+        procesos=args.procesos
+    )
+    runner.run()
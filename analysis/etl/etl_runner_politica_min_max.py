@@ -0,0 +1,98 @@
+# analysis/etl/etl_runner_politica_min_max.py
+
+import argparse
+
+from analysis.extractor.extractor_politicas import ExtractorPoliticas, FUENTES_POLITICA
+from analysis.transformer.transformer_politica_min_max import TransformadorPoliticaMinMax
+from analysis.loader.loader_politica_min_max import LoaderPoliticaMinMax
+from utils.logger_etl import LoggerETL
+
+
+class PoliticaMinMaxETLRunner:
+    """
+    Runner ETL para la tabla policy_min_max.
+    Combina las fuentes de política min/max (incluido el punto de reorden de
+    stock_seguridad) en un único mínimo y máximo efectivo por codigo×punto_de_venta.
+    """
+
+    def __init__(self, fecha_corte=None, reglas=None, fuentes_imperativas=(), precedencia=None):
+        """
+        Inicializa el runner con sus componentes ETL y el logger.
+
+        Args:
+            fecha_corte (date, optional): Fecha de vigencia de temporales; por defecto hoy
+            reglas (dict, optional): Regla por límite ('minimo'/'maximo'): 'max', 'min' o 'precedencia'
+            fuentes_imperativas (iterable): Fuentes que reemplazan al resto cuando existen
+            precedencia (list, optional): Fuentes de mayor a menor prioridad; por defecto FUENTES_POLITICA
+        """
+        self.logger = LoggerETL("ETL Politica Min Max")
+        self.extractor = ExtractorPoliticas(logger=self.logger)
+        self.loader = LoaderPoliticaMinMax(logger=self.logger)
+        self.fecha_corte = fecha_corte
+        self.reglas = reglas
+        self.fuentes_imperativas = fuentes_imperativas
+        self.precedencia = precedencia
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para policy_min_max"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para policy_min_max")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            # Fase de transformación
+            self.logger.info("🔄 Resolviendo política min/max efectiva")
+            transformador = TransformadorPoliticaMinMax(
+                datos_extraidos,
+                logger=self.logger,
+                fecha_corte=self.fecha_corte,
+                reglas=self.reglas,
+                precedencia=self.precedencia,
+                fuentes_imperativas=self.fuentes_imperativas
+            )
+            df_politica = transformador.transformar()
+
+            if df_politica.empty:
+                self.logger.warning("⚠️ No hay datos después de la transformación")
+                return False
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_politica)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_politica_min_max
+    parser = argparse.ArgumentParser(description="ETL política min/max efectiva")
+    parser.add_argument("--fecha-corte", help="Fecha de vigencia de temporales (YYYY-MM-DD)")
+    parser.add_argument("--regla-minimo", choices=["max", "min", "precedencia"], default="max")
+    parser.add_argument("--regla-maximo", choices=["max", "min", "precedencia"], default="max")
+    parser.add_argument("--imperativas", nargs="*", default=[],
+                        help="Fuentes que reemplazan al resto cuando existen (ej: gerencia)")
+    parser.add_argument("--precedencia", nargs="+", choices=FUENTES_POLITICA,
+                        help="Fuentes de mayor a menor prioridad (desempates y regla 'precedencia'); "
+                             "las no listadas quedan al final")
+    args = parser.parse_args()
+
+    runner = PoliticaMinMaxETLRunner(
+        fecha_corte=args.fecha_corte,
+        reglas={'minimo': args.regla_minimo, 'maximo': args.regla_maximo},
+        fuentes_imperativas=args.imperativas,
+        precedencia=args.precedencia
+    )
+    runner.run()
@@ -0,0 +1,71 @@
+# analysis/etl/etl_runner_pronostico_demanda.py
+
+import time
+import argparse
+
+from analysis.extractor.extractor_estadisticas_demanda import ExtractorEstadisticasDemanda
+from analysis.transformer.transformer_pronostico_demanda import TransformadorPronosticoDemanda
+from analysis.loader.loader_pronostico_demanda import LoaderPronosticoDemanda
+from utils.logger_etl import LoggerETL
+
+
+class PronosticoDemandaETLRunner:
+    """
+    Runner ETL para la tabla pronostico_demanda.
+    Ajusta promedio móvil, suavizado exponencial/Holt y Croston a cada serie
+    SKU×PDV del histórico de ventas y guarda el pronóstico del mejor modelo.
+    """
+
+    def __init__(self, horizonte=1):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Pronostico Demanda")
+        self.extractor = ExtractorEstadisticasDemanda(logger=self.logger)
+        self.loader = LoaderPronosticoDemanda(logger=self.logger)
+        self.horizonte = horizonte
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para pronostico_demanda"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para pronostico_demanda")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            # Fase de transformación
+            self.logger.info("🔄 Ajustando modelos de pronóstico")
+            inicio = time.perf_counter()
+            transformador = TransformadorPronosticoDemanda(datos_extraidos, logger=self.logger, horizonte=self.horizonte)
+            df_pronostico = transformador.transformar()
+            self.logger.info(f"⏱️ Pronóstico calculado en {time.perf_counter() - inicio:.1f}s")
+
+            if df_pronostico.empty:
+                self.logger.warning("⚠️ No hay datos después de la transformación")
+                return False
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_pronostico)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_pronostico_demanda [--horizonte 2]
+    parser = argparse.ArgumentParser(description="ETL pronóstico de demanda por SKU×PDV")
+    parser.add_argument("--horizonte", type=int, default=1, help="Meses a pronosticar")
+    args = parser.parse_args()
+
+    runner = PronosticoDemandaETLRunner(horizonte=args.horizonte)
+    runner.run()
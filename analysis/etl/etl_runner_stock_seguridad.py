@@ -0,0 +1,94 @@
+# analysis/etl/etl_runner_stock_seguridad.py
+
+import argparse
+
+from analysis.extractor.extractor_stock_seguridad import ExtractorStockSeguridad
+from analysis.transformer.transformer_stock_seguridad import (
+    TransformadorStockSeguridad, NIVEL_SERVICIO_DEFECTO, DIAS_REVISION_DEFECTO
+)
+from analysis.loader.loader_stock_seguridad import LoaderStockSeguridad
+from utils.logger_etl import LoggerETL
+
+
+class StockSeguridadETLRunner:
+    """
+    Runner ETL para la tabla stock_seguridad.
+    Calcula stock de seguridad y punto de reorden por SKU×PDV desde
+    estadisticas_demanda y el tiempo de reposición de las maestras, y omite
+    la carga cuando la huella de los insumos no cambió desde la anterior.
+    """
+
+    def __init__(self, nivel_servicio=NIVEL_SERVICIO_DEFECTO, dias_revision=DIAS_REVISION_DEFECTO, forzar=False):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Stock Seguridad")
+        self.extractor = ExtractorStockSeguridad(logger=self.logger)
+        self.loader = LoaderStockSeguridad(logger=self.logger)
+        self.nivel_servicio = nivel_servicio
+        self.dias_revision = dias_revision
+        self.forzar = forzar
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para stock_seguridad"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para stock_seguridad")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            transformador = TransformadorStockSeguridad(
+                datos_extraidos,
+                logger=self.logger,
+                nivel_servicio=self.nivel_servicio,
+                dias_revision=self.dias_revision
+            )
+
+            # Sin cambios en insumos ni parámetros no hay nada que recalcular
+            huella = transformador.huella()
+            if not self.forzar and huella == self.loader.huella_cargada():
+                self.logger.info(f"♻️ stock_seguridad ya está al día (huella {huella[:12]}), se omite el cálculo")
+                return True
+
+            # Fase de transformación
+            self.logger.info("🔄 Calculando stock de seguridad y punto de reorden")
+            df_stock = transformador.transformar()
+
+            if df_stock.empty:
+                self.logger.warning("⚠️ No hay datos después de la transformación")
+                return False
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_stock)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_stock_seguridad [--nivel-servicio 0.98]
+    parser = argparse.ArgumentParser(description="ETL stock de seguridad y punto de reorden por SKU×PDV")
+    parser.add_argument("--nivel-servicio", type=float, default=NIVEL_SERVICIO_DEFECTO,
+                        help="Probabilidad de no quedar sin inventario durante la reposición")
+    parser.add_argument("--dias-revision", type=float, default=DIAS_REVISION_DEFECTO,
+                        help="Días de demanda entre el punto de reorden y el máximo")
+    parser.add_argument("--forzar", action="store_true",
+                        help="Recalcular y cargar aunque la huella no haya cambiado")
+    args = parser.parse_args()
+
+    runner = StockSeguridadETLRunner(
+        nivel_servicio=args.nivel_servicio,
+        dias_revision=args.dias_revision,
+        forzar=args.forzar
+    )
+    runner.run()
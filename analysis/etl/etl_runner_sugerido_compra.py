@@ -0,0 +1,116 @@
+# analysis/etl/etl_runner_sugerido_compra.py
+
+import os
+import argparse
+
+from analysis.extractor.extractor_traslados import ExtractorTraslados
+from analysis.extractor.extractor_ofertas_staging import ExtractorOfertasStaging
+from analysis.extractor.extractor_politicas import ExtractorPoliticas
+from analysis.extractor.indice_exclusion import IndiceExclusion
+from analysis.transformer.transformer_sugerido_compra import TransformadorSugeridoCompra
+from analysis.transformer.motor_ofertas import MotorOfertas
+from analysis.loader.loader_sugerido_compra import LoaderSugeridoCompra
+from utils.logger_etl import LoggerETL
+
+RUTA_SALIDA_SUGERIDO = "data/output/sugerido_compra"
+
+
+class SugeridoCompraETLRunner:
+    """
+    Runner ETL para la tabla fact_sugerido_compra.
+    Calcula la compra sugerida por PDV×SKU a partir del inventario actual,
+    las estadísticas de demanda y la política min/max efectiva (policy_min_max,
+    que ya incluye el punto de reorden de stock_seguridad), descontando traslados
+    y anotando el costo efectivo de la mejor bonificación disponible.
+    """
+
+    def __init__(self, ruta_salida=RUTA_SALIDA_SUGERIDO, descontar_traslados=True, aplicar_ofertas=True,
+                 usar_politica_min_max=True):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Sugerido Compra")
+        self.extractor = ExtractorTraslados(logger=self.logger)
+        self.loader = LoaderSugeridoCompra(logger=self.logger)
+        self.ruta_salida = ruta_salida
+        self.descontar_traslados = descontar_traslados
+        self.aplicar_ofertas = aplicar_ofertas
+        self.usar_politica_min_max = usar_politica_min_max
+
+    def run(self):
+        """Ejecuta el proceso ETL completo para fact_sugerido_compra"""
+        try:
+            self.logger.info("🚀 Iniciando ETL para fact_sugerido_compra")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            exclusion = IndiceExclusion.compartido(self.extractor.engine, self.extractor.esquema, logger=self.logger)
+            datos_extraidos = exclusion.filtrar(datos_extraidos, etapa='sugerido_compra')
+
+            # Mínimo y máximo efectivos resueltos entre todas las fuentes de política
+            politicas = None
+            if self.usar_politica_min_max:
+                politicas = ExtractorPoliticas(logger=self.logger).politica_efectiva()
+
+            # Fase de transformación
+            self.logger.info("🔄 Calculando sugerido de compra")
+            transformador = TransformadorSugeridoCompra(
+                datos_extraidos,
+                logger=self.logger,
+                politicas=politicas,
+                descontar_traslados=self.descontar_traslados
+            )
+            df_sugerido = transformador.transformar()
+
+            if df_sugerido.empty:
+                self.logger.warning("⚠️ No hay compras sugeridas")
+                return False
+
+            # Costo efectivo con la mejor oferta por línea
+            if self.aplicar_ofertas:
+                df_ofertas = ExtractorOfertasStaging(logger=self.logger).extraer()
+                if not df_ofertas.empty:
+                    df_sugerido = MotorOfertas(df_ofertas, logger=self.logger).anotar(df_sugerido)
+
+            # Salida CSV
+            os.makedirs(self.ruta_salida, exist_ok=True)
+            fecha = df_sugerido['fecha'].iloc[0]
+            ruta_completa = os.path.join(self.ruta_salida, f"sugerido_compra_{fecha:%Y%m%d}.csv")
+            df_sugerido.to_csv(ruta_completa, index=False, encoding='utf-8-sig')
+            self.logger.info(f"💾 CSV guardado en: {ruta_completa}")
+
+            # Fase de carga
+            self.logger.info("📤 Iniciando carga de datos")
+            resultado_carga = self.loader.cargar_dataframe(df_sugerido)
+
+            if resultado_carga:
+                self.logger.info("✅ Proceso ETL completado con éxito")
+            else:
+                self.logger.error("❌ Error en la carga de datos")
+
+            return resultado_carga
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el proceso ETL: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_sugerido_compra
+    parser = argparse.ArgumentParser(description="ETL sugerido de compra")
+    parser.add_argument("--sin-traslados", action="store_true",
+                        help="No descontar las unidades que llegarán por traslado")
+    parser.add_argument("--sin-ofertas", action="store_true",
+                        help="No calcular el costo efectivo con bonificaciones")
+    parser.add_argument("--sin-politica-min-max", action="store_true",
+                        help="Usar la política por clasificación en lugar de policy_min_max")
+    args = parser.parse_args()
+
+    runner = SugeridoCompraETLRunner(
+        descontar_traslados=not args.sin_traslados,
+        aplicar_ofertas=not args.sin_ofertas,
+        usar_politica_min_max=not args.sin_politica_min_max
+    )
+    runner.run()
@@ -0,0 +1,129 @@
+# analysis/etl/etl_runner_traslados.py
+
+import os
+import time
+import argparse
+
+from analysis.extractor.extractor_traslados import ExtractorTraslados
+from analysis.extractor.extractor_politicas import ExtractorPoliticas
+from analysis.extractor.indice_exclusion import IndiceExclusion
+from analysis.transformer.transformer_traslados import TransformadorTraslados
+from analysis.loader.escritor_excel import escribir_excel, comparar_con_to_excel
+from utils.logger_etl import LoggerETL
+
+RUTA_SALIDA_TRASLADOS = "data/output/traslados"
+
+ARCHIVOS_TRASLADOS = {
+    'exceso': "exceso_transferencias.csv",
+    'deficit': "deficit_transferencias.csv",
+    'traslados': "traslados_final.csv",
+}
+
+ARCHIVO_EXCEL_TRASLADOS = "traslados.xlsx"
+
+# Hojas del libro Excel: clave de resultados -> (hoja, formatos por columna)
+HOJAS_EXCEL_TRASLADOS = {
+    'traslados': ('Traslados', {'cantidad_transferir': 'entero', 'mayor_costo': 'decimal', 'costo_total': 'decimal'}),
+    'exceso': ('Exceso', {'inv_avaluado': 'decimal', 'mayor_costo': 'decimal', 'cant_exceso': 'entero'}),
+    'deficit': ('Deficit', {'inv_avaluado': 'decimal', 'compra_valuada': 'decimal', 'cant_compra': 'entero'}),
+}
+
+
+class TrasladosETLRunner:
+    """
+    Runner para el cálculo de traslados entre PDVs.
+    Clasifica excesos y déficits a partir de estadisticas_demanda, el inventario
+    del último mes y la política min/max efectiva (policy_min_max), empareja
+    oferta y demanda por SKU y genera los CSV de traslados.
+    """
+
+    def __init__(self, ruta_salida=RUTA_SALIDA_TRASLADOS, fecha_corte=None, excel=False, benchmark_excel=False,
+                 usar_politica_min_max=True):
+        """Inicializa el runner con sus componentes ETL y el logger"""
+        self.logger = LoggerETL("ETL Traslados")
+        self.extractor = ExtractorTraslados(logger=self.logger)
+        self.ruta_salida = ruta_salida
+        self.fecha_corte = fecha_corte
+        self.excel = excel
+        self.benchmark_excel = benchmark_excel
+        self.usar_politica_min_max = usar_politica_min_max
+
+    def run(self):
+        """Ejecuta el cálculo completo de traslados"""
+        try:
+            inicio = time.perf_counter()
+            self.logger.info("🚀 Iniciando cálculo de traslados entre PDVs")
+
+            # Fase de extracción
+            datos_extraidos = self.extractor.extraer()
+            if datos_extraidos.empty:
+                self.logger.warning("⚠️ No se obtuvieron datos en la extracción")
+                return False
+
+            exclusion = IndiceExclusion.compartido(self.extractor.engine, self.extractor.esquema, logger=self.logger)
+            datos_extraidos = exclusion.filtrar(datos_extraidos, etapa='traslados')
+
+            # Mínimo y máximo efectivos resueltos entre todas las fuentes de política
+            politicas = None
+            if self.usar_politica_min_max:
+                politicas = ExtractorPoliticas(logger=self.logger).politica_efectiva()
+
+            # Fase de transformación
+            self.logger.info("🔄 Clasificando inventario y emparejando traslados")
+            transformador = TransformadorTraslados(
+                datos_extraidos,
+                logger=self.logger,
+                fecha_corte=self.fecha_corte,
+                politicas=politicas
+            )
+            resultados = transformador.transformar()
+
+            # Fase de salida
+            os.makedirs(self.ruta_salida, exist_ok=True)
+            for clave, nombre_archivo in ARCHIVOS_TRASLADOS.items():
+                ruta_completa = os.path.join(self.ruta_salida, nombre_archivo)
+                resultados[clave].to_csv(ruta_completa, index=False)
+                self.logger.info(f"💾 {nombre_archivo}: {len(resultados[clave])} registros")
+
+            # Libro Excel con las tres hojas, escrito en streaming
+            if self.excel:
+                hojas = {
+                    hoja: (resultados[clave], {'formatos': formatos})
+                    for clave, (hoja, formatos) in HOJAS_EXCEL_TRASLADOS.items()
+                }
+                escribir_excel(os.path.join(self.ruta_salida, ARCHIVO_EXCEL_TRASLADOS), hojas, logger=self.logger)
+            if self.benchmark_excel:
+                comparar_con_to_excel(
+                    {hoja: resultados[clave] for clave, (hoja, _) in HOJAS_EXCEL_TRASLADOS.items()},
+                    os.path.join(self.ruta_salida, "benchmark"),
+                    logger=self.logger
+                )
+
+            self.logger.info(f"✅ Traslados generados en {time.perf_counter() - inicio:.1f}s")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"💥 Error en el cálculo de traslados: {e}")
+            return False
+
+
+if __name__ == '__main__':
+    # Para ejecutar desde línea de comandos: python -m analysis.etl.etl_runner_traslados
+    parser = argparse.ArgumentParser(description="Cálculo de traslados entre PDVs")
+    parser.add_argument("--salida", default=RUTA_SALIDA_TRASLADOS,
+                        help="Carpeta donde se escriben los CSV")
+    parser.add_argument("--excel", action="store_true",
+                        help=f"Escribir también {ARCHIVO_EXCEL_TRASLADOS} con una hoja por reporte")
+    parser.add_argument("--benchmark-excel", action="store_true",
+                        help="Comparar el escritor en streaming contra DataFrame.to_excel")
+    parser.add_argument("--sin-politica-min-max", action="store_true",
+                        help="Usar la política por clasificación en lugar de policy_min_max")
+    args = parser.parse_args()
+
+    runner = TrasladosETLRunner(
+        ruta_salida=args.salida,
+        excel=args.excel,
+        benchmark_excel=args.benchmark_excel,
+        usar_politica_min_max=not args.sin_politica_min_max
+    )
+    runner.run()
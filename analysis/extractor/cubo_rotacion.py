@@ -0,0 +1,272 @@
+# analysis/extractor/cubo_rotacion.py
+
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Dimensiones por las que se puede filtrar y agrupar
+DIMENSIONES_CUBO = [
+    'codigo_pdv', 'nombre_pdv', 'codigo_producto', 'laboratorio', 'categoria', 'subcategoria',
+    'grupo_i', 'grupo_ii', 'grupo_iii', 'grupo_iv', 'grupo_v', 'grupo_vi',
+    'abc_clasificacion', 'estado_inventario', 'mes',
+]
+
+# Medidas aditivas; 'filas' cuenta registros de fact_rotacion
+MEDIDAS_CUBO = [
+    'venta_unidades', 'venta_total', 'costo_total', 'margen_bruto', 'valor_inventario', 'rotacion_mes', 'filas',
+]
+
+# Cortes que se agregan al cargar el cubo, cada uno junto con el mes
+AGREGADOS_PRECALCULADOS = [
+    'codigo_pdv', 'laboratorio', 'categoria',
+    'grupo_i', 'grupo_ii', 'grupo_iii', 'grupo_iv', 'grupo_v', 'grupo_vi',
+]
+
+# Segundos entre verificaciones de la firma de fact_rotacion en compartido()
+INTERVALO_VERIFICACION = 60
+
+CONSULTA_CUBO = """
+    SELECT
+        f.codigo_pdv,
+        p.nombre_pdv,
+        f.codigo_producto,
+        pr.laboratorio, pr.categoria, pr.subcategoria,
+        pr.grupo_i, pr.grupo_ii, pr.grupo_iii, pr.grupo_iv, pr.grupo_v, pr.grupo_vi,
+        f.abc_clasificacion,
+        f.estado_inventario,
+        DATE_FORMAT(f.fecha, '%Y-%m') AS mes,
+        f.venta_unidades,
+        f.venta_total,
+        f.costo_total,
+        f.margen_bruto,
+        f.inventario_unidades_final * f.costo_unitario AS valor_inventario,
+        f.rotacion_mes
+    FROM fact_rotacion f
+    LEFT JOIN dim_producto pr ON f.producto_sk = pr.producto_sk
+    LEFT JOIN dim_pdv p ON f.pdv_sk = p.pdv_sk
+"""
+
+
+class CuboRotacion:
+    """
+    Cubo analítico en memoria sobre fact_rotacion y sus dimensiones.
+
+    Se lee una vez y se guarda en columnas: cada dimensión como un arreglo de
+    códigos enteros sobre su vocabulario y cada medida como un arreglo float64.
+    Las consultas (filtros + agrupación) se resuelven con máscaras e
+    np.bincount sin volver a MySQL. Al cargar se precalculan los cortes de
+    AGREGADOS_PRECALCULADOS por mes; una consulta que solo toca una de esas
+    dimensiones y el mes se responde desde el corte, que es mucho más pequeño.
+
+    Se comparte por proceso (ver compartido()) y los runners de fact_rotacion
+    lo refrescan al terminar una carga.
+    """
+
+    _compartido = None
+    _verificado = 0.0
+    _bloqueo = threading.Lock()
+
+    def __init__(self, df, firma=None, logger=None):
+        """
+        Construye el cubo.
+
+        Args:
+            df (pd.DataFrame): Filas de CONSULTA_CUBO
+            firma (tuple, optional): Firma de fact_rotacion al momento de la lectura
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        self.firma = firma
+        self.filas = len(df)
+
+        # Vocabulario de cada dimensión; el código 0 queda para los nulos
+        self.vocabulario = {}
+        codigos = {}
+        for dimension in DIMENSIONES_CUBO:
+            valores = df[dimension].astype(object).where(df[dimension].notna(), None)
+            posiciones, categorias = pd.factorize(
+                valores.map(lambda valor: None if valor is None else str(valor).strip()), sort=True
+            )
+            self.vocabulario[dimension] = np.concatenate([np.array([None], dtype=object), categorias.astype(object)])
+            codigos[dimension] = (posiciones + 1).astype(np.int32)
+
+        medidas = {
+            medida: pd.to_numeric(df[medida], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            for medida in MEDIDAS_CUBO if medida != 'filas'
+        }
+        medidas['filas'] = np.ones(len(df), dtype=np.float64)
+        self._base = {'codigos': codigos, 'medidas': medidas}
+
+        self._precalculados = {}
+        for dimension in AGREGADOS_PRECALCULADOS:
+            self._precalculados[dimension] = self._corte(self._base, [dimension, 'mes'])
+
+        if self.logger:
+            tamanos = ", ".join(f"{d}={len(c['medidas']['filas'])}" for d, c in self._precalculados.items())
+            self.logger.info(f"🧊 Cubo de rotación cargado: {self.filas} filas; cortes precalculados: {tamanos}")
+
+    @staticmethod
+    def firma_actual(connection):
+        """Firma barata de fact_rotacion: cambia con cualquier carga, borrado o actualización"""
+        fila = connection.execute(text("SELECT COUNT(*), MAX(fecha_actualizacion) FROM fact_rotacion")).one()
+        return (int(fila[0]), str(fila[1]))
+
+    @classmethod
+    def desde_bd(cls, engine, logger=None):
+        """
+        Lee fact_rotacion con sus dimensiones y construye el cubo.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            logger: Instancia de logger para registrar eventos
+
+        Returns:
+            CuboRotacion: Cubo cargado
+        """
+        inicio = time.perf_counter()
+        with engine.connect() as connection:
+            firma = cls.firma_actual(connection)
+            df = pd.read_sql(text(CONSULTA_CUBO), connection)
+        cubo = cls(df, firma=firma, logger=logger)
+        if logger:
+            logger.info(f"⏱️ Cubo de rotación construido en {time.perf_counter() - inicio:.1f}s")
+        return cubo
+
+    @classmethod
+    def compartido(cls, engine, logger=None, refrescar=False):
+        """
+        Devuelve el cubo del proceso, construyéndolo la primera vez.
+
+        Si pasaron más de INTERVALO_VERIFICACION segundos desde la última
+        verificación se compara la firma de fact_rotacion y se reconstruye
+        cuando otra ejecución (ej: un ETL en otro proceso) cambió la tabla.
+        """
+        with cls._bloqueo:
+            ahora = time.monotonic()
+            if cls._compartido is not None and not refrescar and ahora - cls._verificado >= INTERVALO_VERIFICACION:
+                with engine.connect() as connection:
+                    refrescar = cls.firma_actual(connection) != cls._compartido.firma
+                cls._verificado = ahora
+            if cls._compartido is None or refrescar:
+                cls._compartido = cls.desde_bd(engine, logger=logger)
+                cls._verificado = ahora
+            return cls._compartido
+
+    @classmethod
+    def refrescar(cls, engine, logger=None):
+        """
+        Reconstruye el cubo del proceso al terminar un ETL de fact_rotacion.
+
+        Si el proceso todavía no cargó el cubo no se hace nada: la primera
+        consulta lo construirá con los datos nuevos y los demás procesos lo
+        detectan por la firma.
+        """
+        if cls._compartido is None:
+            return None
+        try:
+            return cls.compartido(engine, logger=logger, refrescar=True)
+        except Exception as e:
+            # La carga ya terminó; el cubo se reintentará en la próxima verificación de firma
+            if logger:
+                logger.warning(f"⚠️ No se pudo refrescar el cubo de rotación: {e}")
+            return None
+
+    def _corte(self, tabla, dimensiones, mascara=None):
+        """
+        Agrega una tabla columnar por un conjunto de dimensiones.
+
+        Args:
+            tabla (dict): {'codigos': dimensión -> arreglo, 'medidas': medida -> arreglo}
+            dimensiones (list): Dimensiones del resultado
+            mascara (np.ndarray, optional): Filas a considerar
+
+        Returns:
+            dict: Tabla columnar con una fila por combinación presente
+        """
+        codigos = {d: tabla['codigos'][d] for d in dimensiones}
+        medidas = tabla['medidas']
+        if mascara is not None:
+            codigos = {d: arreglo[mascara] for d, arreglo in codigos.items()}
+            medidas = {m: arreglo[mascara] for m, arreglo in medidas.items()}
+
+        n = len(medidas['filas'])
+        if not dimensiones:
+            return {'codigos': {}, 'medidas': {m: np.array([arreglo.sum()]) for m, arreglo in medidas.items()}}
+
+        # Clave combinada por posición; si no cabe en int64 se agrupa por filas
+        cardinalidades = [len(self.vocabulario[d]) for d in dimensiones]
+        if np.prod(cardinalidades, dtype=float) < 2 ** 62:
+            clave = np.ravel_multi_index([codigos[d] for d in dimensiones], cardinalidades) if n else np.array([], dtype=np.int64)
+            unicas, grupo = np.unique(clave, return_inverse=True)
+            combinaciones = np.unravel_index(unicas, cardinalidades)
+        else:
+            unicas, grupo = np.unique(np.column_stack([codigos[d] for d in dimensiones]), axis=0, return_inverse=True)
+            combinaciones = unicas.T
+        grupo = grupo.ravel()
+
+        return {
+            'codigos': {d: np.asarray(combinaciones[i], dtype=np.int32) for i, d in enumerate(dimensiones)},
+            'medidas': {m: np.bincount(grupo, weights=arreglo, minlength=len(unicas)) for m, arreglo in medidas.items()},
+        }
+
+    def _mascara(self, tabla, filtros):
+        """Máscara de las filas que cumplen todos los filtros (dimensión -> valor o lista de valores)"""
+        mascara = np.ones(len(tabla['medidas']['filas']), dtype=bool)
+        for dimension, valores in filtros.items():
+            if not isinstance(valores, (list, tuple, set, np.ndarray, pd.Index, pd.Series)):
+                valores = [valores]
+            buscados = {None if valor is None else str(valor).strip() for valor in valores}
+            permitidos = np.array(
+                [i for i, valor in enumerate(self.vocabulario[dimension]) if valor in buscados], dtype=np.int32
+            )
+            mascara &= np.isin(tabla['codigos'][dimension], permitidos)
+        return mascara
+
+    def consultar(self, agrupar=None, filtros=None, medidas=None):
+        """
+        Agrega las medidas por las dimensiones pedidas.
+
+        Args:
+            agrupar (list, optional): Dimensiones de DIMENSIONES_CUBO; vacío = total general
+            filtros (dict, optional): dimensión -> valor o lista de valores
+            medidas (list, optional): Medidas de MEDIDAS_CUBO; por defecto todas
+
+        Returns:
+            pd.DataFrame: Una fila por combinación con las medidas, margen_porcentaje
+                y rotacion_promedio
+        """
+        agrupar = list(agrupar or [])
+        filtros = dict(filtros or {})
+        medidas = list(medidas or MEDIDAS_CUBO)
+        desconocidas = (set(agrupar) | set(filtros)) - set(DIMENSIONES_CUBO)
+        if desconocidas:
+            raise ValueError(f"Dimensiones no soportadas: {', '.join(sorted(desconocidas))}")
+
+        # El corte precalculado más pequeño que cubra todas las dimensiones usadas
+        usadas = set(agrupar) | set(filtros)
+        tabla = self._base
+        for dimension in AGREGADOS_PRECALCULADOS:
+            if usadas <= {dimension, 'mes'}:
+                tabla = self._precalculados[dimension]
+                break
+
+        mascara = self._mascara(tabla, filtros) if filtros else None
+        resultado = self._corte(tabla, agrupar, mascara)
+
+        df = pd.DataFrame({d: self.vocabulario[d][resultado['codigos'][d]] for d in agrupar})
+        for medida in medidas:
+            df[medida] = resultado['medidas'][medida]
+        totales = resultado['medidas']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['margen_porcentaje'] = np.where(
+                totales['venta_total'] != 0, totales['margen_bruto'] / totales['venta_total'] * 100, np.nan
+            )
+            df['rotacion_promedio'] = np.where(
+                totales['filas'] != 0, totales['rotacion_mes'] / totales['filas'], np.nan
+            )
+        if 'filas' in df:
+            df['filas'] = df['filas'].astype(np.int64)
+        return df.sort_values(agrupar).reset_index(drop=True) if agrupar else df
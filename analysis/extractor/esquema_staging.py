@@ -0,0 +1,147 @@
+# analysis/extractor/esquema_staging.py
+
+from sqlalchemy import text
+
+# Mapeo de columnas estándar a los posibles nombres en las tablas staging
+MAPEOS_POSIBLES = {
+    'codigo': ['codigo', 'codigo_producto', 'cod_producto', 'id_producto'],
+    'producto': ['producto', 'nombre_producto', 'descripcion', 'nombre'],
+    'ventas': ['ventas', 'venta', 'venta_total', 'venta_pesos'],
+    'unidades': ['unidades', 'cantidad', 'unidades_vendidas', 'venta_unidades', 'venta_unidad'],
+    'costo': ['costo', 'costo_total', 'costo_unidad', 'costo_unitario'],
+    'margen': ['margen', 'margen_bruto', 'margen_porcentaje', 'porcentaje_margen'],
+    'stock': ['stock', 'stock_actual', 'existencia', 'inventario_final', 'inventario_unidad']
+}
+
+# Alias de salida y valor por defecto de cada campo estándar
+PROYECCION_ESTANDAR = [
+    ('codigo', 'codigo_producto', "'desconocido'"),
+    ('producto', 'nombre_producto', "''"),
+    ('ventas', 'venta_total', "0"),
+    ('unidades', 'venta_unidades', "0"),
+    ('costo', 'costo_total', "0"),
+    ('margen', 'margen_porcentaje', "0"),
+    ('stock', 'inventario_unidades_final', "0"),
+]
+
+
+class EsquemaStaging:
+    """
+    Catálogo de columnas de las tablas staging (stg_%) obtenido con una sola
+    consulta a INFORMATION_SCHEMA.COLUMNS y cacheado durante la ejecución.
+    También precompila la proyección SELECT estándar de cada tabla.
+    """
+
+    def __init__(self, engine, db_name="gestion_compras", patron="stg_%", logger=None):
+        """
+        Inicializa el catálogo sin consultar todavía la base de datos.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            db_name (str): Esquema a inspeccionar
+            patron (str): Patrón LIKE de las tablas a incluir
+            logger: Instancia de logger para registrar eventos
+        """
+        self.engine = engine
+        self.db_name = db_name
+        self.patron = patron
+        self.logger = logger
+        self._columnas_por_tabla = None
+        self._proyecciones = {}
+
+    def cargar(self):
+        """Consulta en una sola ida y vuelta las columnas de todas las tablas staging"""
+        query = text("""
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = :esquema
+            AND TABLE_NAME LIKE :patron
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """)
+
+        columnas_por_tabla = {}
+        with self.engine.connect() as connection:
+            for tabla, columna in connection.execute(query, {"esquema": self.db_name, "patron": self.patron}):
+                columnas_por_tabla.setdefault(tabla, []).append(columna)
+
+        self._columnas_por_tabla = columnas_por_tabla
+        self._proyecciones = {}
+
+        if self.logger:
+            self.logger.info(f"🗂️ Esquema staging cargado: {len(columnas_por_tabla)} tablas")
+
+        return self
+
+    def refrescar(self):
+        """Descarta la caché y vuelve a consultar el catálogo"""
+        return self.cargar()
+
+    @property
+    def columnas_por_tabla(self):
+        if self._columnas_por_tabla is None:
+            self.cargar()
+        return self._columnas_por_tabla
+
+    def tablas(self, prefijo="", contiene=None):
+        """
+        Lista las tablas cacheadas que empiezan por un prefijo.
+
+        Args:
+            prefijo (str): Prefijo del nombre de la tabla (ej: 'stg_rotacion_')
+            contiene (str, optional): Texto que además debe aparecer en el nombre
+
+        Returns:
+            list: Nombres de tabla ordenados
+        """
+        return sorted(
+            tabla for tabla in self.columnas_por_tabla
+            if tabla.startswith(prefijo) and (contiene is None or contiene in tabla)
+        )
+
+    def columnas(self, nombre_tabla):
+        """Devuelve las columnas de una tabla (lista vacía si no existe)"""
+        return self.columnas_por_tabla.get(nombre_tabla, [])
+
+    def resolver_columnas(self, nombre_tabla, mapeos=None):
+        """
+        Resuelve qué columna real corresponde a cada campo estándar.
+
+        Args:
+            nombre_tabla (str): Nombre de la tabla
+            mapeos (dict, optional): Mapeo campo estándar -> nombres posibles
+
+        Returns:
+            dict: Campo estándar -> columna encontrada en la tabla
+        """
+        mapeos = mapeos or MAPEOS_POSIBLES
+        columnas = set(self.columnas(nombre_tabla))
+
+        columnas_a_usar = {}
+        for campo_estandar, posibles_nombres in mapeos.items():
+            for nombre in posibles_nombres:
+                if nombre in columnas:
+                    columnas_a_usar[campo_estandar] = nombre
+                    break
+        return columnas_a_usar
+
+    def proyeccion(self, nombre_tabla):
+        """
+        Devuelve (y cachea) la lista SELECT estándar para una tabla staging.
+
+        Args:
+            nombre_tabla (str): Nombre de la tabla
+
+        Returns:
+            str: Campos separados por coma con los alias estándar
+        """
+        if nombre_tabla not in self._proyecciones:
+            columnas_a_usar = self.resolver_columnas(nombre_tabla)
+            campos_select = []
+            for campo_estandar, alias, por_defecto in PROYECCION_ESTANDAR:
+                if campo_estandar in columnas_a_usar:
+                    campos_select.append(f"{columnas_a_usar[campo_estandar]} as {alias}")
+                else:
+                    campos_select.append(f"{por_defecto} as {alias}")
+            self._proyecciones[nombre_tabla] = ', '.join(campos_select)
+
+        return self._proyecciones[nombre_tabla]
@@ -0,0 +1,107 @@
+# analysis/extractor/extractor_antiguedad_inventario.py
+
+import pandas as pd
+from sqlalchemy import text
+from analysis.extractor.extractor_estadisticas_demanda import ExtractorEstadisticasDemanda
+from analysis.extractor.extractor_traslados import ExtractorTraslados
+from analysis.extractor.extractor_matriz_productos import ExtractorMatrizProductos
+
+
+class ExtractorAntiguedadInventario(ExtractorTraslados):
+    """
+    Extractor de los insumos de antigüedad de inventario por PDV×SKU:
+    inventario, costo y ultima_compra de la tabla de rotación más reciente,
+    último mes con venta del histórico stg_rotacion_* y las fechas de compra
+    y venta de las maestras (stg_maestra_pdv_*).
+    """
+
+    def __init__(self, logger=None, fecha_referencia=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+            fecha_referencia (date, optional): Fecha desde la que se cuentan los meses
+                relativos de las tablas de rotación; por defecto hoy
+        """
+        super().__init__(logger=logger, fecha_referencia=fecha_referencia)
+        # Histórico de ventas por mes (stg_rotacion_*), para el último mes con venta
+        self.extractor_ventas = ExtractorEstadisticasDemanda(logger=logger, fecha_referencia=fecha_referencia)
+
+    def extraer(self):
+        """
+        Consolida inventario y fechas de movimiento por PDV×SKU.
+
+        Returns:
+            pd.DataFrame: Inventario del último mes con ultima_compra, ultima_venta
+                (fin del último mes con venta), fecha_compra_maestra y fecha_venta_maestra
+        """
+        try:
+            df = self._extraer_inventario()
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ Sin inventario para calcular antigüedad")
+                return pd.DataFrame()
+
+            # Último mes con venta de cada PDV×SKU en el histórico
+            df_ventas = self.extractor_ventas.extraer()
+            if not df_ventas.empty:
+                con_venta = df_ventas[df_ventas['venta'] > 0]
+                ultimo_mes = con_venta.groupby(['codigo', 'codigo_pdv'], as_index=False)['periodo'].max()
+                ultimo_mes['ultima_venta'] = pd.PeriodIndex(ultimo_mes.pop('periodo'), freq='M').end_time.normalize()
+                ultimo_mes['codigo_pdv'] = ultimo_mes['codigo_pdv'].astype(str)
+                df = df.merge(ultimo_mes, on=['codigo', 'codigo_pdv'], how='left')
+            else:
+                df['ultima_venta'] = pd.NaT
+
+            df_maestra = self._extraer_fechas_maestra()
+            if not df_maestra.empty:
+                df = df.merge(df_maestra, on=['codigo', 'codigo_pdv'], how='left')
+            else:
+                df['fecha_compra_maestra'] = pd.NaT
+                df['fecha_venta_maestra'] = pd.NaT
+
+            if self.logger:
+                self.logger.info(f"📥 Insumos de antigüedad: {len(df)} combinaciones PDV×SKU")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de insumos de antigüedad: {e}")
+            return pd.DataFrame()
+
+    def _extraer_fechas_maestra(self):
+        """
+        Lee en una sola consulta fecha_compra y fecha_venta de todas las maestras de PDV.
+
+        Returns:
+            pd.DataFrame: codigo, codigo_pdv, fecha_compra_maestra, fecha_venta_maestra
+        """
+        tablas = []
+        for tabla in self.esquema.tablas("stg_maestra_pdv_"):
+            columnas = set(self.esquema.columnas(tabla))
+            if 'codigo' in columnas and {'fecha_compra', 'fecha_venta'} & columnas:
+                tablas.append(tabla)
+
+        subconsultas = []
+        for tabla, codigo_pdv in ExtractorMatrizProductos.codigos_pdv(self.engine, tablas, self.logger).items():
+            columnas = set(self.esquema.columnas(tabla))
+            subconsultas.append(
+                f"SELECT CAST(codigo AS CHAR) AS codigo, '{codigo_pdv}' AS codigo_pdv, "
+                f"{'fecha_compra' if 'fecha_compra' in columnas else 'NULL'} AS fecha_compra_maestra, "
+                f"{'fecha_venta' if 'fecha_venta' in columnas else 'NULL'} AS fecha_venta_maestra "
+                f"FROM `{tabla}` WHERE codigo IS NOT NULL"
+            )
+
+        if not subconsultas:
+            return pd.DataFrame()
+
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+        df['codigo'] = df['codigo'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+        for columna in ('fecha_compra_maestra', 'fecha_venta_maestra'):
+            df[columna] = pd.to_datetime(df[columna], errors='coerce', dayfirst=True)
+        return df.groupby(['codigo', 'codigo_pdv'], as_index=False)[
+            ['fecha_compra_maestra', 'fecha_venta_maestra']
+        ].max()
@@ -0,0 +1,154 @@
+# analysis/extractor/extractor_estadisticas_demanda.py
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+
+class ExtractorEstadisticasDemanda:
+    """
+    Extractor del histórico de ventas por PDV y mes desde las tablas
+    stg_rotacion_de_NOMBRE_PDV_CODIGO_MES cargadas por el ETL de ventas.
+
+    Las ventas se normalizan a cajas equivalentes (unidades sueltas divididas
+    por el contenido de la caja) para que todos los meses sean comparables.
+    """
+
+    def __init__(self, logger=None, fecha_referencia=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+            fecha_referencia (date, optional): Fecha desde la que se cuentan los meses
+                relativos (sufijos 1, 2, 3 = mes anterior, hace dos meses...); por defecto hoy
+        """
+        self.logger = logger
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+        self.periodo_referencia = pd.Period(fecha_referencia or pd.Timestamp.now(), freq='M')
+
+    def extraer(self):
+        """
+        Extrae en una sola consulta las ventas de todas las tablas de rotación.
+
+        Returns:
+            pd.DataFrame: Columnas codigo, nombre_producto, codigo_pdv, punto_de_venta,
+                periodo (YYYY-MM) y venta (cajas equivalentes)
+        """
+        try:
+            subconsultas = []
+            for tabla in self.esquema.tablas("stg_rotacion_"):
+                subconsulta = self._construir_subconsulta(tabla)
+                if subconsulta:
+                    subconsultas.append(subconsulta)
+
+            if not subconsultas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron tablas de ventas (stg_rotacion_*)")
+                return pd.DataFrame()
+
+            query = text("\nUNION ALL\n".join(subconsultas))
+            with self.engine.connect() as connection:
+                df = pd.read_sql(query, connection)
+
+            df['codigo'] = df['codigo'].astype(str).str.strip()
+            df['venta'] = pd.to_numeric(df['venta'], errors='coerce').fillna(0)
+
+            if self.logger:
+                self.logger.info(
+                    f"📥 Ventas extraídas: {len(df)} registros de {len(subconsultas)} tablas "
+                    f"({df['periodo'].nunique()} meses)"
+                )
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción del histórico de ventas: {e}")
+            return pd.DataFrame()
+
+    def _periodo_desde_sufijo(self, sufijo):
+        """
+        Convierte el sufijo de la tabla en un periodo mensual.
+
+        Acepta meses absolutos (YYYYMM) o relativos a la fecha de referencia (1, 2, 3).
+        """
+        if not sufijo.isdigit():
+            return None
+        if len(sufijo) == 6:
+            return pd.Period(f"{sufijo[:4]}-{sufijo[4:]}", freq='M')
+        return self.periodo_referencia - int(sufijo)
+
+    def info_tabla(self, nombre_tabla):
+        """
+        Interpreta el nombre de una tabla de ventas.
+
+        Args:
+            nombre_tabla (str): Nombre de la tabla (ej: stg_rotacion_de_bella_suiza_40350_1)
+
+        Returns:
+            dict: codigo_pdv, nombre_pdv y periodo, o None si el formato no es válido
+        """
+        # Formato esperado: stg_rotacion_de_NOMBRE_PDV_CODIGO_MES
+        partes = nombre_tabla.split('_')
+        if 'de' not in partes or len(partes) < 6:
+            return None
+
+        codigo_pdv = partes[-2]
+        periodo = self._periodo_desde_sufijo(partes[-1])
+        if not codigo_pdv.isdigit() or periodo is None:
+            if self.logger:
+                self.logger.warning(f"⚠️ Tabla con formato no reconocido: {nombre_tabla}")
+            return None
+
+        return {
+            'codigo_pdv': codigo_pdv,
+            'nombre_pdv': '_'.join(partes[partes.index('de') + 1:-2]),
+            'periodo': periodo
+        }
+
+    def _construir_subconsulta(self, nombre_tabla):
+        """
+        Construye el SELECT normalizado de una tabla de ventas.
+
+        Args:
+            nombre_tabla (str): Nombre de la tabla (ej: stg_rotacion_de_bella_suiza_40350_1)
+
+        Returns:
+            str: Subconsulta SQL o None si la tabla no tiene el formato esperado
+        """
+        info = self.info_tabla(nombre_tabla)
+        if info is None:
+            return None
+
+        codigo_pdv, nombre_pdv, periodo = info['codigo_pdv'], info['nombre_pdv'], info['periodo']
+        columnas = set(self.esquema.columnas(nombre_tabla))
+        columnas_a_usar = self.esquema.resolver_columnas(nombre_tabla)
+
+        if 'codigo' not in columnas_a_usar:
+            if self.logger:
+                self.logger.warning(f"⚠️ Tabla sin columna de código: {nombre_tabla}")
+            return None
+
+        # Venta en cajas equivalentes
+        if 'venta_caja' in columnas:
+            venta = "COALESCE(venta_caja, 0)"
+        elif {'venta_unidad', 'contenido_caja'} <= columnas:
+            venta = "COALESCE(venta_unidad / NULLIF(contenido_caja, 0), 0)"
+        elif 'unidades' in columnas_a_usar:
+            venta = f"COALESCE({columnas_a_usar['unidades']}, 0)"
+        else:
+            venta = "0"
+
+        nombre = columnas_a_usar.get('producto')
+        return (
+            f"SELECT {columnas_a_usar['codigo']} AS codigo, "
+            f"{nombre if nombre else 'NULL'} AS nombre_producto, "
+            f"'{codigo_pdv}' AS codigo_pdv, "
+            f"'{nombre_pdv} {codigo_pdv}' AS punto_de_venta, "
+            f"'{periodo}' AS periodo, "
+            f"{venta} AS venta "
+            f"FROM `{nombre_tabla}`"
+        )
@@ -0,0 +1,95 @@
+# analysis/extractor/extractor_fact_inventario_producto.py
+
+import re
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+# stg_inventario_<nombre pdv> <codigo pdv> (el ETL de inventarios conserva el espacio)
+PATRON_TABLA_INVENTARIO = re.compile(r'^stg_inventario_(?P<nombre>.+?)[ _](?P<codigo_pdv>\d+)$')
+
+
+class ExtractorFactInventarioProducto:
+    """
+    Extractor del inventario por producto de todas las tablas staging de
+    inventario (stg_inventario_*), en una sola consulta UNION ALL.
+    A diferencia de ExtractorFactInventarios no agrega por PDV: devuelve una
+    fila por PDV×producto con unidades y costo.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+
+    @staticmethod
+    def info_tabla(nombre_tabla):
+        """
+        Interpreta el nombre de una tabla de inventario.
+
+        Ej: 'stg_inventario_bella_suiza 40350' -> {'codigo_pdv': '40350', 'nombre_pdv': 'bella_suiza'}
+
+        Returns:
+            dict: codigo_pdv y nombre_pdv, o None si el nombre no trae código de PDV
+        """
+        coincidencia = PATRON_TABLA_INVENTARIO.match(nombre_tabla)
+        if not coincidencia:
+            return None
+        return {'codigo_pdv': coincidencia['codigo_pdv'], 'nombre_pdv': coincidencia['nombre']}
+
+    def extraer(self):
+        """
+        Extrae el inventario actual por producto de todos los PDVs.
+
+        Returns:
+            pd.DataFrame: codigo_pdv, codigo_producto, unidades, costo_unitario, costo_total
+        """
+        try:
+            subconsultas = []
+            for tabla in self.esquema.tablas("stg_inventario_"):
+                info = self.info_tabla(tabla)
+                columnas = set(self.esquema.columnas(tabla))
+                if info is None or 'codigo' not in columnas:
+                    if self.logger:
+                        self.logger.warning(f"⚠️ Tabla de inventario con formato no reconocido: {tabla}")
+                    continue
+
+                def columna(nombre):
+                    return f"COALESCE(`{nombre}`, 0)" if nombre in columnas else "0"
+
+                subconsultas.append(
+                    f"SELECT '{info['codigo_pdv']}' AS codigo_pdv, "
+                    f"CAST(codigo AS CHAR) AS codigo_producto, "
+                    f"{columna('inventario_unidad')} AS unidades, "
+                    f"{columna('costo_unidad')} AS costo_unitario, "
+                    f"{columna('costo_total')} AS costo_total "
+                    f"FROM `{tabla}` WHERE codigo IS NOT NULL"
+                )
+
+            if not subconsultas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron tablas de inventario (stg_inventario_*)")
+                return pd.DataFrame()
+
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+            if self.logger:
+                self.logger.info(
+                    f"📥 Inventario por producto extraído: {len(df)} registros de {len(subconsultas)} PDVs"
+                )
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de inventario por producto: {e}")
+            return pd.DataFrame()
@@ -1,8 +1,29 @@
 # analysis/extractor/extractor_fact_rotacion_all_pdv.py
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine, text
 from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+# Códigos repetidos por fila: se codifican como enteros con un diccionario compartido
+COLUMNAS_CODIGO = ['codigo_producto', 'codigo_pdv', 'nombre_producto']
+
+# Valores en pesos: se mantienen en float64 para no perder centavos en montos grandes
+COLUMNAS_MONETARIAS = [
+    'venta_total', 'costo_total', 'margen_bruto',
+    'costo_unitario', 'precio_venta_unitario'
+]
+
+# Medidas en unidades, días y porcentajes: float32 es suficiente
+COLUMNAS_MEDIDA = [
+    'venta_unidades', 'venta_cajas', 'venta_blisters', 'margen_porcentaje',
+    'inventario_unidades_inicial', 'inventario_unidades_final',
+    'dias_inventario', 'rotacion_mes'
+]
+
+COLUMNAS_ENTERAS = ['pdv_sk']
+
 
 class ExtractorFactRotacion:
     """
@@ -20,17 +41,21 @@ class ExtractorFactRotacion:
         self.logger = logger
         self.db_url = get_mysql_url("gestion_compras")
         self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
     
-    def extraer(self):
+    def extraer(self, tablas=None):
         """
         Extrae datos de las tablas stg_rotacion_* existentes para todos los PDVs.
         
+        Args:
+            tablas (list, optional): Subconjunto de tablas a extraer; por defecto todas
+            
         Returns:
             pd.DataFrame: DataFrame con los datos consolidados para fact_rotacion
         """
         try:
             # 1. Obtener todas las tablas de rotación
-            tablas_rotacion = self._obtener_tablas_rotacion()
+            tablas_rotacion = tablas if tablas is not None else self._obtener_tablas_rotacion()
             
             if not tablas_rotacion:
                 if self.logger:
@@ -94,7 +119,7 @@ class ExtractorFactRotacion:
             
             # 3. Combinar todos los resultados
             if resultados_consolidados:
-                df_final = pd.concat(resultados_consolidados, ignore_index=True)
+                df_final = self._consolidar_compacto(resultados_consolidados)
                 
                 if self.logger:
                     self.logger.info(f"✅ Extracción completada. Total registros: {len(df_final)}")
@@ -111,21 +136,74 @@ class ExtractorFactRotacion:
                 self.logger.error(f"💥 Error en extracción de datos de rotación: {e}")
             return pd.DataFrame()
     
-    def _obtener_tablas_rotacion(self):
-        """Obtiene la lista de tablas stg_rotacion_* disponibles"""
-        try:
-            query = text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'gestion_compras' 
-                AND table_name LIKE 'stg_rotacion_%'
-            """)
+    def _consolidar_compacto(self, frames):
+        """
+        Une los DataFrames de cada tabla en un único frame compacto: códigos como
+        categorías con diccionario compartido, medidas en float32, una sola fecha
+        de corte y columnas preasignadas en lugar de pd.concat.
+        
+        Args:
+            frames (list): DataFrames obtenidos de cada tabla
             
-            with self.engine.connect() as connection:
-                resultado = connection.execute(query)
-                tablas = [row[0] for row in resultado]
+        Returns:
+            pd.DataFrame: DataFrame consolidado
+        """
+        total = sum(len(df) for df in frames)
+        bytes_antes = sum(df.memory_usage(deep=True).sum() for df in frames)
+        columnas = list(dict.fromkeys(col for df in frames for col in df.columns))
+        
+        limites = np.cumsum([0] + [len(df) for df in frames])
+        tramos = list(zip(frames, limites[:-1], limites[1:]))
+        datos = {}
+        
+        for col in columnas:
+            if col == 'fecha':
+                continue
             
-            return tablas
+            if col in COLUMNAS_CODIGO:
+                # Diccionario compartido por todos los PDVs y códigos enteros por fila
+                valores = [df[col].astype(str).str.strip() if col in df.columns else None for df in frames]
+                categorias = pd.Index(pd.unique(np.concatenate([v.to_numpy() for v in valores if v is not None])))
+                codigos = np.full(total, -1, dtype=np.int32)
+                for v, (_, inicio, fin) in zip(valores, tramos):
+                    if v is not None:
+                        codigos[inicio:fin] = categorias.get_indexer(v)
+                datos[col] = pd.Categorical.from_codes(codigos, categories=categorias)
+                
+            elif col in COLUMNAS_MONETARIAS or col in COLUMNAS_MEDIDA or col in COLUMNAS_ENTERAS:
+                tipo = np.float64 if col in COLUMNAS_MONETARIAS else np.float32
+                arreglo = np.full(total, np.nan, dtype=tipo)
+                for df, inicio, fin in tramos:
+                    if col in df.columns:
+                        arreglo[inicio:fin] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=tipo, na_value=np.nan)
+                if col in COLUMNAS_ENTERAS and not np.isnan(arreglo).any():
+                    arreglo = arreglo.astype(np.int32)
+                datos[col] = arreglo
+                
+            else:
+                arreglo = np.empty(total, dtype=object)
+                for df, inicio, fin in tramos:
+                    arreglo[inicio:fin] = df[col].to_numpy(dtype=object) if col in df.columns else None
+                datos[col] = arreglo
+        
+        df_final = pd.DataFrame(datos, columns=[col for col in columnas if col != 'fecha'])
+        
+        # Una sola fecha de corte (el día de la extracción) para todas las filas
+        df_final['fecha'] = pd.Timestamp.now().normalize()
+        
+        if self.logger and total:
+            bytes_despues = df_final.memory_usage(deep=True).sum()
+            self.logger.info(
+                f"🧮 Memoria consolidada: {bytes_antes / total:.1f} → {bytes_despues / total:.1f} bytes/fila "
+                f"({bytes_antes / 1024 / 1024:.1f} MB → {bytes_despues / 1024 / 1024:.1f} MB)"
+            )
+        
+        return df_final
+    
+    def _obtener_tablas_rotacion(self):
+        """Obtiene la lista de tablas stg_rotacion_* disponibles desde el catálogo cacheado"""
+        try:
+            return self.esquema.tablas("stg_rotacion_")
             
         except Exception as e:
             if self.logger:
@@ -251,78 +329,13 @@ class ExtractorFactRotacion:
             pd.DataFrame: DataFrame con los datos procesados
         """
         try:
-            # Primero averiguar las columnas de la tabla
-            query_columnas = text(f"""
-                SELECT COLUMN_NAME
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = 'gestion_compras'
-                AND TABLE_NAME = '{nombre_tabla}'
-            """)
-            
-            with self.engine.connect() as connection:
-                columnas = [row[0] for row in connection.execute(query_columnas)]
-            
-            # Mapeo de columnas estándar a nombres en la tabla
-            mapeos_posibles = {
-                'codigo': ['codigo', 'codigo_producto', 'cod_producto', 'id_producto'],
-                'producto': ['producto', 'nombre_producto', 'descripcion', 'nombre'],
-                'ventas': ['ventas', 'venta', 'venta_total', 'venta_pesos'],
-                'unidades': ['unidades', 'cantidad', 'unidades_vendidas', 'venta_unidades'],
-                'costo': ['costo', 'costo_total', 'costo_unidad', 'costo_unitario'],
-                'margen': ['margen', 'margen_bruto', 'margen_porcentaje', 'porcentaje_margen'],
-                'stock': ['stock', 'stock_actual', 'existencia', 'inventario_final']
-            }
-            
-            # Encontrar las columnas disponibles en la tabla
-            columnas_a_usar = {}
-            for campo_estandar, posibles_nombres in mapeos_posibles.items():
-                for nombre in posibles_nombres:
-                    if nombre in columnas:
-                        columnas_a_usar[campo_estandar] = nombre
-                        break
-            
-            # Construir la consulta según las columnas disponibles
-            campos_select = []
-            
-            if 'codigo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['codigo']} as codigo_producto")
-            else:
-                campos_select.append("'desconocido' as codigo_producto")
-                
-            if 'producto' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['producto']} as nombre_producto")
-            else:
-                campos_select.append("'' as nombre_producto")
-                
-            if 'ventas' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['ventas']} as venta_total")
-            else:
-                campos_select.append("0 as venta_total")
-                
-            if 'unidades' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['unidades']} as venta_unidades")
-            else:
-                campos_select.append("0 as venta_unidades")
-                
-            if 'costo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['costo']} as costo_total")
-            else:
-                campos_select.append("0 as costo_total")
-                
-            if 'margen' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['margen']} as margen_porcentaje")
-            else:
-                campos_select.append("0 as margen_porcentaje")
-                
-            if 'stock' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['stock']} as inventario_unidades_final")
-            else:
-                campos_select.append("0 as inventario_unidades_final")
+            # Proyección precompilada a partir del catálogo cacheado (sin consultar INFORMATION_SCHEMA)
+            campos_select = self.esquema.proyeccion(nombre_tabla)
             
             # Consultar todos los registros sin límite
             query = text(f"""
                 SELECT 
-                    {', '.join(campos_select)},
+                    {campos_select},
                     NOW() as fecha
                 FROM `{nombre_tabla}`
             """)
@@ -3,6 +3,7 @@
 import pandas as pd
 from sqlalchemy import create_engine, text
 from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
 
 class ExtractorFactRotacion:
     """
@@ -20,6 +21,7 @@ class ExtractorFactRotacion:
         self.logger = logger
         self.db_url = get_mysql_url("gestion_compras")
         self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
     
     def extraer(self):
         """
@@ -79,20 +81,9 @@ class ExtractorFactRotacion:
             return pd.DataFrame()
     
     def _obtener_tablas_rotacion(self):
-        """Obtiene la lista de tablas stg_rotacion_* disponibles"""
+        """Obtiene la lista de tablas stg_rotacion_* disponibles desde el catálogo cacheado"""
         try:
-            query = text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'gestion_compras' 
-                AND table_name LIKE 'stg_rotacion_%'
-            """)
-            
-            with self.engine.connect() as connection:
-                resultado = connection.execute(query)
-                tablas = [row[0] for row in resultado]
-            
-            return tablas
+            return self.esquema.tablas("stg_rotacion_")
             
         except Exception as e:
             if self.logger:
@@ -188,103 +179,21 @@ class ExtractorFactRotacion:
             pd.DataFrame: DataFrame con los datos procesados
         """
         try:
-            # Primero averiguar las columnas de la tabla
-            query_columnas = text(f"""
-                SELECT COLUMN_NAME
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = 'gestion_compras'
-                AND TABLE_NAME = '{nombre_tabla}'
+            # Proyección precompilada a partir del catálogo cacheado (sin consultar INFORMATION_SCHEMA)
+            campos_select = self.esquema.proyeccion(nombre_tabla)
+            
+            # Consultar todos los registros sin límite
+            query = text(f"""
+                SELECT 
+                    {campos_select},
+                    NOW() as fecha
+                FROM `{nombre_tabla}`
             """)
             
             with self.engine.connect() as connection:
-                columnas = [row[0] for row in connection.execute(query_columnas)]
-            
-            # Mapeo de columnas estándar a nombres en la tabla
-            mapeos_posibles = {
-                'codigo': ['codigo', 'codigo_producto', 'cod_producto', 'id_producto'],
-                'producto': ['producto', 'nombre_producto', 'descripcion', 'nombre'],
-                'ventas': ['ventas', 'venta', 'venta_total', 'venta_pesos'],
-                'unidades': ['unidades', 'cantidad', 'unidades_vendidas', 'venta_unidades'],
-                'costo': ['costo', 'costo_total', 'costo_unidad', 'costo_unitario'],
-                'margen': ['margen', 'margen_bruto', 'margen_porcentaje', 'porcentaje_margen'],
-                'stock': ['stock', 'stock_actual', 'existencia', 'inventario_final']
-            }
-            
-            # Encontrar las columnas disponibles en la tabla
-            columnas_a_usar = {}
-            for campo_estandar, posibles_nombres in mapeos_posibles.items():
-                for nombre in posibles_nombres:
-                    if nombre in columnas:
-                        columnas_a_usar[campo_estandar] = nombre
-                        break
-            
-            # Construir la consulta según las columnas disponibles
-            campos_select = []
-            
-            if 'codigo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['codigo']} as codigo_producto")
-            else:
-                campos_select.append("'desconocido' as codigo_producto")
-                
-            if 'producto' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['producto']} as nombre_producto")
-            else:
-                campos_select.append("'' as nombre_producto")
-                
-            if 'ventas' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['ventas']} as venta_total")
-            else:
-                campos_select.append("0 as venta_total")
-                
-            if 'unidades' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['unidades']} as venta_unidades")
-            else:
-                campos_select.append("0 as venta_unidades")
-                
-            if 'costo' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['costo']} as costo_total")
-            else:
-                campos_select.append("0 as costo_total")
-                
-            if 'margen' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['margen']} as margen_porcentaje")
-            else:
-                campos_select.append("0 as margen_porcentaje")
-                
-            if 'stock' in columnas_a_usar:
-                campos_select.append(f"{columnas_a_usar['stock']} as inventario_unidades_final")
-            else:
-                campos_select.append("0 as inventario_unidades_final")
-            
-        if 'costo' in columnas_a_usar:
-            campos_select.append(f"{columnas_a_usar['costo']} as costo_total")
-        else:
-            campos_select.append("0 as costo_total")
-            
-        if 'margen' in columnas_a_usar:
-            campos_select.append(f"{columnas_a_usar['margen']} as margen_porcentaje")
-        else:
-            campos_select.append("0 as margen_porcentaje")
+                df = pd.read_sql(query, connection)
             
-        if 'stock' in columnas_a_usar:
-            campos_select.append(f"{columnas_a_usar['stock']} as inventario_unidades_final")
-        else:
-            campos_select.append("0 as inventario_unidades_final")
-        
-        query = text(f"""
-            SELECT 
-                {', '.join(campos_select)},
-                NOW() as fecha
-            FROM `{nombre_tabla}`
-        """)
-        
-        with self.engine.connect() as connection:
-            df = pd.read_sql(query, connection)
-        
-        if not df.empty:
-            # Agregar información del PDV
-            df['codigo_pdv'] = pdv_info.get('codigo_pdv')
-            df['pdv_sk'] = pdv_info.get('pdv_sk')
+            if not df.empty:
                 # Agregar información del PDV
                 df['codigo_pdv'] = pdv_info.get('codigo_pdv')
                 df['pdv_sk'] = pdv_info.get('pdv_sk')
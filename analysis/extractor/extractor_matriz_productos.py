@@ -0,0 +1,126 @@
+# analysis/extractor/extractor_matriz_productos.py
+
+import unicodedata
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+
+class ExtractorMatrizProductos:
+    """
+    Extractor de fechas de activación por producto y PDV desde las maestras
+    de inventario de cada punto de venta (stg_maestra_pdv_*).
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+
+    @staticmethod
+    def punto_de_venta(nombre_tabla):
+        """
+        Obtiene la etiqueta del PDV a partir del nombre de la tabla.
+
+        Ej: stg_maestra_pdv_bella_suiza_40350 -> 'bella_suiza 40350'
+        """
+        sufijo = nombre_tabla.replace("stg_maestra_pdv_", "", 1)
+        nombre, _, codigo = sufijo.rpartition('_')
+        return f"{nombre} {codigo}" if nombre and codigo.isdigit() else sufijo
+
+    @staticmethod
+    def _normalizar_nombre(nombre):
+        """Nombre de PDV comparable: minúsculas, sin tildes y con espacios simples"""
+        nombre = unicodedata.normalize('NFKD', str(nombre)).encode('ascii', 'ignore').decode()
+        return ' '.join(nombre.lower().replace('_', ' ').replace('-', ' ').split())
+
+    @staticmethod
+    def codigos_pdv(engine, tablas, logger=None):
+        """
+        Resuelve el código de PDV de cada maestra.
+
+        Se toma del sufijo numérico del nombre (stg_maestra_pdv_bella_suiza_40350);
+        las maestras sin código (ej: la vista stg_maestra_pdv_bella_suiza) se buscan
+        por nombre en dim_pdv.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            tablas (list): Nombres de tablas stg_maestra_pdv_*
+            logger: Instancia de logger para registrar eventos
+
+        Returns:
+            dict: tabla -> codigo_pdv; las maestras sin PDV identificable se omiten con advertencia
+        """
+        codigos = {}
+        sin_codigo = []
+        for tabla in tablas:
+            _, _, codigo_pdv = ExtractorMatrizProductos.punto_de_venta(tabla).rpartition(' ')
+            if codigo_pdv.isdigit():
+                codigos[tabla] = codigo_pdv
+            else:
+                sin_codigo.append(tabla)
+        if not sin_codigo:
+            return codigos
+
+        try:
+            with engine.connect() as connection:
+                dim_pdv = pd.read_sql(text("SELECT codigo_pdv, nombre_pdv FROM dim_pdv"), connection)
+        except Exception as e:
+            dim_pdv = pd.DataFrame(columns=['codigo_pdv', 'nombre_pdv'])
+            if logger:
+                logger.warning(f"⚠️ No se pudo leer dim_pdv para resolver maestras sin código: {e}")
+        nombres = dim_pdv['nombre_pdv'].map(ExtractorMatrizProductos._normalizar_nombre)
+
+        for tabla in sin_codigo:
+            nombre = ExtractorMatrizProductos._normalizar_nombre(ExtractorMatrizProductos.punto_de_venta(tabla))
+            candidatos = dim_pdv.loc[nombres == nombre, 'codigo_pdv']
+            if candidatos.empty:
+                candidatos = dim_pdv.loc[nombres.str.contains(nombre, regex=False), 'codigo_pdv']
+            if candidatos.nunique() == 1:
+                codigos[tabla] = str(candidatos.iloc[0])
+            elif logger:
+                logger.warning(f"⚠️ Maestra sin código de PDV identificable, se omite: {tabla}")
+        return codigos
+
+    def extraer(self):
+        """
+        Extrae en una sola consulta las fechas de activación de todas las maestras.
+
+        Returns:
+            pd.DataFrame: Columnas codigo, punto_de_venta, fecha_activacion
+        """
+        try:
+            tablas = [
+                tabla for tabla in self.esquema.tablas("stg_maestra_pdv_")
+                if {'codigo', 'fecha_activacion'} <= set(self.esquema.columnas(tabla))
+            ]
+            if not tablas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron maestras de PDV (stg_maestra_pdv_*)")
+                return pd.DataFrame()
+
+            union = "\nUNION ALL\n".join(
+                f"SELECT codigo, '{self.punto_de_venta(tabla)}' AS punto_de_venta, fecha_activacion "
+                f"FROM `{tabla}` WHERE fecha_activacion IS NOT NULL"
+                for tabla in tablas
+            )
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text(union), connection)
+
+            if self.logger:
+                self.logger.info(f"📥 Fechas de activación extraídas: {len(df)} registros de {len(tablas)} maestras")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de fechas de activación: {e}")
+            return pd.DataFrame()
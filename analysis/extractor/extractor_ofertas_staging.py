@@ -0,0 +1,62 @@
+# analysis/extractor/extractor_ofertas_staging.py
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+COLUMNAS_OFERTA = ['codigo', 'laboratorio', 'cantidad', 'cantidad_obsequio', 'codigo_obsequio', 'costo_caja_real']
+
+
+class ExtractorOfertasStaging:
+    """
+    Extractor de las bonificaciones cargadas por el ETL de ofertas (stg_ofertas_*).
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+
+    def extraer(self):
+        """
+        Lee todas las tablas de ofertas en una sola consulta UNION ALL.
+
+        Returns:
+            pd.DataFrame: Columnas COLUMNAS_OFERTA, una fila por oferta
+        """
+        try:
+            subconsultas = []
+            for tabla in self.esquema.tablas("stg_ofertas_"):
+                columnas = set(self.esquema.columnas(tabla))
+                if not {'codigo', 'cantidad', 'costo_caja_real'} <= columnas:
+                    continue
+                campos = ", ".join(
+                    f"`{columna}` AS {columna}" if columna in columnas else f"NULL AS {columna}"
+                    for columna in COLUMNAS_OFERTA
+                )
+                subconsultas.append(f"SELECT {campos} FROM `{tabla}` WHERE codigo IS NOT NULL")
+
+            if not subconsultas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron tablas de ofertas (stg_ofertas_*)")
+                return pd.DataFrame(columns=COLUMNAS_OFERTA)
+
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+            if self.logger:
+                self.logger.info(f"📥 Ofertas extraídas: {len(df)} registros de {len(subconsultas)} tablas")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de ofertas: {e}")
+            return pd.DataFrame(columns=COLUMNAS_OFERTA)
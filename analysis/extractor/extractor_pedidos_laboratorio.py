@@ -0,0 +1,94 @@
+# analysis/extractor/extractor_pedidos_laboratorio.py
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+
+COLUMNAS_CONTACTO = ['laboratorio', 'nombre_contacto', 'correo_contacto', 'cargo_contacto', 'telefono_contacto']
+
+
+class ExtractorPedidosLaboratorio:
+    """
+    Extractor de los insumos de pedidos por laboratorio: líneas de
+    fact_sugerido_compra con el laboratorio y proveedor vigentes de dim_producto,
+    y los contactos de laboratorio cargados por el ETL de correos.
+    """
+
+    def __init__(self, logger=None, fecha=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+            fecha (date, optional): Fecha del sugerido; por defecto la más reciente
+        """
+        self.logger = logger
+        self.fecha = fecha
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+
+    def extraer(self):
+        """
+        Lee las líneas del sugerido de compra de la fecha.
+
+        Returns:
+            pd.DataFrame: Líneas del sugerido con laboratorio y proveedor
+        """
+        try:
+            filtro_fecha = "s.fecha = :fecha" if self.fecha else "s.fecha = (SELECT MAX(fecha) FROM fact_sugerido_compra)"
+            query = text(f"""
+                SELECT s.*, d.laboratorio, d.proveedor
+                FROM fact_sugerido_compra s
+                LEFT JOIN dim_producto d
+                    ON d.codigo = s.codigo_producto AND d.flag_actual = TRUE
+                WHERE {filtro_fecha} AND s.cant_sugerida > 0
+            """)
+            with self.engine.connect() as connection:
+                df = pd.read_sql(query, connection, params={"fecha": self.fecha} if self.fecha else None)
+
+            if self.logger:
+                self.logger.info(f"📥 Líneas de sugerido extraídas: {len(df)}")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción del sugerido para pedidos: {e}")
+            return pd.DataFrame()
+
+    def contactos(self):
+        """
+        Lee los contactos de laboratorio de las tablas staging que los contienen.
+
+        Returns:
+            pd.DataFrame: COLUMNAS_CONTACTO, un contacto por laboratorio
+        """
+        try:
+            subconsultas = []
+            for tabla in self.esquema.tablas("stg_", contiene="laboratorio"):
+                columnas = set(self.esquema.columnas(tabla))
+                if not {'laboratorio', 'correo_contacto'} <= columnas:
+                    continue
+                campos = ", ".join(
+                    f"`{columna}` AS {columna}" if columna in columnas else f"NULL AS {columna}"
+                    for columna in COLUMNAS_CONTACTO
+                )
+                subconsultas.append(f"SELECT {campos} FROM `{tabla}` WHERE laboratorio IS NOT NULL")
+
+            if not subconsultas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron contactos de laboratorio")
+                return pd.DataFrame(columns=COLUMNAS_CONTACTO)
+
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+            if self.logger:
+                self.logger.info(f"📇 Contactos de laboratorio extraídos: {len(df)}")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de contactos de laboratorio: {e}")
+            return pd.DataFrame(columns=COLUMNAS_CONTACTO)
@@ -0,0 +1,234 @@
+# analysis/extractor/extractor_politicas.py
+
+import pandas as pd
+from sqlalchemy import create_engine, text, inspect as sqlalchemy_inspect
+from utils.db_connection import get_mysql_url
+from analysis.extractor.esquema_staging import EsquemaStaging
+from analysis.extractor.extractor_stock_seguridad import TABLA_STOCK_SEGURIDAD
+from analysis.loader.loader_politica_min_max import TABLA_POLITICA_MIN_MAX
+
+# Fuentes de política: sufijo de las columnas min_*/max_* que cargan sus transformadores
+FUENTES_POLITICA = [
+    'gerencia',
+    'convenio',
+    'temporales',
+    'exhibicion',
+    'merchandising',
+    'mostrador',
+    'quincenales',
+    'semanales',
+    'stock_seguridad',
+]
+
+# Unidad en que llega cada fuente. La política efectiva se resuelve en cajas
+# (igual que el inventario de traslados y el sugerido), así que las fuentes en
+# unidades se dividen por el contenido_caja del producto antes de combinarlas.
+UNIDAD_FUENTE_POLITICA = {
+    'gerencia': 'unidad',
+    'convenio': 'unidad',
+    'temporales': 'unidad',
+    'exhibicion': 'unidad',
+    'merchandising': 'unidad',
+    'mostrador': 'unidad',
+    'quincenales': 'unidad',
+    'semanales': 'unidad',
+    'stock_seguridad': 'caja',
+}
+
+
+class ExtractorPoliticas:
+    """
+    Extractor de las tablas staging de política min/max (exhibiciones, gerencia,
+    convenios, mostrador, merchandising, temporales, semanales y quincenales).
+    Las tablas se reconocen por sus columnas min_<fuente>/max_<fuente>.
+    Si existe la tabla stock_seguridad, su punto de reorden y nivel máximo se
+    agregan como la fuente de menor prioridad. Todos los límites se devuelven
+    en cajas (ver UNIDAD_FUENTE_POLITICA).
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el extractor.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        self.db_url = get_mysql_url("gestion_compras")
+        self.engine = create_engine(self.db_url)
+        self.esquema = EsquemaStaging(self.engine, logger=logger)
+
+    def tablas_politica(self):
+        """
+        Identifica las tablas staging de política.
+
+        Returns:
+            list: Tuplas (tabla, fuente)
+        """
+        encontradas = []
+        for tabla in self.esquema.tablas("stg_"):
+            columnas = set(self.esquema.columnas(tabla))
+            if 'codigo' not in columnas:
+                continue
+            for fuente in FUENTES_POLITICA:
+                if f"min_{fuente}" in columnas and f"max_{fuente}" in columnas:
+                    encontradas.append((tabla, fuente))
+                    break
+        return encontradas
+
+    def _construir_subconsulta(self, tabla, fuente):
+        """SELECT de una tabla de política al formato largo común"""
+        columnas = set(self.esquema.columnas(tabla))
+
+        def columna(nombre):
+            return f"`{nombre}`" if nombre in columnas else "NULL"
+
+        return (
+            f"SELECT CAST(codigo AS CHAR) AS codigo, "
+            f"{columna('punto_de_venta')} AS punto_de_venta, "
+            f"'{fuente}' AS fuente, "
+            f"`min_{fuente}` AS minimo, "
+            f"`max_{fuente}` AS maximo, "
+            f"{columna('fecha_inicial')} AS fecha_inicial, "
+            f"{columna('fecha_final')} AS fecha_final "
+            f"FROM `{tabla}` WHERE codigo IS NOT NULL"
+        )
+
+    def _subconsulta_stock_seguridad(self):
+        """SELECT del punto de reorden calculado al formato largo, o None si no existe la tabla"""
+        with self.engine.connect() as connection:
+            if not sqlalchemy_inspect(connection).has_table(TABLA_STOCK_SEGURIDAD):
+                return None
+        # estadisticas_demanda rotula el PDV 'nombre codigo'; las demás fuentes usan 'nombre_codigo'
+        return (
+            f"SELECT CAST(codigo AS CHAR) AS codigo, REPLACE(punto_de_venta, ' ', '_') AS punto_de_venta, "
+            f"'stock_seguridad' AS fuente, "
+            f"punto_reorden AS minimo, "
+            f"nivel_maximo AS maximo, "
+            f"NULL AS fecha_inicial, NULL AS fecha_final "
+            f"FROM {TABLA_STOCK_SEGURIDAD}"
+        )
+
+    def extraer(self):
+        """
+        Extrae todas las políticas en una sola consulta UNION ALL.
+
+        Returns:
+            pd.DataFrame: codigo, punto_de_venta (NULL si la fuente aplica a todos
+                los PDVs), fuente, minimo y maximo en cajas, fecha_inicial, fecha_final
+        """
+        try:
+            tablas = self.tablas_politica()
+            subconsultas = [self._construir_subconsulta(tabla, fuente) for tabla, fuente in tablas]
+            subconsulta_stock = self._subconsulta_stock_seguridad()
+            if subconsulta_stock:
+                subconsultas.append(subconsulta_stock)
+                tablas.append((TABLA_STOCK_SEGURIDAD, 'stock_seguridad'))
+
+            if not subconsultas:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron tablas de política min/max")
+                return pd.DataFrame()
+
+            union = "\nUNION ALL\n".join(subconsultas)
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text(union), connection)
+            df = self._a_cajas(df)
+
+            if self.logger:
+                fuentes = sorted({fuente for _, fuente in tablas})
+                self.logger.info(
+                    f"📥 Políticas extraídas: {len(df)} registros de {len(tablas)} tablas ({', '.join(fuentes)})"
+                )
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de políticas: {e}")
+            return pd.DataFrame()
+
+    def _contenido_caja(self):
+        """
+        Unidades por caja de cada producto según las maestras de PDV.
+
+        Returns:
+            pd.Series: contenido_caja indexado por codigo (vacía si no hay maestras)
+        """
+        tablas = [
+            tabla for tabla in self.esquema.tablas("stg_maestra_pdv_")
+            if {'codigo', 'contenido_caja'} <= set(self.esquema.columnas(tabla))
+        ]
+        if not tablas:
+            return pd.Series(dtype=float)
+
+        union = "\nUNION ALL\n".join(
+            f"SELECT CAST(codigo AS CHAR) AS codigo, contenido_caja FROM `{tabla}` WHERE codigo IS NOT NULL"
+            for tabla in tablas
+        )
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text(union), connection)
+
+        df['codigo'] = df['codigo'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+        df['contenido_caja'] = pd.to_numeric(df['contenido_caja'], errors='coerce')
+        return df[df['contenido_caja'] > 0].groupby('codigo')['contenido_caja'].max()
+
+    def _a_cajas(self, df):
+        """Lleva a cajas los límites de las fuentes que vienen en unidades"""
+        en_unidades = df['fuente'].map(UNIDAD_FUENTE_POLITICA).eq('unidad')
+        if df.empty or not en_unidades.any():
+            return df
+
+        df = df.copy()
+        codigos = df['codigo'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+        contenido = codigos.map(self._contenido_caja())
+        sin_contenido = en_unidades & contenido.isna()
+        if self.logger and sin_contenido.any():
+            self.logger.warning(
+                f"⚠️ {int(sin_contenido.sum())} políticas en unidades sin contenido_caja en maestra; "
+                f"se toman como cajas de una unidad"
+            )
+
+        divisor = contenido.fillna(1).where(en_unidades, 1)
+        for columna in ('minimo', 'maximo'):
+            df[columna] = (pd.to_numeric(df[columna], errors='coerce') / divisor).round(2)
+        return df
+
+    def politica_efectiva(self):
+        """
+        Lee la política min/max efectiva ya resuelta (policy_min_max) en el
+        formato que esperan traslados y sugerido de compra.
+
+        Returns:
+            pd.DataFrame: codigo, codigo_pdv, inv_minimo, inv_maximo; vacío si la
+                tabla aún no existe
+        """
+        try:
+            with self.engine.connect() as connection:
+                if not sqlalchemy_inspect(connection).has_table(TABLA_POLITICA_MIN_MAX):
+                    if self.logger:
+                        self.logger.warning(
+                            f"⚠️ La tabla {TABLA_POLITICA_MIN_MAX} no existe, se usa la política por clasificación"
+                        )
+                    return pd.DataFrame()
+                df = pd.read_sql(text(f"""
+                    SELECT codigo, codigo_pdv, inv_minimo, inv_maximo
+                    FROM {TABLA_POLITICA_MIN_MAX}
+                    WHERE codigo_pdv IS NOT NULL
+                """), connection)
+
+            # Una fila por SKU×PDV: si la tabla trae la misma celda con dos rótulos de PDV se combinan con max
+            df['codigo'] = df['codigo'].astype(str).str.strip()
+            df['codigo_pdv'] = df['codigo_pdv'].astype(str).str.strip()
+            filas = len(df)
+            df = df.groupby(['codigo', 'codigo_pdv'], as_index=False)[['inv_minimo', 'inv_maximo']].max()
+            if self.logger and len(df) < filas:
+                self.logger.warning(f"⚠️ {filas - len(df)} políticas repetidas por SKU×PDV combinadas con el máximo")
+
+            if self.logger:
+                self.logger.info(f"📏 Política min/max efectiva leída: {len(df)} combinaciones SKU×PDV")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error leyendo {TABLA_POLITICA_MIN_MAX}: {e}")
+            return pd.DataFrame()
@@ -0,0 +1,123 @@
+# analysis/extractor/extractor_stock_seguridad.py
+
+import pandas as pd
+from sqlalchemy import text
+from analysis.extractor.extractor_estadisticas_demanda import ExtractorEstadisticasDemanda
+from analysis.extractor.extractor_matriz_productos import ExtractorMatrizProductos
+
+TABLA_STOCK_SEGURIDAD = "stock_seguridad"
+
+COLUMNAS_INSUMO_STOCK_SEGURIDAD = [
+    'codigo', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'promedio_venta', 'desviacion_venta', 'meses_con_venta',
+    'tiempo_reposicion', 'stock_minimo_maestra', 'stock_maximo_maestra'
+]
+
+
+class ExtractorStockSeguridad(ExtractorEstadisticasDemanda):
+    """
+    Extractor de los insumos del stock de seguridad: estadísticas de demanda
+    por SKU×PDV y, desde las maestras de cada PDV (stg_maestra_pdv_*), el
+    tiempo de reposición y los stocks mínimo/máximo configurados.
+    """
+
+    def extraer(self):
+        """
+        Combina estadisticas_demanda con los datos de reposición de las maestras.
+
+        Returns:
+            pd.DataFrame: Una fila por SKU×PDV con COLUMNAS_INSUMO_STOCK_SEGURIDAD
+        """
+        try:
+            with self.engine.connect() as connection:
+                df = pd.read_sql(text("""
+                    SELECT codigo, nombre_producto, codigo_pdv, punto_de_venta,
+                           promedio_venta, desviacion_venta, meses_con_venta
+                    FROM estadisticas_demanda
+                """), connection)
+
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ Sin estadísticas de demanda para el stock de seguridad")
+                return pd.DataFrame()
+
+            df['codigo'] = df['codigo'].astype(str).str.strip()
+            df['codigo_pdv'] = df['codigo_pdv'].astype(str)
+
+            df_reposicion = self._extraer_reposicion()
+            if not df_reposicion.empty:
+                df = df.merge(df_reposicion, on=['codigo', 'codigo_pdv'], how='left')
+            else:
+                for columna in ('tiempo_reposicion', 'stock_minimo_maestra', 'stock_maximo_maestra'):
+                    df[columna] = float('nan')
+
+            if self.logger:
+                con_reposicion = int(df['tiempo_reposicion'].gt(0).sum())
+                self.logger.info(
+                    f"📥 Insumos de stock de seguridad: {len(df)} combinaciones SKU×PDV, "
+                    f"{con_reposicion} con tiempo de reposición en maestra"
+                )
+            return df[COLUMNAS_INSUMO_STOCK_SEGURIDAD]
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de insumos de stock de seguridad: {e}")
+            return pd.DataFrame()
+
+    def _extraer_reposicion(self):
+        """
+        Lee en una sola consulta el tiempo de reposición y los stocks de todas las maestras.
+
+        Los stocks se llevan a cajas equivalentes (caja + blister / contenido_blister
+        + unidad / contenido_caja), igual que el inventario en traslados.
+
+        Returns:
+            pd.DataFrame: codigo, codigo_pdv, tiempo_reposicion (días),
+                stock_minimo_maestra y stock_maximo_maestra (cajas)
+        """
+        tablas = [
+            tabla for tabla in self.esquema.tablas("stg_maestra_pdv_")
+            if {'codigo', 'tiempo_reposicion'} <= set(self.esquema.columnas(tabla))
+        ]
+        subconsultas = []
+        for tabla, codigo_pdv in ExtractorMatrizProductos.codigos_pdv(self.engine, tablas, self.logger).items():
+            columnas = set(self.esquema.columnas(tabla))
+
+            def columna(nombre, por_defecto="0"):
+                return f"COALESCE(`{nombre}`, {por_defecto})" if nombre in columnas else por_defecto
+
+            subconsultas.append(
+                f"SELECT CAST(codigo AS CHAR) AS codigo, '{codigo_pdv}' AS codigo_pdv, "
+                f"tiempo_reposicion, "
+                f"{columna('stock_minimo_caja')} AS stock_minimo_caja, "
+                f"{columna('stock_minimo_blister')} AS stock_minimo_blister, "
+                f"{columna('stock_minimo_unidad')} AS stock_minimo_unidad, "
+                f"{columna('stock_maximo_caja')} AS stock_maximo_caja, "
+                f"{columna('stock_maximo_blister')} AS stock_maximo_blister, "
+                f"{columna('stock_maximo_unidad')} AS stock_maximo_unidad, "
+                f"{columna('contenido_caja', '1')} AS contenido_caja, "
+                f"{columna('contenido_blister', '1')} AS contenido_blister "
+                f"FROM `{tabla}` WHERE codigo IS NOT NULL"
+            )
+
+        if not subconsultas:
+            return pd.DataFrame()
+
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+        df['codigo'] = df['codigo'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+        numericas = df.columns.drop(['codigo', 'codigo_pdv'])
+        df[numericas] = df[numericas].apply(pd.to_numeric, errors='coerce')
+        contenido_caja = df['contenido_caja'].where(df['contenido_caja'] > 0, 1)
+        contenido_blister = df['contenido_blister'].where(df['contenido_blister'] > 0, 1)
+
+        for limite in ('minimo', 'maximo'):
+            df[f'stock_{limite}_maestra'] = (
+                df[f'stock_{limite}_caja'].fillna(0)
+                + df[f'stock_{limite}_blister'].fillna(0) / contenido_blister
+                + df[f'stock_{limite}_unidad'].fillna(0) / contenido_caja
+            ).round(2)
+
+        columnas = ['codigo', 'codigo_pdv', 'tiempo_reposicion', 'stock_minimo_maestra', 'stock_maximo_maestra']
+        return df[columnas].drop_duplicates(subset=['codigo', 'codigo_pdv'])
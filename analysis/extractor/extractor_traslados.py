@@ -0,0 +1,145 @@
+# analysis/extractor/extractor_traslados.py
+
+import pandas as pd
+from sqlalchemy import text
+from analysis.extractor.extractor_estadisticas_demanda import ExtractorEstadisticasDemanda
+from analysis.extractor.extractor_matriz_productos import ExtractorMatrizProductos
+
+
+class ExtractorTraslados(ExtractorEstadisticasDemanda):
+    """
+    Extractor de los insumos para traslados entre PDVs:
+    estadísticas de demanda, inventario del último mes por PDV×SKU,
+    costo y fecha de activación de cada producto.
+    """
+
+    def extraer(self):
+        """
+        Combina estadísticas de demanda con el inventario del último mes.
+
+        Returns:
+            pd.DataFrame: Una fila por PDV×SKU con demanda, inventario y costo
+        """
+        try:
+            with self.engine.connect() as connection:
+                df_estadisticas = pd.read_sql(text("SELECT * FROM estadisticas_demanda"), connection)
+
+            df_inventario = self._extraer_inventario()
+            if df_estadisticas.empty or df_inventario.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ Sin estadísticas de demanda o inventario para traslados")
+                return pd.DataFrame()
+
+            df = df_estadisticas.merge(
+                df_inventario,
+                on=['codigo', 'codigo_pdv'],
+                how='outer',
+                suffixes=('', '_inventario')
+            )
+            df['nombre_producto'] = df['nombre_producto'].fillna(df.pop('nombre_producto_inventario'))
+            df['punto_de_venta'] = df['punto_de_venta'].fillna(df.pop('punto_de_venta_inventario'))
+
+            df_activacion = self._extraer_fechas_activacion()
+            if not df_activacion.empty:
+                df['codigo_pdv'] = df['codigo_pdv'].astype(str)
+                df = df.merge(df_activacion, on=['codigo', 'codigo_pdv'], how='left')
+            else:
+                df['fecha_activacion'] = pd.NaT
+
+            if self.logger:
+                self.logger.info(f"📥 Insumos de traslados: {len(df)} combinaciones PDV×SKU")
+            return df
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error en extracción de insumos de traslados: {e}")
+            return pd.DataFrame()
+
+    def _extraer_inventario(self):
+        """
+        Lee en una sola consulta el inventario y costo de la tabla más reciente de cada PDV.
+
+        Returns:
+            pd.DataFrame: codigo, codigo_pdv, inventario en caja/blister/unidad,
+                contenidos, costo_unitario y ultima_compra
+        """
+        ultima_por_pdv = {}
+        for tabla in self.esquema.tablas("stg_rotacion_"):
+            info = self.info_tabla(tabla)
+            if info and (info['codigo_pdv'] not in ultima_por_pdv
+                         or info['periodo'] > ultima_por_pdv[info['codigo_pdv']][1]['periodo']):
+                ultima_por_pdv[info['codigo_pdv']] = (tabla, info)
+
+        subconsultas = []
+        for tabla, info in ultima_por_pdv.values():
+            columnas = set(self.esquema.columnas(tabla))
+            columnas_a_usar = self.esquema.resolver_columnas(tabla)
+            if 'codigo' not in columnas_a_usar:
+                continue
+
+            def columna(nombre, por_defecto="0"):
+                return f"COALESCE({nombre}, {por_defecto})" if nombre in columnas else por_defecto
+
+            nombre = columnas_a_usar.get('producto')
+            subconsultas.append(
+                f"SELECT {columnas_a_usar['codigo']} AS codigo, "
+                f"{nombre if nombre else 'NULL'} AS nombre_producto, "
+                f"'{info['codigo_pdv']}' AS codigo_pdv, "
+                f"'{info['nombre_pdv']} {info['codigo_pdv']}' AS punto_de_venta, "
+                f"{columna('inventario_caja')} AS inventario_caja, "
+                f"{columna('inventario_blister')} AS inventario_blister, "
+                f"{columna('inventario_unidad')} AS inventario_unidad, "
+                f"{columna('contenido_caja', '1')} AS contenido_caja, "
+                f"{columna('contenido_blister', '1')} AS contenido_blister, "
+                f"{columna('costo_unitario')} AS costo_unitario, "
+                f"{'ultima_compra' if 'ultima_compra' in columnas else 'NULL'} AS ultima_compra "
+                f"FROM `{tabla}`"
+            )
+
+        if not subconsultas:
+            return pd.DataFrame()
+
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+        df['codigo'] = df['codigo'].astype(str).str.strip()
+        columnas_numericas = [
+            'inventario_caja', 'inventario_blister', 'inventario_unidad',
+            'contenido_caja', 'contenido_blister', 'costo_unitario'
+        ]
+        for col in columnas_numericas:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        df['ultima_compra'] = pd.to_datetime(df['ultima_compra'], errors='coerce', dayfirst=True)
+
+        # Un producto repetido en la misma tabla conserva su primera fila
+        return df.drop_duplicates(subset=['codigo', 'codigo_pdv'])
+
+    def _extraer_fechas_activacion(self):
+        """
+        Obtiene la fecha de activación de cada producto en la maestra de cada PDV.
+
+        La activación es por PDV: un producto recién activado en un PDV no es
+        nuevo en otro donde lleva tiempo activo.
+
+        Returns:
+            pd.DataFrame: codigo, codigo_pdv, fecha_activacion (vacío si no hay maestras cargadas)
+        """
+        subconsultas = []
+        for tabla in self.esquema.tablas("stg_maestra_pdv_"):
+            if not {'codigo', 'fecha_activacion'} <= set(self.esquema.columnas(tabla)):
+                continue
+            _, _, codigo_pdv = ExtractorMatrizProductos.punto_de_venta(tabla).rpartition(' ')
+            if not codigo_pdv.isdigit():
+                continue
+            subconsultas.append(
+                f"SELECT codigo, '{codigo_pdv}' AS codigo_pdv, fecha_activacion FROM `{tabla}`"
+            )
+        if not subconsultas:
+            return pd.DataFrame()
+
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text("\nUNION ALL\n".join(subconsultas)), connection)
+
+        df['codigo'] = df['codigo'].astype(str).str.strip()
+        df['fecha_activacion'] = pd.to_datetime(df['fecha_activacion'], errors='coerce', dayfirst=True)
+        return df.groupby(['codigo', 'codigo_pdv'], as_index=False)['fecha_activacion'].max()
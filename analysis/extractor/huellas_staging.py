@@ -0,0 +1,155 @@
+# analysis/extractor/huellas_staging.py
+
+from sqlalchemy import text, bindparam
+
+TABLA_HUELLAS = "etl_huellas_staging"
+
+
+class HuellasStaging:
+    """
+    Registro de huellas (checksum + número de filas) de las tablas staging.
+    Permite saber qué tablas cambiaron desde la última carga exitosa para
+    reprocesar solo esas fuentes.
+    """
+
+    def __init__(self, engine, proceso, logger=None):
+        """
+        Inicializa el registro de huellas.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            proceso (str): Nombre del proceso consumidor (ej: 'fact_rotacion')
+            logger: Instancia de logger para registrar eventos
+        """
+        self.engine = engine
+        self.proceso = proceso
+        self.logger = logger
+        self._tabla_creada = False
+
+    def _asegurar_tabla(self, connection):
+        """Crea la tabla de control de huellas si no existe"""
+        if self._tabla_creada:
+            return
+        connection.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {TABLA_HUELLAS} (
+                proceso VARCHAR(64) NOT NULL,
+                tabla_origen VARCHAR(128) NOT NULL,
+                checksum_tabla BIGINT NULL,
+                filas BIGINT NULL,
+                fecha_registro DATETIME NOT NULL,
+                PRIMARY KEY (proceso, tabla_origen)
+            )
+        """))
+        self._tabla_creada = True
+
+    def calcular(self, tablas):
+        """
+        Calcula la huella actual de las tablas con una sola sentencia CHECKSUM TABLE
+        y una sola consulta de conteo.
+
+        Args:
+            tablas (list): Nombres de las tablas staging
+
+        Returns:
+            dict: tabla -> (checksum, filas)
+        """
+        if not tablas:
+            return {}
+
+        lista_tablas = ", ".join(f"`{tabla}`" for tabla in tablas)
+        conteos = " UNION ALL ".join(
+            f"SELECT '{tabla}' AS tabla, COUNT(*) AS filas FROM `{tabla}`" for tabla in tablas
+        )
+
+        with self.engine.connect() as connection:
+            checksums = {
+                nombre.split('.')[-1]: checksum
+                for nombre, checksum in connection.execute(text(f"CHECKSUM TABLE {lista_tablas}"))
+            }
+            filas = dict(connection.execute(text(conteos)).fetchall())
+
+        return {tabla: (checksums.get(tabla), filas.get(tabla)) for tabla in tablas}
+
+    def registradas(self):
+        """
+        Obtiene las huellas registradas en la última carga exitosa.
+
+        Returns:
+            dict: tabla -> (checksum, filas)
+        """
+        with self.engine.begin() as connection:
+            self._asegurar_tabla(connection)
+            resultado = connection.execute(text(f"""
+                SELECT tabla_origen, checksum_tabla, filas
+                FROM {TABLA_HUELLAS}
+                WHERE proceso = :proceso
+            """), {"proceso": self.proceso})
+            return {tabla: (checksum, filas) for tabla, checksum, filas in resultado}
+
+    def cambiadas(self, huellas_actuales):
+        """
+        Compara las huellas actuales contra las registradas.
+
+        Args:
+            huellas_actuales (dict): Resultado de calcular()
+
+        Returns:
+            list: Tablas nuevas o con contenido distinto
+        """
+        anteriores = self.registradas()
+        tablas_cambiadas = [
+            tabla for tabla, huella in huellas_actuales.items()
+            if huella[0] is None or anteriores.get(tabla) != huella
+        ]
+
+        if self.logger:
+            self.logger.info(
+                f"🔎 Huellas staging: {len(tablas_cambiadas)} de {len(huellas_actuales)} tablas con cambios"
+            )
+        return tablas_cambiadas
+
+    def registrar(self, huellas):
+        """
+        Guarda las huellas de las tablas procesadas con éxito.
+
+        Args:
+            huellas (dict): tabla -> (checksum, filas)
+        """
+        if not huellas:
+            return
+
+        registros = [
+            {"proceso": self.proceso, "tabla": tabla, "checksum": checksum, "filas": filas}
+            for tabla, (checksum, filas) in huellas.items()
+        ]
+        with self.engine.begin() as connection:
+            self._asegurar_tabla(connection)
+            connection.execute(text(f"""
+                INSERT INTO {TABLA_HUELLAS} (proceso, tabla_origen, checksum_tabla, filas, fecha_registro)
+                VALUES (:proceso, :tabla, :checksum, :filas, NOW())
+                ON DUPLICATE KEY UPDATE
+                    checksum_tabla = VALUES(checksum_tabla),
+                    filas = VALUES(filas),
+                    fecha_registro = NOW()
+            """), registros)
+
+        if self.logger:
+            self.logger.info(f"🧾 Huellas registradas para {len(registros)} tablas staging")
+
+    def eliminar(self, tablas):
+        """
+        Quita del registro las huellas de tablas que ya no existen.
+
+        Args:
+            tablas (iterable): Nombres de tabla
+        """
+        tablas = list(tablas)
+        if not tablas:
+            return
+        with self.engine.begin() as connection:
+            self._asegurar_tabla(connection)
+            connection.execute(
+                text(f"DELETE FROM {TABLA_HUELLAS} WHERE proceso = :proceso AND tabla_origen IN :tablas")
+                .bindparams(bindparam("tablas", expanding=True)),
+                {"proceso": self.proceso, "tablas": tablas}
+            )
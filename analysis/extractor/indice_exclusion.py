@@ -0,0 +1,276 @@
+# analysis/extractor/indice_exclusion.py
+
+import threading
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Bit de cada motivo de exclusión dentro del mapa de bits
+MOTIVOS_EXCLUSION = {
+    'excluido': 1,      # stg_codigos_excluidos*
+    'inactivo': 2,      # stg_*inactivos* con marca Inactivo
+    'solo_bodega': 4,   # stg_productos_solo_bodega*
+}
+
+# Motivos que aplica cada etapa
+MOTIVOS_POR_ETAPA = {
+    'rotacion': ('excluido',),
+    'traslados': ('excluido', 'inactivo', 'solo_bodega'),
+    'sugerido_compra': ('excluido', 'inactivo', 'solo_bodega'),
+}
+
+# El mapa de bits ocupa un byte por posición hasta el mayor código; solo se usa
+# si cabe en MIN_POSICIONES_MAPA_BITS o en BYTES_POR_CODIGO_MAPA_BITS por código
+# excluido. Códigos dispersos (ej: EAN de 13 dígitos) usan el diccionario.
+MIN_POSICIONES_MAPA_BITS = 1 << 20
+BYTES_POR_CODIGO_MAPA_BITS = 64
+
+# Códigos que el mapa de bits puede representar sin ambigüedad: enteros sin ceros a la izquierda
+PATRON_CODIGO_CANONICO = r'0|[1-9]\d*'
+
+# Tabla donde se materializa el índice para filtrar dentro de MySQL
+TABLA_EXCLUSION_PRODUCTOS = "exclusion_productos"
+
+# Valores de la columna Inactivo que NO marcan inactividad
+VALORES_ACTIVO = {'', '0', 'no', 'n', 'false', 'activo', 'nan', 'none'}
+
+
+class IndiceExclusion:
+    """
+    Índice de productos excluidos, inactivos y de solo bodega.
+
+    Siempre se guarda un diccionario ordenado de códigos con su máscara (un
+    bit por motivo). Si todos los códigos son enteros canónicos (sin ceros a
+    la izquierda) y el mayor es pequeño frente a la cantidad de códigos, se
+    agrega un mapa de bits (un uint8 por código) y la pertenencia es un acceso
+    directo por posición. Se construye una vez por ejecución (ver compartido())
+    y se reutiliza en rotación, traslados y sugerido de compra; el motor SQL
+    lo usa materializado en TABLA_EXCLUSION_PRODUCTOS (ver materializar()).
+    """
+
+    _compartido = None
+    _bloqueo = threading.Lock()
+
+    def __init__(self, codigos_por_motivo, logger=None):
+        """
+        Construye el índice.
+
+        Args:
+            codigos_por_motivo (dict): motivo -> iterable de códigos
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        codigos, bits = [], []
+        for motivo, lista in codigos_por_motivo.items():
+            lista = pd.Series(list(lista), dtype=str).str.strip()
+            lista = lista[lista != ''].unique()
+            codigos.append(lista)
+            bits.append(np.full(len(lista), MOTIVOS_EXCLUSION[motivo], dtype=np.uint8))
+
+        codigos = np.concatenate(codigos) if codigos else np.array([], dtype=str)
+        bits = np.concatenate(bits) if bits else np.array([], dtype=np.uint8)
+        self.conteo = {motivo: len(lista) for motivo, lista in codigos_por_motivo.items()}
+
+        # Diccionario ordenado: código -> OR de motivos
+        tabla = pd.Series(bits, dtype=np.uint8).groupby(codigos).agg(np.bitwise_or.reduce)
+        self._diccionario = pd.Index(tabla.index.astype(str))
+        self._bits = tabla.to_numpy(dtype=np.uint8)
+        self._materializado = False
+
+        canonicos = pd.Series(self._diccionario, dtype=str).str.fullmatch(PATRON_CODIGO_CANONICO)
+        self.usa_mapa_bits = bool(len(self._diccionario) and canonicos.all())
+        if self.usa_mapa_bits:
+            enteros = pd.to_numeric(pd.Series(self._diccionario)).to_numpy(dtype=np.int64)
+            posiciones = int(enteros.max()) + 1
+            self.usa_mapa_bits = posiciones <= max(
+                MIN_POSICIONES_MAPA_BITS, BYTES_POR_CODIGO_MAPA_BITS * len(enteros)
+            )
+        if self.usa_mapa_bits:
+            self._mapa = np.zeros(posiciones, dtype=np.uint8)
+            self._mapa[enteros] = self._bits
+
+    @classmethod
+    def desde_staging(cls, engine, esquema, logger=None):
+        """
+        Lee las tablas staging de excluidos, inactivos y solo bodega.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            esquema (EsquemaStaging): Catálogo de tablas staging
+            logger: Instancia de logger para registrar eventos
+
+        Returns:
+            IndiceExclusion: Índice con los tres motivos
+        """
+        fuentes = {
+            'excluido': esquema.tablas("stg_", contiene="codigos_excluidos"),
+            'inactivo': esquema.tablas("stg_", contiene="inactivos"),
+            'solo_bodega': esquema.tablas("stg_", contiene="solo_bodega"),
+        }
+        codigos_por_motivo = {}
+        with engine.connect() as connection:
+            for motivo, tablas in fuentes.items():
+                codigos = []
+                for tabla in tablas:
+                    columnas = {columna.lower(): columna for columna in esquema.columnas(tabla)}
+                    if 'codigo' not in columnas:
+                        continue
+                    columna_codigo = columnas['codigo']
+                    if motivo == 'inactivo' and 'inactivo' in columnas:
+                        df = pd.read_sql(
+                            text(f"SELECT `{columna_codigo}` AS codigo, `{columnas['inactivo']}` AS inactivo FROM `{tabla}`"),
+                            connection
+                        )
+                        marca = df['inactivo'].astype(str).str.strip().str.lower()
+                        df = df[~marca.isin(VALORES_ACTIVO)]
+                    else:
+                        df = pd.read_sql(text(f"SELECT `{columna_codigo}` AS codigo FROM `{tabla}`"), connection)
+                    codigos.append(cls._normalizar(df['codigo'].dropna()))
+                codigos_por_motivo[motivo] = pd.concat(codigos) if codigos else []
+
+        indice = cls(codigos_por_motivo, logger=logger)
+        if logger:
+            detalle = ", ".join(f"{motivo}: {n}" for motivo, n in indice.conteo.items())
+            tipo = "mapa de bits" if indice.usa_mapa_bits else "diccionario"
+            logger.info(f"🚫 Índice de exclusión construido ({tipo}) - {detalle}")
+        return indice
+
+    @classmethod
+    def compartido(cls, engine, esquema, logger=None, refrescar=False):
+        """Devuelve el índice de la ejecución actual, construyéndolo la primera vez"""
+        with cls._bloqueo:
+            if cls._compartido is None or refrescar:
+                cls._compartido = cls.desde_staging(engine, esquema, logger=logger)
+            return cls._compartido
+
+    @staticmethod
+    def _normalizar(codigos):
+        """Quita el '.0' que deja Excel/pandas en códigos numéricos leídos como float"""
+        return codigos.astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+
+    def bits(self, codigos):
+        """
+        Máscara de motivos de cada código.
+
+        Args:
+            codigos (array-like): Códigos de producto (texto, numérico o categórico)
+
+        Returns:
+            np.ndarray: uint8 con los bits de MOTIVOS_EXCLUSION (0 = sin exclusión)
+        """
+        serie = pd.Series(codigos)
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # Evaluar solo las categorías y expandir por sus códigos internos
+            por_categoria = self.bits(serie.cat.categories)
+            posiciones = serie.cat.codes.to_numpy()
+            return np.where(posiciones >= 0, por_categoria[posiciones], 0).astype(np.uint8)
+
+        if self.usa_mapa_bits:
+            if pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_bool_dtype(serie.dtype):
+                numericos = serie.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                # Un texto con ceros a la izquierda ('0123') es otro código que 123
+                texto = self._normalizar(serie)
+                numericos = pd.to_numeric(
+                    texto.where(texto.str.fullmatch(PATRON_CODIGO_CANONICO, na=False)), errors='coerce'
+                ).to_numpy(dtype=float)
+            validos = np.isfinite(numericos) & (numericos >= 0) & (numericos < len(self._mapa))
+            validos &= numericos == np.floor(np.where(validos, numericos, 0))
+            resultado = np.zeros(len(serie), dtype=np.uint8)
+            resultado[validos] = self._mapa[numericos[validos].astype(np.int64)]
+            return resultado
+
+        if not len(self._diccionario):
+            return np.zeros(len(serie), dtype=np.uint8)
+        posiciones = self._diccionario.get_indexer(self._normalizar(serie))
+        return np.where(posiciones >= 0, self._bits[np.maximum(posiciones, 0)], 0).astype(np.uint8)
+
+    @staticmethod
+    def filtro_motivos(motivos):
+        """Máscara de bits que reúne los motivos indicados"""
+        return sum(MOTIVOS_EXCLUSION[motivo] for motivo in motivos)
+
+    def mascara(self, codigos, motivos=tuple(MOTIVOS_EXCLUSION)):
+        """Devuelve True para los códigos excluidos por alguno de los motivos"""
+        filtro = np.uint8(self.filtro_motivos(motivos))
+        return (self.bits(codigos) & filtro) != 0
+
+    def materializar(self, engine, tabla=TABLA_EXCLUSION_PRODUCTOS):
+        """
+        Escribe el índice en una tabla MySQL (codigo, motivos) para filtrar con
+        NOT EXISTS dentro de consultas SQL. Se hace una sola vez por índice.
+
+        Args:
+            engine: Engine de SQLAlchemy
+            tabla (str): Tabla destino
+
+        Returns:
+            str: Nombre de la tabla materializada
+        """
+        with self._bloqueo:
+            if self._materializado:
+                return tabla
+            registros = [
+                {'codigo': codigo, 'motivos': int(bits)}
+                for codigo, bits in zip(self._diccionario, self._bits)
+            ]
+            with engine.begin() as connection:
+                connection.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS {tabla} (
+                        codigo VARCHAR(50) NOT NULL PRIMARY KEY,
+                        motivos TINYINT UNSIGNED NOT NULL
+                    )
+                """))
+                connection.execute(text(f"DELETE FROM {tabla}"))
+                if registros:
+                    connection.execute(
+                        text(f"INSERT INTO {tabla} (codigo, motivos) VALUES (:codigo, :motivos)"), registros
+                    )
+            self._materializado = True
+        if self.logger:
+            self.logger.info(f"🚫 Índice de exclusión materializado en {tabla}: {len(registros)} códigos")
+        return tabla
+
+    @staticmethod
+    def condicion_sql(columna, motivos, tabla=TABLA_EXCLUSION_PRODUCTOS):
+        """
+        Condición NOT EXISTS que descarta los códigos excluidos en una consulta SQL.
+
+        Args:
+            columna (str): Expresión SQL con el código de producto (texto)
+            motivos (iterable): Motivos de MOTIVOS_EXCLUSION que se aplican
+            tabla (str): Tabla creada por materializar()
+
+        Returns:
+            str: Condición para un WHERE
+        """
+        # Mismo criterio que _normalizar: se ignora el '.0' de códigos leídos como float
+        codigo = f"IF({columna} LIKE '%.0', LEFT({columna}, CHAR_LENGTH({columna}) - 2), {columna})"
+        return (
+            f"NOT EXISTS (SELECT 1 FROM {tabla} x "
+            f"WHERE x.codigo = {codigo} AND (x.motivos & {IndiceExclusion.filtro_motivos(motivos)}) <> 0)"
+        )
+
+    def filtrar(self, df, columna='codigo', etapa=None, motivos=None):
+        """
+        Quita de un DataFrame los productos excluidos.
+
+        Args:
+            df (pd.DataFrame): Datos a filtrar
+            columna (str): Columna con el código de producto
+            etapa (str, optional): Etapa de MOTIVOS_POR_ETAPA cuyos motivos se aplican
+            motivos (iterable, optional): Motivos explícitos (tienen prioridad sobre etapa)
+
+        Returns:
+            pd.DataFrame: Filas no excluidas
+        """
+        if df is None or df.empty:
+            return df
+        motivos = motivos or MOTIVOS_POR_ETAPA.get(etapa, tuple(MOTIVOS_EXCLUSION))
+        excluidos = self.mascara(df[columna], motivos)
+        if self.logger and excluidos.any():
+            self.logger.info(
+                f"🚫 {int(excluidos.sum())} registros excluidos"
+                f"{f' en {etapa}' if etapa else ''} ({', '.join(motivos)})"
+            )
+        return df[~excluidos]
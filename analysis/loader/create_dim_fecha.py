@@ -1,318 +1,396 @@
 # analysis/loader/create_dim_fecha.py
 
-from sqlalchemy import create_engine, text, inspect as sqlalchemy_inspect
-from utils.db_connection import get_mysql_url
-from datetime import date, timedelta
+import os
+import json
+import argparse
+import numpy as np
 import pandas as pd
+from datetime import date, timedelta
+from sqlalchemy import create_engine, text, bindparam
+from utils.db_connection import get_mysql_url
+
+COLUMNAS_INSERT_DIM_FECHA = """dim_fecha (
+  fecha_key, fecha, anio, trimestre, mes, mes_nombre,
+  dia, dia_nombre, dia_semana, semana_anyo, dia_del_anyo,
+  es_fin_de_semana, es_habil, es_feriado,
+  temporada_climatica, temporada_escolar, 
+  temporada_comercial, temporada_salud, evento_especial, 
+  merchandising, e_commerce
+)
+VALUES (
+  :fecha_key, :fecha, :anio, :trimestre, :mes, :mes_nombre,
+  :dia, :dia_nombre, :dia_semana, :semana_anyo, :dia_del_anyo,
+  :es_fin_de_semana, :es_habil, :es_feriado,
+  :temporada_climatica, :temporada_escolar, 
+  :temporada_comercial, :temporada_salud, :evento_especial,
+  :merchandising, :e_commerce
+)
+"""
+
+STMT_UPSERT_DIM_FECHA = "INSERT INTO " + COLUMNAS_INSERT_DIM_FECHA + """
+ON DUPLICATE KEY UPDATE
+  fecha = VALUES(fecha), anio = VALUES(anio), trimestre = VALUES(trimestre),
+  mes = VALUES(mes), mes_nombre = VALUES(mes_nombre), dia = VALUES(dia),
+  dia_nombre = VALUES(dia_nombre), dia_semana = VALUES(dia_semana),
+  semana_anyo = VALUES(semana_anyo), dia_del_anyo = VALUES(dia_del_anyo),
+  es_fin_de_semana = VALUES(es_fin_de_semana), es_habil = VALUES(es_habil),
+  es_feriado = VALUES(es_feriado), temporada_climatica = VALUES(temporada_climatica),
+  temporada_escolar = VALUES(temporada_escolar), 
+  temporada_comercial = VALUES(temporada_comercial), 
+  temporada_salud = VALUES(temporada_salud),
+  evento_especial = VALUES(evento_especial),
+  merchandising = VALUES(merchandising),
+  e_commerce = VALUES(e_commerce);
+"""
+
+STMT_INSERT_IGNORE_DIM_FECHA = "INSERT IGNORE INTO " + COLUMNAS_INSERT_DIM_FECHA
+
+# Temporadas, eventos y feriados (ver el archivo para el formato de las reglas)
+RUTA_CALENDARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calendario_dim_fecha.json")
+
+# Secciones del calendario en orden de aplicación: None = la última regla que
+# aplica gana; texto = los valores de todas las reglas se concatenan con ese separador.
+# temporada_salud va después de temporada_escolar porque sus reglas pueden depender de ella.
+SECCIONES_CALENDARIO = {
+    'temporada_climatica': None,
+    'temporada_escolar': None,
+    'temporada_comercial': None,
+    'evento_especial': '; ',
+    'temporada_salud': ' / ',
+}
+
+MESES_ES = ["", "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto",
+            "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+DIAS_ES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+COLUMNAS_DIM_FECHA = [
+    'fecha_key', 'fecha', 'anio', 'trimestre', 'mes', 'mes_nombre',
+    'dia', 'dia_nombre', 'dia_semana', 'semana_anyo', 'dia_del_anyo',
+    'es_fin_de_semana', 'es_habil', 'es_feriado',
+    'temporada_climatica', 'temporada_escolar',
+    'temporada_comercial', 'temporada_salud', 'evento_especial',
+    'merchandising', 'e_commerce',
+]
+
+DDL_DIM_FECHA = """
+CREATE TABLE IF NOT EXISTS dim_fecha (
+  fecha_key INT NOT NULL PRIMARY KEY, fecha DATE NOT NULL UNIQUE, anio INT NOT NULL,
+  trimestre INT NOT NULL, mes INT NOT NULL, mes_nombre VARCHAR(20) NOT NULL,
+  dia INT NOT NULL, dia_nombre VARCHAR(10) NOT NULL, dia_semana INT NOT NULL,
+  semana_anyo INT NOT NULL, dia_del_anyo INT NOT NULL,
+  es_fin_de_semana TINYINT(1) NOT NULL, es_habil TINYINT(1) NOT NULL,
+  es_feriado TINYINT(1) NOT NULL DEFAULT 0,
+  temporada_climatica VARCHAR(50) NULL,
+  temporada_escolar VARCHAR(50) NULL,
+  temporada_comercial VARCHAR(100) NULL,
+  temporada_salud VARCHAR(100) NULL,
+  evento_especial VARCHAR(100) NULL,
+  merchandising VARCHAR(255) NULL,
+  e_commerce VARCHAR(255) NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+# Columnas agregadas después de la primera versión de la tabla
+DEFINICION_COLUMNAS_DIM_FECHA = {
+    'temporada_comercial': "VARCHAR(100) NULL AFTER temporada_escolar",
+    'temporada_salud': "VARCHAR(100) NULL AFTER temporada_comercial",
+    'evento_especial': "VARCHAR(100) NULL AFTER temporada_salud",
+    'merchandising': "VARCHAR(255) NULL AFTER evento_especial",
+    'e_commerce': "VARCHAR(255) NULL AFTER merchandising",
+}
+
+
+def cargar_calendario(ruta=RUTA_CALENDARIO):
+    """
+    Lee el archivo de temporadas, eventos y feriados.
+
+    Args:
+        ruta (str): Ruta del JSON del calendario
+
+    Returns:
+        dict: Reglas por sección y lista de feriados
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _cargar_campanas(engine):
+    """
+    Carga las campañas de merchandising y e-commerce usadas para etiquetar fechas.
+
+    Returns:
+        tuple: (campanas_merchandising_df, campanas_ecommerce_df)
+    """
+    campanas = []
+    for tabla, descripcion in (('dim_campana_merchandising', 'merchandising'), ('dim_campana_ecommerce', 'e-commerce')):
+        df = pd.DataFrame()
+        try:
+            with engine.connect() as conn:
+                df = pd.read_sql(
+                    text(f"SELECT nombre_campana, fecha_inicio, fecha_fin FROM {tabla} ORDER BY fecha_inicio"), conn
+                )
+            df['fecha_inicio'] = pd.to_datetime(df['fecha_inicio'])
+            df['fecha_fin'] = pd.to_datetime(df['fecha_fin'])
+            print(f"Cargadas {len(df)} campañas de {descripcion}.")
+        except Exception as e:
+            print(f"Advertencia: No se pudieron cargar campañas de {descripcion}: {e}. Se continuará sin ellas.")
+        campanas.append(df)
+    return tuple(campanas)
+
+
+def _entre(df, inicio, fin):
+    """
+    Máscara de las fechas dentro de [inicio, fin].
+
+    'YYYY-MM-DD' es una fecha concreta; 'MM-DD' se repite todos los años y se
+    compara contra mes*100 + día.
+    """
+    if len(inicio) == 5 and len(fin) == 5:
+        mes_dia = df['mes'] * 100 + df['dia']
+        return (mes_dia >= int(inicio.replace('-', ''))) & (mes_dia <= int(fin.replace('-', '')))
+    return (df['fecha'] >= pd.Timestamp(inicio)) & (df['fecha'] <= pd.Timestamp(fin))
+
+
+def _mascara_regla(df, regla):
+    """Fechas a las que aplica una regla del calendario (rangos, fechas, meses o temporada escolar)"""
+    mascara = pd.Series(False, index=df.index)
+    for inicio, fin in regla.get('rangos', []):
+        mascara |= _entre(df, inicio, fin)
+    for fecha in regla.get('fechas', []):
+        mascara |= _entre(df, fecha, fecha)
+    if regla.get('meses'):
+        mascara |= df['mes'].isin(regla['meses'])
+    if regla.get('temporada_escolar'):
+        mascara |= df['temporada_escolar'].isin(regla['temporada_escolar'])
+    return mascara
+
+
+def _etiquetar_campanas(fechas, campanas):
+    """
+    Nombres de las campañas activas en cada fecha, unidos con '; '.
+
+    Cruce por intervalos: cada campaña se ubica en el calendario ordenado con
+    dos searchsorted y se expande solo sobre sus propios días, sin recorrer
+    las campañas por cada fecha.
+
+    Args:
+        fechas (pd.DatetimeIndex): Fechas ordenadas y únicas
+        campanas (pd.DataFrame): nombre_campana, fecha_inicio, fecha_fin
+
+    Returns:
+        np.ndarray: object con el texto de campañas o None por fecha
+    """
+    resultado = np.full(len(fechas), None, dtype=object)
+    if campanas is None or campanas.empty:
+        return resultado
+
+    campanas = campanas.dropna(subset=['fecha_inicio', 'fecha_fin'])
+    valores = fechas.values
+    inicio = np.searchsorted(valores, campanas['fecha_inicio'].values.astype(valores.dtype), side='left')
+    fin = np.searchsorted(valores, campanas['fecha_fin'].values.astype(valores.dtype), side='right')
+    largo = np.clip(fin - inicio, 0, None)
+
+    desplazamiento = np.arange(largo.sum()) - np.repeat(np.cumsum(largo) - largo, largo)
+    posiciones = np.repeat(inicio, largo) + desplazamiento
+    nombres = np.repeat(campanas['nombre_campana'].astype(str).to_numpy(), largo)
+
+    agrupado = pd.Series(nombres).groupby(posiciones, sort=False).agg('; '.join)
+    resultado[agrupado.index.to_numpy()] = agrupado.to_numpy()
+    return resultado
 
-def create_and_populate_dim_fecha(db_name: str, start_year: int = 2024, end_year: int = 2026):
+
+def generar_dim_fecha(fechas, calendario=None, campanas_merchandising_df=None, campanas_ecommerce_df=None):
+    """
+    Genera las filas de dim_fecha para un conjunto de fechas con operaciones vectorizadas.
+
+    Args:
+        fechas (iterable): Fechas a generar (date, datetime o Timestamp)
+        calendario (dict, optional): Resultado de cargar_calendario(); por defecto RUTA_CALENDARIO
+        campanas_merchandising_df (pd.DataFrame, optional): Campañas de merchandising
+        campanas_ecommerce_df (pd.DataFrame, optional): Campañas de e-commerce
+
+    Returns:
+        pd.DataFrame: Una fila por fecha con COLUMNAS_DIM_FECHA
+    """
+    calendario = cargar_calendario() if calendario is None else calendario
+    fechas = pd.DatetimeIndex(pd.to_datetime(list(fechas))).normalize().unique().sort_values()
+
+    df = pd.DataFrame({'fecha': fechas})
+    dia_semana = fechas.dayofweek.to_numpy()
+    df['fecha_key'] = fechas.year * 10000 + fechas.month * 100 + fechas.day
+    df['anio'] = fechas.year
+    df['trimestre'] = fechas.quarter
+    df['mes'] = fechas.month
+    df['mes_nombre'] = np.array(MESES_ES, dtype=object)[fechas.month]
+    df['dia'] = fechas.day
+    df['dia_nombre'] = np.array(DIAS_ES, dtype=object)[dia_semana]
+    df['dia_semana'] = dia_semana + 1
+    df['semana_anyo'] = fechas.isocalendar().week.to_numpy().astype(int)
+    df['dia_del_anyo'] = fechas.dayofyear
+    df['es_fin_de_semana'] = (dia_semana >= 5).astype(int)
+    df['es_habil'] = (dia_semana < 5).astype(int)
+    df['es_feriado'] = _mascara_regla(df, {'fechas': calendario.get('feriados', [])}).astype(int)
+
+    for seccion, separador in SECCIONES_CALENDARIO.items():
+        valores = pd.Series(None, index=df.index, dtype=object)
+        for regla in calendario.get(seccion, []):
+            mascara = _mascara_regla(df, regla)
+            if separador is None:
+                valores[mascara] = regla['valor']
+            else:
+                valores[mascara] = np.where(
+                    valores[mascara].isna(), regla['valor'], valores[mascara] + separador + regla['valor']
+                )
+        df[seccion] = valores
+
+    df['merchandising'] = _etiquetar_campanas(fechas, campanas_merchandising_df)
+    df['e_commerce'] = _etiquetar_campanas(fechas, campanas_ecommerce_df)
+    return df[COLUMNAS_DIM_FECHA]
+
+
+def _registros(df):
+    """Filas de generar_dim_fecha como diccionarios con tipos de Python para executemany"""
+    df = df.assign(fecha=df['fecha'].dt.date).astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+
+def asegurar_tabla_dim_fecha(engine):
+    """
+    Crea dim_fecha si no existe y agrega las columnas que le falten (sin recrearla).
+
+    Returns:
+        list: Columnas agregadas
+    """
+    with engine.begin() as conn:
+        conn.execute(text(DDL_DIM_FECHA))
+        existentes = {
+            fila[0] for fila in conn.execute(text("""
+                SELECT COLUMN_NAME
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'dim_fecha'
+            """))
+        }
+        creadas = []
+        for columna, definicion in DEFINICION_COLUMNAS_DIM_FECHA.items():
+            if columna not in existentes:
+                conn.execute(text(f"ALTER TABLE dim_fecha ADD COLUMN {columna} {definicion}"))
+                creadas.append(columna)
+    if creadas:
+        print(f"Columnas agregadas a dim_fecha: {', '.join(creadas)}")
+    return creadas
+
+
+def create_and_populate_dim_fecha(db_name: str, start_year: int = 2024, end_year: int = 2026,
+                                  refrescar: bool = False, ruta_calendario: str = RUTA_CALENDARIO):
+    """
+    Extiende dim_fecha hasta el 31 de diciembre de end_year.
+
+    Solo se generan e insertan las fechas posteriores a la máxima ya cargada,
+    así que ampliar el horizonte no recalcula el calendario existente. Con
+    refrescar=True (o si se agregaron columnas a la tabla) se regenera todo el
+    rango y se actualizan las filas existentes, ej: tras editar el calendario
+    o las campañas.
+
+    Args:
+        db_name (str): Base de datos
+        start_year (int): Primer año del rango cuando la tabla está vacía o se refresca
+        end_year (int): Último año del calendario
+        refrescar (bool): Regenerar y actualizar todo el rango
+        ruta_calendario (str): JSON de temporadas, eventos y feriados
+
+    Returns:
+        int: Fechas insertadas o actualizadas
+    """
     engine = create_engine(get_mysql_url(db_name))
-    
-    recrear_tabla = False
-    with engine.connect() as conn_check:
-        inspector = sqlalchemy_inspect(conn_check)
-        table_exists = inspector.has_table("dim_fecha")
-        if table_exists:
-            columns = [col['name'] for col in inspector.get_columns('dim_fecha')]
-            # Verificar todas las columnas, incluyendo las nuevas de temporada
-            columnas_requeridas = {
-                'merchandising', 'e_commerce', 
-                'temporada_comercial', 'temporada_salud', 'evento_especial'
-            }
-            if not columnas_requeridas.issubset(set(columns)):
-                print("Tabla dim_fecha existente no tiene todas las columnas nuevas (temporadas/eventos), se marcará para recrear.")
-                recrear_tabla = True
-        else:
-            print("Tabla dim_fecha no existe, se marcará para crear.")
-            recrear_tabla = True
-
-    if recrear_tabla:
-        with engine.connect() as conn_recreate: 
-            with conn_recreate.begin(): 
-                if table_exists: 
-                    print("Eliminando tabla dim_fecha existente...")
-                    conn_recreate.execute(text("DROP TABLE IF EXISTS dim_fecha;")) 
-                
-                print("Creando tabla dim_fecha...")
-                conn_recreate.execute(text("""
-                CREATE TABLE dim_fecha (
-                  fecha_key INT NOT NULL PRIMARY KEY, fecha DATE NOT NULL UNIQUE, anio INT NOT NULL,
-                  trimestre INT NOT NULL, mes INT NOT NULL, mes_nombre VARCHAR(20) NOT NULL,
-                  dia INT NOT NULL, dia_nombre VARCHAR(10) NOT NULL, dia_semana INT NOT NULL,
-                  semana_anyo INT NOT NULL, dia_del_anyo INT NOT NULL,
-                  es_fin_de_semana TINYINT(1) NOT NULL, es_habil TINYINT(1) NOT NULL,
-                  es_feriado TINYINT(1) NOT NULL DEFAULT 0,
-                  temporada_climatica VARCHAR(50) NULL,  -- Aumentado un poco por si acaso
-                  temporada_escolar VARCHAR(50) NULL,
-                  temporada_comercial VARCHAR(100) NULL, -- Nueva columna
-                  temporada_salud VARCHAR(100) NULL,     -- Nueva columna
-                  evento_especial VARCHAR(100) NULL,   -- Nueva columna
-                  merchandising VARCHAR(255) NULL,
-                  e_commerce VARCHAR(255) NULL
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-                """))
-                print("Tabla dim_fecha creada/recreada.")
-    else:
-        print("Tabla dim_fecha ya existe con las columnas necesarias. No se recreará.")
-
-    # Cargar campañas
-    campanas_merchandising_df = pd.DataFrame()
-    try:
-        with engine.connect() as conn:
-            campanas_merchandising_df = pd.read_sql_table('dim_campana_merchandising', conn)
-            campanas_merchandising_df['fecha_inicio'] = pd.to_datetime(campanas_merchandising_df['fecha_inicio']).dt.date
-            campanas_merchandising_df['fecha_fin'] = pd.to_datetime(campanas_merchandising_df['fecha_fin']).dt.date
-            print(f"Cargadas {len(campanas_merchandising_df)} campañas de merchandising.")
-    except Exception as e:
-        print(f"Advertencia: No se pudieron cargar campañas de merchandising: {e}. Se continuará sin ellas.")
-
-    campanas_ecommerce_df = pd.DataFrame()
-    try:
+    refrescar = bool(asegurar_tabla_dim_fecha(engine)) or refrescar
+
+    inicio = date(start_year, 1, 1)
+    fin = date(end_year, 12, 31)
+    if not refrescar:
         with engine.connect() as conn:
-            campanas_ecommerce_df = pd.read_sql_table('dim_campana_ecommerce', conn)
-            campanas_ecommerce_df['fecha_inicio'] = pd.to_datetime(campanas_ecommerce_df['fecha_inicio']).dt.date
-            campanas_ecommerce_df['fecha_fin'] = pd.to_datetime(campanas_ecommerce_df['fecha_fin']).dt.date
-            print(f"Cargadas {len(campanas_ecommerce_df)} campañas de e-commerce.")
-    except Exception as e:
-        print(f"Advertencia: No se pudieron cargar campañas de e-commerce: {e}. Se continuará sin ellas.")
-
-    feriados_por_ano = {
-        2024: set(),
-        2025: {
-            "2025-01-01", "2025-01-06", "2025-03-24", "2025-04-17", "2025-04-18",
-            "2025-05-01", "2025-06-02", "2025-06-23", "2025-06-30", "2025-07-20",
-            "2025-08-07", "2025-08-18", "2025-10-13", "2025-11-03", "2025-11-17",
-            "2025-12-08", "2025-12-25"
-        },
-        2026: set()
-    }
-
-    records = []
-    start_date_obj = date(start_year, 1, 1)
-    end_date_obj = date(end_year, 12, 31)
-    delta = timedelta(days=1)
-    current_date = start_date_obj
-
-    print(f"Generando registros de fecha desde {start_date_obj} hasta {end_date_obj}...")
-    while current_date <= end_date_obj:
-        fk = int(current_date.strftime('%Y%m%d'))
-        wd = current_date.weekday()
-        es_fin = 1 if wd >= 5 else 0
-        es_hab = 1 if wd < 5 else 0
-        anio = current_date.year
-        mes = current_date.month
-        dia = current_date.day
-        trimestre = (mes - 1) // 3 + 1
-        semana_iso_tuple = current_date.isocalendar()
-        semana_iso = semana_iso_tuple[1]
-        dia_anyo = current_date.timetuple().tm_yday
-        meses_es = ["", "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
-        dias_es = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-        mes_nombre = meses_es[mes]
-        dia_nombre = dias_es[wd]
-        str_fecha = current_date.strftime('%Y-%m-%d')
-        feriados_ano_actual = feriados_por_ano.get(anio, set())
-        es_feriado = 1 if str_fecha in feriados_ano_actual else 0
-        
-        climatica = None
-        escolar = None
-        temporada_comercial_valor = None
-        temporada_salud_valor = None
-        evento_especial_valor = None
-        merchandising_valor = None
-        ecommerce_valor = None
-
-        if anio == 2025:
-            # Temporada climática 2025
-            if mes in (1, 2): 
-                climatica = 'Seca (Inicio Año)'
-            elif mes in (3, 4, 5): 
-                climatica = 'Lluvias 1'
-            elif mes in (6, 7, 8, 9): 
-                climatica = 'Seca (Mitad Año)'
-            elif mes in (10, 11): 
-                climatica = 'Lluvias 2'
-            elif mes == 12: 
-                climatica = 'Seca (Fin Año)'
-
-            # Temporada escolar 2025
-            if date(2025,1,1) <= current_date <= date(2025,1,19): 
-                escolar = 'Vacaciones Inicio Año'
-            elif date(2025,1,20) <= current_date <= date(2025,4,13): 
-                escolar = 'Periodo Escolar 1'
-            elif date(2025,4,14) <= current_date <= date(2025,4,20): 
-                escolar = 'Semana Santa'
-            elif date(2025,4,21) <= current_date <= date(2025,6,15): 
-                escolar = 'Periodo Escolar 2'
-            elif date(2025,6,16) <= current_date <= date(2025,7,6): 
-                escolar = 'Vacaciones Mitad Año'
-            elif date(2025,7,7) <= current_date <= date(2025,10,5): 
-                escolar = 'Periodo Escolar 3'
-            elif date(2025,10,6) <= current_date <= date(2025,10,12): 
-                escolar = 'Receso Escolar Octubre'
-            elif date(2025,10,13) <= current_date <= date(2025,11,30): 
-                escolar = 'Periodo Escolar 4'
-            elif date(2025,12,1) <= current_date <= date(2025,12,31): 
-                escolar = 'Vacaciones Fin Año'
-            
-            # TEMPORADAS COMERCIALES Y EVENTOS ESPECIALES 2025
-            if date(2025, 1, 1) <= current_date <= date(2025, 1, 6):
-                temporada_comercial_valor = "Post-Navidad / Reyes"
-                if current_date == date(2025, 1, 6): 
-                    evento_especial_valor = "Día de Reyes"
-            if date(2025, 2, 10) <= current_date <= date(2025, 2, 16):
-                temporada_comercial_valor = "Semana San Valentín"
-                if current_date == date(2025, 2, 14): 
-                    evento_especial_valor = "San Valentín"
-            if date(2025, 4, 13) <= current_date <= date(2025, 4, 20):
-                temporada_comercial_valor = "Semana Santa"
-                if current_date == date(2025, 4, 17): 
-                    evento_especial_valor = "Jueves Santo"
-                elif current_date == date(2025, 4, 18): 
-                    evento_especial_valor = "Viernes Santo"
-                elif current_date == date(2025, 4, 20): 
-                    evento_especial_valor = "Domingo Resurrección"
-            if date(2025, 5, 5) <= current_date <= date(2025, 5, 11):
-                temporada_comercial_valor = "Semana Día de la Madre"
-                if current_date == date(2025, 5, 11): 
-                    evento_especial_valor = "Día de la Madre"
-            if date(2025, 6, 9) <= current_date <= date(2025, 6, 15):
-                temporada_comercial_valor = "Semana Día del Padre"
-                if current_date == date(2025, 6, 15): 
-                    evento_especial_valor = "Día del Padre"
-            if date(2025, 9, 15) <= current_date <= date(2025, 9, 21):
-                temporada_comercial_valor = "Semana Amor y Amistad"
-                if current_date == date(2025, 9, 20): 
-                    evento_especial_valor = "Día Amor y Amistad"
-            if date(2025, 10, 27) <= current_date <= date(2025, 10, 31):
-                temporada_comercial_valor = "Semana Halloween"
-                if current_date == date(2025, 10, 31): 
-                    evento_especial_valor = "Halloween"
-            
-            current_event = evento_especial_valor # Guardar evento actual para no sobrescribirlo con temporada general
-            current_commercial = temporada_comercial_valor
-
-            if date(2025, 11, 24) <= current_date <= date(2025, 12, 2):
-                 temporada_comercial_valor = "Black Friday / Cyber Week"
-                 if current_date == date(2025, 11, 28): 
-                     evento_especial_valor = "Black Friday"
-                 elif current_date == date(2025, 12, 1): 
-                     evento_especial_valor = "Cyber Monday"
-            elif (mes == 11 and dia >= 15) or mes == 12:
-                 if not current_commercial: 
-                     temporada_comercial_valor = "Temporada Navideña"
-            
-            if current_date == date(2025, 12, 7):
-                evento_especial_valor = "Día de Velitas"
-                if not current_commercial: 
-                    temporada_comercial_valor = "Temporada Navideña"
-            elif date(2025, 12, 16) <= current_date <= date(2025, 12, 24):
-                evento_especial_valor = "Novenas Navideñas" if not current_event else current_event + "; Novenas"
-                if not current_commercial: 
-                    temporada_comercial_valor = "Temporada Navideña"
-            elif current_date == date(2025, 12, 24):
-                evento_especial_valor = "Noche Buena" if not current_event else current_event + "; Noche Buena"
-                if not current_commercial: 
-                    temporada_comercial_valor = "Temporada Navideña"
-            elif current_date == date(2025, 12, 25):
-                evento_especial_valor = "Navidad" if not current_event else current_event + "; Navidad"
-                if not current_commercial: 
-                    temporada_comercial_valor = "Temporada Navideña"
-            elif current_date == date(2025, 12, 31):
-                evento_especial_valor = "Fin de Año" if not current_event else current_event + "; Fin de Año"
-                if not current_commercial: 
-                    temporada_comercial_valor = "Temporada Navideña"
-
-            # TEMPORADAS DE SALUD 2025
-            if (date(2025, 3, 15) <= current_date <= date(2025, 5, 31)) or \
-               (date(2025, 9, 15) <= current_date <= date(2025, 11, 30)):
-                temporada_salud_valor = "Pico Enfermedades Respiratorias"
-            if (date(2025, 4, 1) <= current_date <= date(2025, 5, 15)):
-                if temporada_salud_valor: 
-                    temporada_salud_valor += " / Alergias"
-                else: 
-                    temporada_salud_valor = "Temporada Alergias"
-            if mes in [1, 2, 6, 7, 12] or escolar in ['Semana Santa', 'Vacaciones Mitad Año', 'Receso Escolar Octubre', 'Vacaciones Inicio Año', 'Vacaciones Fin Año']:
-                 if temporada_salud_valor and "Protección Solar" not in temporada_salud_valor : 
-                    temporada_salud_valor += " / Alta Demanda Protección Solar"
-                 elif not temporada_salud_valor: 
-                    temporada_salud_valor = "Alta Demanda Protección Solar"
-        
-        # Lógica para campañas de merchandising y e-commerce (ya existente)
-        if not campanas_merchandising_df.empty:
-            activas_merch = campanas_merchandising_df[
-                (campanas_merchandising_df['fecha_inicio'] <= current_date) &
-                (campanas_merchandising_df['fecha_fin'] >= current_date)
-            ]
-            if not activas_merch.empty:
-                merchandising_valor = '; '.join(activas_merch['nombre_campana'].tolist())
-
-        if not campanas_ecommerce_df.empty:
-            activas_ecom = campanas_ecommerce_df[
-                (campanas_ecommerce_df['fecha_inicio'] <= current_date) &
-                (campanas_ecommerce_df['fecha_fin'] >= current_date)
-            ]
-            if not activas_ecom.empty:
-                ecommerce_valor = '; '.join(activas_ecom['nombre_campana'].tolist())
-        
-        records.append({
-            'fecha_key': fk, 'fecha': current_date, 'anio': anio, 'trimestre': trimestre,
-            'mes': mes, 'mes_nombre': mes_nombre, 'dia': dia, 'dia_nombre': dia_nombre,
-            'dia_semana': wd + 1, 'semana_anyo': semana_iso, 'dia_del_anyo': dia_anyo,
-            'es_fin_de_semana': es_fin, 'es_habil': es_hab, 'es_feriado': es_feriado,
-            'temporada_climatica': climatica, 'temporada_escolar': escolar,
-            'temporada_comercial': temporada_comercial_valor,
-            'temporada_salud': temporada_salud_valor,
-            'evento_especial': evento_especial_valor,
-            'merchandising': merchandising_valor,
-            'e_commerce': ecommerce_valor
-        })
-        current_date += delta
-    
-    if records:
-        stmt_insert_base = """
-        INSERT INTO dim_fecha (
-          fecha_key, fecha, anio, trimestre, mes, mes_nombre,
-          dia, dia_nombre, dia_semana, semana_anyo, dia_del_anyo,
-          es_fin_de_semana, es_habil, es_feriado,
-          temporada_climatica, temporada_escolar, 
-          temporada_comercial, temporada_salud, evento_especial, 
-          merchandising, e_commerce
-        )
-        VALUES (
-          :fecha_key, :fecha, :anio, :trimestre, :mes, :mes_nombre,
-          :dia, :dia_nombre, :dia_semana, :semana_anyo, :dia_del_anyo,
-          :es_fin_de_semana, :es_habil, :es_feriado,
-          :temporada_climatica, :temporada_escolar, 
-          :temporada_comercial, :temporada_salud, :evento_especial,
-          :merchandising, :e_commerce
-        )
-        ON DUPLICATE KEY UPDATE
-          fecha = VALUES(fecha), anio = VALUES(anio), trimestre = VALUES(trimestre),
-          mes = VALUES(mes), mes_nombre = VALUES(mes_nombre), dia = VALUES(dia),
-          dia_nombre = VALUES(dia_nombre), dia_semana = VALUES(dia_semana),
-          semana_anyo = VALUES(semana_anyo), dia_del_anyo = VALUES(dia_del_anyo),
-          es_fin_de_semana = VALUES(es_fin_de_semana), es_habil = VALUES(es_habil),
-          es_feriado = VALUES(es_feriado), temporada_climatica = VALUES(temporada_climatica),
-          temporada_escolar = VALUES(temporada_escolar), 
-          temporada_comercial = VALUES(temporada_comercial), 
-          temporada_salud = VALUES(temporada_salud),
-          evento_especial = VALUES(evento_especial),
-          merchandising = VALUES(merchandising),
-          e_commerce = VALUES(e_commerce);
-        """
-        with engine.connect() as conn_insert:
-            with conn_insert.begin():
-                conn_insert.execute(text(stmt_insert_base), records)
-        print(f"✅ dim_fecha poblada/actualizada. {len(records)} registros procesados para el rango de fechas.")
-    else:
-        print("No se generaron registros para insertar.")
+            maximo = conn.execute(text("SELECT MAX(fecha) FROM dim_fecha")).scalar()
+        if maximo is not None:
+            inicio = max(inicio, pd.Timestamp(maximo).date() + timedelta(days=1))
 
-if __name__ == "__main__":
+    if inicio > fin:
+        print(f"✅ dim_fecha ya cubre hasta {fin}. No hay fechas nuevas.")
+        return 0
+
+    campanas_merchandising_df, campanas_ecommerce_df = _cargar_campanas(engine)
+    print(f"Generando registros de fecha desde {inicio} hasta {fin}...")
+    df = generar_dim_fecha(
+        pd.date_range(inicio, fin, freq='D'),
+        cargar_calendario(ruta_calendario),
+        campanas_merchandising_df,
+        campanas_ecommerce_df
+    )
+
+    sentencia = STMT_UPSERT_DIM_FECHA if refrescar else STMT_INSERT_IGNORE_DIM_FECHA
+    with engine.begin() as conn:
+        conn.execute(text(sentencia), _registros(df))
+    print(f"✅ dim_fecha {'actualizada' if refrescar else 'extendida'}. {len(df)} registros procesados ({inicio} a {fin}).")
+    return len(df)
+
+
+def asegurar_fechas(engine, fechas, logger=None):
+    """
+    Garantiza que todas las fechas existan en dim_fecha y devuelve el mapa de claves.
+
+    Consulta de una vez las fechas ya presentes, genera las faltantes con
+    generar_dim_fecha y las inserta en un único lote
+    INSERT IGNORE. Como fecha_key es determinística (YYYYMMDD) el mapa final no
+    requiere volver a consultar la tabla.
+
+    Args:
+        engine: Engine de SQLAlchemy conectado a la base de datos
+        fechas (iterable): Fechas (date, datetime o Timestamp) a garantizar
+        logger: Instancia de logger para registrar eventos
 
-    año_inicio = 2024
-    año_fin = 2026 
-    print(f"Iniciando creación/población de dim_fecha para los años {año_inicio} a {año_fin}...")
-    create_and_populate_dim_fecha("gestion_compras", start_year=año_inicio, end_year=año_fin)
+    Returns:
+        dict: Mapeo {date: fecha_key} para todas las fechas solicitadas
+    """
+    fechas_unicas = sorted({pd.Timestamp(f).date() for f in fechas if pd.notnull(f)})
+    if not fechas_unicas:
+        return {}
+
+    query_existentes = text("""
+        SELECT fecha
+        FROM dim_fecha
+        WHERE fecha IN :fechas
+    """).bindparams(bindparam("fechas", expanding=True))
+
+    with engine.connect() as conn:
+        existentes = {pd.Timestamp(row[0]).date() for row in conn.execute(query_existentes, {"fechas": fechas_unicas})}
+
+    faltantes = [f for f in fechas_unicas if f not in existentes]
+
+    if faltantes:
+        campanas_merchandising_df, campanas_ecommerce_df = _cargar_campanas(engine)
+        df = generar_dim_fecha(faltantes, cargar_calendario(), campanas_merchandising_df, campanas_ecommerce_df)
+        with engine.begin() as conn:
+            conn.execute(text(STMT_INSERT_IGNORE_DIM_FECHA), _registros(df))
+
+        if logger:
+            logger.info(f"📅 Fechas nuevas agregadas a dim_fecha: {len(faltantes)}")
+
+    return {f: int(f.strftime('%Y%m%d')) for f in fechas_unicas}
+
+if __name__ == "__main__":
+    # python -m analysis.loader.create_dim_fecha [--fin 2027] [--refrescar]
+    parser = argparse.ArgumentParser(description="Crea o extiende dim_fecha")
+    parser.add_argument("--inicio", type=int, default=2024, help="Primer año si la tabla está vacía o se refresca")
+    parser.add_argument("--fin", type=int, default=2026, help="Último año del calendario")
+    parser.add_argument("--refrescar", action="store_true",
+                        help="Regenerar todo el rango (tras cambiar el calendario o las campañas)")
+    parser.add_argument("--calendario", default=RUTA_CALENDARIO, help="JSON de temporadas, eventos y feriados")
+    args = parser.parse_args()
 
-    # python -m analysis.loader.create_dim_fecha
\ No newline at end of file
+    print(f"Iniciando creación/extensión de dim_fecha para los años {args.inicio} a {args.fin}...")
+    create_and_populate_dim_fecha(
+        "gestion_compras",
+        start_year=args.inicio,
+        end_year=args.fin,
+        refrescar=args.refrescar,
+        ruta_calendario=args.calendario
+    )
@@ -0,0 +1,317 @@
+# analysis/loader/escritor_excel.py
+
+import os
+import time
+import tracemalloc
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+
+# Formatos numéricos reutilizables por nombre corto
+FORMATOS_EXCEL = {
+    'entero': '#,##0',
+    'decimal': '#,##0.00',
+    'moneda': '$#,##0',
+    'porcentaje': '0.0%',
+    'fecha': 'dd/mm/yyyy',
+}
+
+ANCHO_COLUMNA_DEFECTO = 16
+
+
+class EscritorExcel:
+    """
+    Escritor xlsx en streaming sobre xlsxwriter en modo constant_memory.
+
+    Cada fila se escribe a disco al pasar a la siguiente, así que la memoria no
+    crece con el tamaño del reporte. Las hojas se escriben completas una tras
+    otra y cada una acepta un DataFrame o un iterable de DataFrames (ej:
+    pd.read_sql con chunksize), con formatos por columna, autofiltro,
+    encabezado opcional sobre la tabla y fila de totales.
+
+    Uso:
+        with EscritorExcel("reporte.xlsx") as escritor:
+            escritor.agregar_hoja("Traslados", df, formatos={'costo_total': 'moneda'})
+    """
+
+    def __init__(self, ruta, logger=None):
+        """
+        Abre el libro.
+
+        Args:
+            ruta (str): Ruta del archivo .xlsx
+            logger: Instancia de logger para registrar eventos
+        """
+        try:
+            import xlsxwriter
+        except ImportError as e:
+            raise ImportError("Para escribir reportes en Excel se requiere xlsxwriter (pip install xlsxwriter)") from e
+
+        self.ruta = ruta
+        self.logger = logger
+        self.libro = xlsxwriter.Workbook(ruta, {'constant_memory': True, 'nan_inf_to_errors': True})
+        self._formatos = {}
+        self.filas_escritas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    def cerrar(self):
+        """Cierra el libro y termina de escribir el archivo"""
+        if self.libro is not None:
+            self.libro.close()
+            self.libro = None
+            if self.logger:
+                self.logger.info(f"💾 {os.path.basename(self.ruta)}: {self.filas_escritas} filas")
+
+    def _formato(self, especificacion):
+        """Devuelve (creándolo una sola vez) el formato de xlsxwriter de una especificación"""
+        if especificacion is None:
+            return None
+        if isinstance(especificacion, str):
+            especificacion = {'num_format': FORMATOS_EXCEL.get(especificacion, especificacion)}
+        clave = tuple(sorted(especificacion.items()))
+        if clave not in self._formatos:
+            self._formatos[clave] = self.libro.add_format(especificacion)
+        return self._formatos[clave]
+
+    def agregar_hoja(self, nombre, datos, columnas=None, formatos=None, autofiltro=True,
+                     encabezado=None, totales=None, anchos=None):
+        """
+        Escribe una hoja completa.
+
+        Args:
+            nombre (str): Nombre de la hoja (máximo 31 caracteres en Excel)
+            datos (pd.DataFrame | iterable): DataFrame o bloques de DataFrames con las mismas columnas
+            columnas (list, optional): Pares (columna, título) a escribir; por defecto todas
+            formatos (dict, optional): columna -> nombre de FORMATOS_EXCEL, num_format o dict de formato
+            autofiltro (bool): Agregar autofiltro sobre la tabla
+            encabezado (list, optional): Pares (etiqueta, valor) escritos sobre la tabla
+            totales (list, optional): Columnas numéricas a totalizar en una fila final
+            anchos (dict, optional): columna -> ancho; por defecto ANCHO_COLUMNA_DEFECTO
+
+        Returns:
+            int: Filas de datos escritas
+        """
+        hoja = self.libro.add_worksheet(nombre[:31])
+        negrita = self._formato({'bold': True})
+        formatos = formatos or {}
+        anchos = anchos or {}
+
+        fila = 0
+        for etiqueta, valor in encabezado or []:
+            hoja.write_string(fila, 0, str(etiqueta), negrita)
+            if not _vacio(valor):
+                hoja.write(fila, 1, valor)
+            fila += 1
+        if encabezado:
+            fila += 1
+
+        bloques = iter([datos] if isinstance(datos, pd.DataFrame) else datos)
+        bloque = next(bloques, None)
+        if bloque is None:
+            bloque = pd.DataFrame(columns=[columna for columna, _ in columnas or []])
+        columnas = columnas or [(columna, columna) for columna in bloque.columns]
+        nombres = [columna for columna, _ in columnas]
+
+        inicio_tabla = fila
+        hoja.write_row(fila, 0, [titulo for _, titulo in columnas],
+                       self._formato({'bold': True, 'bg_color': '#D9E1F2', 'border': 1}))
+        for j, columna in enumerate(nombres):
+            hoja.set_column(j, j, anchos.get(columna, ANCHO_COLUMNA_DEFECTO))
+        fila += 1
+
+        sumas = dict.fromkeys(totales or [], 0.0)
+        escritas = 0
+        while bloque is not None:
+            escritas += self._escribir_bloque(hoja, fila + escritas, bloque[nombres], formatos)
+            for columna in sumas:
+                # Solo valores finitos: las celdas NA o infinitas quedan en blanco y no cuentan
+                numeros = pd.to_numeric(bloque[columna], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                sumas[columna] += float(numeros[np.isfinite(numeros)].sum())
+            bloque = next(bloques, None)
+        fila += escritas
+
+        if autofiltro:
+            hoja.autofilter(inicio_tabla, 0, max(fila - 1, inicio_tabla), len(nombres) - 1)
+        if sumas:
+            hoja.write_string(fila, 0, 'Total', negrita)
+            for columna, total in sumas.items():
+                hoja.write_number(fila, nombres.index(columna), total, self._formato(formatos.get(columna)))
+
+        self.filas_escritas += escritas
+        return escritas
+
+    def _escribir_bloque(self, hoja, fila_inicial, df, formatos):
+        """
+        Escribe las filas de un bloque con el método tipado de cada columna.
+
+        write_number/write_string/write_datetime directos evitan la inferencia
+        de tipo de write() en cada celda.
+        """
+        escritores = []
+        for columna in df.columns:
+            formato = self._formato(formatos.get(columna))
+            serie = df[columna]
+            if pd.api.types.is_bool_dtype(serie) or _es_booleana(serie):
+                escritores.append((hoja.write_boolean, formato))
+            elif pd.api.types.is_numeric_dtype(serie):
+                escritores.append((hoja.write_number, formato))
+            elif pd.api.types.is_datetime64_any_dtype(serie):
+                escritores.append((hoja.write_datetime, formato or self._formato('fecha')))
+            else:
+                escritores.append((_escribir_texto(hoja), formato))
+
+        # Los datetimes pasan como Timestamp (subclase de datetime); lo demás como valores de Python
+        valores = [serie.to_numpy(dtype=object) for _, serie in df.items()]
+        fila = fila_inicial
+        for registro in zip(*valores):
+            for j, valor in enumerate(registro):
+                if not _vacio(valor):
+                    escribir, formato = escritores[j]
+                    escribir(fila, j, valor, formato)
+            fila += 1
+        return fila - fila_inicial
+
+
+def _vacio(valor):
+    """True para None, NaN, NaT, pd.NA e infinitos (la celda queda en blanco)"""
+    if not pd.api.types.is_scalar(valor):
+        return False
+    if pd.isna(valor):
+        return True
+    return isinstance(valor, (float, np.floating)) and bool(np.isinf(valor))
+
+
+def _es_booleana(serie):
+    """True para columnas object con solo booleanos y nulos (ej: True/False/None)"""
+    if serie.dtype != object:
+        return False
+    valores = serie.dropna()
+    return not valores.empty and all(isinstance(valor, (bool, np.bool_)) for valor in valores)
+
+
+def _escribir_texto(hoja):
+    """write_string que acepta cualquier valor (códigos numéricos en columnas object, fechas, etc.)"""
+    def escribir(fila, columna, valor, formato=None):
+        if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, bool):
+            return hoja.write_number(fila, columna, valor, formato)
+        return hoja.write_string(fila, columna, str(valor), formato)
+    return escribir
+
+
+def escribir_excel(ruta, hojas, logger=None):
+    """
+    Escribe un libro con varias hojas en streaming.
+
+    Args:
+        ruta (str): Ruta del archivo .xlsx
+        hojas (dict): nombre de hoja -> DataFrame, o -> (DataFrame, opciones de agregar_hoja)
+        logger: Instancia de logger para registrar eventos
+
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    with EscritorExcel(ruta, logger=logger) as escritor:
+        for nombre, hoja in hojas.items():
+            datos, opciones = hoja if isinstance(hoja, tuple) else (hoja, {})
+            escritor.agregar_hoja(nombre, datos, **opciones)
+    return ruta
+
+
+def escribir_reportes(reportes, procesos=None, logger=None):
+    """
+    Escribe varios libros a la vez en un pool de procesos.
+
+    Args:
+        reportes (dict): ruta -> hojas (ver escribir_excel)
+        procesos (int, optional): Procesos del pool; 1 escribe en el proceso actual.
+            Por defecto os.cpu_count()
+        logger: Instancia de logger para registrar eventos
+
+    Returns:
+        dict: ruta -> True si se escribió, False si falló
+    """
+    procesos = procesos or os.cpu_count() or 1
+    resultado = {}
+    if procesos == 1 or len(reportes) <= 1:
+        for ruta, hojas in reportes.items():
+            escribir_excel(ruta, hojas)
+            resultado[ruta] = True
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = {pool.submit(escribir_excel, ruta, hojas): ruta for ruta, hojas in reportes.items()}
+            for futuro in concurrent.futures.as_completed(futuros):
+                ruta = futuros[futuro]
+                try:
+                    futuro.result()
+                    resultado[ruta] = True
+                except Exception as e:
+                    resultado[ruta] = False
+                    if logger:
+                        logger.error(f"❌ Error escribiendo {ruta}: {e}")
+
+    if logger:
+        logger.info(f"💾 {sum(resultado.values())}/{len(reportes)} reportes Excel escritos ({min(procesos, len(reportes))} procesos)")
+    return resultado
+
+
+def comparar_con_to_excel(hojas, carpeta, logger=None):
+    """
+    Compara tiempo y memoria pico de EscritorExcel contra DataFrame.to_excel (openpyxl).
+
+    La memoria se mide con tracemalloc en una segunda pasada para que su
+    sobrecosto no afecte la medición de tiempo.
+
+    Args:
+        hojas (dict): nombre de hoja -> DataFrame
+        carpeta (str): Carpeta para los archivos de prueba
+        logger: Instancia de logger para registrar eventos
+
+    Returns:
+        pd.DataFrame: Una fila por método con segundos, memoria_pico_mb y tamano_mb
+    """
+    os.makedirs(carpeta, exist_ok=True)
+
+    def con_to_excel(ruta):
+        with pd.ExcelWriter(ruta, engine='openpyxl') as writer:
+            for nombre, df in hojas.items():
+                df.to_excel(writer, sheet_name=nombre[:31], index=False)
+
+    metodos = {
+        'to_excel (openpyxl)': (con_to_excel, os.path.join(carpeta, "benchmark_to_excel.xlsx")),
+        'EscritorExcel (streaming)': (lambda ruta: escribir_excel(ruta, hojas),
+                                      os.path.join(carpeta, "benchmark_streaming.xlsx")),
+    }
+    filas = []
+    for metodo, (escribir, ruta) in metodos.items():
+        inicio = time.perf_counter()
+        escribir(ruta)
+        segundos = time.perf_counter() - inicio
+
+        tracemalloc.start()
+        escribir(ruta)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        filas.append({
+            'metodo': metodo,
+            'filas': sum(len(df) for df in hojas.values()),
+            'segundos': round(segundos, 2),
+            'memoria_pico_mb': round(pico / 2**20, 1),
+            'tamano_mb': round(os.path.getsize(ruta) / 2**20, 2),
+        })
+
+    df_resultado = pd.DataFrame(filas)
+    if logger:
+        for fila in filas:
+            logger.info(
+                f"⏱️ {fila['metodo']}: {fila['segundos']}s, pico {fila['memoria_pico_mb']} MB, "
+                f"archivo {fila['tamano_mb']} MB ({fila['filas']} filas)"
+            )
+    return df_resultado
@@ -0,0 +1,153 @@
+# analysis/loader/escritor_pedidos_laboratorio.py
+
+import os
+import concurrent.futures
+
+from analysis.loader.escritor_excel import escribir_excel
+
+FORMATOS_PEDIDO = ('xlsx', 'csv')
+
+ARCHIVO_MANIFIESTO = "manifiesto_pedidos.csv"
+
+# Columnas de las hojas del pedido: (columna, título)
+COLUMNAS_CONSOLIDADO = [
+    ('codigo_producto', 'Código'),
+    ('nombre_producto', 'Producto'),
+    ('cant_sugerida', 'Cajas'),
+    ('cant_obsequio', 'Obsequio'),
+    ('costo', 'Costo caja'),
+    ('valor', 'Valor'),
+]
+COLUMNAS_DETALLE_PDV = [
+    ('punto_de_venta', 'Punto de venta'),
+    ('codigo_producto', 'Código'),
+    ('nombre_producto', 'Producto'),
+    ('cant_sugerida', 'Cajas'),
+    ('costo', 'Costo caja'),
+    ('valor', 'Valor'),
+]
+FORMATOS_PEDIDO_EXCEL = {
+    'cant_sugerida': 'entero',
+    'cant_obsequio': 'entero',
+    'costo': 'decimal',
+    'valor': 'decimal',
+}
+
+
+def _consolidar(lineas):
+    """Suma las líneas de todos los PDVs por producto"""
+    return lineas.groupby(['codigo_producto', 'nombre_producto'], as_index=False, sort=False, dropna=False).agg(
+        cant_sugerida=('cant_sugerida', 'sum'),
+        cant_obsequio=('cant_obsequio', 'sum'),
+        costo=('costo', 'max'),
+        valor=('valor', 'sum'),
+    )
+
+
+def renderizar_pedido(ruta, encabezado, lineas, formato='xlsx'):
+    """
+    Escribe el archivo de un pedido. Se ejecuta en un proceso del pool.
+
+    Args:
+        ruta (str): Ruta del archivo sin extensión
+        encabezado (list): Pares (etiqueta, valor) de la cabecera del pedido
+        lineas (pd.DataFrame): Líneas del pedido (COLUMNAS_LINEA_PEDIDO)
+        formato (str): 'xlsx' (hojas Pedido y Por PDV) o 'csv' (detalle por PDV)
+
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    if formato == 'csv':
+        ruta_archivo = f"{ruta}.csv"
+        lineas.to_csv(ruta_archivo, index=False, encoding='utf-8-sig')
+        return ruta_archivo
+
+    opciones = {'formatos': FORMATOS_PEDIDO_EXCEL, 'totales': ['cant_sugerida', 'valor']}
+    return escribir_excel(f"{ruta}.xlsx", {
+        'Pedido': (_consolidar(lineas), {'columnas': COLUMNAS_CONSOLIDADO, 'encabezado': encabezado, **opciones}),
+        'Por PDV': (lineas, {'columnas': COLUMNAS_DETALLE_PDV, 'encabezado': encabezado[:2], **opciones}),
+    })
+
+
+class EscritorPedidosLaboratorio:
+    """
+    Genera un archivo por pedido de laboratorio en paralelo (ProcessPoolExecutor)
+    y un manifiesto CSV que enlaza cada archivo con el contacto del laboratorio.
+    """
+
+    def __init__(self, ruta_salida, formato='xlsx', procesos=None, logger=None):
+        """
+        Inicializa el escritor.
+
+        Args:
+            ruta_salida (str): Carpeta donde se escriben los pedidos
+            formato (str): Uno de FORMATOS_PEDIDO
+            procesos (int, optional): Procesos del pool; 1 escribe en el proceso actual.
+                Por defecto os.cpu_count()
+            logger: Instancia de logger para registrar eventos
+        """
+        if formato not in FORMATOS_PEDIDO:
+            raise ValueError(f"Formato de pedido no soportado: {formato}")
+        self.ruta_salida = ruta_salida
+        self.formato = formato
+        self.procesos = procesos or os.cpu_count() or 1
+        self.logger = logger
+
+    def escribir(self, lineas, pedidos, fecha):
+        """
+        Escribe todos los pedidos y el manifiesto.
+
+        Args:
+            lineas (pd.DataFrame): Líneas de todos los pedidos (columna 'pedido')
+            pedidos (pd.DataFrame): Resumen y contacto de cada pedido
+            fecha (date): Fecha del sugerido que origina los pedidos
+
+        Returns:
+            pd.DataFrame: Manifiesto (pedidos con la columna 'archivo')
+        """
+        os.makedirs(self.ruta_salida, exist_ok=True)
+        resumen = pedidos.set_index('pedido')
+
+        tareas = []
+        for pedido, lineas_pedido in lineas.groupby('pedido', sort=False):
+            info = resumen.loc[pedido]
+            encabezado = [
+                ('Laboratorio', info['laboratorio']),
+                ('Proveedor', info['proveedor']),
+                ('Fecha', f"{fecha:%Y-%m-%d}"),
+                ('Contacto', info['nombre_contacto']),
+                ('Correo', info['correo_contacto']),
+                ('Teléfono', info['telefono_contacto']),
+            ]
+            tareas.append((pedido, os.path.join(self.ruta_salida, pedido), encabezado, lineas_pedido))
+
+        archivos = {}
+        if self.procesos == 1 or len(tareas) == 1:
+            for pedido, ruta, encabezado, lineas_pedido in tareas:
+                archivos[pedido] = renderizar_pedido(ruta, encabezado, lineas_pedido, self.formato)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                futuros = {
+                    pool.submit(renderizar_pedido, ruta, encabezado, lineas_pedido, self.formato): pedido
+                    for pedido, ruta, encabezado, lineas_pedido in tareas
+                }
+                for futuro in concurrent.futures.as_completed(futuros):
+                    pedido = futuros[futuro]
+                    try:
+                        archivos[pedido] = futuro.result()
+                    except Exception as e:
+                        if self.logger:
+                            self.logger.error(f"❌ Error escribiendo el pedido {pedido}: {e}")
+
+        manifiesto = pedidos.copy()
+        manifiesto['archivo'] = manifiesto['pedido'].map(
+            lambda pedido: os.path.basename(archivos[pedido]) if pedido in archivos else None
+        )
+        manifiesto.to_csv(os.path.join(self.ruta_salida, ARCHIVO_MANIFIESTO), index=False, encoding='utf-8-sig')
+
+        if self.logger:
+            self.logger.info(
+                f"💾 {len(archivos)}/{len(tareas)} pedidos escritos en {self.ruta_salida} "
+                f"({self.formato}, {min(self.procesos, len(tareas))} procesos)"
+            )
+        return manifiesto
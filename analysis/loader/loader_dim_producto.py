@@ -2,22 +2,136 @@
 
 from sqlalchemy import create_engine, text
 from utils.db_connection import get_mysql_url
+from analysis.loader.maestra_integrada import MaestraIntegrada, TABLA_MAESTRA_INTEGRADA
 
 """
 Este loader implementa SCD-2 optimizado evitando largos CTE en una sola transacción.
 Se generan tablas temporales para "integr" y "changed", luego se ejecutan
 UPDATE e INSERT en bloques separados para reducir bloqueos.
+
+La detección de cambios compara un hash SHA1 de los atributos seguidos
+(row_hash) en lugar de columna por columna: se guarda en dim_producto y se
+indexa junto con (codigo, flag_actual), así que la comparación contra la
+versión vigente se resuelve desde el índice.
+
+La fuente es la tabla maestra_integrada (ver analysis/loader/maestra_integrada.py),
+que se actualiza de forma incremental antes de cada carga en lugar de
+recalcular vw_maestra_integrada completa.
 """
 
+# Atributos seguidos por SCD-2 y el tipo con que entran al hash. Los numéricos
+# se fijan a un DECIMAL para que el texto del hash no dependa del tipo de origen.
+COLUMNAS_HASH_DIM_PRODUCTO = {
+    'nuevo_codigo': None,
+    'codigo_barras': None,
+    'nombre': None,
+    'laboratorio': None,
+    'principio_activo': None,
+    'marca': None,
+    'departamento': None,
+    'categoria': None,
+    'subcategoria': None,
+    'pvp': 'DECIMAL(18,2)',
+    'costo_promedio': 'DECIMAL(18,4)',
+    'grupo_i': None,
+    'grupo_ii': None,
+    'grupo_iii': None,
+    'grupo_iv': None,
+    'grupo_v': None,
+    'grupo_vi': None,
+    'unidad_medida': None,
+    'tipo_producto': None,
+    'porcentaje_descuento': 'DECIMAL(18,4)',
+    'proveedor': None,
+    'clasificacion': None,
+    'componente': None,
+    'sustituto': None,
+    'estado': None,
+}
+
+
+def expresion_row_hash(alias=None):
+    """
+    Expresión SQL del hash de los atributos seguidos.
+
+    Los nulos se marcan con CHAR(0) para distinguirlos del texto vacío y los
+    campos se separan con CHAR(31) (separador de unidad); ninguno de los dos
+    aparece en los datos de la maestra.
+
+    Args:
+        alias (str, optional): Alias de la tabla cuyas columnas se usan
+
+    Returns:
+        str: Expresión SHA1(...) de 40 caracteres hexadecimales
+    """
+    prefijo = f"{alias}." if alias else ""
+    campos = []
+    for columna, tipo in COLUMNAS_HASH_DIM_PRODUCTO.items():
+        valor = f"CAST({prefijo}{columna} AS {tipo})" if tipo else f"{prefijo}{columna}"
+        campos.append(f"IFNULL(CAST({valor} AS CHAR), CHAR(0))")
+    return f"SHA1(CONCAT_WS(CHAR(31), {', '.join(campos)}))"
+
+
+def asegurar_row_hash(conn):
+    """
+    Crea en dim_producto la columna row_hash y su índice si no existen, y
+    calcula el hash de las versiones vigentes que aún no lo tienen.
+
+    Args:
+        conn: Conexión (transacción) a la base de datos
+
+    Returns:
+        int: Versiones vigentes a las que se les calculó el hash
+    """
+    columnas = {
+        fila[0] for fila in conn.execute(text("""
+            SELECT COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'dim_producto'
+        """))
+    }
+    if 'row_hash' not in columnas:
+        conn.execute(text("ALTER TABLE dim_producto ADD COLUMN row_hash CHAR(40) NULL AFTER estado"))
+
+    indices = {
+        fila[0] for fila in conn.execute(text("""
+            SELECT INDEX_NAME
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'dim_producto'
+        """))
+    }
+    if 'idx_dim_producto_hash' not in indices:
+        conn.execute(text("CREATE INDEX idx_dim_producto_hash ON dim_producto (codigo, flag_actual, row_hash)"))
+
+    # Las columnas guardadas ya están normalizadas, así que el hash coincide con el de tmp_integr
+    resultado = conn.execute(text(f"""
+        UPDATE dim_producto d
+        SET d.row_hash = {expresion_row_hash('d')}
+        WHERE d.flag_actual = TRUE AND d.row_hash IS NULL;
+    """))
+    return resultado.rowcount
+
 def load_dim_producto(db_name: str):
     """
     Ejecuta SCD-2 de dim_producto en MySQL con tablas temporales para minimizar bloqueos.
     """
+    if not MaestraIntegrada(db_name=db_name).actualizar():
+        raise RuntimeError(f"No se pudo actualizar {TABLA_MAESTRA_INTEGRADA}")
+
     engine = create_engine(get_mysql_url(db_name))
     with engine.begin() as conn:
-        # 1) Crear tabla temporal con valores normalizados de la vista integrada
-        conn.execute(text("""
-            CREATE TEMPORARY TABLE tmp_integr AS
+        # 0) Columna e índice de hash; hash inicial de las versiones vigentes
+        backfill = asegurar_row_hash(conn)
+        if backfill:
+            print(f"✅ Hash calculado para versiones vigentes: {backfill}")
+
+        # 1) Crear tabla temporal con valores normalizados de la maestra integrada
+        conn.execute(text(f"""
+            CREATE TEMPORARY TABLE tmp_integr (INDEX idx_tmp_integr_codigo (codigo)) AS
+            SELECT n.*, {expresion_row_hash('n')} AS row_hash
+            FROM (
             SELECT
               codigo,
               TRIM(LOWER(nuevo_codigo))        AS nuevo_codigo,
@@ -45,41 +159,17 @@ def load_dim_producto(db_name: str):
               TRIM(LOWER(componente))          AS componente,
               TRIM(LOWER(sustituto))           AS sustituto,
               TRIM(LOWER(estado))              AS estado
-            FROM vw_maestra_integrada;
+            FROM maestra_integrada
+            ) n;
         """))
 
-        # 2) Crear tabla temporal con códigos que cambiaron
+        # 2) Crear tabla temporal con códigos que cambiaron (una comparación de hash por código)
         conn.execute(text("""
-            CREATE TEMPORARY TABLE tmp_changed AS
-            SELECT i.codigo
+            CREATE TEMPORARY TABLE tmp_changed (PRIMARY KEY (codigo)) AS
+            SELECT DISTINCT i.codigo
             FROM tmp_integr i
             JOIN dim_producto d ON d.codigo = i.codigo AND d.flag_actual = TRUE
-            WHERE
-              NOT (d.nuevo_codigo    <=> i.nuevo_codigo)
-            OR NOT (d.codigo_barras <=> i.codigo_barras)
-            OR NOT (d.nombre        <=> i.nombre)
-            OR NOT (d.laboratorio   <=> i.laboratorio)
-            OR NOT (d.principio_activo <=> i.principio_activo)
-            OR NOT (d.marca         <=> i.marca)
-            OR NOT (d.departamento  <=> i.departamento)
-            OR NOT (d.categoria     <=> i.categoria)
-            OR NOT (d.subcategoria  <=> i.subcategoria)
-            OR NOT (d.pvp           <=> i.pvp)
-            OR NOT (d.costo_promedio <=> i.costo_promedio)
-            OR NOT (d.grupo_i       <=> i.grupo_i)
-            OR NOT (d.grupo_ii      <=> i.grupo_ii)
-            OR NOT (d.grupo_iii     <=> i.grupo_iii)
-            OR NOT (d.grupo_iv      <=> i.grupo_iv)
-            OR NOT (d.grupo_v       <=> i.grupo_v)
-            OR NOT (d.grupo_vi      <=> i.grupo_vi)
-            OR NOT (d.unidad_medida <=> i.unidad_medida)
-            OR NOT (d.tipo_producto <=> i.tipo_producto)
-            OR NOT (d.porcentaje_descuento <=> i.porcentaje_descuento)
-            OR NOT (d.proveedor    <=> i.proveedor)
-            OR NOT (d.clasificacion <=> i.clasificacion)
-            OR NOT (d.componente   <=> i.componente)
-            OR NOT (d.sustituto    <=> i.sustituto)
-            OR NOT (d.estado       <=> i.estado);
+            WHERE NOT (d.row_hash <=> i.row_hash);
         """))
 
         # 3) Expirar versiones antiguas solo para códigos cambiados
@@ -100,7 +190,7 @@ def load_dim_producto(db_name: str):
               grupo_i, grupo_ii, grupo_iii, grupo_iv, grupo_v, grupo_vi,
               unidad_medida, tipo_producto, porcentaje_descuento,
               proveedor, clasificacion, componente, sustituto,
-              estado, fecha_inicio, flag_actual, fecha_actualizacion
+              estado, row_hash, fecha_inicio, flag_actual, fecha_actualizacion
             )
             SELECT
               i.codigo,
@@ -124,6 +214,7 @@ def load_dim_producto(db_name: str):
               i.componente,
               i.sustituto,
               i.estado,
+              i.row_hash,
               CURDATE(),
               TRUE,
               CURRENT_TIMESTAMP
@@ -0,0 +1,185 @@
+# analysis/loader/loader_fact_inventario_producto.py
+
+import pandas as pd
+from sqlalchemy import text, inspect as sqlalchemy_inspect
+from analysis.loader.loader_base import BaseLoader
+from analysis.transformer.transformer_fact_inventario_producto import COLUMNAS_FACT_INVENTARIO_PRODUCTO
+
+TABLA_FACT_INVENTARIO_PRODUCTO = "fact_inventario_producto"
+
+# Partición comodín que recibe fechas posteriores a la última partición mensual
+PARTICION_FUTURO = "p_futuro"
+
+DDL_FACT_INVENTARIO_PRODUCTO = """
+CREATE TABLE IF NOT EXISTS {tabla} (
+    fecha DATE NOT NULL,
+    codigo_pdv VARCHAR(20) NOT NULL,
+    codigo_producto VARCHAR(50) NOT NULL,
+    unidades DECIMAL(14,2) NOT NULL DEFAULT 0,
+    costo_unitario DECIMAL(16,4) NOT NULL DEFAULT 0,
+    costo_total DECIMAL(18,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (codigo_pdv, codigo_producto, fecha),
+    KEY idx_fecha (fecha)
+)
+PARTITION BY RANGE (TO_DAYS(fecha)) (
+    PARTITION {futuro} VALUES LESS THAN MAXVALUE
+)
+"""
+
+
+class LoaderFactInventarioProducto(BaseLoader):
+    """
+    Cargador de fact_inventario_producto: fotos diarias de inventario por
+    PDV×producto comprimidas por longitud de corrida (solo filas con cambios).
+
+    La tabla se particiona por mes sobre la fecha (RANGE TO_DAYS) y cada carga
+    reemplaza la foto de su fecha en una sola transacción con inserción por
+    lotes. Las fotos se deben cargar en orden cronológico: la compresión de un
+    día depende del estado acumulado hasta el día anterior, así que una fecha
+    anterior a la última cargada se rechaza salvo que se pida reconstruir.
+    """
+
+    def __init__(self, logger=None):
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def crear_tabla(self, nombre_tabla=TABLA_FACT_INVENTARIO_PRODUCTO):
+        """Crea la tabla particionada si no existe"""
+        with self.engine.begin() as connection:
+            connection.execute(text(DDL_FACT_INVENTARIO_PRODUCTO.format(tabla=nombre_tabla, futuro=PARTICION_FUTURO)))
+
+    def asegurar_particion(self, fecha, nombre_tabla=TABLA_FACT_INVENTARIO_PRODUCTO):
+        """
+        Crea la partición mensual de la fecha separándola de p_futuro.
+
+        Args:
+            fecha (date): Fecha de la foto a cargar
+        """
+        mes = pd.Timestamp(fecha).to_period('M')
+        particion = f"p{mes:%Y%m}"
+        limite = (mes + 1).start_time.date()
+
+        with self.engine.begin() as connection:
+            existentes = {
+                fila[0]: fila[1] for fila in connection.execute(text("""
+                    SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+                    FROM information_schema.PARTITIONS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla
+                """), {'tabla': nombre_tabla})
+            }
+            if particion in existentes:
+                return
+            if PARTICION_FUTURO not in existentes:
+                # Tabla creada sin el esquema de particiones: se carga igual
+                if self.logger:
+                    self.logger.warning(f"⚠️ '{nombre_tabla}' no tiene la partición {PARTICION_FUTURO}, se omite el particionado")
+                return
+
+            # Solo se divide p_futuro; una fecha anterior a la última partición ya cae en una existente
+            limite_dias = connection.execute(text("SELECT TO_DAYS(:limite)"), {'limite': limite}).scalar()
+            limites = [int(valor) for valor in existentes.values() if valor and valor != 'MAXVALUE']
+            if limites and limite_dias <= max(limites):
+                return
+
+            connection.execute(text(f"""
+                ALTER TABLE {nombre_tabla} REORGANIZE PARTITION {PARTICION_FUTURO} INTO (
+                    PARTITION {particion} VALUES LESS THAN (TO_DAYS('{limite}')),
+                    PARTITION {PARTICION_FUTURO} VALUES LESS THAN MAXVALUE
+                )
+            """))
+        if self.logger:
+            self.logger.info(f"🧱 Partición {particion} creada en '{nombre_tabla}'")
+
+    def estado_a_fecha(self, fecha, incluir_fecha=True, nombre_tabla=TABLA_FACT_INVENTARIO_PRODUCTO):
+        """
+        Reconstruye el inventario de un día: la última fila de cada PDV×producto
+        con fecha menor o igual (o solo menor) a la dada.
+
+        Args:
+            fecha (date): Día a reconstruir
+            incluir_fecha (bool): False para el estado anterior a la fecha (base de la compresión)
+
+        Returns:
+            pd.DataFrame: codigo_pdv, codigo_producto, fecha, unidades, costo_unitario, costo_total
+        """
+        operador = "<=" if incluir_fecha else "<"
+        with self.engine.connect() as connection:
+            if not sqlalchemy_inspect(connection).has_table(nombre_tabla):
+                return pd.DataFrame(columns=COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+            return pd.read_sql(text(f"""
+                SELECT f.codigo_pdv, f.codigo_producto, f.fecha, f.unidades, f.costo_unitario, f.costo_total
+                FROM {nombre_tabla} f
+                JOIN (
+                    SELECT codigo_pdv, codigo_producto, MAX(fecha) AS fecha
+                    FROM {nombre_tabla}
+                    WHERE fecha {operador} :fecha
+                    GROUP BY codigo_pdv, codigo_producto
+                ) u ON u.codigo_pdv = f.codigo_pdv
+                   AND u.codigo_producto = f.codigo_producto
+                   AND u.fecha = f.fecha
+            """), connection, params={'fecha': pd.Timestamp(fecha).date()})
+
+    def ultima_fecha(self, nombre_tabla=TABLA_FACT_INVENTARIO_PRODUCTO):
+        """Fecha de la última foto cargada, o None si la tabla está vacía o no existe"""
+        with self.engine.connect() as connection:
+            if not sqlalchemy_inspect(connection).has_table(nombre_tabla):
+                return None
+            return connection.execute(text(f"SELECT MAX(fecha) FROM {nombre_tabla}")).scalar()
+
+    def cargar_dataframe(self, df, fecha, nombre_tabla=TABLA_FACT_INVENTARIO_PRODUCTO, reconstruir=False):
+        """
+        Reemplaza la foto comprimida de una fecha.
+
+        Args:
+            df (pd.DataFrame): Filas con cambios (COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+            fecha (date): Fecha de la foto
+            nombre_tabla (str): Tabla destino
+            reconstruir (bool): Permite cargar una fecha anterior a la última foto;
+                las fotos posteriores se deben recargar después en orden
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            fecha = pd.Timestamp(fecha).date()
+            ultima = self.ultima_fecha(nombre_tabla)
+            if ultima is not None and fecha < pd.Timestamp(ultima).date():
+                if not reconstruir:
+                    mensaje_error = (
+                        f"❌ La foto del {fecha} es anterior a la última cargada en '{nombre_tabla}' ({ultima}); "
+                        f"use reconstruir para recargarla y luego recargue en orden las fechas posteriores"
+                    )
+                    print(mensaje_error)
+                    if self.logger:
+                        self.logger.error(mensaje_error)
+                    return False
+                if self.logger:
+                    self.logger.warning(
+                        f"⚠️ Reconstruyendo la foto del {fecha} (última cargada: {ultima}); "
+                        f"recargue en orden las fechas posteriores"
+                    )
+
+            self.crear_tabla(nombre_tabla)
+            self.asegurar_particion(fecha, nombre_tabla)
+
+            registros = df[COLUMNAS_FACT_INVENTARIO_PRODUCTO].to_dict('records')
+            columnas = ", ".join(COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+            parametros = ", ".join(f":{columna}" for columna in COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+
+            # Borrado e inserción en la misma transacción: una recarga del día no deja la foto a medias
+            with self.engine.begin() as connection:
+                connection.execute(text(f"DELETE FROM {nombre_tabla} WHERE fecha = :fecha"), {'fecha': fecha})
+                if registros:
+                    connection.execute(text(f"INSERT INTO {nombre_tabla} ({columnas}) VALUES ({parametros})"), registros)
+
+            mensaje_exito = f"✅ Tabla '{nombre_tabla}' cargada con éxito para {fecha}. Registros: {len(registros)}"
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar tabla '{nombre_tabla}': {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
@@ -1,10 +1,79 @@
 # analysis/loader/loader_fact_rotacion.py
 
+from contextlib import nullcontext
+
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from utils.db_connection import get_mysql_url
 from analysis.loader.loader_base import BaseLoader
 
+def eliminar_periodo_pdv(connection, codigos_pdv, fecha):
+    """
+    Elimina de fact_rotacion el corte PDV-mes que se va a reconstruir.
+
+    Args:
+        connection: Conexión (transacción) a la base de datos
+        codigos_pdv (list): Códigos de PDV a reemplazar
+        fecha (date): Cualquier fecha del mes a reemplazar
+
+    Returns:
+        int: Filas eliminadas
+    """
+    if not codigos_pdv:
+        return 0
+
+    inicio_mes = pd.Timestamp(fecha).to_period('M').start_time.date()
+    fin_mes = pd.Timestamp(fecha).to_period('M').end_time.date()
+
+    query = text("""
+        DELETE FROM fact_rotacion
+        WHERE codigo_pdv IN :codigos_pdv
+          AND fecha BETWEEN :inicio_mes AND :fin_mes
+    """).bindparams(bindparam("codigos_pdv", expanding=True))
+
+    resultado = connection.execute(
+        query,
+        {"codigos_pdv": [str(c) for c in codigos_pdv], "inicio_mes": inicio_mes, "fin_mes": fin_mes}
+    )
+    return resultado.rowcount
+
+
+# Columnas de clasificación calculadas en el transform (antes UPDATE de ajustar_fact_rotacion.sql)
+DEFINICION_COLUMNAS_CLASIFICACION = {
+    'abc_clasificacion': "VARCHAR(1) NULL AFTER rotacion_mes",
+    'estado_inventario': "VARCHAR(10) NULL AFTER dias_inventario",
+    'semanas_inventario': "DECIMAL(10,2) NULL AFTER dias_inventario",
+    'inventario_critico': "BOOLEAN NULL AFTER estado_inventario",
+    'alta_rentabilidad': "BOOLEAN NULL AFTER margen_porcentaje",
+}
+
+
+def asegurar_columnas_clasificacion(connection):
+    """
+    Crea en fact_rotacion las columnas de clasificación que aún no existan.
+
+    Args:
+        connection: Conexión (transacción) a la base de datos
+
+    Returns:
+        list: Columnas creadas
+    """
+    existentes = {
+        fila[0] for fila in connection.execute(text("""
+            SELECT COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'fact_rotacion'
+        """))
+    }
+    creadas = []
+    for columna, definicion in DEFINICION_COLUMNAS_CLASIFICACION.items():
+        if columna not in existentes:
+            connection.execute(text(f"ALTER TABLE fact_rotacion ADD COLUMN {columna} {definicion}"))
+            creadas.append(columna)
+    return creadas
+
+
 class LoaderFactRotacion(BaseLoader):
     """
     Cargador especializado para la tabla fact_rotacion.
@@ -20,7 +89,7 @@ class LoaderFactRotacion(BaseLoader):
         """
         super().__init__(db_name="gestion_compras", logger=logger)
         
-    def cargar_dataframe(self, df, nombre_tabla=None):
+    def cargar_dataframe(self, df, nombre_tabla=None, reemplazar_pdvs=None):
         """
         Carga los datos de rotación a la tabla fact_rotacion usando una estrategia
         de procesamiento por lotes.
@@ -28,6 +97,7 @@ class LoaderFactRotacion(BaseLoader):
         Args:
             df (pandas.DataFrame): DataFrame con los datos a cargar
             nombre_tabla (str, optional): Ignorado, siempre se usa 'fact_rotacion'
+            reemplazar_pdvs (list, optional): PDVs cuyo corte del mes se elimina antes de cargar
             
         Returns:
             bool: True si la carga fue exitosa, False en caso contrario
@@ -41,6 +111,11 @@ class LoaderFactRotacion(BaseLoader):
             # Siempre usar fact_rotacion independientemente del nombre_tabla proporcionado
             nombre_tabla_destino = "fact_rotacion"
             
+            with self.engine.begin() as connection:
+                creadas = asegurar_columnas_clasificacion(connection)
+            if creadas and self.logger:
+                self.logger.info(f"🧱 Columnas creadas en fact_rotacion: {', '.join(creadas)}")
+            
             # Procesar en lotes para evitar problemas de memoria y bloqueos
             tamaño_lote = 100  # Número de registros por lote
             total_registros = len(df)
@@ -49,34 +124,16 @@ class LoaderFactRotacion(BaseLoader):
             if self.logger:
                 self.logger.info(f"📦 Procesando {total_registros} registros en {len(lotes)} lotes")
             
-            # Contadores para estadísticas
-            registros_actualizados = 0
-            registros_insertados = 0
-            
-            # Procesar cada lote
-            for i, lote in enumerate(lotes):
-                if self.logger:
-                    self.logger.info(f"🔄 Procesando lote {i+1}/{len(lotes)} ({len(lote)} registros)")
-                
-                # Usar una transacción por lote
+            if reemplazar_pdvs:
+                # Reemplazar solo el corte PDV-mes de las fuentes que cambiaron: el borrado y
+                # la recarga van en una sola transacción para no dejar el mes vacío si algo falla
                 with self.engine.begin() as connection:
-                    for _, row in lote.iterrows():
-                        # Comprobar si ya existe este registro
-                        existe = self._verificar_registro_existente(
-                            connection, 
-                            row['codigo_producto'], 
-                            row['codigo_pdv'], 
-                            row['fecha']
-                        )
-                        
-                        if existe:
-                            # Actualizar registro existente
-                            self._actualizar_registro(connection, row)
-                            registros_actualizados += 1
-                        else:
-                            # Insertar nuevo registro
-                            self._insertar_registro(connection, row)
-                            registros_insertados += 1
+                    eliminados = eliminar_periodo_pdv(connection, reemplazar_pdvs, df['fecha'].max())
+                    if self.logger:
+                        self.logger.info(f"🗑️ Eliminadas {eliminados} filas del mes para PDVs {', '.join(map(str, reemplazar_pdvs))}")
+                    registros_insertados, registros_actualizados = self._procesar_lotes(lotes, connection)
+            else:
+                registros_insertados, registros_actualizados = self._procesar_lotes(lotes)
             
             # Registrar resultado
             mensaje_exito = (
@@ -100,6 +157,46 @@ class LoaderFactRotacion(BaseLoader):
                 
             return False
     
+    def _procesar_lotes(self, lotes, connection=None):
+        """
+        Inserta o actualiza cada fila de los lotes.
+        
+        Args:
+            lotes (list): DataFrames a procesar
+            connection (optional): Transacción abierta a usar para todos los lotes;
+                sin ella se usa una transacción por lote
+            
+        Returns:
+            tuple: (registros insertados, registros actualizados)
+        """
+        registros_insertados = 0
+        registros_actualizados = 0
+        
+        for i, lote in enumerate(lotes):
+            if self.logger:
+                self.logger.info(f"🔄 Procesando lote {i+1}/{len(lotes)} ({len(lote)} registros)")
+            
+            with nullcontext(connection) if connection is not None else self.engine.begin() as conexion_lote:
+                for _, row in lote.iterrows():
+                    # Comprobar si ya existe este registro
+                    existe = self._verificar_registro_existente(
+                        conexion_lote, 
+                        row['codigo_producto'], 
+                        row['codigo_pdv'], 
+                        row['fecha']
+                    )
+                    
+                    if existe:
+                        # Actualizar registro existente
+                        self._actualizar_registro(conexion_lote, row)
+                        registros_actualizados += 1
+                    else:
+                        # Insertar nuevo registro
+                        self._insertar_registro(conexion_lote, row)
+                        registros_insertados += 1
+        
+        return registros_insertados, registros_actualizados
+    
     def _verificar_registro_existente(self, connection, codigo_producto, codigo_pdv, fecha):
         """
         Verifica si ya existe un registro para la combinación de producto, PDV y fecha.
@@ -162,6 +259,11 @@ class LoaderFactRotacion(BaseLoader):
                 inventario_unidades_final = :inventario_unidades_final,
                 dias_inventario = :dias_inventario,
                 rotacion_mes = :rotacion_mes,
+                abc_clasificacion = :abc_clasificacion,
+                estado_inventario = :estado_inventario,
+                semanas_inventario = :semanas_inventario,
+                inventario_critico = :inventario_critico,
+                alta_rentabilidad = :alta_rentabilidad,
                 fecha_actualizacion = NOW()
             WHERE 
                 codigo_producto = :codigo_producto
@@ -188,6 +290,7 @@ class LoaderFactRotacion(BaseLoader):
                 "inventario_unidades_final": row.get('inventario_unidades_final', 0),
                 "dias_inventario": row.get('dias_inventario', 0),
                 "rotacion_mes": row.get('rotacion_mes', 0),
+                **self._parametros_clasificacion(row),
                 "codigo_producto": row.get('codigo_producto'),
                 "codigo_pdv": row.get('codigo_pdv'),
                 "fecha": row.get('fecha')
@@ -214,6 +317,8 @@ class LoaderFactRotacion(BaseLoader):
                 margen_bruto, margen_porcentaje,
                 inventario_unidades_inicial, inventario_unidades_final,
                 dias_inventario, rotacion_mes,
+                abc_clasificacion, estado_inventario, semanas_inventario,
+                inventario_critico, alta_rentabilidad,
                 fecha_carga, fecha_actualizacion
             ) VALUES (
                 :producto_sk, :pdv_sk, :fecha_sk, :codigo_producto, :codigo_pdv, :fecha,
@@ -223,6 +328,8 @@ class LoaderFactRotacion(BaseLoader):
                 :margen_bruto, :margen_porcentaje,
                 :inventario_unidades_inicial, :inventario_unidades_final,
                 :dias_inventario, :rotacion_mes,
+                :abc_clasificacion, :estado_inventario, :semanas_inventario,
+                :inventario_critico, :alta_rentabilidad,
                 NOW(), NOW()
             )
         """)
@@ -248,6 +355,16 @@ class LoaderFactRotacion(BaseLoader):
                 "inventario_unidades_inicial": row.get('inventario_unidades_inicial', 0),
                 "inventario_unidades_final": row.get('inventario_unidades_final', 0),
                 "dias_inventario": row.get('dias_inventario', 0),
-                "rotacion_mes": row.get('rotacion_mes', 0)
+                "rotacion_mes": row.get('rotacion_mes', 0),
+                **self._parametros_clasificacion(row)
             }
         )
+    
+    @staticmethod
+    def _parametros_clasificacion(row):
+        """Parámetros de las columnas de clasificación (None si el frame no las trae)"""
+        parametros = {columna: row.get(columna) for columna in DEFINICION_COLUMNAS_CLASIFICACION}
+        for columna in ('inventario_critico', 'alta_rentabilidad'):
+            if parametros[columna] is not None:
+                parametros[columna] = bool(parametros[columna])
+        return parametros
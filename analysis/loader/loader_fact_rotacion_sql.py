@@ -0,0 +1,328 @@
+# analysis/loader/loader_fact_rotacion_sql.py
+
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+from analysis.loader.loader_base import BaseLoader
+from analysis.loader.create_dim_fecha import asegurar_fechas
+from analysis.loader.loader_fact_rotacion import eliminar_periodo_pdv, asegurar_columnas_clasificacion
+from analysis.transformer.transformer_fact_rotacion import (
+    UMBRALES_ABC_ROTACION, UMBRALES_ABC_PARETO, METODOS_ABC,
+    TRAMOS_ESTADO_INVENTARIO, ESTADO_INVENTARIO_EXCESO,
+    DIAS_INVENTARIO_CRITICO, MARGEN_ALTA_RENTABILIDAD, COLUMNAS_CLASIFICACION_ROTACION
+)
+from analysis.extractor.esquema_staging import EsquemaStaging
+from analysis.extractor.indice_exclusion import IndiceExclusion, MOTIVOS_POR_ETAPA
+
+INDICE_UNICO_FACT_ROTACION = "uq_fact_rotacion_producto_pdv_fecha"
+
+COLUMNAS_FACT_ROTACION = [
+    'producto_sk', 'pdv_sk', 'fecha_sk',
+    'codigo_producto', 'codigo_pdv', 'fecha',
+    'venta_unidades', 'venta_cajas', 'venta_blisters',
+    'costo_unitario', 'precio_venta_unitario',
+    'costo_total', 'venta_total',
+    'margen_bruto', 'margen_porcentaje',
+    'inventario_unidades_inicial', 'inventario_unidades_final',
+    'dias_inventario', 'rotacion_mes'
+] + COLUMNAS_CLASIFICACION_ROTACION
+
+
+class LoaderFactRotacionSQL(BaseLoader):
+    """
+    Motor SQL para fact_rotacion: construye la tabla de hechos completamente
+    dentro de MySQL con un único INSERT ... SELECT sobre las tablas stg_rotacion_*,
+    sin traer los datos a pandas.
+
+    Replica las reglas del motor pandas (ExtractorFactRotacion de todos los PDVs +
+    TransformadorFactRotacion + LoaderFactRotacion): valores nulos a 0, días de
+    inventario acotados a [0, 90], rotación acotada a [0, 30] y margen máximo 100%,
+    además de la clasificación ABC y el estado del inventario. Con un
+    IndiceExclusion los productos excluidos se descartan dentro de la misma
+    consulta (NOT EXISTS contra el índice materializado).
+    """
+
+    def __init__(self, logger=None, esquema=None, abc_metodo='rotacion', exclusion=None):
+        """
+        Inicializa el motor SQL.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+            esquema (EsquemaStaging, optional): Catálogo staging ya cargado para reutilizar
+            abc_metodo (str): 'rotacion' o 'pareto' (ver TransformadorFactRotacion)
+            exclusion (IndiceExclusion, optional): Productos a descartar con los
+                motivos de la etapa 'rotacion'
+        """
+        if abc_metodo not in METODOS_ABC:
+            raise ValueError(f"Método ABC no soportado: {abc_metodo}. Opciones: {', '.join(METODOS_ABC)}")
+        super().__init__(db_name="gestion_compras", logger=logger)
+        self.esquema = esquema or EsquemaStaging(self.engine, logger=logger)
+        self.abc_metodo = abc_metodo
+        self.exclusion = exclusion
+
+    def _tablas_con_pdv(self, tablas=None):
+        """
+        Obtiene las tablas de rotación junto con el código de PDV de su nombre.
+
+        Formato esperado: stg_rotacion_de_NOMBRE_PDV_CODIGO_NUMERO
+
+        Args:
+            tablas (list, optional): Subconjunto de tablas; por defecto todas las stg_rotacion_*
+
+        Returns:
+            list: Tuplas (nombre_tabla, codigo_pdv)
+        """
+        tablas = tablas if tablas is not None else self.esquema.tablas("stg_rotacion_")
+        resultado = []
+        for tabla in tablas:
+            partes = tabla.split('_')
+            codigo_pdv = partes[-2] if len(partes) >= 3 else None
+            if codigo_pdv and codigo_pdv.isdigit() and 'de' in partes:
+                resultado.append((tabla, codigo_pdv))
+            elif self.logger:
+                self.logger.warning(f"⚠️ No se pudo extraer código PDV válido de tabla: {tabla}")
+        return resultado
+
+    def construir_select(self, tablas=None, fecha=None):
+        """
+        Genera el SELECT que calcula las filas de fact_rotacion dentro de MySQL.
+
+        Args:
+            tablas (list, optional): Tablas staging a incluir
+            fecha (date, optional): Fecha de la foto; por defecto hoy
+
+        Returns:
+            str: Sentencia SELECT (None si no hay tablas)
+        """
+        tablas_pdv = self._tablas_con_pdv(tablas)
+        if not tablas_pdv:
+            return None
+
+        fecha = fecha or date.today()
+
+        subconsultas = [
+            f"SELECT {self.esquema.proyeccion(tabla)}, '{codigo_pdv}' AS codigo_pdv, {orden} AS orden_tabla "
+            f"FROM `{tabla}`"
+            for orden, (tabla, codigo_pdv) in enumerate(tablas_pdv)
+        ]
+        union_staging = "\n                UNION ALL\n                ".join(subconsultas)
+
+        filtro_exclusion = ""
+        if self.exclusion is not None:
+            filtro_exclusion = "WHERE " + IndiceExclusion.condicion_sql(
+                "m.codigo_producto", MOTIVOS_POR_ETAPA['rotacion']
+            )
+
+        base = f"""
+            SELECT
+                pr.producto_sk,
+                p.pdv_sk,
+                f.fecha_key AS fecha_sk,
+                m.codigo_producto,
+                m.codigo_pdv,
+                f.fecha,
+                m.venta_unidades,
+                0 AS venta_cajas,
+                0 AS venta_blisters,
+                m.costo_unitario,
+                m.precio_venta_unitario,
+                m.costo_total,
+                m.venta_total,
+                m.margen_bruto,
+                CASE WHEN m.venta_total > 0
+                     THEN LEAST(100, m.margen_bruto / m.venta_total * 100)
+                     ELSE 0 END AS margen_porcentaje,
+                0 AS inventario_unidades_inicial,
+                m.inventario_unidades_final,
+                m.dias_inventario,
+                LEAST(GREATEST(CASE WHEN m.dias_inventario > 0 THEN 30 / m.dias_inventario ELSE 0 END, 0), 30) AS rotacion_mes,
+                m.orden_tabla
+            FROM (
+                SELECT
+                    TRIM(CAST(s.codigo_producto AS CHAR)) AS codigo_producto,
+                    s.codigo_pdv,
+                    s.orden_tabla,
+                    COALESCE(s.venta_unidades, 0) AS venta_unidades,
+                    COALESCE(s.costo_total, 0) AS costo_total,
+                    COALESCE(s.venta_total, 0) AS venta_total,
+                    COALESCE(s.inventario_unidades_final, 0) AS inventario_unidades_final,
+                    COALESCE(s.venta_total - s.costo_total, 0) AS margen_bruto,
+                    COALESCE(CASE WHEN s.venta_unidades > 0 THEN s.costo_total / s.venta_unidades ELSE 0 END, 0) AS costo_unitario,
+                    COALESCE(CASE WHEN s.venta_unidades > 0 THEN s.venta_total / s.venta_unidades ELSE 0 END, 0) AS precio_venta_unitario,
+                    COALESCE(CASE WHEN s.venta_unidades > 0
+                                  THEN LEAST(GREATEST(s.inventario_unidades_final * 30 / s.venta_unidades, 0), 90)
+                                  ELSE 90 END, 0) AS dias_inventario
+                FROM (
+                {union_staging}
+                ) AS s
+            ) AS m
+            JOIN dim_pdv p ON p.codigo_pdv = m.codigo_pdv
+            JOIN dim_fecha f ON f.fecha = '{fecha.isoformat()}'
+            LEFT JOIN (
+                SELECT codigo, MAX(producto_sk) AS producto_sk
+                FROM dim_producto
+                GROUP BY codigo
+            ) pr ON pr.codigo = m.codigo_producto
+            {filtro_exclusion}
+        """
+
+        estado = " ".join(
+            f"WHEN b.dias_inventario <= {limite} THEN '{nombre}'" for limite, nombre in TRAMOS_ESTADO_INVENTARIO
+        )
+        return f"""
+            SELECT
+                b.*,
+                {self._expresion_abc()} AS abc_clasificacion,
+                CASE {estado} ELSE '{ESTADO_INVENTARIO_EXCESO}' END AS estado_inventario,
+                ROUND(b.dias_inventario / 7, 2) AS semanas_inventario,
+                b.dias_inventario < {DIAS_INVENTARIO_CRITICO} AS inventario_critico,
+                b.margen_porcentaje > {MARGEN_ALTA_RENTABILIDAD} AS alta_rentabilidad
+            FROM ({base}) AS b
+        """
+
+    def _expresion_abc(self):
+        """Expresión SQL de la clase ABC según el método configurado"""
+        if self.abc_metodo == 'rotacion':
+            return (
+                f"CASE WHEN b.rotacion_mes >= {UMBRALES_ABC_ROTACION['A']} THEN 'A' "
+                f"WHEN b.rotacion_mes >= {UMBRALES_ABC_ROTACION['B']} THEN 'B' ELSE 'C' END"
+            )
+
+        # Pareto: participación de la venta acumulada del PDV antes de la fila
+        venta = "GREATEST(b.venta_total, 0)"
+        previo = (
+            f"COALESCE(SUM({venta}) OVER (PARTITION BY b.codigo_pdv ORDER BY {venta} DESC, b.codigo_producto "
+            f"ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0)"
+        )
+        total = f"NULLIF(SUM({venta}) OVER (PARTITION BY b.codigo_pdv), 0)"
+        return (
+            f"CASE WHEN {venta} <= 0 THEN 'C' "
+            f"WHEN {previo} / {total} < {UMBRALES_ABC_PARETO['A']} THEN 'A' "
+            f"WHEN {previo} / {total} < {UMBRALES_ABC_PARETO['B']} THEN 'B' ELSE 'C' END"
+        )
+
+    def construir_insert(self, tablas=None, fecha=None):
+        """
+        Genera el INSERT ... SELECT ... ON DUPLICATE KEY UPDATE completo.
+
+        Returns:
+            str: Sentencia INSERT (None si no hay tablas)
+        """
+        select = self.construir_select(tablas, fecha)
+        if select is None:
+            return None
+
+        columnas = ", ".join(COLUMNAS_FACT_ROTACION)
+        columnas_q = ", ".join(f"q.{col}" for col in COLUMNAS_FACT_ROTACION)
+        actualizaciones = ",\n                ".join(
+            f"{col} = VALUES({col})"
+            for col in COLUMNAS_FACT_ROTACION
+            if col not in ('codigo_producto', 'codigo_pdv', 'fecha')
+        )
+
+        return f"""
+            INSERT INTO fact_rotacion ({columnas}, fecha_carga, fecha_actualizacion)
+            SELECT {columnas_q}, NOW(), NOW()
+            FROM ({select}) AS q
+            ORDER BY q.orden_tabla
+            ON DUPLICATE KEY UPDATE
+                {actualizaciones},
+                fecha_actualizacion = NOW()
+        """
+
+    def _asegurar_clave_unica(self, connection):
+        """Crea la clave única (codigo_producto, codigo_pdv, fecha) que necesita el upsert"""
+        existe = connection.execute(text("""
+            SELECT 1
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'fact_rotacion'
+            AND INDEX_NAME = :indice
+            LIMIT 1
+        """), {"indice": INDICE_UNICO_FACT_ROTACION}).fetchone()
+
+        if not existe:
+            connection.execute(text(f"""
+                ALTER TABLE fact_rotacion
+                ADD UNIQUE KEY {INDICE_UNICO_FACT_ROTACION} (codigo_producto, codigo_pdv, fecha)
+            """))
+            if self.logger:
+                self.logger.info(f"🔑 Clave única {INDICE_UNICO_FACT_ROTACION} creada en fact_rotacion")
+
+    def consultar(self, tablas=None, fecha=None):
+        """
+        Ejecuta solo el SELECT del motor SQL y devuelve el resultado (para comparación).
+
+        Returns:
+            pd.DataFrame: Filas que el motor SQL cargaría en fact_rotacion
+        """
+        fecha = fecha or date.today()
+        select = self.construir_select(tablas, fecha)
+        if select is None:
+            return pd.DataFrame(columns=COLUMNAS_FACT_ROTACION)
+
+        asegurar_fechas(self.engine, [fecha], logger=self.logger)
+        if self.exclusion is not None:
+            self.exclusion.materializar(self.engine)
+        with self.engine.connect() as connection:
+            df = pd.read_sql(text(select), connection)
+
+        # El orden de tablas decide qué fila prevalece cuando un producto se repite
+        return (
+            df.sort_values('orden_tabla', kind='stable')
+              .drop(columns='orden_tabla')
+              .reset_index(drop=True)
+        )
+
+    def cargar_desde_staging(self, tablas=None, fecha=None, reemplazar_periodo=False):
+        """
+        Construye y carga fact_rotacion con una sola sentencia ejecutada en MySQL.
+
+        Args:
+            tablas (list, optional): Tablas staging a procesar; por defecto todas
+            fecha (date, optional): Fecha de la foto; por defecto hoy
+            reemplazar_periodo (bool): Elimina antes, en la misma transacción, el corte
+                PDV-mes de los PDVs de las tablas procesadas
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            fecha = fecha or date.today()
+            sentencia = self.construir_insert(tablas, fecha)
+            if sentencia is None:
+                if self.logger:
+                    self.logger.warning("⚠️ No se encontraron tablas de rotación (stg_rotacion_*)")
+                return False
+
+            asegurar_fechas(self.engine, [fecha], logger=self.logger)
+            if self.exclusion is not None:
+                self.exclusion.materializar(self.engine)
+
+            with self.engine.begin() as connection:
+                asegurar_columnas_clasificacion(connection)
+                self._asegurar_clave_unica(connection)
+                if reemplazar_periodo:
+                    codigos_pdv = sorted({codigo for _, codigo in self._tablas_con_pdv(tablas)})
+                    eliminados = eliminar_periodo_pdv(connection, codigos_pdv, fecha)
+                    if self.logger:
+                        self.logger.info(f"🗑️ Eliminadas {eliminados} filas del mes para PDVs {', '.join(codigos_pdv)}")
+                resultado = connection.execute(text(sentencia))
+
+            # En MySQL rowcount cuenta 1 por inserción y 2 por actualización
+            mensaje_exito = (
+                f"✅ Tabla 'fact_rotacion' actualizada con éxito desde MySQL. "
+                f"Filas afectadas: {resultado.rowcount}"
+            )
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar fact_rotacion con el motor SQL: {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
@@ -0,0 +1,67 @@
+# analysis/loader/loader_politica_min_max.py
+
+from sqlalchemy import text
+from sqlalchemy.types import VARCHAR
+from analysis.loader.loader_base import BaseLoader
+
+TABLA_POLITICA_MIN_MAX = "policy_min_max"
+
+
+class LoaderPoliticaMinMax(BaseLoader):
+    """
+    Cargador de la tabla policy_min_max: reemplaza la tabla completa y crea la
+    clave (codigo, punto_de_venta) y el índice por codigo_pdv para las consultas.
+    """
+
+    def __init__(self, logger=None):
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def cargar_dataframe(self, df, nombre_tabla=TABLA_POLITICA_MIN_MAX):
+        """
+        Carga la política efectiva reemplazando la tabla.
+
+        Args:
+            df (pd.DataFrame): Política min/max por codigo×punto_de_venta
+            nombre_tabla (str): Tabla destino
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ DataFrame vacío, no se realizará carga")
+                return False
+
+            df.to_sql(
+                nombre_tabla,
+                con=self.engine,
+                if_exists='replace',
+                index=False,
+                chunksize=5000,
+                dtype={
+                    'codigo': VARCHAR(50),
+                    'punto_de_venta': VARCHAR(100),
+                    'codigo_pdv': VARCHAR(20),
+                    'fuente_minimo': VARCHAR(30),
+                    'fuente_maximo': VARCHAR(30),
+                }
+            )
+            with self.engine.begin() as connection:
+                connection.execute(text(
+                    f"ALTER TABLE {nombre_tabla} ADD PRIMARY KEY (codigo, punto_de_venta), "
+                    f"ADD INDEX idx_{nombre_tabla}_pdv (codigo_pdv, codigo)"
+                ))
+
+            mensaje_exito = f"✅ Tabla '{nombre_tabla}' cargada con éxito. Registros: {len(df)}"
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar tabla '{nombre_tabla}': {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
@@ -0,0 +1,58 @@
+# analysis/loader/loader_pronostico_demanda.py
+
+from sqlalchemy import text
+from sqlalchemy.types import VARCHAR
+from analysis.loader.loader_base import BaseLoader
+
+TABLA_PRONOSTICO_DEMANDA = "pronostico_demanda"
+
+
+class LoaderPronosticoDemanda(BaseLoader):
+    """
+    Cargador de la tabla pronostico_demanda: reemplaza la tabla completa y
+    crea la clave (codigo, codigo_pdv) que usan los procesos que la leen.
+    """
+
+    def __init__(self, logger=None):
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def cargar_dataframe(self, df, nombre_tabla=TABLA_PRONOSTICO_DEMANDA):
+        """
+        Carga el pronóstico reemplazando la tabla.
+
+        Args:
+            df (pd.DataFrame): Pronóstico por SKU×PDV
+            nombre_tabla (str): Tabla destino
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ DataFrame vacío, no se realizará carga")
+                return False
+
+            df.to_sql(
+                nombre_tabla,
+                con=self.engine,
+                if_exists='replace',
+                index=False,
+                chunksize=5000,
+                dtype={'codigo': VARCHAR(50), 'codigo_pdv': VARCHAR(20)}
+            )
+            with self.engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {nombre_tabla} ADD PRIMARY KEY (codigo, codigo_pdv)"))
+
+            mensaje_exito = f"✅ Tabla '{nombre_tabla}' cargada con éxito. Registros: {len(df)}"
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar tabla '{nombre_tabla}': {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
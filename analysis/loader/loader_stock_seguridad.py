@@ -0,0 +1,75 @@
+# analysis/loader/loader_stock_seguridad.py
+
+from sqlalchemy import text, inspect as sqlalchemy_inspect
+from sqlalchemy.types import VARCHAR
+from analysis.loader.loader_base import BaseLoader
+from analysis.extractor.extractor_stock_seguridad import TABLA_STOCK_SEGURIDAD
+
+
+class LoaderStockSeguridad(BaseLoader):
+    """
+    Cargador de la tabla stock_seguridad: reemplaza la tabla completa y crea la
+    clave (codigo, codigo_pdv). Cada fila guarda la huella de los insumos con
+    que se calculó para poder omitir recargas sin cambios.
+    """
+
+    def __init__(self, logger=None):
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def huella_cargada(self, nombre_tabla=TABLA_STOCK_SEGURIDAD):
+        """
+        Obtiene la huella del último cálculo cargado.
+
+        Returns:
+            str: Huella, o None si la tabla no existe o está vacía
+        """
+        try:
+            with self.engine.connect() as connection:
+                if not sqlalchemy_inspect(connection).has_table(nombre_tabla):
+                    return None
+                return connection.execute(text(f"SELECT huella FROM {nombre_tabla} LIMIT 1")).scalar()
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"⚠️ No se pudo leer la huella de '{nombre_tabla}': {e}")
+            return None
+
+    def cargar_dataframe(self, df, nombre_tabla=TABLA_STOCK_SEGURIDAD):
+        """
+        Carga el stock de seguridad reemplazando la tabla.
+
+        Args:
+            df (pd.DataFrame): Stock de seguridad por SKU×PDV
+            nombre_tabla (str): Tabla destino
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ DataFrame vacío, no se realizará carga")
+                return False
+
+            df.to_sql(
+                nombre_tabla,
+                con=self.engine,
+                if_exists='replace',
+                index=False,
+                chunksize=5000,
+                dtype={'codigo': VARCHAR(50), 'codigo_pdv': VARCHAR(20), 'huella': VARCHAR(40)}
+            )
+            with self.engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {nombre_tabla} ADD PRIMARY KEY (codigo, codigo_pdv)"))
+
+            mensaje_exito = f"✅ Tabla '{nombre_tabla}' cargada con éxito. Registros: {len(df)}"
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar tabla '{nombre_tabla}': {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
@@ -0,0 +1,65 @@
+# analysis/loader/loader_sugerido_compra.py
+
+import pandas as pd
+from sqlalchemy import text
+from analysis.loader.loader_base import BaseLoader
+
+
+class LoaderSugeridoCompra(BaseLoader):
+    """
+    Cargador para la tabla fact_sugerido_compra.
+    Reemplaza en una sola transacción el sugerido de la fecha de corte.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el cargador para la tabla fact_sugerido_compra.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def cargar_dataframe(self, df, nombre_tabla="fact_sugerido_compra"):
+        """
+        Elimina el sugerido existente para las fechas del DataFrame y lo inserta de nuevo.
+
+        Args:
+            df (pd.DataFrame): Sugerido de compra por PDV×SKU
+            nombre_tabla (str): Tabla destino
+
+        Returns:
+            bool: True si la carga fue exitosa, False en caso contrario
+        """
+        try:
+            if df.empty:
+                if self.logger:
+                    self.logger.warning("⚠️ DataFrame vacío, no se realizará carga")
+                return False
+
+            df = df.assign(fecha_carga=pd.Timestamp.now())
+            fechas = [str(fecha) for fecha in df['fecha'].unique()]
+
+            with self.engine.begin() as connection:
+                for fecha in fechas:
+                    connection.execute(
+                        text(f"DELETE FROM {nombre_tabla} WHERE fecha = :fecha"),
+                        {"fecha": fecha}
+                    )
+                df.to_sql(nombre_tabla, con=connection, if_exists='append', index=False, chunksize=5000)
+
+            mensaje_exito = (
+                f"✅ Tabla '{nombre_tabla}' actualizada con éxito. "
+                f"Registros: {len(df)} (fechas: {', '.join(fechas)})"
+            )
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al cargar {nombre_tabla}: {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
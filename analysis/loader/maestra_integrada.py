@@ -0,0 +1,327 @@
+# analysis/loader/maestra_integrada.py
+
+import argparse
+
+from sqlalchemy import text
+from analysis.loader.loader_base import BaseLoader
+from analysis.extractor.esquema_staging import EsquemaStaging
+from analysis.extractor.huellas_staging import HuellasStaging
+
+TABLA_MAESTRA_INTEGRADA = "maestra_integrada"
+TABLA_HUELLAS_CODIGO = "maestra_integrada_huellas"
+TABLA_PENDIENTES = "maestra_integrada_pendientes"
+
+TABLA_MAESTRA_ECOMMERCE = "stg_maestra_ecommerce"
+PREFIJO_MAESTRAS_PDV = "stg_maestra_pdv_"
+
+# Columnas de la maestra e-commerce: columna integrada -> (columna origen, agregación)
+COLUMNAS_ECOMMERCE = {
+    'nuevo_codigo': ('nuevo_codigo', 'MAX'),
+    'codigo_barras': ('codigo_barras', 'MAX'),
+    'nombre': ('nombre', 'MAX'),
+    'laboratorio': ('laboratorio', 'MAX'),
+    'principio_activo': ('principio_activo', 'MAX'),
+    'marca': ('marca', 'MAX'),
+    'departamento': ('departamento', 'MAX'),
+    'categoria': ('categoria', 'MAX'),
+    'subcategoria': ('subcategoria', 'MAX'),
+    'pvp': ('pvp', 'MAX'),
+}
+
+# Columnas de las maestras de PDV (antes vw_maestra_pdv_consolidada)
+COLUMNAS_PDV = {
+    'costo_promedio': ('costo_promedio', 'AVG'),
+    'grupo_i': ('grupo_i', 'MAX'),
+    'grupo_ii': ('grupo_ii', 'MAX'),
+    'grupo_iii': ('grupo_iii', 'MAX'),
+    'grupo_iv': ('grupo_iv', 'MAX'),
+    'grupo_v': ('grupo_v', 'MAX'),
+    'grupo_vi': ('grupo_vi', 'MAX'),
+    'unidad_medida': ('unidad', 'MAX'),
+    'tipo_producto': ('tipo_producto', 'MAX'),
+    'porcentaje_descuento': ('bonificacion', 'MAX'),
+    'proveedor': ('proveedor', 'MAX'),
+    'clasificacion': ('clasificacion', 'MAX'),
+    'componente': ('componente', 'MAX'),
+    'sustituto': ('sustituto', 'MAX'),
+}
+
+DDL_MAESTRA_INTEGRADA = f"""
+CREATE TABLE IF NOT EXISTS {TABLA_MAESTRA_INTEGRADA} (
+    codigo VARCHAR(50) NOT NULL,
+    nuevo_codigo VARCHAR(50) NULL,
+    codigo_barras VARCHAR(100) NULL,
+    nombre VARCHAR(500) NULL,
+    laboratorio VARCHAR(255) NULL,
+    principio_activo VARCHAR(500) NULL,
+    marca VARCHAR(255) NULL,
+    departamento VARCHAR(255) NULL,
+    categoria VARCHAR(255) NULL,
+    subcategoria VARCHAR(255) NULL,
+    pvp DECIMAL(18,4) NULL,
+    costo_promedio DECIMAL(18,4) NULL,
+    grupo_i VARCHAR(255) NULL,
+    grupo_ii VARCHAR(255) NULL,
+    grupo_iii VARCHAR(255) NULL,
+    grupo_iv VARCHAR(255) NULL,
+    grupo_v VARCHAR(255) NULL,
+    grupo_vi VARCHAR(255) NULL,
+    unidad_medida VARCHAR(50) NULL,
+    tipo_producto VARCHAR(255) NULL,
+    porcentaje_descuento DECIMAL(18,4) NULL,
+    proveedor VARCHAR(255) NULL,
+    clasificacion VARCHAR(255) NULL,
+    componente VARCHAR(500) NULL,
+    sustituto VARCHAR(500) NULL,
+    estado VARCHAR(20) NOT NULL,
+    fecha_actualizacion DATETIME NOT NULL,
+    PRIMARY KEY (codigo),
+    INDEX idx_maestra_integrada_laboratorio (laboratorio)
+)
+"""
+
+COLUMNAS_MAESTRA_INTEGRADA = (
+    ['codigo'] + list(COLUMNAS_ECOMMERCE) + list(COLUMNAS_PDV) + ['estado', 'fecha_actualizacion']
+)
+
+DDL_HUELLAS_CODIGO = f"""
+CREATE TABLE IF NOT EXISTS {TABLA_HUELLAS_CODIGO} (
+    tabla_origen VARCHAR(128) NOT NULL,
+    codigo VARCHAR(50) NOT NULL,
+    huella BIGINT UNSIGNED NOT NULL,
+    PRIMARY KEY (tabla_origen, codigo),
+    INDEX idx_maestra_huellas_codigo (codigo)
+)
+"""
+
+# Tabla de trabajo normal (no temporal): MySQL no permite referenciar una
+# tabla temporal más de una vez en la misma consulta y aquí se filtra cada
+# rama del UNION ALL.
+DDL_PENDIENTES = f"""
+CREATE TABLE IF NOT EXISTS {TABLA_PENDIENTES} (
+    codigo VARCHAR(50) NOT NULL,
+    PRIMARY KEY (codigo)
+)
+"""
+
+
+class MaestraIntegrada(BaseLoader):
+    """
+    Mantiene la tabla maestra_integrada: la versión persistida e indexada (PK
+    codigo) de vw_maestra_integrada, que une la maestra e-commerce con las
+    maestras de todos los PDV.
+
+    La actualización es incremental en dos niveles:
+    - Tabla: con HuellasStaging se omiten las fuentes cuyo CHECKSUM no cambió.
+    - Código: de cada fuente cambiada se calcula una huella por código
+      (BIT_XOR de un hash por fila) y se compara con la guardada en
+      maestra_integrada_huellas; solo los códigos nuevos, cambiados o
+      desaparecidos se recalculan y se reemplazan en maestra_integrada.
+    """
+
+    def __init__(self, db_name="gestion_compras", logger=None):
+        """
+        Inicializa el mantenedor.
+
+        Args:
+            db_name (str): Base de datos
+            logger: Instancia de logger para registrar eventos
+        """
+        super().__init__(db_name=db_name, logger=logger)
+        self.esquema = EsquemaStaging(self.engine, db_name=db_name, logger=logger)
+        self.huellas = HuellasStaging(self.engine, TABLA_MAESTRA_INTEGRADA, logger=logger)
+
+    def _fuentes(self):
+        """Maestra e-commerce y maestras de PDV presentes en la base de datos"""
+        fuentes = [TABLA_MAESTRA_ECOMMERCE] if self.esquema.columnas(TABLA_MAESTRA_ECOMMERCE) else []
+        return fuentes + self.esquema.tablas(PREFIJO_MAESTRAS_PDV)
+
+    def _columnas_fuente(self, tabla):
+        """Columnas integradas que aporta una fuente: columna integrada -> (origen, agregación)"""
+        return COLUMNAS_ECOMMERCE if tabla == TABLA_MAESTRA_ECOMMERCE else COLUMNAS_PDV
+
+    def _valor(self, tabla, columna):
+        """Columna de la fuente, o NULL si esa maestra no la trae"""
+        return f"`{columna}`" if columna in self.esquema.columnas(tabla) else "NULL"
+
+    def _consulta_huellas(self, tabla):
+        """SELECT de la huella por código de una fuente (64 bits del SHA1 de cada fila, combinados con BIT_XOR)"""
+        campos = ", ".join(
+            f"IFNULL(CAST({self._valor(tabla, origen)} AS CHAR), CHAR(0))"
+            for origen, _ in self._columnas_fuente(tabla).values()
+        )
+        return f"""
+            SELECT '{tabla}' AS tabla_origen,
+                   CAST(codigo AS CHAR) AS codigo,
+                   BIT_XOR(CAST(CONV(LEFT(SHA1(CONCAT_WS(CHAR(31), {campos})), 16), 16, 10) AS UNSIGNED)) AS huella
+            FROM `{tabla}`
+            WHERE codigo IS NOT NULL
+            GROUP BY CAST(codigo AS CHAR)
+        """
+
+    def _consulta_integrada(self, fuentes, filtrar):
+        """
+        SELECT de las filas integradas, opcionalmente solo para los códigos pendientes.
+
+        Equivale a vw_maestra_integrada: una fila por código de la maestra
+        e-commerce con los atributos consolidados de las maestras de PDV.
+        """
+        filtro = f"AND CAST(codigo AS CHAR) IN (SELECT codigo FROM {TABLA_PENDIENTES})" if filtrar else ""
+
+        columnas_e = ", ".join(
+            f"{agregacion}({self._valor(TABLA_MAESTRA_ECOMMERCE, origen)}) AS {destino}"
+            for destino, (origen, agregacion) in COLUMNAS_ECOMMERCE.items()
+        )
+        tablas_pdv = [tabla for tabla in fuentes if tabla.startswith(PREFIJO_MAESTRAS_PDV)]
+        if tablas_pdv:
+            ramas = "\nUNION ALL\n".join(
+                f"SELECT CAST(codigo AS CHAR) AS codigo, "
+                + ", ".join(f"{self._valor(tabla, origen)} AS {destino}" for destino, (origen, _) in COLUMNAS_PDV.items())
+                + f" FROM `{tabla}` WHERE codigo IS NOT NULL {filtro}"
+                for tabla in tablas_pdv
+            )
+        else:
+            ramas = "SELECT NULL AS codigo, " + ", ".join(f"NULL AS {destino}" for destino in COLUMNAS_PDV) + " FROM DUAL WHERE FALSE"
+        columnas_p = ", ".join(f"{agregacion}(t.{destino}) AS {destino}" for destino, (_, agregacion) in COLUMNAS_PDV.items())
+
+        return f"""
+            SELECT e.codigo, {', '.join(f'e.{c}' for c in COLUMNAS_ECOMMERCE)},
+                   {', '.join(f'p.{c}' for c in COLUMNAS_PDV)},
+                   'activo' AS estado,
+                   NOW() AS fecha_actualizacion
+            FROM (
+                SELECT CAST(codigo AS CHAR) AS codigo, {columnas_e}
+                FROM `{TABLA_MAESTRA_ECOMMERCE}`
+                WHERE codigo IS NOT NULL {filtro}
+                GROUP BY CAST(codigo AS CHAR)
+            ) e
+            LEFT JOIN (
+                SELECT t.codigo, {columnas_p}
+                FROM (
+                    {ramas}
+                ) t
+                GROUP BY t.codigo
+            ) p ON p.codigo = e.codigo
+        """
+
+    def actualizar(self, completa=False):
+        """
+        Actualiza maestra_integrada con los códigos que cambiaron en alguna fuente.
+
+        Args:
+            completa (bool): Recalcula todos los códigos ignorando las huellas
+
+        Returns:
+            bool: True si la actualización fue exitosa, False en caso contrario
+        """
+        try:
+            self.esquema.refrescar()
+            fuentes = self._fuentes()
+            if TABLA_MAESTRA_ECOMMERCE not in fuentes:
+                raise ValueError(f"No existe la tabla {TABLA_MAESTRA_ECOMMERCE}")
+
+            with self.engine.begin() as connection:
+                for ddl in (DDL_MAESTRA_INTEGRADA, DDL_HUELLAS_CODIGO, DDL_PENDIENTES):
+                    connection.execute(text(ddl))
+                vacia = connection.execute(text(f"SELECT COUNT(*) FROM {TABLA_MAESTRA_INTEGRADA}")).scalar() == 0
+            completa = completa or vacia
+
+            huellas_actuales = self.huellas.calcular(fuentes)
+            cambiadas = fuentes if completa else self.huellas.cambiadas(huellas_actuales)
+            eliminadas = sorted(set(self.huellas.registradas()) - set(fuentes))
+            if not cambiadas and not eliminadas:
+                mensaje = f"♻️ {TABLA_MAESTRA_INTEGRADA} ya está al día, sin cambios en las maestras"
+                print(mensaje)
+                if self.logger:
+                    self.logger.info(mensaje)
+                return True
+
+            columnas = ", ".join(COLUMNAS_MAESTRA_INTEGRADA)
+            with self.engine.begin() as connection:
+                connection.execute(text(f"DELETE FROM {TABLA_PENDIENTES}"))
+
+                if cambiadas:
+                    connection.execute(text(
+                        "CREATE TEMPORARY TABLE tmp_huellas_maestra (PRIMARY KEY (tabla_origen, codigo)) AS "
+                        + self._consulta_huellas(cambiadas[0])
+                    ))
+                    for tabla in cambiadas[1:]:
+                        connection.execute(text(f"INSERT INTO tmp_huellas_maestra {self._consulta_huellas(tabla)}"))
+
+                    lista = ", ".join(f"'{tabla}'" for tabla in cambiadas)
+                    # Códigos nuevos o con huella distinta
+                    connection.execute(text(f"""
+                        INSERT IGNORE INTO {TABLA_PENDIENTES} (codigo)
+                        SELECT n.codigo
+                        FROM tmp_huellas_maestra n
+                        LEFT JOIN {TABLA_HUELLAS_CODIGO} h
+                          ON h.tabla_origen = n.tabla_origen AND h.codigo = n.codigo
+                        WHERE NOT (h.huella <=> n.huella)
+                    """))
+                    # Códigos que desaparecieron de una fuente cambiada
+                    connection.execute(text(f"""
+                        INSERT IGNORE INTO {TABLA_PENDIENTES} (codigo)
+                        SELECT h.codigo
+                        FROM {TABLA_HUELLAS_CODIGO} h
+                        LEFT JOIN tmp_huellas_maestra n
+                          ON n.tabla_origen = h.tabla_origen AND n.codigo = h.codigo
+                        WHERE h.tabla_origen IN ({lista}) AND n.codigo IS NULL
+                    """))
+                    connection.execute(text(f"DELETE FROM {TABLA_HUELLAS_CODIGO} WHERE tabla_origen IN ({lista})"))
+                    connection.execute(text(f"INSERT INTO {TABLA_HUELLAS_CODIGO} SELECT * FROM tmp_huellas_maestra"))
+                    connection.execute(text("DROP TEMPORARY TABLE tmp_huellas_maestra"))
+
+                if eliminadas:
+                    lista = ", ".join(f"'{tabla}'" for tabla in eliminadas)
+                    connection.execute(text(f"""
+                        INSERT IGNORE INTO {TABLA_PENDIENTES} (codigo)
+                        SELECT codigo FROM {TABLA_HUELLAS_CODIGO} WHERE tabla_origen IN ({lista})
+                    """))
+                    connection.execute(text(f"DELETE FROM {TABLA_HUELLAS_CODIGO} WHERE tabla_origen IN ({lista})"))
+
+                if completa:
+                    connection.execute(text(f"DELETE FROM {TABLA_MAESTRA_INTEGRADA}"))
+                    insertados = connection.execute(text(
+                        f"INSERT INTO {TABLA_MAESTRA_INTEGRADA} ({columnas}) {self._consulta_integrada(fuentes, filtrar=False)}"
+                    )).rowcount
+                    pendientes = insertados
+                else:
+                    pendientes = connection.execute(text(f"SELECT COUNT(*) FROM {TABLA_PENDIENTES}")).scalar()
+                    connection.execute(text(f"""
+                        DELETE m FROM {TABLA_MAESTRA_INTEGRADA} m
+                        JOIN {TABLA_PENDIENTES} c ON c.codigo = m.codigo
+                    """))
+                    insertados = connection.execute(text(
+                        f"INSERT INTO {TABLA_MAESTRA_INTEGRADA} ({columnas}) {self._consulta_integrada(fuentes, filtrar=True)}"
+                    )).rowcount if pendientes else 0
+                connection.execute(text(f"DELETE FROM {TABLA_PENDIENTES}"))
+
+            # Registrar huellas de tabla solo tras una actualización exitosa
+            self.huellas.registrar({tabla: huellas_actuales[tabla] for tabla in cambiadas})
+            self.huellas.eliminar(eliminadas)
+
+            mensaje_exito = (
+                f"✅ Tabla '{TABLA_MAESTRA_INTEGRADA}' actualizada "
+                f"({'completa' if completa else 'incremental'}): {len(cambiadas)} fuentes cambiadas, "
+                f"{pendientes} códigos recalculados, {insertados} filas escritas"
+            )
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al actualizar tabla '{TABLA_MAESTRA_INTEGRADA}': {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
+
+
+if __name__ == '__main__':
+    # Actualización incremental: python -m analysis.loader.maestra_integrada [--completa]
+    parser = argparse.ArgumentParser(description="Actualiza la tabla maestra_integrada")
+    parser.add_argument("--completa", action="store_true", help="Recalcular todos los códigos")
+    args = parser.parse_args()
+
+    MaestraIntegrada().actualizar(completa=args.completa)
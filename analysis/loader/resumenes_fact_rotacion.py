@@ -0,0 +1,286 @@
+# analysis/loader/resumenes_fact_rotacion.py
+
+import pandas as pd
+from sqlalchemy import text, bindparam
+from analysis.loader.loader_base import BaseLoader
+
+# Última foto de cada PDV×producto dentro del mes: si el mes se cargó varias
+# veces (una fila por fecha), los resúmenes toman la fila más reciente completa
+# en lugar de combinar columnas de fotos distintas.
+FILAS_MES_FACT_ROTACION = """
+            FROM (
+                SELECT
+                    fr.*,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY fr.codigo_pdv, fr.codigo_producto
+                        ORDER BY fr.fecha DESC, fr.id DESC
+                    ) AS orden_foto
+                FROM fact_rotacion fr
+                WHERE fr.codigo_pdv IN :codigos_pdv
+                  AND fr.fecha BETWEEN :inicio_mes AND :fin_mes
+            ) f"""
+
+# Tablas resumen materializadas de las vistas vw_* de ajustar_fact_rotacion.sql.
+# Cada una guarda el periodo (primer día del mes) y el PDV para poder
+# recalcular solo los cortes PDV-mes que cambiaron tras una carga.
+RESUMENES_FACT_ROTACION = {
+    'resumen_rotacion_por_pdv': {
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS resumen_rotacion_por_pdv (
+                periodo DATE NOT NULL,
+                codigo_pdv VARCHAR(20) NOT NULL,
+                nombre_pdv VARCHAR(100) NULL,
+                total_productos INT NOT NULL,
+                productos_a INT NOT NULL,
+                productos_b INT NOT NULL,
+                productos_c INT NOT NULL,
+                rotacion_promedio DECIMAL(10,4) NULL,
+                venta_total DECIMAL(18,2) NULL,
+                valor_inventario DECIMAL(18,2) NULL,
+                productos_criticos INT NOT NULL,
+                fecha_actualizacion DATETIME NOT NULL,
+                PRIMARY KEY (codigo_pdv, periodo),
+                INDEX idx_resumen_rotacion_pdv_periodo (periodo)
+            )
+        """,
+        'select': f"""
+            SELECT
+                :periodo AS periodo,
+                f.codigo_pdv,
+                MAX(p.nombre_pdv) AS nombre_pdv,
+                COUNT(f.producto_sk) AS total_productos,
+                SUM(CASE WHEN f.abc_clasificacion = 'A' THEN 1 ELSE 0 END) AS productos_a,
+                SUM(CASE WHEN f.abc_clasificacion = 'B' THEN 1 ELSE 0 END) AS productos_b,
+                SUM(CASE WHEN f.abc_clasificacion = 'C' THEN 1 ELSE 0 END) AS productos_c,
+                AVG(f.rotacion_mes) AS rotacion_promedio,
+                SUM(f.venta_total) AS venta_total,
+                SUM(f.inventario_unidades_final * f.costo_unitario) AS valor_inventario,
+                SUM(CASE WHEN f.inventario_critico THEN 1 ELSE 0 END) AS productos_criticos,
+                NOW() AS fecha_actualizacion
+            {FILAS_MES_FACT_ROTACION}
+            JOIN dim_pdv p ON f.pdv_sk = p.pdv_sk
+            WHERE f.orden_foto = 1
+            GROUP BY f.codigo_pdv
+        """,
+    },
+    'resumen_productos_estrella': {
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS resumen_productos_estrella (
+                periodo DATE NOT NULL,
+                codigo_pdv VARCHAR(20) NOT NULL,
+                codigo_producto VARCHAR(50) NOT NULL,
+                nombre_producto VARCHAR(255) NULL,
+                nombre_pdv VARCHAR(100) NULL,
+                venta_unidades DECIMAL(12,2) NULL,
+                venta_total DECIMAL(15,2) NULL,
+                margen_porcentaje DECIMAL(5,2) NULL,
+                rotacion_mes DECIMAL(7,2) NULL,
+                abc_clasificacion VARCHAR(1) NULL,
+                estado_inventario VARCHAR(10) NULL,
+                PRIMARY KEY (codigo_pdv, periodo, codigo_producto),
+                INDEX idx_resumen_estrella_venta (periodo, venta_total)
+            )
+        """,
+        'select': f"""
+            SELECT
+                :periodo AS periodo,
+                f.codigo_pdv,
+                f.codigo_producto,
+                pr.nombre AS nombre_producto,
+                p.nombre_pdv,
+                f.venta_unidades,
+                f.venta_total,
+                f.margen_porcentaje,
+                f.rotacion_mes,
+                f.abc_clasificacion,
+                f.estado_inventario
+            {FILAS_MES_FACT_ROTACION}
+            JOIN dim_producto pr ON f.producto_sk = pr.producto_sk
+            JOIN dim_pdv p ON f.pdv_sk = p.pdv_sk
+            WHERE f.orden_foto = 1
+              AND f.abc_clasificacion = 'A' AND f.alta_rentabilidad = 1
+        """,
+    },
+    'resumen_inventario_exceso': {
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS resumen_inventario_exceso (
+                periodo DATE NOT NULL,
+                codigo_pdv VARCHAR(20) NOT NULL,
+                codigo_producto VARCHAR(50) NOT NULL,
+                nombre_producto VARCHAR(255) NULL,
+                nombre_pdv VARCHAR(100) NULL,
+                inventario_unidades_final DECIMAL(12,2) NULL,
+                venta_unidades DECIMAL(12,2) NULL,
+                dias_inventario DECIMAL(7,2) NULL,
+                estado_inventario VARCHAR(10) NULL,
+                costo_unitario DECIMAL(15,4) NULL,
+                valor_inmovilizado DECIMAL(18,2) NULL,
+                PRIMARY KEY (codigo_pdv, periodo, codigo_producto),
+                INDEX idx_resumen_exceso_valor (periodo, valor_inmovilizado)
+            )
+        """,
+        'select': f"""
+            SELECT
+                :periodo AS periodo,
+                f.codigo_pdv,
+                f.codigo_producto,
+                pr.nombre AS nombre_producto,
+                p.nombre_pdv,
+                f.inventario_unidades_final,
+                f.venta_unidades,
+                f.dias_inventario,
+                f.estado_inventario,
+                f.costo_unitario,
+                f.inventario_unidades_final * f.costo_unitario AS valor_inmovilizado
+            {FILAS_MES_FACT_ROTACION}
+            JOIN dim_producto pr ON f.producto_sk = pr.producto_sk
+            JOIN dim_pdv p ON f.pdv_sk = p.pdv_sk
+            WHERE f.orden_foto = 1
+              AND f.estado_inventario = 'EXCESO'
+        """,
+    },
+    'resumen_inventario_critico': {
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS resumen_inventario_critico (
+                periodo DATE NOT NULL,
+                codigo_pdv VARCHAR(20) NOT NULL,
+                codigo_producto VARCHAR(50) NOT NULL,
+                nombre_producto VARCHAR(255) NULL,
+                nombre_pdv VARCHAR(100) NULL,
+                inventario_unidades_final DECIMAL(12,2) NULL,
+                venta_unidades DECIMAL(12,2) NULL,
+                dias_inventario DECIMAL(7,2) NULL,
+                estado_inventario VARCHAR(10) NULL,
+                costo_unitario DECIMAL(15,4) NULL,
+                abc_clasificacion VARCHAR(1) NULL,
+                PRIMARY KEY (codigo_pdv, periodo, codigo_producto),
+                INDEX idx_resumen_critico_abc (periodo, abc_clasificacion, dias_inventario)
+            )
+        """,
+        'select': f"""
+            SELECT
+                :periodo AS periodo,
+                f.codigo_pdv,
+                f.codigo_producto,
+                pr.nombre AS nombre_producto,
+                p.nombre_pdv,
+                f.inventario_unidades_final,
+                f.venta_unidades,
+                f.dias_inventario,
+                f.estado_inventario,
+                f.costo_unitario,
+                f.abc_clasificacion
+            {FILAS_MES_FACT_ROTACION}
+            JOIN dim_producto pr ON f.producto_sk = pr.producto_sk
+            JOIN dim_pdv p ON f.pdv_sk = p.pdv_sk
+            WHERE f.orden_foto = 1
+              AND f.inventario_critico = 1
+        """,
+    },
+}
+
+
+class ResumenesFactRotacion(BaseLoader):
+    """
+    Mantiene las tablas resumen de fact_rotacion (rotación por PDV, productos
+    estrella, inventario en exceso e inventario crítico).
+
+    Tras cada carga solo se recalculan los cortes PDV-mes afectados: se borran
+    y se reinsertan con un INSERT ... SELECT por tabla dentro de una transacción.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Inicializa el mantenedor de resúmenes.
+
+        Args:
+            logger: Instancia de logger para registrar eventos
+        """
+        super().__init__(db_name="gestion_compras", logger=logger)
+
+    def _asegurar_tablas(self, connection):
+        """Crea las tablas resumen que no existan"""
+        for definicion in RESUMENES_FACT_ROTACION.values():
+            connection.execute(text(definicion['ddl']))
+
+    def actualizar(self, fecha=None, codigos_pdv=None):
+        """
+        Recalcula el corte PDV-mes de todas las tablas resumen.
+
+        Args:
+            fecha (date, optional): Cualquier fecha del mes a recalcular; por defecto hoy
+            codigos_pdv (list, optional): PDVs a recalcular; por defecto los que
+                tienen filas ese mes en fact_rotacion
+
+        Returns:
+            bool: True si la actualización fue exitosa, False en caso contrario
+        """
+        try:
+            periodo = pd.Timestamp(fecha or pd.Timestamp.now()).to_period('M')
+            parametros = {
+                "periodo": periodo.start_time.date(),
+                "inicio_mes": periodo.start_time.date(),
+                "fin_mes": periodo.end_time.date(),
+            }
+
+            with self.engine.begin() as connection:
+                self._asegurar_tablas(connection)
+
+                if codigos_pdv is None:
+                    codigos_pdv = [fila[0] for fila in connection.execute(text("""
+                        SELECT DISTINCT codigo_pdv
+                        FROM fact_rotacion
+                        WHERE fecha BETWEEN :inicio_mes AND :fin_mes
+                    """), parametros)]
+                codigos_pdv = sorted({str(codigo) for codigo in codigos_pdv})
+                if not codigos_pdv:
+                    if self.logger:
+                        self.logger.warning(f"⚠️ Sin filas en fact_rotacion para {periodo}; no hay resúmenes que actualizar")
+                    return True
+
+                parametros["codigos_pdv"] = codigos_pdv
+                filas = {}
+                for tabla, definicion in RESUMENES_FACT_ROTACION.items():
+                    connection.execute(
+                        text(f"DELETE FROM {tabla} WHERE codigo_pdv IN :codigos_pdv AND periodo = :periodo")
+                        .bindparams(bindparam("codigos_pdv", expanding=True)),
+                        parametros
+                    )
+                    resultado = connection.execute(
+                        text(f"INSERT INTO {tabla} {definicion['select']}")
+                        .bindparams(bindparam("codigos_pdv", expanding=True)),
+                        parametros
+                    )
+                    filas[tabla] = resultado.rowcount
+
+            mensaje_exito = (
+                f"✅ Resúmenes de fact_rotacion actualizados para {periodo} "
+                f"({len(codigos_pdv)} PDVs): "
+                + ", ".join(f"{tabla}={n}" for tabla, n in filas.items())
+            )
+            print(mensaje_exito)
+            if self.logger:
+                self.logger.info(mensaje_exito)
+            return True
+
+        except Exception as e:
+            mensaje_error = f"❌ Error al actualizar resúmenes de fact_rotacion: {e}"
+            print(mensaje_error)
+            if self.logger:
+                self.logger.error(mensaje_error)
+            return False
+
+    def reconstruir(self):
+        """Recalcula todos los meses presentes en fact_rotacion"""
+        with self.engine.connect() as connection:
+            meses = [fila[0] for fila in connection.execute(text("""
+                SELECT DISTINCT DATE_FORMAT(fecha, '%Y-%m-01')
+                FROM fact_rotacion
+                WHERE fecha IS NOT NULL
+            """))]
+        return all(self.actualizar(fecha=mes) for mes in sorted(meses))
+
+
+if __name__ == '__main__':
+    # Reconstrucción completa: python -m analysis.loader.resumenes_fact_rotacion
+    ResumenesFactRotacion().reconstruir()
@@ -0,0 +1,178 @@
+# analysis/transformer/matriz_productos.py
+
+import numpy as np
+import pandas as pd
+
+
+def formatear_fecha_activacion(fecha):
+    """Formato de fecha usado en matriz_productos.csv (ej: 2/11/2024)"""
+    return f"{fecha.day}/{fecha:%m/%Y}"
+
+
+class MatrizProductos:
+    """
+    Matriz codigo × PDV de fechas de activación en representación dispersa.
+
+    Solo se guardan las celdas con fecha (listas de coordenadas fila/columna/fecha),
+    ordenadas dos veces: por producto (tipo CSR) para responder "qué PDVs manejan
+    el SKU X" y por PDV (tipo CSC) para "qué SKUs maneja el PDV Y".
+    """
+
+    def __init__(self, codigos, pdvs, fila, columna, fecha):
+        """
+        Inicializa la matriz a partir de coordenadas ya codificadas.
+
+        Args:
+            codigos (pd.Index): Diccionario de códigos de producto (filas)
+            pdvs (pd.Index): Diccionario de puntos de venta (columnas)
+            fila (np.ndarray): Índice de producto de cada celda
+            columna (np.ndarray): Índice de PDV de cada celda
+            fecha (np.ndarray): Fecha de activación de cada celda (datetime64[D])
+        """
+        self.codigos = pd.Index(codigos)
+        self.pdvs = pd.Index(pdvs)
+
+        # Orden por producto (CSR)
+        orden = np.lexsort((columna, fila))
+        self.fila = np.asarray(fila, dtype=np.int32)[orden]
+        self.columna = np.asarray(columna, dtype=np.int16)[orden]
+        self.fecha = np.asarray(fecha, dtype='datetime64[D]')[orden]
+        self._inicio_fila = np.searchsorted(self.fila, np.arange(len(self.codigos) + 1))
+
+        # Orden por PDV (CSC) sobre las mismas celdas
+        self._orden_columna = np.lexsort((self.fila, self.columna))
+        self._inicio_columna = np.searchsorted(
+            self.columna[self._orden_columna], np.arange(len(self.pdvs) + 1)
+        )
+
+        # Número de PDVs por producto
+        self.pdvs_por_codigo = np.diff(self._inicio_fila)
+
+    @classmethod
+    def desde_registros(cls, df):
+        """
+        Construye la matriz desde registros largos.
+
+        Args:
+            df (pd.DataFrame): Columnas codigo, punto_de_venta, fecha_activacion
+
+        Returns:
+            MatrizProductos: Matriz con la fecha más reciente por celda
+        """
+        registros = df.dropna(subset=['codigo', 'punto_de_venta', 'fecha_activacion'])
+        registros = registros.assign(
+            codigo=registros['codigo'].astype(str).str.strip(),
+            fecha_activacion=pd.to_datetime(registros['fecha_activacion'], errors='coerce', dayfirst=True)
+        ).dropna(subset=['fecha_activacion'])
+
+        codigos = pd.Index(sorted(registros['codigo'].unique()))
+        pdvs = pd.Index(sorted(registros['punto_de_venta'].unique()))
+        fila = codigos.get_indexer(registros['codigo'])
+        columna = pdvs.get_indexer(registros['punto_de_venta'])
+        fecha = registros['fecha_activacion'].to_numpy(dtype='datetime64[D]')
+
+        # Si una celda se repite, conservar la fecha más reciente
+        orden = np.lexsort((fecha, columna, fila))
+        fila, columna, fecha = fila[orden], columna[orden], fecha[orden]
+        ultimo = np.ones(len(fila), dtype=bool)
+        ultimo[:-1] = (fila[1:] != fila[:-1]) | (columna[1:] != columna[:-1])
+
+        return cls(codigos, pdvs, fila[ultimo], columna[ultimo], fecha[ultimo])
+
+    @classmethod
+    def desde_csv(cls, ruta):
+        """Lee un matriz_productos.csv en formato ancho sin materializar celdas vacías"""
+        ancho = pd.read_csv(ruta, dtype=str).set_index('codigo')
+        largo = ancho.stack().rename('fecha_activacion').reset_index()
+        largo.columns = ['codigo', 'punto_de_venta', 'fecha_activacion']
+        matriz = cls.desde_registros(largo)
+        # Conservar todas las columnas de PDV aunque alguna quede vacía
+        return matriz._con_pdvs(ancho.columns)
+
+    def _con_pdvs(self, pdvs):
+        """Reindexa las columnas a una lista de PDVs dada"""
+        pdvs = pd.Index(pdvs)
+        columna = pdvs.get_indexer(self.pdvs[self.columna])
+        return MatrizProductos(self.codigos, pdvs, self.fila, columna, self.fecha)
+
+    def __len__(self):
+        return len(self.fila)
+
+    @property
+    def densidad(self):
+        """Proporción de celdas con fecha de activación"""
+        total = len(self.codigos) * len(self.pdvs)
+        return len(self) / total if total else 0.0
+
+    def pdvs_de(self, codigo):
+        """
+        PDVs que manejan un SKU.
+
+        Returns:
+            pd.Series: Fecha de activación indexada por punto de venta
+        """
+        i = self.codigos.get_indexer([str(codigo)])[0]
+        if i < 0:
+            return pd.Series(dtype='datetime64[ns]', name='fecha_activacion')
+        tramo = slice(self._inicio_fila[i], self._inicio_fila[i + 1])
+        return pd.Series(
+            self.fecha[tramo], index=self.pdvs[self.columna[tramo]], name='fecha_activacion'
+        )
+
+    def codigos_de(self, pdv):
+        """
+        SKUs activos en un PDV.
+
+        Returns:
+            pd.Series: Fecha de activación indexada por código
+        """
+        j = self.pdvs.get_indexer([pdv])[0]
+        if j < 0:
+            return pd.Series(dtype='datetime64[ns]', name='fecha_activacion')
+        celdas = self._orden_columna[self._inicio_columna[j]:self._inicio_columna[j + 1]]
+        return pd.Series(
+            self.fecha[celdas], index=self.codigos[self.fila[celdas]], name='fecha_activacion'
+        )
+
+    def codigos_exclusivos(self, pdv):
+        """
+        SKUs activos únicamente en un PDV.
+
+        Returns:
+            pd.Series: Fecha de activación indexada por código
+        """
+        activos = self.codigos_de(pdv)
+        filas = self.codigos.get_indexer(activos.index)
+        return activos[self.pdvs_por_codigo[filas] == 1]
+
+    def a_registros(self):
+        """Devuelve las celdas con fecha en formato largo (codigo, punto_de_venta, fecha_activacion)"""
+        return pd.DataFrame({
+            'codigo': self.codigos[self.fila],
+            'punto_de_venta': self.pdvs[self.columna],
+            'fecha_activacion': self.fecha.astype('datetime64[ns]'),
+        })
+
+    def exportar_csv(self, ruta):
+        """Escribe la matriz en el formato ancho de matriz_productos.csv"""
+        celdas = np.full((len(self.codigos), len(self.pdvs)), '', dtype=object)
+        celdas[self.fila, self.columna] = [
+            formatear_fecha_activacion(fecha) for fecha in pd.DatetimeIndex(self.fecha)
+        ]
+        ancho = pd.DataFrame(celdas, index=self.codigos, columns=self.pdvs)
+        ancho.index.name = 'codigo'
+        ancho.to_csv(ruta)
+
+    def exportar_parquet(self, ruta):
+        """
+        Escribe las celdas con fecha en Parquet (formato largo, códigos categóricos).
+
+        Requiere pyarrow o fastparquet instalado.
+        """
+        registros = self.a_registros().astype({'codigo': 'category', 'punto_de_venta': 'category'})
+        try:
+            registros.to_parquet(ruta, index=False)
+        except ImportError as e:
+            raise ImportError(
+                "❌ Para exportar a Parquet instala 'pyarrow' o 'fastparquet'"
+            ) from e
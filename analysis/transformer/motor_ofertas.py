@@ -0,0 +1,154 @@
+# analysis/transformer/motor_ofertas.py
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_ANOTACION_OFERTA = ['laboratorio_oferta', 'cant_obsequio', 'costo_efectivo', 'ahorro_oferta']
+
+
+class MotorOfertas:
+    """
+    Selección de la mejor bonificación por SKU para una cantidad pedida.
+
+    Las ofertas se ordenan por código y se indexan por tramos (inicio/fin de
+    cada código), de modo que todas las líneas de compra se evalúan contra sus
+    ofertas candidatas en una sola pasada vectorizada.
+
+    Una oferta 'cantidad + cantidad_obsequio' solo bonifica lotes completos
+    dentro de la cantidad pedida: de q cajas, floor(q / (cantidad + obsequio))
+    lotes llegan con obsequio y el resto se paga a costo_caja_real.
+    """
+
+    def __init__(self, df_ofertas, logger=None):
+        """
+        Inicializa el motor con las ofertas disponibles.
+
+        Args:
+            df_ofertas (pd.DataFrame): codigo, cantidad, cantidad_obsequio, costo_caja_real
+                y opcionalmente codigo_obsequio y laboratorio
+            logger: Instancia de logger para registrar eventos
+        """
+        self.logger = logger
+        ofertas = df_ofertas.copy()
+        ofertas['codigo'] = ofertas['codigo'].astype(str).str.strip()
+        for columna in ('cantidad', 'cantidad_obsequio', 'costo_caja_real'):
+            ofertas[columna] = pd.to_numeric(ofertas[columna], errors='coerce').fillna(0)
+        ofertas = ofertas[(ofertas['cantidad'] > 0) & (ofertas['costo_caja_real'] > 0)]
+
+        # Un obsequio de otro producto no abarata el SKU comprado
+        if 'codigo_obsequio' in ofertas.columns:
+            obsequio = ofertas['codigo_obsequio'].astype('string').str.strip()
+            otro_producto = obsequio.notna() & (obsequio != '') & (obsequio != ofertas['codigo'])
+            ofertas.loc[otro_producto.to_numpy(dtype=bool), 'cantidad_obsequio'] = 0
+        if 'laboratorio' not in ofertas.columns:
+            ofertas['laboratorio'] = None
+
+        ofertas = ofertas.sort_values('codigo', kind='stable').reset_index(drop=True)
+        self.ofertas = ofertas
+        self.codigos = pd.Index(ofertas['codigo'].unique())
+        self._inicio = np.searchsorted(ofertas['codigo'].to_numpy(), self.codigos.to_numpy())
+        self._fin = np.append(self._inicio[1:], len(ofertas))
+
+        self._cantidad = ofertas['cantidad'].to_numpy(dtype=float)
+        self._obsequio = ofertas['cantidad_obsequio'].to_numpy(dtype=float)
+        self._costo = ofertas['costo_caja_real'].to_numpy(dtype=float)
+
+        if self.logger:
+            self.logger.info(f"🏷️ Motor de ofertas: {len(ofertas)} ofertas para {len(self.codigos)} productos")
+
+    def mejor_oferta(self, codigos, cantidades):
+        """
+        Elige, para cada línea, la oferta con menor costo total.
+
+        Args:
+            codigos (array-like): Código de producto de cada línea
+            cantidades (array-like): Cajas a comprar de cada línea
+
+        Returns:
+            pd.DataFrame: Una fila por línea (mismo orden) con indice_oferta
+                (-1 si no hay oferta), cant_obsequio, costo_total, costo_efectivo
+                y ahorro_oferta
+        """
+        codigos = pd.Index(pd.Series(codigos, dtype=str).str.strip())
+        cantidades = np.asarray(cantidades, dtype=float)
+        n = len(cantidades)
+
+        resultado = pd.DataFrame({
+            'indice_oferta': np.full(n, -1),
+            'cant_obsequio': np.zeros(n),
+            'costo_total': np.full(n, np.nan),
+            'costo_efectivo': np.full(n, np.nan),
+            'ahorro_oferta': np.zeros(n),
+        })
+        # Sin ofertas válidas (ej: todas con cantidad o costo en cero) ninguna línea tiene oferta
+        if self.ofertas.empty:
+            return resultado
+
+        posicion = self.codigos.get_indexer(codigos)
+        con_oferta = posicion >= 0
+        inicio = np.where(con_oferta, self._inicio[posicion], 0)
+        num_ofertas = np.where(con_oferta, self._fin[posicion] - inicio, 0)
+
+        # Expandir cada línea a sus ofertas candidatas
+        linea = np.repeat(np.arange(n), num_ofertas)
+        desplazamiento = np.arange(len(linea)) - np.repeat(np.cumsum(num_ofertas) - num_ofertas, num_ofertas)
+        oferta = inicio[linea] + desplazamiento
+
+        q = cantidades[linea]
+        lotes = np.floor(q / (self._cantidad[oferta] + self._obsequio[oferta]))
+        obsequio = lotes * self._obsequio[oferta]
+        costo_total = (q - obsequio) * self._costo[oferta]
+
+        # Menor costo total; a igual costo, más obsequio
+        orden = np.lexsort((-obsequio, costo_total, linea))
+        primera = np.ones(len(orden), dtype=bool)
+        primera[1:] = linea[orden][1:] != linea[orden][:-1]
+        elegidas = orden[primera]
+
+        filas = linea[elegidas]
+        resultado.loc[filas, 'indice_oferta'] = oferta[elegidas]
+        resultado.loc[filas, 'cant_obsequio'] = obsequio[elegidas]
+        resultado.loc[filas, 'costo_total'] = costo_total[elegidas]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resultado.loc[filas, 'costo_efectivo'] = np.where(
+                q[elegidas] > 0, costo_total[elegidas] / q[elegidas], self._costo[oferta[elegidas]]
+            )
+        resultado.loc[filas, 'ahorro_oferta'] = obsequio[elegidas] * self._costo[oferta[elegidas]]
+        return resultado
+
+    def anotar(self, df, columna_codigo='codigo_producto', columna_cantidad='cant_sugerida'):
+        """
+        Agrega a un sugerido de compra el costo efectivo y ahorro de la mejor oferta.
+
+        Args:
+            df (pd.DataFrame): Líneas de compra
+            columna_codigo (str): Columna con el código de producto
+            columna_cantidad (str): Columna con las cajas a comprar
+
+        Returns:
+            pd.DataFrame: Copia de df con COLUMNAS_ANOTACION_OFERTA
+        """
+        df = df.copy()
+        if df.empty:
+            for columna in COLUMNAS_ANOTACION_OFERTA:
+                df[columna] = pd.Series(dtype=float)
+            return df
+
+        mejor = self.mejor_oferta(df[columna_codigo], df[columna_cantidad])
+        indice = mejor['indice_oferta'].to_numpy()
+        laboratorios = self.ofertas['laboratorio'].to_numpy(dtype=object)
+
+        df['laboratorio_oferta'] = (
+            np.where(indice >= 0, laboratorios[np.maximum(indice, 0)], None) if len(laboratorios) else None
+        )
+        df['cant_obsequio'] = mejor['cant_obsequio'].to_numpy()
+        df['costo_efectivo'] = mejor['costo_efectivo'].round(2).to_numpy()
+        df['ahorro_oferta'] = mejor['ahorro_oferta'].round(2).to_numpy()
+
+        if self.logger:
+            con_oferta = int((indice >= 0).sum())
+            self.logger.info(
+                f"🏷️ Ofertas aplicadas: {con_oferta}/{len(df)} líneas con oferta, "
+                f"{df['cant_obsequio'].sum():.0f} cajas de obsequio, ahorro ${df['ahorro_oferta'].sum():,.0f}"
+            )
+        return df
@@ -0,0 +1,185 @@
+# analysis/transformer/transformer_antiguedad_inventario.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+
+# Bandas de antigüedad por días sin venta: (etiqueta, días máximos)
+BANDAS_ANTIGUEDAD = [
+    ('0-30', 30),
+    ('31-60', 60),
+    ('61-90', 90),
+    ('91-180', 180),
+    ('181-365', 365),
+    ('>365', np.inf),
+]
+BANDA_SIN_VENTA = 'sin_venta'
+
+# Acción para el inventario sin fecha de venta conocida: no se puede decidir si está muerto
+ACCION_SIN_DATO = 'sin_dato'
+
+# Días sin venta a partir de los que el inventario es candidato a muerto
+DIAS_INVENTARIO_MUERTO = 180
+
+# Compras más recientes que esto no se marcan como inventario muerto
+DIAS_GRACIA_COMPRA = 90
+
+# Un PDV con venta en estos días puede recibir el inventario muerto de otro
+DIAS_VENTA_ACTIVA = 60
+
+COLUMNAS_ANTIGUEDAD_INVENTARIO = [
+    'fecha', 'codigo', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'inv_fraccion', 'costo_unitario', 'inv_avaluado',
+    'ultima_venta', 'ultima_compra', 'dias_sin_venta', 'dias_sin_compra',
+    'banda_antiguedad', 'inventario_muerto', 'pdvs_con_venta', 'accion_sugerida'
+]
+
+
+class TransformadorAntiguedadInventario(BaseTransformer):
+    """
+    Antigüedad del inventario por PDV×SKU.
+
+    Toma la fecha más reciente entre el histórico de rotación y la maestra para
+    la última venta y la última compra, ubica el inventario valorizado en bandas
+    de días sin venta y marca como inventario muerto lo que no vende hace
+    DIAS_INVENTARIO_MUERTO días ni se compró recientemente. El inventario muerto
+    se sugiere para traslado si otro PDV vende el SKU, o para devolución si no;
+    sin fecha de venta conocida no se marca y su acción es ACCION_SIN_DATO.
+    Todo en una pasada vectorizada sobre el DataFrame consolidado.
+    """
+
+    def __init__(self, df, logger=None, fecha_corte=None, bandas=None,
+                 dias_muerto=DIAS_INVENTARIO_MUERTO, dias_gracia_compra=DIAS_GRACIA_COMPRA):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Insumos por PDV×SKU (ExtractorAntiguedadInventario)
+            logger: Instancia de logger para registrar eventos
+            fecha_corte (date, optional): Fecha desde la que se cuentan los días; por defecto hoy
+            bandas (list, optional): Pares (etiqueta, días máximos), ver BANDAS_ANTIGUEDAD
+            dias_muerto (int): Días sin venta para marcar inventario muerto
+            dias_gracia_compra (int): Días desde la última compra en que no se marca
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.fecha_corte = pd.Timestamp(fecha_corte or pd.Timestamp.now()).normalize()
+        self.bandas = bandas or BANDAS_ANTIGUEDAD
+        self.dias_muerto = dias_muerto
+        self.dias_gracia_compra = dias_gracia_compra
+
+    def transformar(self):
+        """
+        Calcula antigüedad, bandas y candidatos a inventario muerto.
+
+        Returns:
+            pd.DataFrame: Una fila por PDV×SKU con inventario y COLUMNAS_ANTIGUEDAD_INVENTARIO
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay datos para calcular antigüedad de inventario")
+            return pd.DataFrame(columns=COLUMNAS_ANTIGUEDAD_INVENTARIO)
+
+        try:
+            df = self._limpiar_datos()
+            df = df[df['inv_fraccion'] > 0].copy()
+
+            # Última venta/compra: la más reciente entre histórico y maestra
+            df['ultima_venta'] = df[['ultima_venta', 'fecha_venta_maestra']].max(axis=1)
+            df['ultima_compra'] = df[['ultima_compra', 'fecha_compra_maestra']].max(axis=1)
+            df['dias_sin_venta'] = (self.fecha_corte - df['ultima_venta']).dt.days.clip(lower=0)
+            df['dias_sin_compra'] = (self.fecha_corte - df['ultima_compra']).dt.days.clip(lower=0)
+
+            dias_venta = df['dias_sin_venta'].to_numpy(dtype=float)
+            dias_compra = df['dias_sin_compra'].to_numpy(dtype=float)
+            sin_venta = np.isnan(dias_venta)
+
+            limites = np.array([dias for _, dias in self.bandas], dtype=float)
+            etiquetas = np.array([etiqueta for etiqueta, _ in self.bandas] + [BANDA_SIN_VENTA], dtype=object)
+            posicion = np.searchsorted(limites, np.where(sin_venta, 0, dias_venta), side='left')
+            df['banda_antiguedad'] = etiquetas[np.where(sin_venta, len(limites), posicion)]
+
+            # Sin compra registrada cuenta como compra antigua; sin venta registrada
+            # no se sabe cuánto lleva quieto, así que no se marca como muerto
+            compra_antigua = np.isnan(dias_compra) | (dias_compra >= self.dias_gracia_compra)
+            muerto = ~sin_venta & (dias_venta >= self.dias_muerto) & compra_antigua
+            df['inventario_muerto'] = muerto
+
+            # PDVs que venden el SKU actualmente (sin contar el propio)
+            activo = ~sin_venta & (dias_venta <= DIAS_VENTA_ACTIVA)
+            df['pdvs_con_venta'] = (
+                pd.Series(activo, index=df.index).groupby(df['codigo']).transform('sum').to_numpy() - activo
+            ).astype(int)
+            df['accion_sugerida'] = np.select(
+                [muerto & (df['pdvs_con_venta'].to_numpy() > 0), muerto, sin_venta],
+                ['traslado', 'devolucion', ACCION_SIN_DATO],
+                default=''
+            )
+
+            df['inv_avaluado'] = (df['inv_fraccion'] * df['costo_unitario']).round(2)
+            df['inv_fraccion'] = df['inv_fraccion'].round(2)
+            df['fecha'] = self.fecha_corte.date()
+            for columna in ('ultima_venta', 'ultima_compra'):
+                df[columna] = df[columna].dt.date
+
+            if self.logger:
+                self.logger.info(
+                    f"✅ Antigüedad calculada: {len(df)} PDV×SKU con inventario, "
+                    f"{int(muerto.sum())} candidatos a inventario muerto "
+                    f"(${df.loc[muerto, 'inv_avaluado'].sum():,.0f}), "
+                    f"{int(sin_venta.sum())} sin fecha de venta"
+                )
+            return df[COLUMNAS_ANTIGUEDAD_INVENTARIO].reset_index(drop=True)
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular antigüedad de inventario: {e}")
+            return pd.DataFrame(columns=COLUMNAS_ANTIGUEDAD_INVENTARIO)
+
+    def _limpiar_datos(self):
+        """Normaliza tipos, fechas e inventario en cajas equivalentes"""
+        df = self.df.copy()
+        df['codigo'] = df['codigo'].astype(str).str.strip()
+        df['codigo_pdv'] = df['codigo_pdv'].astype(str)
+
+        for col in ('inventario_caja', 'inventario_blister', 'inventario_unidad', 'costo_unitario'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        for col in ('contenido_caja', 'contenido_blister'):
+            contenido = pd.to_numeric(df[col], errors='coerce')
+            df[col] = contenido.where(contenido > 0, 1)
+        for col in ('ultima_venta', 'ultima_compra', 'fecha_venta_maestra', 'fecha_compra_maestra'):
+            if col not in df.columns:
+                df[col] = pd.NaT
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.normalize()
+
+        df['inv_fraccion'] = (
+            df['inventario_caja']
+            + df['inventario_blister'] / df['contenido_blister']
+            + df['inventario_unidad'] / df['contenido_caja']
+        )
+        return df
+
+    @staticmethod
+    def resumen_bandas(df):
+        """
+        Inventario valorizado por PDV y banda de antigüedad.
+
+        Args:
+            df (pd.DataFrame): Resultado de transformar()
+
+        Returns:
+            pd.DataFrame: Una fila por punto_de_venta, una columna por banda y total
+        """
+        if df.empty:
+            return pd.DataFrame()
+        orden = [etiqueta for etiqueta, _ in BANDAS_ANTIGUEDAD] + [BANDA_SIN_VENTA]
+        resumen = df.pivot_table(
+            index='punto_de_venta', columns='banda_antiguedad', values='inv_avaluado',
+            aggfunc='sum', fill_value=0
+        )
+        resumen = resumen.reindex(columns=[b for b in orden if b in resumen.columns] +
+                                  [b for b in resumen.columns if b not in orden])
+        resumen['total'] = resumen.sum(axis=1)
+        resumen['inventario_muerto'] = df[df['inventario_muerto']].groupby('punto_de_venta')['inv_avaluado'].sum()
+        return resumen.fillna(0).round(2).reset_index()
@@ -0,0 +1,156 @@
+# analysis/transformer/transformer_estadisticas_demanda.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+
+COLUMNAS_ESTADISTICAS_DEMANDA = [
+    'codigo', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'venta_m3', 'venta_m2', 'venta_m1',
+    'promedio_venta', 'prom_2_meses', 'desviacion_venta',
+    'coeficiente_variacion', 'tendencia',
+    'dias_periodo', 'rotacion_diaria',
+    'meses_con_venta', 'periodo_final'
+]
+
+
+class TransformadorEstadisticasDemanda(BaseTransformer):
+    """
+    Calcula estadísticas de demanda por SKU×PDV sobre un arreglo denso
+    SKU×PDV×mes, en una sola pasada vectorizada con numpy.
+    """
+
+    def __init__(self, df, logger=None, meses=3):
+        """
+        Inicializa el transformador con el histórico ya extraído.
+
+        Args:
+            df (pd.DataFrame): Ventas por codigo, codigo_pdv y periodo
+            logger: Instancia de logger para registrar eventos
+            meses (int): Ventana de meses para las estadísticas
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.meses = meses
+
+    def transformar(self):
+        """
+        Construye el cubo de ventas y calcula las estadísticas de cada celda.
+
+        Returns:
+            pd.DataFrame: Una fila por SKU×PDV presente en el histórico
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay ventas para calcular estadísticas")
+            return pd.DataFrame(columns=COLUMNAS_ESTADISTICAS_DEMANDA)
+
+        try:
+            cubo, presentes, skus, pdvs, periodos = self._construir_cubo()
+            estadisticas = self._calcular_estadisticas(cubo, periodos)
+
+            # Solo las combinaciones SKU×PDV que existen en alguna tabla
+            i_sku, i_pdv = np.nonzero(presentes)
+            df_resultado = pd.DataFrame({
+                'codigo': skus[i_sku],
+                'codigo_pdv': pdvs[i_pdv],
+            })
+            for nombre, matriz in estadisticas.items():
+                df_resultado[nombre] = np.round(matriz[i_sku, i_pdv], 4)
+
+            df_resultado['dias_periodo'] = df_resultado['dias_periodo'].astype(int)
+            df_resultado['meses_con_venta'] = df_resultado['meses_con_venta'].astype(int)
+            df_resultado['periodo_final'] = str(periodos[-1])
+
+            # Atributos descriptivos del último registro disponible
+            descriptivos = (
+                self.df.sort_values('periodo')
+                .drop_duplicates(subset=['codigo', 'codigo_pdv'], keep='last')
+                [['codigo', 'codigo_pdv', 'nombre_producto', 'punto_de_venta']]
+            )
+            df_resultado = df_resultado.merge(descriptivos, on=['codigo', 'codigo_pdv'], how='left')
+
+            if self.logger:
+                self.logger.info(
+                    f"✅ Estadísticas calculadas: {len(df_resultado)} combinaciones SKU×PDV "
+                    f"({len(skus)} SKUs, {len(pdvs)} PDVs, {len(periodos)} meses)"
+                )
+            return df_resultado[COLUMNAS_ESTADISTICAS_DEMANDA]
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular estadísticas de demanda: {e}")
+            return pd.DataFrame(columns=COLUMNAS_ESTADISTICAS_DEMANDA)
+
+    def _construir_cubo(self):
+        """
+        Arma el arreglo denso SKU×PDV×mes sumando las ventas de cada celda.
+
+        El eje de meses es continuo entre el primer y el último periodo: un mes
+        sin tabla de rotación queda como venta cero en lugar de desaparecer y
+        correr la ventana hacia meses más antiguos.
+
+        Returns:
+            tuple: (cubo, matriz de presencia SKU×PDV, skus, pdvs, periodos ordenados)
+        """
+        i_sku, skus = pd.factorize(self.df['codigo'])
+        i_pdv, pdvs = pd.factorize(self.df['codigo_pdv'].astype(str))
+        # Convertir a Period solo los valores distintos, no cada fila
+        i_periodo, valores_periodo = pd.factorize(self.df['periodo'].astype(str))
+        periodos_fila = pd.PeriodIndex(valores_periodo, freq='M')
+        periodos = pd.period_range(periodos_fila.min(), periodos_fila.max(), freq='M')
+        i_mes = periodos.get_indexer(periodos_fila)[i_periodo]
+
+        cubo = np.zeros((len(skus), len(pdvs), len(periodos)), dtype=np.float64)
+        np.add.at(cubo, (i_sku, i_pdv, i_mes), self.df['venta'].to_numpy(dtype=np.float64))
+
+        presentes = np.zeros((len(skus), len(pdvs)), dtype=bool)
+        presentes[i_sku, i_pdv] = True
+
+        return cubo, presentes, np.asarray(skus), np.asarray(pdvs), periodos
+
+    def _calcular_estadisticas(self, cubo, periodos):
+        """
+        Calcula todas las estadísticas sobre la ventana de los últimos meses.
+
+        Args:
+            cubo (np.ndarray): Ventas SKU×PDV×mes
+            periodos (pd.PeriodIndex): Meses del cubo en orden cronológico
+
+        Returns:
+            dict: Nombre de estadística -> matriz SKU×PDV
+        """
+        ventana = cubo[:, :, -self.meses:]
+        n_meses = ventana.shape[2]
+        ceros = np.zeros(cubo.shape[:2])
+
+        def mes(atras):
+            return cubo[:, :, -atras] if cubo.shape[2] >= atras else ceros
+
+        promedio = ventana.mean(axis=2)
+        desviacion = ventana.std(axis=2)
+
+        # Pendiente de mínimos cuadrados (cajas por mes)
+        x = np.arange(n_meses) - (n_meses - 1) / 2
+        denominador = (x ** 2).sum()
+        tendencia = (ventana * x).sum(axis=2) / denominador if denominador > 0 else ceros
+
+        # Rotación diaria con los días reales de los meses de la ventana
+        dias_periodo = int(sum(p.days_in_month for p in periodos[-n_meses:]))
+
+        return {
+            'venta_m3': mes(3),
+            'venta_m2': mes(2),
+            'venta_m1': mes(1),
+            'promedio_venta': promedio,
+            'prom_2_meses': cubo[:, :, -2:].mean(axis=2),
+            'desviacion_venta': desviacion,
+            'coeficiente_variacion': np.divide(
+                desviacion, promedio, out=np.zeros_like(promedio), where=promedio > 0
+            ),
+            'tendencia': tendencia,
+            'dias_periodo': np.full(cubo.shape[:2], dias_periodo),
+            'rotacion_diaria': ventana.sum(axis=2) / dias_periodo,
+            'meses_con_venta': (ventana > 0).sum(axis=2),
+        }
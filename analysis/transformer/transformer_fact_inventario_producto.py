@@ -0,0 +1,128 @@
+# analysis/transformer/transformer_fact_inventario_producto.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+
+CLAVE_INVENTARIO_PRODUCTO = ['codigo_pdv', 'codigo_producto']
+
+COLUMNAS_FACT_INVENTARIO_PRODUCTO = [
+    'fecha', 'codigo_pdv', 'codigo_producto', 'unidades', 'costo_unitario', 'costo_total'
+]
+
+# Decimales con que se guardan (y comparan) unidades y costo
+DECIMALES_UNIDADES = 2
+DECIMALES_COSTO = 4
+
+
+class TransformadorFactInventarioProducto(BaseTransformer):
+    """
+    Prepara la foto diaria de inventario por PDV×producto para
+    fact_inventario_producto con compresión por longitud de corrida: solo se
+    conservan las filas cuyas unidades o costo cambiaron respecto al último
+    estado guardado, más una fila en cero para los productos que
+    desaparecieron del inventario. El estado de cualquier día es la última
+    fila de cada PDV×producto con fecha menor o igual a ese día.
+    """
+
+    def __init__(self, df, logger=None, fecha=None, anterior=None):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Inventario actual (ExtractorFactInventarioProducto)
+            logger: Instancia de logger para registrar eventos
+            fecha (date, optional): Fecha de la foto; por defecto hoy
+            anterior (pd.DataFrame, optional): Último estado guardado de cada
+                PDV×producto (codigo_pdv, codigo_producto, unidades, costo_unitario)
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.fecha = pd.Timestamp(fecha or pd.Timestamp.now()).normalize()
+        self.anterior = anterior
+
+    def transformar(self):
+        """
+        Normaliza la foto y la reduce a los cambios.
+
+        Returns:
+            pd.DataFrame: Filas a guardar con COLUMNAS_FACT_INVENTARIO_PRODUCTO
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay inventario por producto para transformar")
+            return pd.DataFrame(columns=COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+
+        try:
+            actual = self._normalizar(self.df)
+            cambios = self._comprimir(actual)
+            cambios['fecha'] = self.fecha.date()
+
+            if self.logger:
+                proporcion = len(cambios) / len(actual) if len(actual) else 0
+                self.logger.info(
+                    f"✅ Foto de inventario del {self.fecha:%Y-%m-%d}: {len(actual)} PDV×producto, "
+                    f"{len(cambios)} filas con cambios ({proporcion:.1%})"
+                )
+            return cambios[COLUMNAS_FACT_INVENTARIO_PRODUCTO].reset_index(drop=True)
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al preparar fact_inventario_producto: {e}")
+            return pd.DataFrame(columns=COLUMNAS_FACT_INVENTARIO_PRODUCTO)
+
+    def _normalizar(self, df):
+        """Tipos, redondeo y una fila por PDV×producto (los repetidos se suman)"""
+        df = df.copy()
+        df['codigo_pdv'] = df['codigo_pdv'].astype(str)
+        df['codigo_producto'] = (
+            df['codigo_producto'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+        )
+        for columna in ('unidades', 'costo_unitario', 'costo_total'):
+            df[columna] = pd.to_numeric(df[columna], errors='coerce').fillna(0)
+
+        df = df.groupby(CLAVE_INVENTARIO_PRODUCTO, as_index=False, sort=False).agg(
+            unidades=('unidades', 'sum'),
+            costo_unitario=('costo_unitario', 'max'),
+            costo_total=('costo_total', 'sum'),
+        )
+        df['unidades'] = df['unidades'].round(DECIMALES_UNIDADES)
+        df['costo_unitario'] = df['costo_unitario'].round(DECIMALES_COSTO)
+        df['costo_total'] = df['costo_total'].round(2)
+        return df
+
+    def _comprimir(self, actual):
+        """
+        Compara contra el último estado en una sola unión externa.
+
+        Returns:
+            pd.DataFrame: Filas nuevas o cambiadas, y filas en cero para los
+                productos que tenían inventario y ya no aparecen
+        """
+        if self.anterior is None or self.anterior.empty:
+            return actual
+
+        anterior = self.anterior[CLAVE_INVENTARIO_PRODUCTO + ['unidades', 'costo_unitario']].astype(
+            {'codigo_pdv': str, 'codigo_producto': str}
+        )
+        # Solo se comparan los PDVs presentes en la foto; un PDV sin archivo hoy conserva su estado
+        anterior = anterior[anterior['codigo_pdv'].isin(actual['codigo_pdv'].unique())]
+
+        unido = actual.merge(anterior, on=CLAVE_INVENTARIO_PRODUCTO, how='outer',
+                             suffixes=('', '_anterior'), indicator=True)
+        nuevo = (unido['_merge'] == 'left_only').to_numpy()
+        desaparecido = (unido['_merge'] == 'right_only').to_numpy()
+
+        unidades_ant = pd.to_numeric(unido['unidades_anterior'], errors='coerce').round(DECIMALES_UNIDADES).to_numpy()
+        costo_ant = pd.to_numeric(unido['costo_unitario_anterior'], errors='coerce').round(DECIMALES_COSTO).to_numpy()
+        cambio = ~nuevo & ~desaparecido & (
+            (unido['unidades'].to_numpy() != unidades_ant) | (unido['costo_unitario'].to_numpy() != costo_ant)
+        )
+        # Un producto que desaparece se cierra con unidades en cero (si no estaba ya en cero)
+        cierre = desaparecido & (np.nan_to_num(unidades_ant) != 0)
+
+        unido.loc[cierre, 'unidades'] = 0.0
+        unido.loc[cierre, 'costo_unitario'] = costo_ant[cierre]
+        unido.loc[cierre, 'costo_total'] = 0.0
+        return unido.loc[nuevo | cambio | cierre, CLAVE_INVENTARIO_PRODUCTO + ['unidades', 'costo_unitario', 'costo_total']]
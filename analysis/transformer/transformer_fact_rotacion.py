@@ -1,37 +1,155 @@
 # analysis/transformer/transformer_fact_rotacion.py
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from utils.db_connection import get_mysql_url
 from analysis.transformer.transformer_base import BaseTransformer
+from analysis.loader.create_dim_fecha import asegurar_fechas
+
+# Clasificación ABC por rotación mensual: A >= 2 veces al mes, B >= 1, resto C
+UMBRALES_ABC_ROTACION = {'A': 2, 'B': 1}
+
+# Clasificación ABC Pareto: participación acumulada de la venta del PDV en el mes
+# antes del producto (A hasta 80%, B hasta 95%, resto C)
+UMBRALES_ABC_PARETO = {'A': 0.80, 'B': 0.95}
+
+METODOS_ABC = ('rotacion', 'pareto')
+
+# Estado del inventario por días de inventario (límite superior de cada tramo)
+TRAMOS_ESTADO_INVENTARIO = [(15, 'BAJO'), (45, 'ÓPTIMO'), (60, 'ALTO')]
+ESTADO_INVENTARIO_EXCESO = 'EXCESO'
+
+DIAS_INVENTARIO_CRITICO = 7
+MARGEN_ALTA_RENTABILIDAD = 30
+
+COLUMNAS_CLASIFICACION_ROTACION = [
+    'abc_clasificacion', 'estado_inventario', 'semanas_inventario',
+    'inventario_critico', 'alta_rentabilidad'
+]
+
+
+def _limpiar_codigos(serie):
+    """
+    Quita espacios de una columna de códigos. Las columnas categóricas (ver
+    ExtractorFactRotacion._consolidar_compacto) se limpian sobre sus categorías,
+    una vez por valor distinto, y siguen siendo categóricas con las categorías
+    ordenadas para que los desempates coincidan con el orden del motor SQL.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.astype(str).str.strip()
+    if serie.cat.categories.empty:
+        return serie
+
+    limpias = serie.cat.categories.astype(str).str.strip()
+    categorias = pd.Index(limpias.unique()).sort_values()
+    posiciones = categorias.get_indexer(limpias)
+    codigos = serie.cat.codes.to_numpy()
+    codigos = np.where(codigos >= 0, posiciones[np.maximum(codigos, 0)], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index, name=serie.name
+    )
+
+
+def clasificar_abc_rotacion(rotacion_mes):
+    """Clase ABC según la rotación mensual"""
+    rotacion_mes = np.asarray(rotacion_mes, dtype=float)
+    return np.select(
+        [rotacion_mes >= UMBRALES_ABC_ROTACION['A'], rotacion_mes >= UMBRALES_ABC_ROTACION['B']],
+        ['A', 'B'],
+        default='C'
+    )
+
+
+def clasificar_abc_pareto(df, columna_venta='venta_total', grupo=('codigo_pdv', 'fecha')):
+    """
+    Clase ABC de Pareto sobre la venta acumulada de cada grupo (PDV-fecha).
+
+    Returns:
+        np.ndarray: Clase de cada fila en el orden de df
+    """
+    grupo = list(grupo)
+    venta = df[columna_venta].to_numpy(dtype=float).clip(min=0)
+    # Empates de venta: por código de producto, igual que el motor SQL
+    desempate = ['codigo_producto'] if 'codigo_producto' in df.columns else []
+    ordenado = df[grupo + desempate].assign(_venta=venta, _pos=np.arange(len(df))).sort_values(
+        grupo + ['_venta'] + desempate,
+        ascending=[True] * len(grupo) + [False] + [True] * len(desempate),
+        kind='stable'
+    )
+    agrupado = ordenado.groupby(grupo, sort=False, observed=True)['_venta']
+    total = agrupado.transform('sum').to_numpy()
+    previo = agrupado.cumsum().to_numpy() - ordenado['_venta'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        participacion = np.where(total > 0, previo / total, 1.0)
+
+    clase = np.select(
+        [participacion < UMBRALES_ABC_PARETO['A'], participacion < UMBRALES_ABC_PARETO['B']],
+        ['A', 'B'],
+        default='C'
+    )
+    clase[ordenado['_venta'].to_numpy() <= 0] = 'C'
+
+    resultado = np.empty(len(df), dtype=object)
+    resultado[ordenado['_pos'].to_numpy()] = clase
+    return resultado
+
+
+def estado_inventario(dias_inventario):
+    """Estado del inventario (BAJO/ÓPTIMO/ALTO/EXCESO) según días de inventario"""
+    dias_inventario = np.asarray(dias_inventario, dtype=float)
+    return np.select(
+        [dias_inventario <= limite for limite, _ in TRAMOS_ESTADO_INVENTARIO],
+        [estado for _, estado in TRAMOS_ESTADO_INVENTARIO],
+        default=ESTADO_INVENTARIO_EXCESO
+    )
+
 
 class TransformadorFactRotacion(BaseTransformer):
     """
     Transformador para datos de rotación de inventario.
     Aplica transformaciones y enriquece los datos para la tabla fact_rotacion.
+    
+    Una misma instancia puede transformar varios DataFrames (ej: uno por PDV)
+    pasando cada uno a transformar(): comparte el engine y guarda las claves de
+    dim_producto y dim_fecha ya resueltas, así cada código se consulta una vez.
     """
     
-    def __init__(self, df, logger=None):
+    def __init__(self, df, logger=None, abc_metodo='rotacion', engine=None):
         """
         Inicializa el transformador con los datos ya extraídos.
         
         Args:
             df (pd.DataFrame): DataFrame con los datos extraídos
             logger: Instancia de logger para registrar eventos
+            abc_metodo (str): 'rotacion' (umbrales de rotación mensual) o
+                'pareto' (venta acumulada por PDV)
+            engine (optional): Engine de SQLAlchemy a reutilizar; por defecto se crea uno
         """
+        if abc_metodo not in METODOS_ABC:
+            raise ValueError(f"Método ABC no soportado: {abc_metodo}. Opciones: {', '.join(METODOS_ABC)}")
         self.path = None  # No usamos path en este caso
         self.df = df
         self.logger = logger
+        self.abc_metodo = abc_metodo
         self.db_url = get_mysql_url("gestion_compras")
-        self.engine = create_engine(self.db_url)
+        self.engine = engine or create_engine(self.db_url)
+        # Claves ya resueltas: codigo_producto -> producto_sk (None si no existe) y fecha -> fecha_sk
+        self._productos_sk = {}
+        self._fechas_sk = {}
     
-    def transformar(self):
+    def transformar(self, df=None):
         """
         Transforma y enriquece los datos para fact_rotacion.
         
+        Args:
+            df (pd.DataFrame, optional): Datos a transformar en lugar de los del constructor
+        
         Returns:
             pd.DataFrame: DataFrame transformado listo para cargar
         """
+        if df is not None:
+            self.df = df
         if self.df is None or self.df.empty:
             if self.logger:
                 self.logger.warning("⚠️ No hay datos para transformar")
@@ -47,6 +165,7 @@ class TransformadorFactRotacion(BaseTransformer):
             
             # 3. Calcular campos adicionales
             self._calcular_campos_adicionales()
+            self._calcular_clasificaciones()
             
             # 4. Formato final
             self._ajustar_formato_final()
@@ -80,42 +199,42 @@ class TransformadorFactRotacion(BaseTransformer):
         
         # Convertir fechas
         if 'fecha' in self.df.columns:
-            self.df['fecha'] = pd.to_datetime(self.df['fecha'], errors='coerce')
+            # Normalizar a día para que la clave (producto, PDV, fecha) coincida entre corridas
+            self.df['fecha'] = pd.to_datetime(self.df['fecha'], errors='coerce').dt.normalize()
             # Usar fecha actual para valores nulos
             self.df['fecha'] = self.df['fecha'].fillna(pd.Timestamp.now().normalize())
         
-        # Limpiar códigos de producto y PDV
+        # Limpiar códigos de producto y PDV (sin perder el tipo categórico)
         if 'codigo_producto' in self.df.columns:
-            self.df['codigo_producto'] = self.df['codigo_producto'].astype(str).str.strip()
+            self.df['codigo_producto'] = _limpiar_codigos(self.df['codigo_producto'])
             
         if 'codigo_pdv' in self.df.columns:
-            self.df['codigo_pdv'] = self.df['codigo_pdv'].astype(str).str.strip()
+            self.df['codigo_pdv'] = _limpiar_codigos(self.df['codigo_pdv'])
     
     def _buscar_producto_sk(self):
-        """Busca las claves de producto en dim_producto"""
+        """Busca las claves de producto en dim_producto (solo los códigos aún no resueltos)"""
         try:
-            # Obtener lista única de códigos de producto
-            codigos_producto = self.df['codigo_producto'].unique().tolist()
-            
-            # Buscar los productos_sk en la dimensión
-            query = text("""
-                SELECT producto_sk, codigo
-                FROM dim_producto
-                WHERE codigo IN :codigos
-            """)
+            codigos_producto = [str(codigo) for codigo in pd.unique(self.df['codigo_producto'].dropna())]
+            faltantes = [codigo for codigo in codigos_producto if codigo not in self._productos_sk]
             
-            with self.engine.connect() as connection:
-                resultado = pd.read_sql(
-                    query, 
-                    connection, 
-                    params={"codigos": tuple(codigos_producto) if len(codigos_producto) > 1 else f"('{codigos_producto[0]}')" }
-                )
-            
-            # Crear diccionario de mapeo
-            mapeo_productos = dict(zip(resultado['codigo'], resultado['producto_sk']))
+            if faltantes:
+                query = text("""
+                    SELECT producto_sk, codigo
+                    FROM dim_producto
+                    WHERE codigo IN :codigos
+                """).bindparams(bindparam("codigos", expanding=True))
+                
+                with self.engine.connect() as connection:
+                    resultado = pd.read_sql(query, connection, params={"codigos": faltantes})
+                
+                # Los códigos sin fila en la dimensión también se recuerdan para no volver a consultarlos
+                self._productos_sk.update(dict.fromkeys(faltantes))
+                self._productos_sk.update(zip(resultado['codigo'].astype(str), resultado['producto_sk']))
             
             # Aplicar el mapeo al DataFrame
-            self.df['producto_sk'] = self.df['codigo_producto'].map(mapeo_productos)
+            self.df['producto_sk'] = pd.to_numeric(
+                self.df['codigo_producto'].astype(str).map(self._productos_sk), errors='coerce'
+            )
             
             # Contar cuántos se mapearon
             productos_mapeados = self.df['producto_sk'].notnull().sum()
@@ -128,67 +247,19 @@ class TransformadorFactRotacion(BaseTransformer):
                 self.logger.error(f"💥 Error al buscar producto_sk: {e}")
     
     def _buscar_fecha_sk(self):
-        """Busca o crea las claves de fecha en dim_fecha"""
+        """Busca o crea en un solo lote las claves de fecha en dim_fecha"""
         try:
-            # Obtener lista única de fechas
-            fechas_unicas = self.df['fecha'].dt.date.unique()
-            
-            # Buscar fecha_sk para cada fecha en dim_fecha
-            fechas_map = {}
-            
-            with self.engine.connect() as connection:
-                for fecha in fechas_unicas:
-                    query = text("""
-                        SELECT fecha_sk
-                        FROM dim_fecha
-                        WHERE fecha = :fecha
-                    """)
-                    
-                    resultado = connection.execute(query, {"fecha": fecha}).fetchone()
-                    
-                    if resultado:
-                        fechas_map[fecha] = resultado[0]
-                    else:
-                        # La fecha no existe, intentar crearla
-                        query_insertar = text("""
-                            INSERT INTO dim_fecha (
-                                fecha, dia, mes, anio, trimestre, semestre,
-                                dia_semana, nombre_dia, nombre_mes, 
-                                es_fin_semana, es_feriado
-                            ) VALUES (
-                                :fecha, 
-                                DAY(:fecha), 
-                                MONTH(:fecha), 
-                                YEAR(:fecha),
-                                QUARTER(:fecha),
-                                IF(MONTH(:fecha) <= 6, 1, 2),
-                                DAYOFWEEK(:fecha),
-                                DATE_FORMAT(:fecha, '%W'),
-                                DATE_FORMAT(:fecha, '%M'),
-                                IF(DAYOFWEEK(:fecha) IN (1, 7), 1, 0),
-                                0  # Por defecto no es feriado
-                            )
-                        """)
-                        
-                        connection.execute(query_insertar, {"fecha": fecha})
-                        
-                        # Obtener el ID generado
-                        query_id = text("""
-                            SELECT fecha_sk 
-                            FROM dim_fecha 
-                            WHERE fecha = :fecha
-                        """)
-                        
-                        resultado = connection.execute(query_id, {"fecha": fecha}).fetchone()
-                        
-                        if resultado:
-                            fechas_map[fecha] = resultado[0]
+            # Garantizar con una sola inserción masiva las fechas que aún no se resolvieron
+            fechas = self.df['fecha'].dt.date.unique()
+            faltantes = [fecha for fecha in fechas if fecha not in self._fechas_sk]
+            if faltantes:
+                self._fechas_sk.update(asegurar_fechas(self.engine, faltantes, logger=self.logger))
             
             # Aplicar el mapeo al DataFrame
-            self.df['fecha_sk'] = self.df['fecha'].dt.date.map(fechas_map)
+            self.df['fecha_sk'] = self.df['fecha'].dt.date.map(self._fechas_sk)
             
             if self.logger:
-                self.logger.info(f"📅 Fechas mapeadas: {len(fechas_map)}")
+                self.logger.info(f"📅 Fechas mapeadas: {len(fechas)}")
                 
         except Exception as e:
             if self.logger:
@@ -207,6 +278,26 @@ class TransformadorFactRotacion(BaseTransformer):
         self.df['dias_inventario'] = self.df['dias_inventario'].clip(0, 90)
         self.df['rotacion_mes'] = self.df['rotacion_mes'].clip(0, 30)
     
+    def _calcular_clasificaciones(self):
+        """Clasificación ABC, estado del inventario y banderas de análisis de cada fila"""
+        if self.abc_metodo == 'pareto':
+            self.df['abc_clasificacion'] = clasificar_abc_pareto(self.df)
+        else:
+            self.df['abc_clasificacion'] = clasificar_abc_rotacion(self.df['rotacion_mes'])
+        
+        dias = self.df['dias_inventario'].to_numpy(dtype=float)
+        self.df['estado_inventario'] = estado_inventario(dias)
+        self.df['semanas_inventario'] = np.round(dias / 7, 2)
+        self.df['inventario_critico'] = dias < DIAS_INVENTARIO_CRITICO
+        self.df['alta_rentabilidad'] = self.df['margen_porcentaje'].to_numpy(dtype=float) > MARGEN_ALTA_RENTABILIDAD
+        
+        if self.logger:
+            conteo = self.df['abc_clasificacion'].value_counts()
+            self.logger.info(
+                f"🔠 Clasificación ABC ({self.abc_metodo}): "
+                + ", ".join(f"{clase}={conteo.get(clase, 0)}" for clase in 'ABC')
+            )
+    
     def _ajustar_formato_final(self):
         """Ajusta el formato final del DataFrame para la carga"""
         # Asegurar que todos los campos estén presentes
@@ -219,7 +310,7 @@ class TransformadorFactRotacion(BaseTransformer):
             'margen_bruto', 'margen_porcentaje',
             'inventario_unidades_inicial', 'inventario_unidades_final',
             'dias_inventario', 'rotacion_mes'
-        ]
+        ] + COLUMNAS_CLASIFICACION_ROTACION
         
         for col in columnas_requeridas:
             if col not in self.df.columns:
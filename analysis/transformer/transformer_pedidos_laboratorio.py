@@ -0,0 +1,172 @@
+# analysis/transformer/transformer_pedidos_laboratorio.py
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+from analysis.extractor.extractor_pedidos_laboratorio import COLUMNAS_CONTACTO
+
+SIN_LABORATORIO = 'sin laboratorio'
+SIN_PROVEEDOR = 'sin proveedor'
+
+COLUMNAS_LINEA_PEDIDO = [
+    'pedido', 'laboratorio', 'proveedor',
+    'codigo_producto', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'cant_sugerida', 'cant_obsequio', 'costo', 'valor'
+]
+
+COLUMNAS_PEDIDO = (
+    ['pedido', 'laboratorio', 'proveedor', 'lineas', 'productos', 'pdvs', 'cajas', 'valor']
+    + COLUMNAS_CONTACTO[1:]
+)
+
+
+def nombre_archivo(texto):
+    """Convierte un nombre en un fragmento de archivo seguro: minúsculas, ASCII y '_'"""
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_') or 'sin_nombre'
+
+
+def _limpiar_nombre(serie):
+    """Nombre para mostrar: sin espacios sobrantes, conservando mayúsculas y tildes"""
+    return serie.astype('string').str.strip().str.replace(r'\s+', ' ', regex=True)
+
+
+def _normalizar_laboratorio(serie):
+    """Clave de cruce de laboratorio: minúsculas y espacios simples"""
+    return _limpiar_nombre(serie).str.lower()
+
+
+def _nombres_unicos(bases):
+    """Agrega _2, _3... a los nombres repetidos para que ningún archivo pise a otro"""
+    usados = set()
+    nombres = []
+    for base in bases:
+        nombre, numero = base, 1
+        while nombre in usados:
+            numero += 1
+            nombre = f"{base}_{numero}"
+        usados.add(nombre)
+        nombres.append(nombre)
+    return nombres
+
+
+class TransformadorPedidosLaboratorio(BaseTransformer):
+    """
+    Agrupa el sugerido de compra en pedidos por laboratorio y proveedor.
+
+    Cada pedido recibe un nombre de archivo estable (con sufijo numérico si dos
+    laboratorios o proveedores dan el mismo nombre de archivo) y se enlaza con
+    el contacto de su laboratorio. Los pedidos se agrupan sin distinguir
+    mayúsculas ni espacios, pero muestran el nombre original. El costo de cada línea es el costo efectivo de la mejor
+    oferta cuando existe y el mayor costo del SKU en la cadena si no.
+    """
+
+    def __init__(self, df, contactos=None, logger=None):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Líneas del sugerido (ExtractorPedidosLaboratorio)
+            contactos (pd.DataFrame, optional): Contactos con COLUMNAS_CONTACTO
+            logger: Instancia de logger para registrar eventos
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.contactos = contactos
+        self.logger = logger
+
+    def transformar(self):
+        """
+        Arma las líneas y el resumen de cada pedido.
+
+        Returns:
+            dict: DataFrames 'lineas' (COLUMNAS_LINEA_PEDIDO, ordenadas por pedido)
+                y 'pedidos' (COLUMNAS_PEDIDO, uno por archivo)
+        """
+        vacio = {
+            'lineas': pd.DataFrame(columns=COLUMNAS_LINEA_PEDIDO),
+            'pedidos': pd.DataFrame(columns=COLUMNAS_PEDIDO),
+        }
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay sugerido de compra para armar pedidos")
+            return vacio
+
+        try:
+            df = self.df.copy()
+            laboratorio = _limpiar_nombre(df['laboratorio'])
+            if 'laboratorio_oferta' in df.columns:
+                laboratorio = laboratorio.fillna(_limpiar_nombre(df['laboratorio_oferta']))
+            df['laboratorio'] = laboratorio.fillna(SIN_LABORATORIO).replace('', SIN_LABORATORIO)
+            proveedor = _limpiar_nombre(df['proveedor'])
+            df['proveedor'] = proveedor.fillna(SIN_PROVEEDOR).replace('', SIN_PROVEEDOR)
+            df['clave_laboratorio'] = df['laboratorio'].str.lower()
+            df['clave_proveedor'] = df['proveedor'].str.lower()
+
+            df['cant_sugerida'] = pd.to_numeric(df['cant_sugerida'], errors='coerce').fillna(0)
+            df['cant_obsequio'] = (
+                pd.to_numeric(df['cant_obsequio'], errors='coerce').fillna(0)
+                if 'cant_obsequio' in df.columns else 0.0
+            )
+            costo = pd.to_numeric(df['mayor_costo'], errors='coerce')
+            if 'costo_efectivo' in df.columns:
+                costo = pd.to_numeric(df['costo_efectivo'], errors='coerce').fillna(costo)
+            df['costo'] = costo.fillna(0).round(2)
+            df['valor'] = (df['cant_sugerida'] * df['costo']).round(2)
+
+            # Un archivo por laboratorio×proveedor; el nombre se calcula una vez por grupo
+            clave = ['clave_laboratorio', 'clave_proveedor']
+            grupos = df.groupby(clave, as_index=False, sort=True).agg(
+                laboratorio=('laboratorio', 'first'), proveedor=('proveedor', 'first')
+            )
+            bases = [
+                f"pedido_{nombre_archivo(lab)}_{nombre_archivo(prov)}"
+                for lab, prov in zip(grupos['clave_laboratorio'], grupos['clave_proveedor'])
+            ]
+            grupos['pedido'] = _nombres_unicos(bases)
+            if self.logger and len(set(bases)) < len(bases):
+                self.logger.warning(
+                    f"⚠️ {len(bases) - len(set(bases))} pedidos comparten nombre de archivo; se les agregó un sufijo numérico"
+                )
+            df = df.drop(columns=['laboratorio', 'proveedor']).merge(grupos, on=clave, how='left')
+            df = df.sort_values(['pedido', 'codigo_producto', 'punto_de_venta'], kind='stable')
+
+            pedidos = df.groupby(['pedido', 'laboratorio', 'proveedor', 'clave_laboratorio'], as_index=False).agg(
+                lineas=('codigo_producto', 'size'),
+                productos=('codigo_producto', 'nunique'),
+                pdvs=('codigo_pdv', 'nunique'),
+                cajas=('cant_sugerida', 'sum'),
+                valor=('valor', 'sum'),
+            )
+            pedidos = self._enlazar_contactos(pedidos)
+
+            if self.logger:
+                sin_contacto = int(pedidos['correo_contacto'].isna().sum())
+                self.logger.info(
+                    f"✅ Pedidos armados: {len(pedidos)} pedidos, {len(df)} líneas, "
+                    f"${pedidos['valor'].sum():,.0f} ({sin_contacto} sin contacto de laboratorio)"
+                )
+            return {
+                'lineas': df[COLUMNAS_LINEA_PEDIDO].reset_index(drop=True),
+                'pedidos': pedidos[COLUMNAS_PEDIDO],
+            }
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al armar pedidos por laboratorio: {e}")
+            return vacio
+
+    def _enlazar_contactos(self, pedidos):
+        """Agrega el primer contacto registrado de cada laboratorio"""
+        if self.contactos is None or self.contactos.empty:
+            for columna in COLUMNAS_CONTACTO[1:]:
+                pedidos[columna] = np.nan
+            return pedidos
+
+        contactos = self.contactos[COLUMNAS_CONTACTO].copy()
+        contactos['clave_laboratorio'] = _normalizar_laboratorio(contactos.pop('laboratorio'))
+        contactos = contactos.dropna(subset=['clave_laboratorio']).drop_duplicates(subset='clave_laboratorio')
+        return pedidos.merge(contactos, on='clave_laboratorio', how='left')
@@ -0,0 +1,203 @@
+# analysis/transformer/transformer_politica_min_max.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+from analysis.extractor.extractor_politicas import FUENTES_POLITICA
+
+# Etiqueta de PDV para políticas generales cuando no hay PDVs a los que expandirlas
+PDV_TODOS = 'todos'
+
+# Cómo se combina cada límite entre fuentes: 'max', 'min' o 'precedencia'
+# (valor de la fuente más prioritaria según el orden de FUENTES_POLITICA)
+REGLAS_POLITICA = {
+    'minimo': 'max',
+    'maximo': 'max',
+}
+
+COLUMNAS_POLITICA_MIN_MAX = (
+    ['codigo', 'punto_de_venta', 'codigo_pdv',
+     'inv_minimo', 'inv_maximo', 'fuente_minimo', 'fuente_maximo', 'num_fuentes']
+    + [f"{limite}_{fuente}" for fuente in FUENTES_POLITICA for limite in ('min', 'max')]
+)
+
+
+class TransformadorPoliticaMinMax(BaseTransformer):
+    """
+    Resuelve la política min/max efectiva por (codigo, PDV) a partir
+    de todas las fuentes de política en formato largo, en una sola pasada
+    vectorizada (orden + drop_duplicates) en lugar de un join por fuente.
+    Los límites llegan en cajas desde ExtractorPoliticas, así que max/min
+    comparan fuentes en la misma unidad.
+
+    El PDV se identifica por el código al final de punto_de_venta: las fuentes
+    que rotulan el mismo PDV con otro formato ('ciudadela 28233' frente a
+    'ciudadela_28233') se combinan en la misma fila.
+    """
+
+    def __init__(self, df, logger=None, fecha_corte=None, reglas=None,
+                 precedencia=None, fuentes_imperativas=(), pdvs=None):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Políticas en formato largo (ExtractorPoliticas)
+            logger: Instancia de logger para registrar eventos
+            fecha_corte (date, optional): Fecha para vigencia de temporales; por defecto hoy
+            reglas (dict, optional): Regla por límite ('minimo'/'maximo'), ver REGLAS_POLITICA
+            precedencia (list, optional): Fuentes de mayor a menor prioridad
+            fuentes_imperativas (iterable): Fuentes que, si existen para la celda,
+                descartan al resto (ej: ('gerencia',))
+            pdvs (iterable, optional): PDVs a los que se expanden las políticas sin
+                punto de venta; por defecto los que aparecen en las demás fuentes
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.fecha_corte = pd.Timestamp(fecha_corte or pd.Timestamp.now()).normalize()
+        self.reglas = {**REGLAS_POLITICA, **(reglas or {})}
+        self.precedencia = list(precedencia or FUENTES_POLITICA)
+        self.fuentes_imperativas = set(fuentes_imperativas)
+        self.pdvs = pdvs
+
+    def transformar(self):
+        """
+        Calcula la política efectiva.
+
+        Returns:
+            pd.DataFrame: Una fila por codigo×punto_de_venta con COLUMNAS_POLITICA_MIN_MAX
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay políticas para resolver")
+            return pd.DataFrame(columns=COLUMNAS_POLITICA_MIN_MAX)
+
+        try:
+            df = self._limpiar_datos()
+            df = self._filtrar_vigentes(df)
+            df = self._expandir_generales(df)
+            if df.empty:
+                return pd.DataFrame(columns=COLUMNAS_POLITICA_MIN_MAX)
+
+            df = self._aplicar_imperativas(df)
+            clave = ['codigo', 'pdv']
+
+            # Valores por fuente (una columna min_/max_ por fuente)
+            por_fuente = df.pivot_table(
+                index=clave, columns='fuente', values=['minimo', 'maximo'], aggfunc='max'
+            )
+            resultado = pd.DataFrame(index=por_fuente.index)
+            for fuente in FUENTES_POLITICA:
+                for limite, columna in (('min', 'minimo'), ('max', 'maximo')):
+                    resultado[f"{limite}_{fuente}"] = (
+                        por_fuente[(columna, fuente)] if (columna, fuente) in por_fuente.columns else np.nan
+                    )
+            resultado['num_fuentes'] = df.groupby(clave)['fuente'].nunique()
+            # Rótulo del PDV tomado de la fuente más prioritaria
+            resultado['punto_de_venta'] = (
+                df.sort_values('prioridad', kind='stable').groupby(clave)['punto_de_venta'].first()
+            )
+
+            # Límite efectivo y fuente que lo determina
+            for columna, destino in (('minimo', 'inv_minimo'), ('maximo', 'inv_maximo')):
+                elegido = self._resolver_limite(df, columna, clave)
+                resultado[destino] = elegido[columna]
+                resultado[f"fuente_{columna}"] = elegido['fuente']
+
+            resultado = resultado.reset_index()
+            resultado['inv_maximo'] = resultado[['inv_minimo', 'inv_maximo']].max(axis=1)
+            resultado['codigo_pdv'] = self._codigo_pdv(resultado['punto_de_venta'])
+
+            if self.logger:
+                self.logger.info(
+                    f"✅ Política min/max resuelta: {len(resultado)} combinaciones "
+                    f"codigo×PDV desde {df['fuente'].nunique()} fuentes"
+                )
+            return resultado[COLUMNAS_POLITICA_MIN_MAX]
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"❌ Error resolviendo política min/max: {e}")
+            raise
+
+    def _limpiar_datos(self):
+        """Normaliza tipos, descarta filas sin límites y asigna la prioridad de cada fuente"""
+        df = self.df.copy()
+        df['codigo'] = df['codigo'].astype(str).str.strip()
+        df['punto_de_venta'] = df['punto_de_venta'].astype('string').str.strip().replace('', pd.NA)
+        for columna in ('minimo', 'maximo'):
+            df[columna] = pd.to_numeric(df[columna], errors='coerce')
+        for columna in ('fecha_inicial', 'fecha_final'):
+            df[columna] = pd.to_datetime(df[columna], errors='coerce').dt.normalize()
+
+        df = df[df['minimo'].notna() | df['maximo'].notna()]
+        df['pdv'] = self._codigo_pdv(df['punto_de_venta']).fillna(df['punto_de_venta'])
+        rango = {fuente: i for i, fuente in enumerate(self.precedencia)}
+        df['prioridad'] = df['fuente'].map(rango).fillna(len(rango)).astype(int)
+        return df
+
+    def _filtrar_vigentes(self, df):
+        """Descarta políticas con fecha_inicial/fecha_final que no cubren la fecha de corte"""
+        vigente = (
+            (df['fecha_inicial'].isna() | (df['fecha_inicial'] <= self.fecha_corte))
+            & (df['fecha_final'].isna() | (df['fecha_final'] >= self.fecha_corte))
+        )
+        if self.logger and (~vigente).any():
+            self.logger.info(f"📅 {int((~vigente).sum())} políticas fuera de vigencia al {self.fecha_corte:%Y-%m-%d}")
+        return df[vigente]
+
+    def _expandir_generales(self, df):
+        """Replica las políticas sin punto de venta (semanales, quincenales) a cada PDV"""
+        generales = df['punto_de_venta'].isna()
+        if not generales.any():
+            return df
+
+        pdvs = self.pdvs
+        if pdvs is None:
+            pdvs = df.loc[~generales].sort_values('prioridad', kind='stable')['punto_de_venta']
+        pdvs = pd.DataFrame({'punto_de_venta': pd.Series(pdvs, dtype='string')})
+        if pdvs.empty:
+            pdvs = pd.DataFrame({'punto_de_venta': pd.Series([PDV_TODOS], dtype='string')})
+        # Un rótulo por PDV aunque las fuentes lo escriban distinto
+        pdvs['pdv'] = self._codigo_pdv(pdvs['punto_de_venta']).fillna(pdvs['punto_de_venta'])
+        pdvs = pdvs.drop_duplicates(subset='pdv')
+
+        expandidas = df[generales].drop(columns=['punto_de_venta', 'pdv']).merge(pdvs, how='cross')
+        return pd.concat([df[~generales], expandidas], ignore_index=True)
+
+    def _aplicar_imperativas(self, df):
+        """Si una celda tiene fuente imperativa, solo esas fuentes cuentan para ella"""
+        if not self.fuentes_imperativas:
+            return df
+        imperativa = df['fuente'].isin(self.fuentes_imperativas)
+        tiene_imperativa = imperativa.groupby([df['codigo'], df['pdv']]).transform('any')
+        return df[imperativa | ~tiene_imperativa]
+
+    @staticmethod
+    def _codigo_pdv(punto_de_venta):
+        """Código numérico al final del rótulo del PDV (NA si no lo trae)"""
+        return punto_de_venta.astype('string').str.extract(r'(\d+)\s*$', expand=False)
+
+    def _resolver_limite(self, df, columna, clave):
+        """
+        Elige el valor efectivo de un límite según su regla.
+
+        Returns:
+            pd.DataFrame: columna y fuente elegida, indexado por la clave
+        """
+        regla = self.reglas[columna]
+        if regla not in ('max', 'min', 'precedencia'):
+            raise ValueError(f"Regla de política no soportada para {columna}: {regla}")
+
+        candidatos = df[df[columna].notna()]
+        if regla == 'precedencia':
+            orden, ascendente = ['prioridad'], [True]
+        else:
+            # Empates en valor: gana la fuente más prioritaria
+            orden, ascendente = [columna, 'prioridad'], [regla == 'min', True]
+
+        return (
+            candidatos.sort_values(orden, ascending=ascendente, kind='stable')
+            .drop_duplicates(subset=clave, keep='first')
+            .set_index(clave)[[columna, 'fuente']]
+        )
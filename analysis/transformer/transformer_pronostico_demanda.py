@@ -0,0 +1,230 @@
+# analysis/transformer/transformer_pronostico_demanda.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_estadisticas_demanda import TransformadorEstadisticasDemanda
+
+COLUMNAS_PRONOSTICO_DEMANDA = [
+    'codigo', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'modelo', 'periodo_pronostico', 'horizonte',
+    'pronostico_mes', 'pronostico_horizonte', 'error_backtest',
+    'meses_historia', 'intermitente'
+]
+
+# Proporción mínima de meses sin venta para considerar la serie intermitente
+UMBRAL_INTERMITENCIA = 0.3
+
+
+def media_movil(y, k):
+    """
+    Promedio móvil de k meses.
+
+    Args:
+        y (np.ndarray): Series × meses
+        k (int): Meses del promedio (con menos historia se usan los disponibles)
+
+    Returns:
+        tuple: (ajustes un paso adelante series × meses, función h -> pronóstico)
+    """
+    n, t_total = y.shape
+    acumulado = np.concatenate([np.zeros((n, 1)), np.cumsum(y, axis=1)], axis=1)
+    ajustes = np.full((n, t_total), np.nan)
+    for t in range(1, t_total):
+        ventana = min(k, t)
+        ajustes[:, t] = (acumulado[:, t] - acumulado[:, t - ventana]) / ventana
+    ventana = min(k, t_total)
+    final = (acumulado[:, t_total] - acumulado[:, t_total - ventana]) / ventana
+    return ajustes, lambda h: final
+
+
+def suavizado_exponencial(y, alfa):
+    """Suavizado exponencial simple (nivel) con nivel inicial en el primer mes"""
+    n, t_total = y.shape
+    ajustes = np.full((n, t_total), np.nan)
+    nivel = y[:, 0].copy()
+    for t in range(1, t_total):
+        ajustes[:, t] = nivel
+        nivel = alfa * y[:, t] + (1 - alfa) * nivel
+    return ajustes, lambda h: nivel
+
+
+def holt(y, alfa, beta):
+    """Suavizado exponencial doble de Holt (nivel + tendencia lineal)"""
+    n, t_total = y.shape
+    ajustes = np.full((n, t_total), np.nan)
+    nivel = y[:, 0].copy()
+    tendencia = np.zeros(n)
+    for t in range(1, t_total):
+        ajustes[:, t] = np.maximum(nivel + tendencia, 0)
+        nivel_anterior = nivel
+        nivel = alfa * y[:, t] + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (nivel - nivel_anterior) + (1 - beta) * tendencia
+    return ajustes, lambda h: np.maximum(nivel + h * tendencia, 0)
+
+
+def croston(y, alfa):
+    """
+    Método de Croston para demanda intermitente: suaviza por separado el tamaño
+    de la demanda y el intervalo entre meses con venta; pronóstico = tamaño / intervalo.
+    """
+    n, t_total = y.shape
+    ajustes = np.full((n, t_total), np.nan)
+    hay_demanda = y[:, 0] > 0
+    tamano = np.where(hay_demanda, y[:, 0], 0.0)
+    intervalo = np.ones(n)
+    meses_desde_venta = np.ones(n)
+
+    for t in range(1, t_total):
+        ajustes[:, t] = np.where(hay_demanda, tamano / intervalo, 0.0)
+        venta = y[:, t] > 0
+        actualiza = venta & hay_demanda
+        inicia = venta & ~hay_demanda
+        tamano = np.where(actualiza, tamano + alfa * (y[:, t] - tamano), tamano)
+        intervalo = np.where(actualiza, intervalo + alfa * (meses_desde_venta - intervalo), intervalo)
+        tamano = np.where(inicia, y[:, t], tamano)
+        intervalo = np.where(inicia, meses_desde_venta, intervalo)
+        hay_demanda |= venta
+        meses_desde_venta = np.where(venta, 1, meses_desde_venta + 1)
+
+    final = np.where(hay_demanda, tamano / intervalo, 0.0)
+    return ajustes, lambda h: final
+
+
+# Modelos candidatos; ante igual error gana el primero (el más simple)
+MODELOS_PRONOSTICO = [
+    ('promedio_movil_3', lambda y: media_movil(y, 3)),
+    ('promedio_movil_2', lambda y: media_movil(y, 2)),
+    ('ultimo_mes', lambda y: media_movil(y, 1)),
+    ('suavizado_0.3', lambda y: suavizado_exponencial(y, 0.3)),
+    ('suavizado_0.6', lambda y: suavizado_exponencial(y, 0.6)),
+    ('holt_0.5_0.2', lambda y: holt(y, 0.5, 0.2)),
+    ('holt_0.8_0.4', lambda y: holt(y, 0.8, 0.4)),
+    ('croston_0.2', lambda y: croston(y, 0.2)),
+    ('croston_0.5', lambda y: croston(y, 0.5)),
+]
+
+
+class TransformadorPronosticoDemanda(TransformadorEstadisticasDemanda):
+    """
+    Pronóstico de demanda mensual por SKU×PDV.
+
+    Ajusta todos los modelos candidatos a todas las series a la vez sobre la
+    matriz series×mes (un paso de tiempo vectorizado sobre todas las series),
+    elige por serie el de menor error absoluto medio un paso adelante en el
+    histórico y proyecta los próximos meses.
+
+    Cada serie empieza en su primer mes con venta: los meses anteriores no son
+    demanda cero sino un producto que aún no se vendía, así que no cuentan
+    para el ajuste ni para marcarla intermitente.
+    """
+
+    def __init__(self, df, logger=None, horizonte=1, modelos=None):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Ventas por codigo, codigo_pdv y periodo
+            logger: Instancia de logger para registrar eventos
+            horizonte (int): Meses a pronosticar
+            modelos (list, optional): Pares (nombre, función) a evaluar;
+                por defecto MODELOS_PRONOSTICO
+        """
+        super().__init__(df, logger=logger)
+        self.horizonte = horizonte
+        self.modelos = modelos or MODELOS_PRONOSTICO
+
+    def transformar(self):
+        """
+        Calcula el pronóstico de cada serie.
+
+        Returns:
+            pd.DataFrame: Una fila por SKU×PDV con COLUMNAS_PRONOSTICO_DEMANDA
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay ventas para pronosticar")
+            return pd.DataFrame(columns=COLUMNAS_PRONOSTICO_DEMANDA)
+
+        try:
+            cubo, presentes, skus, pdvs, periodos = self._construir_cubo()
+            i_sku, i_pdv = np.nonzero(presentes)
+            series = cubo[i_sku, i_pdv, :]
+
+            # Primer mes con venta de cada serie (0 si nunca vendió)
+            inicio = (series > 0).argmax(axis=1)
+            meses_historia = series.shape[1] - inicio
+            meses_sin_venta = (series == 0).sum(axis=1) - inicio
+
+            errores, pronosticos = self._evaluar_modelos(series, inicio)
+
+            # Mejor modelo por serie (sin backtest posible gana el primero)
+            errores_comparables = np.where(np.isnan(errores), np.inf, errores)
+            mejor = errores_comparables.argmin(axis=1)
+            filas = np.arange(len(series))
+
+            df_resultado = pd.DataFrame({
+                'codigo': skus[i_sku],
+                'codigo_pdv': pdvs[i_pdv],
+                'modelo': np.array([nombre for nombre, _ in self.modelos])[mejor],
+                'periodo_pronostico': str(periodos[-1] + 1),
+                'horizonte': self.horizonte,
+                'pronostico_mes': np.round(pronosticos[filas, mejor, 0], 4),
+                'pronostico_horizonte': np.round(pronosticos[filas, mejor, :].sum(axis=1), 4),
+                'error_backtest': np.round(errores[filas, mejor], 4),
+                'meses_historia': meses_historia,
+                'intermitente': meses_sin_venta / meses_historia >= UMBRAL_INTERMITENCIA,
+            })
+
+            descriptivos = (
+                self.df.sort_values('periodo')
+                .drop_duplicates(subset=['codigo', 'codigo_pdv'], keep='last')
+                [['codigo', 'codigo_pdv', 'nombre_producto', 'punto_de_venta']]
+                .astype({'codigo_pdv': str})
+            )
+            df_resultado = df_resultado.merge(descriptivos, on=['codigo', 'codigo_pdv'], how='left')
+
+            if self.logger:
+                uso = df_resultado['modelo'].value_counts()
+                self.logger.info(
+                    f"✅ Pronóstico calculado: {len(df_resultado)} series, {len(periodos)} meses de historia. "
+                    f"Modelos: " + ", ".join(f"{modelo}={n}" for modelo, n in uso.items())
+                )
+            return df_resultado[COLUMNAS_PRONOSTICO_DEMANDA]
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular el pronóstico de demanda: {e}")
+            return pd.DataFrame(columns=COLUMNAS_PRONOSTICO_DEMANDA)
+
+    def _evaluar_modelos(self, series, inicio=None):
+        """
+        Ajusta cada modelo a todas las series.
+
+        Las series se agrupan por mes de inicio y cada grupo se ajusta en bloque
+        desde ese mes, así el costo sigue siendo un paso vectorizado por mes.
+
+        Args:
+            series (np.ndarray): Ventas series × meses
+            inicio (np.ndarray, optional): Primer mes de cada serie; por defecto 0
+
+        Returns:
+            tuple: (errores series × modelos, pronósticos series × modelos × horizonte)
+        """
+        n = len(series)
+        errores = np.full((n, len(self.modelos)), np.nan)
+        pronosticos = np.zeros((n, len(self.modelos), self.horizonte))
+        if inicio is None:
+            inicio = np.zeros(n, dtype=int)
+
+        for desde in np.unique(inicio):
+            grupo = np.flatnonzero(inicio == desde)
+            tramo = series[grupo, desde:]
+            for j, (_, modelo) in enumerate(self.modelos):
+                ajustes, pronosticar = modelo(tramo)
+                residuos = np.abs(tramo[:, 1:] - ajustes[:, 1:])
+                if residuos.shape[1]:
+                    errores[grupo, j] = residuos.mean(axis=1)
+                for h in range(1, self.horizonte + 1):
+                    pronosticos[grupo, j, h - 1] = pronosticar(h)
+
+        return errores, pronosticos
@@ -0,0 +1,192 @@
+# analysis/transformer/transformer_stock_seguridad.py
+
+import hashlib
+import threading
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+from analysis.extractor.extractor_stock_seguridad import COLUMNAS_INSUMO_STOCK_SEGURIDAD
+
+# Probabilidad de no quedar sin inventario durante la reposición
+NIVEL_SERVICIO_DEFECTO = 0.95
+
+# Días de reposición cuando la maestra no trae tiempo_reposicion
+DIAS_REPOSICION_DEFECTO = 8
+
+# Días de demanda que cubre el pedido por encima del punto de reorden
+DIAS_REVISION_DEFECTO = 15
+
+# Días por mes con que se pasan a diarias las estadísticas mensuales
+DIAS_MES = 30
+
+COLUMNAS_STOCK_SEGURIDAD = [
+    'codigo', 'nombre_producto', 'codigo_pdv', 'punto_de_venta',
+    'demanda_diaria', 'varianza_diaria', 'tiempo_reposicion',
+    'demanda_reposicion', 'desviacion_reposicion',
+    'nivel_servicio', 'factor_servicio',
+    'stock_seguridad', 'punto_reorden', 'nivel_maximo',
+    'stock_minimo_maestra', 'stock_maximo_maestra', 'huella'
+]
+
+
+def factor_servicio(nivel_servicio):
+    """
+    Factor z de la normal estándar para un nivel de servicio.
+
+    Args:
+        nivel_servicio (float): Probabilidad entre 0 y 1 (exclusivos)
+
+    Returns:
+        float: z tal que P(Z <= z) = nivel_servicio
+    """
+    if not 0 < nivel_servicio < 1:
+        raise ValueError(f"Nivel de servicio fuera de rango (0, 1): {nivel_servicio}")
+    return NormalDist().inv_cdf(nivel_servicio)
+
+
+def huella_insumos(df, parametros):
+    """
+    Huella de los insumos y parámetros del cálculo.
+
+    Es independiente del orden de las filas: se ordena por SKU×PDV y se
+    combinan los hashes por fila de pandas con los parámetros.
+
+    Args:
+        df (pd.DataFrame): Insumos con COLUMNAS_INSUMO_STOCK_SEGURIDAD
+        parametros (dict): Parámetros que afectan el resultado
+
+    Returns:
+        str: Hash SHA-1 en hexadecimal
+    """
+    ordenado = df[COLUMNAS_INSUMO_STOCK_SEGURIDAD].sort_values(['codigo', 'codigo_pdv'], kind='stable')
+    hashes = pd.util.hash_pandas_object(ordenado, index=False).to_numpy()
+    huella = hashlib.sha1(hashes.tobytes())
+    huella.update(repr(sorted(parametros.items())).encode())
+    return huella.hexdigest()
+
+
+class TransformadorStockSeguridad(BaseTransformer):
+    """
+    Stock de seguridad y punto de reorden por SKU×PDV.
+
+    Con demanda diaria d, varianza diaria s² y tiempo de reposición L días:
+        demanda_reposicion = d·L
+        desviacion_reposicion = sqrt(L·s²)
+        stock_seguridad = z·desviacion_reposicion
+        punto_reorden = demanda_reposicion + stock_seguridad
+        nivel_maximo = punto_reorden + d·dias_revision
+    donde z es el factor del nivel de servicio. Todo se calcula en cajas
+    sobre columnas completas, sin recorrer filas.
+
+    Los resultados se guardan en memoria por huella de insumos y parámetros,
+    de modo que varios procesos de la misma ejecución no repiten el cálculo.
+    """
+
+    _cache = {}
+    _bloqueo = threading.Lock()
+
+    def __init__(self, df, logger=None, nivel_servicio=NIVEL_SERVICIO_DEFECTO,
+                 dias_reposicion_defecto=DIAS_REPOSICION_DEFECTO, dias_revision=DIAS_REVISION_DEFECTO):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Insumos por SKU×PDV (ExtractorStockSeguridad)
+            logger: Instancia de logger para registrar eventos
+            nivel_servicio (float): Nivel de servicio objetivo (ej: 0.95)
+            dias_reposicion_defecto (float): Tiempo de reposición si la maestra no lo trae
+            dias_revision (float): Días de demanda entre el punto de reorden y el máximo
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.nivel_servicio = nivel_servicio
+        self.dias_reposicion_defecto = dias_reposicion_defecto
+        self.dias_revision = dias_revision
+
+    @property
+    def parametros(self):
+        """Parámetros que forman parte de la huella"""
+        return {
+            'nivel_servicio': self.nivel_servicio,
+            'dias_reposicion_defecto': self.dias_reposicion_defecto,
+            'dias_revision': self.dias_revision,
+            'dias_mes': DIAS_MES,
+        }
+
+    def huella(self):
+        """Huella de los insumos y parámetros actuales"""
+        return huella_insumos(self.df, self.parametros)
+
+    def transformar(self):
+        """
+        Calcula el stock de seguridad, reutilizando el resultado si la huella ya se calculó.
+
+        Returns:
+            pd.DataFrame: Una fila por SKU×PDV con COLUMNAS_STOCK_SEGURIDAD
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay insumos para el stock de seguridad")
+            return pd.DataFrame(columns=COLUMNAS_STOCK_SEGURIDAD)
+
+        try:
+            huella = self.huella()
+            with self._bloqueo:
+                en_cache = self._cache.get(huella)
+            if en_cache is not None:
+                if self.logger:
+                    self.logger.info(f"♻️ Stock de seguridad reutilizado desde caché (huella {huella[:12]})")
+                return en_cache.copy()
+
+            df_resultado = self._calcular(huella)
+            with self._bloqueo:
+                self._cache[huella] = df_resultado
+            return df_resultado.copy()
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular el stock de seguridad: {e}")
+            return pd.DataFrame(columns=COLUMNAS_STOCK_SEGURIDAD)
+
+    def _calcular(self, huella):
+        """Aplica las fórmulas sobre todas las combinaciones SKU×PDV a la vez"""
+        df = self.df.copy()
+        z = factor_servicio(self.nivel_servicio)
+
+        promedio = pd.to_numeric(df['promedio_venta'], errors='coerce').fillna(0).clip(lower=0).to_numpy()
+        desviacion = pd.to_numeric(df['desviacion_venta'], errors='coerce').fillna(0).clip(lower=0).to_numpy()
+        reposicion = pd.to_numeric(df['tiempo_reposicion'], errors='coerce').to_numpy(dtype=float)
+        reposicion = np.where(np.isfinite(reposicion) & (reposicion > 0), reposicion, self.dias_reposicion_defecto)
+
+        # Estadísticas mensuales a diarias asumiendo días independientes
+        demanda_diaria = promedio / DIAS_MES
+        varianza_diaria = desviacion ** 2 / DIAS_MES
+
+        demanda_reposicion = demanda_diaria * reposicion
+        desviacion_reposicion = np.sqrt(reposicion * varianza_diaria)
+        stock_seguridad = z * desviacion_reposicion
+        punto_reorden = demanda_reposicion + stock_seguridad
+        nivel_maximo = punto_reorden + demanda_diaria * self.dias_revision
+
+        df['demanda_diaria'] = np.round(demanda_diaria, 4)
+        df['varianza_diaria'] = np.round(varianza_diaria, 4)
+        df['tiempo_reposicion'] = reposicion
+        df['demanda_reposicion'] = np.round(demanda_reposicion, 2)
+        df['desviacion_reposicion'] = np.round(desviacion_reposicion, 2)
+        df['nivel_servicio'] = self.nivel_servicio
+        df['factor_servicio'] = round(z, 4)
+        df['stock_seguridad'] = np.round(stock_seguridad, 2)
+        df['punto_reorden'] = np.round(punto_reorden, 2)
+        df['nivel_maximo'] = np.round(nivel_maximo, 2)
+        df['huella'] = huella
+
+        if self.logger:
+            self.logger.info(
+                f"✅ Stock de seguridad calculado: {len(df)} combinaciones SKU×PDV, "
+                f"nivel de servicio {self.nivel_servicio:.1%} (z={z:.3f}), "
+                f"{int((df['stock_seguridad'] > 0).sum())} con stock de seguridad positivo"
+            )
+        return df[COLUMNAS_STOCK_SEGURIDAD]
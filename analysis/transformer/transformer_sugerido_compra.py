@@ -0,0 +1,91 @@
+# analysis/transformer/transformer_sugerido_compra.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_traslados import TransformadorTraslados
+
+COLUMNAS_SUGERIDO_COMPRA = [
+    'codigo_producto', 'codigo_pdv', 'punto_de_venta', 'nombre_producto', 'fecha',
+    'clasificacion', 'inv_fraccion', 'inv_minimo', 'inv_maximo',
+    'cant_compra', 'cant_traslado', 'cant_sugerida',
+    'mayor_costo', 'inv_avaluado', 'compra_valuada'
+]
+
+
+class TransformadorSugeridoCompra(TransformadorTraslados):
+    """
+    Calcula el sugerido de compra por PDV×SKU para toda la cadena.
+
+    Reutiliza la normalización de inventario, la clasificación y la política
+    min/max de traslados; opcionalmente descuenta lo que cada PDV recibirá por
+    traslado antes de comprar.
+    """
+
+    def __init__(self, df, logger=None, fecha_corte=None, politicas=None, descontar_traslados=True):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Insumos por PDV×SKU (ExtractorTraslados)
+            logger: Instancia de logger para registrar eventos
+            fecha_corte (date, optional): Fecha del sugerido; por defecto hoy
+            politicas (pd.DataFrame, optional): Mínimos y máximos efectivos por PDV×SKU
+            descontar_traslados (bool): Restar las unidades que llegarán por traslado
+        """
+        super().__init__(df, logger=logger, fecha_corte=fecha_corte, politicas=politicas)
+        self.descontar_traslados = descontar_traslados
+
+    def transformar(self):
+        """
+        Calcula cantidades y valorización del sugerido.
+
+        Returns:
+            pd.DataFrame: Una fila por PDV×SKU con compra sugerida mayor que cero
+        """
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay datos para calcular el sugerido de compra")
+            return pd.DataFrame(columns=COLUMNAS_SUGERIDO_COMPRA)
+
+        try:
+            self._limpiar_datos()
+            self._clasificar()
+            self._calcular_politica()
+            self._calcular_desviacion()
+
+            # Unidades que cada PDV recibirá por traslado
+            self.df['cant_traslado'] = 0.0
+            if self.descontar_traslados:
+                exceso = self.df[self.df['desviacion_inventario'] == 'exceso']
+                deficit = self.df[self.df['desviacion_inventario'] == 'deficit']
+                traslados = self._emparejar(exceso, deficit)
+                if not traslados.empty:
+                    recibido = traslados.groupby(['codigo', 'destino'])['cantidad_transferir'].sum()
+                    claves = pd.MultiIndex.from_frame(self.df[['codigo', 'punto_de_venta']])
+                    self.df['cant_traslado'] = recibido.reindex(claves).fillna(0).to_numpy()
+
+            self.df['cant_sugerida'] = np.maximum(self.df['cant_compra'] - self.df['cant_traslado'], 0)
+            self.df['compra_valuada'] = (self.df['cant_sugerida'] * self.df['mayor_costo']).round(2)
+
+            df_sugerido = self.df[self.df['cant_sugerida'] > 0].rename(columns={'codigo': 'codigo_producto'})
+            df_sugerido = df_sugerido.assign(fecha=self.fecha_corte.date())
+
+            if self.logger:
+                self.logger.info(
+                    f"✅ Sugerido de compra: {len(df_sugerido)} líneas, "
+                    f"{df_sugerido['cant_sugerida'].sum():.0f} cajas, "
+                    f"${df_sugerido['compra_valuada'].sum():,.0f} "
+                    f"({self.df['cant_traslado'].sum():.0f} cajas cubiertas por traslados)"
+                )
+
+            return df_sugerido[COLUMNAS_SUGERIDO_COMPRA].reset_index(drop=True)
+
+        except pd.errors.MergeError as e:
+            # Política externa con claves repetidas: se propaga en vez de devolver un sugerido vacío
+            if self.logger:
+                self.logger.error(f"💥 Política min/max inválida para el sugerido de compra: {e}")
+            raise
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular el sugerido de compra: {e}")
+            return pd.DataFrame(columns=COLUMNAS_SUGERIDO_COMPRA)
@@ -0,0 +1,270 @@
+# analysis/transformer/transformer_traslados.py
+
+import numpy as np
+import pandas as pd
+from analysis.transformer.transformer_base import BaseTransformer
+
+# Clasificación por promedio de venta mensual (cajas): (letra, venta mínima)
+UMBRALES_CLASIFICACION = [('E', 4.0), ('A', 2.0), ('B', 0.5), ('L', 0.17)]
+
+# Días de cobertura del inventario máximo por clasificación
+DIAS_COBERTURA = {'E': 16, 'A': 21, 'B': 31}
+
+# Productos activados hace menos de estos días se tratan como nuevos (N)
+DIAS_PRODUCTO_NUEVO = 90
+
+COLUMNAS_DESVIACION = [
+    'punto_de_venta', 'codigo', 'nombre_producto',
+    'inventario_caja', 'inventario_blister', 'inventario_unidad',
+    'venta_m3', 'venta_m2', 'venta_m1',
+    'promedio_venta', 'prom_2_meses', 'rotacion_diaria',
+    'Fecha_activacion', 'clasificacion',
+    'inv_minimo', 'inv_maximo', 'inv_fraccion',
+    'desviacion_inventario', 'cant_compra',
+    'mayor_costo', 'inv_avaluado', 'compra_valuada', 'cant_exceso'
+]
+
+COLUMNAS_TRASLADOS = [
+    'codigo', 'nombre_producto',
+    'origen', 'origen_clasificacion', 'origen_promedio_venta',
+    'cantidad_transferir',
+    'destino', 'destino_clasificacion', 'destino_promedio_venta',
+    'mayor_costo', 'costo_total'
+]
+
+
+class TransformadorTraslados(BaseTransformer):
+    """
+    Clasifica cada PDV×SKU en exceso o déficit frente a su política min/max
+    y empareja excesos con déficits del mismo SKU entre PDVs.
+
+    El emparejamiento es un greedy vectorizado: por SKU, los orígenes se ordenan
+    del más lento al más rápido y los destinos del más rápido al más lento, y se
+    cruzan los intervalos acumulados de oferta y demanda de todos los SKUs a la vez.
+    """
+
+    def __init__(self, df, logger=None, fecha_corte=None, politicas=None):
+        """
+        Inicializa el transformador.
+
+        Args:
+            df (pd.DataFrame): Insumos por PDV×SKU (ExtractorTraslados)
+            logger: Instancia de logger para registrar eventos
+            fecha_corte (date, optional): Fecha para decidir productos nuevos; por defecto hoy
+            politicas (pd.DataFrame, optional): codigo, codigo_pdv, inv_minimo, inv_maximo
+                que reemplazan la política calculada por clasificación
+        """
+        self.path = None  # No usamos path en este caso
+        self.df = df
+        self.logger = logger
+        self.fecha_corte = pd.Timestamp(fecha_corte or pd.Timestamp.now()).normalize()
+        self.politicas = politicas
+
+    def transformar(self):
+        """
+        Ejecuta clasificación, política y emparejamiento.
+
+        Returns:
+            dict: DataFrames 'exceso', 'deficit' y 'traslados' con el esquema de los CSV
+        """
+        vacio = {
+            'exceso': pd.DataFrame(columns=COLUMNAS_DESVIACION),
+            'deficit': pd.DataFrame(columns=COLUMNAS_DESVIACION),
+            'traslados': pd.DataFrame(columns=COLUMNAS_TRASLADOS),
+        }
+        if self.df is None or self.df.empty:
+            if self.logger:
+                self.logger.warning("⚠️ No hay datos para calcular traslados")
+            return vacio
+
+        try:
+            self._limpiar_datos()
+            self._clasificar()
+            self._calcular_politica()
+            self._calcular_desviacion()
+
+            exceso = self.df[self.df['desviacion_inventario'] == 'exceso']
+            deficit = self.df[self.df['desviacion_inventario'] == 'deficit']
+            traslados = self._emparejar(exceso, deficit)
+
+            if self.logger:
+                self.logger.info(
+                    f"✅ Traslados calculados: {len(exceso)} excesos, {len(deficit)} déficits, "
+                    f"{len(traslados)} movimientos ({traslados['cantidad_transferir'].sum():.0f} cajas)"
+                )
+
+            return {
+                'exceso': exceso[COLUMNAS_DESVIACION].reset_index(drop=True),
+                'deficit': deficit[COLUMNAS_DESVIACION].reset_index(drop=True),
+                'traslados': traslados,
+            }
+
+        except pd.errors.MergeError as e:
+            # Política externa con claves repetidas: se propaga en vez de devolver traslados vacíos
+            if self.logger:
+                self.logger.error(f"💥 Política min/max inválida para traslados: {e}")
+            raise
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"💥 Error al calcular traslados: {e}")
+            return vacio
+
+    def _limpiar_datos(self):
+        """Normaliza tipos y completa valores faltantes"""
+        columnas_numericas = [
+            'inventario_caja', 'inventario_blister', 'inventario_unidad',
+            'venta_m3', 'venta_m2', 'venta_m1',
+            'promedio_venta', 'prom_2_meses', 'rotacion_diaria', 'costo_unitario'
+        ]
+        for col in columnas_numericas:
+            self.df[col] = pd.to_numeric(self.df[col], errors='coerce').fillna(0)
+
+        for col in ('contenido_caja', 'contenido_blister'):
+            contenido = pd.to_numeric(self.df[col], errors='coerce')
+            self.df[col] = contenido.where(contenido > 0, 1)
+
+        self.df['codigo'] = self.df['codigo'].astype(str).str.strip()
+        self.df['fecha_activacion'] = pd.to_datetime(self.df['fecha_activacion'], errors='coerce').dt.normalize()
+
+        # Inventario expresado en cajas (blister y unidad como fracción de caja)
+        self.df['inv_fraccion'] = (
+            self.df['inventario_caja']
+            + self.df['inventario_blister'] / self.df['contenido_blister']
+            + self.df['inventario_unidad'] / self.df['contenido_caja']
+        )
+
+        # Mayor costo unitario del SKU entre todos los PDVs
+        self.df['mayor_costo'] = self.df.groupby('codigo')['costo_unitario'].transform('max')
+
+    def _clasificar(self):
+        """Asigna la clasificación E/A/B/L/D por velocidad y N para productos nuevos"""
+        promedio = self.df['promedio_venta'].to_numpy()
+        condiciones = [promedio >= umbral for _, umbral in UMBRALES_CLASIFICACION]
+        letras = [letra for letra, _ in UMBRALES_CLASIFICACION]
+        clasificacion = np.select(condiciones, letras, default='D')
+
+        dias_activo = (self.fecha_corte - self.df['fecha_activacion']).dt.days
+        es_nuevo = (dias_activo >= 0) & (dias_activo <= DIAS_PRODUCTO_NUEVO)
+        self.df['clasificacion'] = np.where(es_nuevo.to_numpy(), 'N', clasificacion)
+
+    def _calcular_politica(self):
+        """Calcula inv_minimo/inv_maximo por clasificación, con políticas externas opcionales"""
+        clasificacion = self.df['clasificacion']
+        rotacion_diaria = self.df['promedio_venta'] / 30
+
+        maximo = pd.Series(0.0, index=self.df.index)
+        for letra, dias in DIAS_COBERTURA.items():
+            mascara = clasificacion == letra
+            maximo[mascara] = np.maximum(np.floor(rotacion_diaria[mascara] * dias + 0.5), 1)
+        maximo[clasificacion == 'L'] = 1
+        mascara_nuevo = clasificacion == 'N'
+        maximo[mascara_nuevo] = np.floor(self.df.loc[mascara_nuevo, 'prom_2_meses'] * 2 + 0.5)
+
+        self.df['inv_maximo'] = maximo
+        self.df['inv_minimo'] = maximo
+
+        if self.politicas is not None and not self.politicas.empty:
+            politicas = self.politicas[['codigo', 'codigo_pdv', 'inv_minimo', 'inv_maximo']].astype(
+                {'codigo': str, 'codigo_pdv': str}
+            )
+            # Una política por PDV×SKU: una clave repetida multiplicaría filas y desalinearía el df
+            externas = self.df[['codigo', 'codigo_pdv']].astype(str).merge(
+                politicas, on=['codigo', 'codigo_pdv'], how='left', validate='many_to_one'
+            )
+            for col in ('inv_minimo', 'inv_maximo'):
+                externa = externas[col].to_numpy(dtype=float)
+                self.df[col] = np.where(np.isnan(externa), self.df[col].to_numpy(), externa)
+
+    def _calcular_desviacion(self):
+        """Marca exceso/déficit y calcula cantidades y valorizaciones"""
+        inv = self.df['inv_fraccion']
+        es_exceso = inv > self.df['inv_maximo']
+        es_deficit = inv < self.df['inv_minimo']
+
+        self.df['desviacion_inventario'] = np.select([es_exceso, es_deficit], ['exceso', 'deficit'], default='')
+
+        # Se compra hasta el máximo; se traslada lo que supera el máximo más una caja de resguardo
+        self.df['cant_compra'] = np.where(es_deficit, np.ceil(self.df['inv_maximo'] - inv - 1e-9), 0.0)
+        resguardo = np.where(self.df['inv_maximo'] > 0, 1, 0)
+        self.df['cant_exceso'] = np.where(
+            es_exceso,
+            np.maximum(np.floor(self.df['inventario_caja']) - self.df['inv_maximo'] - resguardo, 0),
+            0.0
+        )
+
+        self.df['inv_avaluado'] = (inv * self.df['mayor_costo']).round(2)
+        self.df['compra_valuada'] = (self.df['cant_compra'] * self.df['mayor_costo']).round(2)
+        self.df['inv_fraccion'] = inv.round(2)
+        self.df['mayor_costo'] = self.df['mayor_costo'].round(2)
+        self.df['Fecha_activacion'] = self.df['fecha_activacion'].map(
+            lambda f: f"{f.day}/{f:%m/%Y}" if pd.notna(f) else None
+        )
+
+    def _emparejar(self, exceso, deficit):
+        """
+        Cruza oferta (cant_exceso) y demanda (cant_compra) por SKU en una sola pasada.
+
+        Returns:
+            pd.DataFrame: Movimientos con el esquema de traslados_final.csv
+        """
+        oferta = exceso[exceso['cant_exceso'] > 0]
+        demanda = deficit[deficit['cant_compra'] > 0]
+        skus_comunes = np.intersect1d(oferta['codigo'].unique(), demanda['codigo'].unique())
+        if len(skus_comunes) == 0:
+            return pd.DataFrame(columns=COLUMNAS_TRASLADOS)
+
+        # Origen: primero el PDV que menos vende; destino: primero el que más vende
+        oferta = oferta[oferta['codigo'].isin(skus_comunes)].sort_values(
+            ['codigo', 'promedio_venta', 'cant_exceso'], ascending=[True, True, False]
+        ).reset_index(drop=True)
+        demanda = demanda[demanda['codigo'].isin(skus_comunes)].sort_values(
+            ['codigo', 'promedio_venta', 'cant_compra'], ascending=[True, False, False]
+        ).reset_index(drop=True)
+
+        sku_oferta = np.searchsorted(skus_comunes, oferta['codigo'].to_numpy())
+        sku_demanda = np.searchsorted(skus_comunes, demanda['codigo'].to_numpy())
+        fin_oferta = oferta.groupby('codigo')['cant_exceso'].cumsum().to_numpy()
+        fin_demanda = demanda.groupby('codigo')['cant_compra'].cumsum().to_numpy()
+
+        # Lo trasladable por SKU es el mínimo entre oferta y demanda totales
+        tope = np.minimum(
+            np.bincount(sku_oferta, weights=oferta['cant_exceso'], minlength=len(skus_comunes)),
+            np.bincount(sku_demanda, weights=demanda['cant_compra'], minlength=len(skus_comunes)),
+        )
+
+        # Puntos de corte de ambos acumulados, desplazados para separar los SKUs
+        escala = max(fin_oferta.max(), fin_demanda.max()) + 1
+        desplazamiento = np.arange(len(skus_comunes)) * escala
+        cortes = np.unique(np.concatenate([
+            desplazamiento,
+            desplazamiento[sku_oferta] + np.minimum(fin_oferta, tope[sku_oferta]),
+            desplazamiento[sku_demanda] + np.minimum(fin_demanda, tope[sku_demanda]),
+        ]))
+        inicio, fin = cortes[:-1], cortes[1:]
+        medio = (inicio + fin) / 2
+        sku_tramo = np.floor(medio / escala).astype(int)
+        validos = (fin > inicio) & (medio - desplazamiento[sku_tramo] < tope[sku_tramo])
+        inicio, fin, medio = inicio[validos], fin[validos], medio[validos]
+
+        # Cada tramo pertenece a un único origen y un único destino
+        i_origen = np.searchsorted(desplazamiento[sku_oferta] + fin_oferta, medio, side='right')
+        i_destino = np.searchsorted(desplazamiento[sku_demanda] + fin_demanda, medio, side='right')
+
+        origen = oferta.iloc[i_origen].reset_index(drop=True)
+        destino = demanda.iloc[i_destino].reset_index(drop=True)
+        cantidad = fin - inicio
+
+        traslados = pd.DataFrame({
+            'codigo': origen['codigo'],
+            'nombre_producto': origen['nombre_producto'],
+            'origen': origen['punto_de_venta'],
+            'origen_clasificacion': origen['clasificacion'],
+            'origen_promedio_venta': origen['promedio_venta'],
+            'cantidad_transferir': cantidad,
+            'destino': destino['punto_de_venta'],
+            'destino_clasificacion': destino['clasificacion'],
+            'destino_promedio_venta': destino['promedio_venta'],
+            'mayor_costo': origen['mayor_costo'],
+        })
+        traslados['costo_total'] = (traslados['cantidad_transferir'] * traslados['mayor_costo']).round(2)
+        return traslados[COLUMNAS_TRASLADOS]
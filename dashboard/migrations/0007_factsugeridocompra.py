@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_fix_existing_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FactSugeridoCompra',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo_producto', models.CharField(max_length=50, verbose_name='Código Producto')),
+                ('codigo_pdv', models.CharField(max_length=20, verbose_name='Código PDV')),
+                ('punto_de_venta', models.CharField(blank=True, max_length=100, null=True, verbose_name='Punto de Venta')),
+                ('nombre_producto', models.CharField(blank=True, max_length=255, null=True, verbose_name='Nombre Producto')),
+                ('fecha', models.DateField(verbose_name='Fecha del Sugerido')),
+                ('clasificacion', models.CharField(blank=True, max_length=2, null=True, verbose_name='Clasificación')),
+                ('inv_fraccion', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Inventario (Cajas)')),
+                ('inv_minimo', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Inventario Mínimo')),
+                ('inv_maximo', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Inventario Máximo')),
+                ('cant_compra', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Cantidad hasta el Máximo')),
+                ('cant_traslado', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Cantidad por Traslado')),
+                ('cant_sugerida', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Cantidad Sugerida')),
+                ('mayor_costo', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Mayor Costo')),
+                ('inv_avaluado', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Inventario Avaluado')),
+                ('compra_valuada', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Compra Valuada')),
+                ('fecha_carga', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Carga')),
+            ],
+            options={
+                'verbose_name': 'Sugerido de Compra',
+                'verbose_name_plural': 'Sugeridos de Compra',
+                'db_table': 'fact_sugerido_compra',
+                'ordering': ['-fecha', 'codigo_pdv', 'codigo_producto'],
+                'indexes': [models.Index(fields=['fecha'], name='fact_sugeri_fecha_idx'), models.Index(fields=['codigo_pdv'], name='fact_sugeri_pdv_idx')],
+                'constraints': [models.UniqueConstraint(fields=('codigo_producto', 'codigo_pdv', 'fecha'), name='unique_sugerido_producto_pdv_fecha')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_factsugeridocompra'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factsugeridocompra',
+            name='laboratorio_oferta',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Laboratorio Oferta'),
+        ),
+        migrations.AddField(
+            model_name='factsugeridocompra',
+            name='cant_obsequio',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True, verbose_name='Cantidad Obsequio'),
+        ),
+        migrations.AddField(
+            model_name='factsugeridocompra',
+            name='costo_efectivo',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='Costo Efectivo por Caja'),
+        ),
+        migrations.AddField(
+            model_name='factsugeridocompra',
+            name='ahorro_oferta',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='Ahorro por Oferta'),
+        ),
+    ]
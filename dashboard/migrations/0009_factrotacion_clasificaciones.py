@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Registra en el estado de Django las columnas de clasificación de fact_rotacion.
+    En la base de datos las crean los loaders de fact_rotacion (o ajustar_fact_rotacion.sql
+    en instalaciones anteriores), por lo que aquí no se ejecuta ningún ALTER.
+    """
+
+    dependencies = [
+        ('dashboard', '0008_factsugeridocompra_ofertas'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[],
+            state_operations=[
+                migrations.AddField(
+                    model_name='factrotacion',
+                    name='abc_clasificacion',
+                    field=models.CharField(blank=True, max_length=1, null=True, verbose_name='Clasificación ABC'),
+                ),
+                migrations.AddField(
+                    model_name='factrotacion',
+                    name='estado_inventario',
+                    field=models.CharField(blank=True, max_length=10, null=True, verbose_name='Estado Inventario'),
+                ),
+                migrations.AddField(
+                    model_name='factrotacion',
+                    name='semanas_inventario',
+                    field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Semanas de Inventario'),
+                ),
+                migrations.AddField(
+                    model_name='factrotacion',
+                    name='inventario_critico',
+                    field=models.BooleanField(blank=True, null=True, verbose_name='Inventario Crítico'),
+                ),
+                migrations.AddField(
+                    model_name='factrotacion',
+                    name='alta_rentabilidad',
+                    field=models.BooleanField(blank=True, null=True, verbose_name='Alta Rentabilidad'),
+                ),
+            ],
+        ),
+    ]
@@ -350,6 +350,13 @@ class FactRotacion(models.Model):
     dias_inventario = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True, verbose_name="Días de Inventario")
     rotacion_mes = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True, verbose_name="Rotación del Mes")
     
+    # Clasificaciones (calculadas en el transform)
+    abc_clasificacion = models.CharField(max_length=1, null=True, blank=True, verbose_name="Clasificación ABC")
+    estado_inventario = models.CharField(max_length=10, null=True, blank=True, verbose_name="Estado Inventario")
+    semanas_inventario = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Semanas de Inventario")
+    inventario_critico = models.BooleanField(null=True, blank=True, verbose_name="Inventario Crítico")
+    alta_rentabilidad = models.BooleanField(null=True, blank=True, verbose_name="Alta Rentabilidad")
+    
     # Auditoría
     fecha_carga = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Carga")
     fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
@@ -367,4 +374,57 @@ class FactRotacion(models.Model):
             models.Index(fields=['fecha']),
             models.Index(fields=['codigo_pdv']),
             models.Index(fields=['codigo_producto']),
-        ]
\ No newline at end of file
+        ]
+
+# Tabla de hechos para el sugerido de compra
+class FactSugeridoCompra(models.Model):
+    # Claves de negocio
+    codigo_producto = models.CharField(max_length=50, verbose_name="Código Producto")
+    codigo_pdv = models.CharField(max_length=20, verbose_name="Código PDV")
+    punto_de_venta = models.CharField(max_length=100, null=True, blank=True, verbose_name="Punto de Venta")
+    nombre_producto = models.CharField(max_length=255, null=True, blank=True, verbose_name="Nombre Producto")
+    fecha = models.DateField(verbose_name="Fecha del Sugerido")
+    clasificacion = models.CharField(max_length=2, null=True, blank=True, verbose_name="Clasificación")
+    
+    # Inventario y política (en cajas)
+    inv_fraccion = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Inventario (Cajas)")
+    inv_minimo = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Inventario Mínimo")
+    inv_maximo = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Inventario Máximo")
+    
+    # Cantidades
+    cant_compra = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Cantidad hasta el Máximo")
+    cant_traslado = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Cantidad por Traslado")
+    cant_sugerida = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Cantidad Sugerida")
+    
+    # Valorización
+    mayor_costo = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Mayor Costo")
+    inv_avaluado = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Inventario Avaluado")
+    compra_valuada = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Compra Valuada")
+    
+    # Mejor bonificación disponible
+    laboratorio_oferta = models.CharField(max_length=255, null=True, blank=True, verbose_name="Laboratorio Oferta")
+    cant_obsequio = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, verbose_name="Cantidad Obsequio")
+    costo_efectivo = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, verbose_name="Costo Efectivo por Caja")
+    ahorro_oferta = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, verbose_name="Ahorro por Oferta")
+    
+    # Auditoría
+    fecha_carga = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Carga")
+
+    def __str__(self):
+        return f"Sugerido {self.codigo_producto} - {self.codigo_pdv} - {self.fecha}"
+
+    class Meta:
+        db_table = 'fact_sugerido_compra'
+        verbose_name = "Sugerido de Compra"
+        verbose_name_plural = "Sugeridos de Compra"
+        ordering = ['-fecha', 'codigo_pdv', 'codigo_producto']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['codigo_producto', 'codigo_pdv', 'fecha'],
+                name='unique_sugerido_producto_pdv_fecha'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['fecha'], name='fact_sugeri_fecha_idx'),
+            models.Index(fields=['codigo_pdv'], name='fact_sugeri_pdv_idx'),
+        ]
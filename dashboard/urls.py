@@ -9,4 +9,5 @@ urlpatterns = [
     path('', views.inicio, name='inicio'), # Esta será la raíz de la app dashboard
     path('logout/', views.cerrar_sesion, name='logout'),
     path('actualizar-archivos/', views.actualizar_archivos, name='actualizar_archivos'),
+    path('resumenes-rotacion/', views.resumenes_rotacion, name='resumenes_rotacion'),
 ]
\ No newline at end of file
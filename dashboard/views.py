@@ -4,9 +4,20 @@ from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from django.http import JsonResponse
+from django.db import connection, DatabaseError
+from datetime import datetime
 from analysis.etl_prueba import procesar_archivo_excel
 import os
 
+# Tablas resumen de fact_rotacion (ver analysis/loader/resumenes_fact_rotacion.py): clave -> (tabla, orden)
+RESUMENES_ROTACION = {
+    'rotacion_por_pdv': ('resumen_rotacion_por_pdv', 'venta_total DESC'),
+    'productos_estrella': ('resumen_productos_estrella', 'venta_total DESC'),
+    'inventario_exceso': ('resumen_inventario_exceso', 'valor_inmovilizado DESC'),
+    'inventario_critico': ('resumen_inventario_critico', 'abc_clasificacion, dias_inventario'),
+}
+LIMITE_RESUMENES = 100
+
 @login_required
 def inicio(request):
     return render(request, 'dashboard/inicio.html')
@@ -27,4 +38,47 @@ def actualizar_archivos(request):
                 if procesar_archivo_excel(ruta_archivo):
                     archivos_procesados += 1
 
-    return JsonResponse({'mensaje': f'{archivos_procesados} archivos procesados exitosamente.'})
\ No newline at end of file
+    return JsonResponse({'mensaje': f'{archivos_procesados} archivos procesados exitosamente.'})
+
+def _consultar_resumen(tabla, orden, periodo, codigo_pdv, limite):
+    filtros, parametros = ['periodo = %s'], [periodo]
+    if codigo_pdv:
+        filtros.append('codigo_pdv = %s')
+        parametros.append(codigo_pdv)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT * FROM {tabla} WHERE {' AND '.join(filtros)} ORDER BY {orden} LIMIT %s",
+            parametros + [limite]
+        )
+        columnas = [columna[0] for columna in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+@login_required
+def resumenes_rotacion(request):
+    # Lee las tablas resumen precalculadas en lugar de agregar fact_rotacion en cada consulta
+    codigo_pdv = request.GET.get('codigo_pdv')
+    try:
+        limite = max(1, min(int(request.GET.get('limite', LIMITE_RESUMENES)), 1000))
+    except ValueError:
+        return JsonResponse({'error': 'limite debe ser un número entero'}, status=400)
+
+    periodo = request.GET.get('periodo')  # YYYY-MM; por defecto el último mes resumido
+    try:
+        if periodo:
+            periodo = datetime.strptime(periodo, '%Y-%m').date()
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT MAX(periodo) FROM resumen_rotacion_por_pdv")
+                periodo = cursor.fetchone()[0]
+            if periodo is None:
+                return JsonResponse({'periodo': None, **{clave: [] for clave in RESUMENES_ROTACION}})
+
+        datos = {
+            clave: _consultar_resumen(tabla, orden, periodo, codigo_pdv, limite)
+            for clave, (tabla, orden) in RESUMENES_ROTACION.items()
+        }
+    except ValueError:
+        return JsonResponse({'error': 'periodo debe tener formato YYYY-MM'}, status=400)
+    except DatabaseError as e:
+        return JsonResponse({'error': f'Resúmenes de rotación no disponibles: {e}'}, status=503)
+    return JsonResponse({'periodo': f"{periodo:%Y-%m}", **datos})
@@ -33,6 +33,10 @@ class LoggerETL:
         if self.logger:
             self.logger.info(mensaje)
 
+    def warning(self, mensaje):
+        if self.logger:
+            self.logger.warning(mensaje)
+
     def error(self, mensaje):
         if self.logger:
             self.logger.error(mensaje)